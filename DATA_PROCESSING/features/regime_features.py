@@ -41,12 +41,10 @@ def compute_trend_strength(close: pd.Series, lookback: int = 50) -> pd.Series:
         -1 = strong downtrend
         0 = no trend
     """
-    def rolling_corr_with_time(x):
-        if len(x) < 2:
-            return 0.0
-        return np.corrcoef(x, np.arange(len(x)))[0, 1]
+    from DATA_PROCESSING.utils.rolling_moments import rolling_corr
     
-    return close.rolling(lookback, min_periods=2).apply(rolling_corr_with_time)
+    # Closed-form rolling correlation with the bar index (O(n), no per-window Python call)
+    return rolling_corr(close, None, lookback, min_periods=2)
 
 
 def compute_volatility_regime(
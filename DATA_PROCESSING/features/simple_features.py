@@ -24,7 +24,7 @@ Provides a simplified feature computation logic to avoid duplicate column issues
 
 
 import polars as pl
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -227,6 +227,109 @@ class SimpleFeatureComputer:
         
         return features
     
+    def compute_universe_features(
+        self,
+        scans: Mapping[str, pl.LazyFrame],
+        config_features: List[str],
+        sector_map: Optional[Mapping[str, str]] = None,
+        market_cap_col: Optional[str] = None,
+    ) -> pl.LazyFrame:
+        """
+        Compute features for a whole universe: per-symbol features for each scan, then
+        the panel stage (compute_panel_features) once over the concatenated frame.
+        
+        Args:
+            scans: symbol -> per-symbol bars (ts, open, high, low, close, volume)
+            config_features: Feature categories (as for compute_features)
+            sector_map: Optional symbol -> sector used for sector momentum
+            market_cap_col: Optional market-cap column for deciles (default: dollar-volume proxy)
+        """
+        per_symbol = [
+            self.compute_features(scan, config_features).with_columns(pl.lit(symbol).alias("symbol"))
+            for symbol, scan in scans.items()
+        ]
+        panel = pl.concat(per_symbol, how="diagonal_relaxed")
+        if "cross_sectional" in config_features:
+            panel = self.compute_panel_features(panel, sector_map=sector_map, market_cap_col=market_cap_col)
+        return panel
+    
+    def compute_panel_features(
+        self,
+        panel: pl.LazyFrame,
+        symbol_col: str = "symbol",
+        time_col: str = "ts",
+        sector_map: Optional[Mapping[str, str]] = None,
+        market_cap_col: Optional[str] = None,
+    ) -> pl.LazyFrame:
+        """
+        Cross-sectional features over a timestamp-aligned universe frame, in one lazy pass.
+        
+        The market return at each timestamp is the equal-weighted universe mean return;
+        beta and correlation use rolling first/second moments per symbol (no per-symbol
+        join against a market series). Sector momentum is the sector mean when
+        sector_map is given, else the universe mean. Market-cap deciles rank
+        market_cap_col per timestamp, or the 20-bar mean dollar volume when it is absent.
+        Replaces the per-symbol placeholder columns of the same names.
+        """
+        sym = symbol_col
+        ret = pl.col("_ret")
+        mkt = pl.col("_mkt_ret")
+        
+        panel = panel.sort([sym, time_col]).with_columns(
+            pl.col("close").pct_change().over(sym).alias("_ret"),
+            *[pl.col("close").pct_change(n).over(sym).alias(f"_ret_{n}") for n in (5, 20, 60)],
+        )
+        if sector_map is not None:
+            sectors = pl.LazyFrame(
+                {sym: list(sector_map.keys()), "_sector": list(sector_map.values())},
+                schema={sym: pl.Utf8, "_sector": pl.Utf8},
+            )
+            panel = panel.join(sectors, on=sym, how="left")
+            sector_keys = [time_col, "_sector"]
+        else:
+            sector_keys = [time_col]
+        
+        if market_cap_col is not None:
+            size = pl.col(market_cap_col).cast(pl.Float64)
+        else:
+            size = (pl.col("close") * pl.col("volume")).rolling_mean(20).over(sym)
+        
+        panel = panel.with_columns(
+            ret.mean().over(time_col).alias("_mkt_ret"),
+            *[pl.col(f"_ret_{n}").mean().over(time_col).alias(f"_mkt_ret_{n}") for n in (5, 20, 60)],
+            size.alias("_size"),
+        )
+        
+        def rolling_stats(window: int) -> List[pl.Expr]:
+            mean_r = ret.rolling_mean(window).over(sym)
+            mean_m = mkt.rolling_mean(window).over(sym)
+            cov = (ret * mkt).rolling_mean(window).over(sym) - mean_r * mean_m
+            var_m = (mkt * mkt).rolling_mean(window).over(sym) - mean_m * mean_m
+            var_r = (ret * ret).rolling_mean(window).over(sym) - mean_r * mean_r
+            beta = pl.when(var_m > 0).then(cov / var_m).otherwise(None)
+            corr = pl.when((var_m > 0) & (var_r > 0)).then(cov / (var_m * var_r).sqrt()).otherwise(None)
+            return [
+                beta.alias(f"beta_{window}d").cast(pl.Float32),
+                corr.clip(-1.0, 1.0).alias(f"market_correlation_{window}d").cast(pl.Float32),
+            ]
+        
+        size_rank = pl.col("_size").rank("ordinal").over(time_col)
+        size_count = pl.col("_size").count().over(time_col)
+        decile = ((size_rank - 1) * 10 // size_count + 1)
+        
+        return panel.with_columns(
+            *[(pl.col(f"_ret_{n}") - pl.col(f"_mkt_ret_{n}")).alias(f"relative_performance_{n}d").cast(pl.Float32)
+              for n in (5, 20, 60)],
+            *[pl.col(f"_ret_{n}").mean().over(sector_keys).alias(f"sector_momentum_{n}d").cast(pl.Float32)
+              for n in (5, 20)],
+            pl.when(pl.col("_size").is_not_null()).then(decile).otherwise(None)
+              .alias("market_cap_decile").cast(pl.Int16),
+            *rolling_stats(20),
+            *rolling_stats(60),
+        ).drop(["_ret", "_mkt_ret", "_size", "_ret_5", "_ret_20", "_ret_60",
+                "_mkt_ret_5", "_mkt_ret_20", "_mkt_ret_60"]
+               + (["_sector"] if sector_map is not None else []))
+    
     def _compute_basic_features(self, features: pl.LazyFrame) -> pl.LazyFrame:
         """Compute basic price and volume features"""
         return features.with_columns([
@@ -585,7 +688,10 @@ class SimpleFeatureComputer:
         ])
     
     def _compute_cross_sectional_features(self, features: pl.LazyFrame) -> pl.LazyFrame:
-        """Compute cross-sectional features"""
+        """
+        Per-symbol stand-ins for the cross-sectional features (one symbol has no market to
+        compare against); compute_panel_features replaces them with panel-wide values.
+        """
         return features.with_columns([
             # Relative performance (simplified - would need market data for full implementation)
             pl.col("close").pct_change(5).alias("relative_performance_5d").cast(pl.Float32),
@@ -31,7 +31,7 @@ import numpy as np
 import sys
 from pathlib import Path
 import argparse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 import gc
 import time
@@ -164,8 +164,11 @@ def normalize_bars(df: pl.DataFrame, symbol: str, interval: str = "15m",
 # Add project root to path for centralized utilities
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
 
-from ml.memory import MemoryManager
+from DATA_PROCESSING.utils.memory_manager import MemoryManager
 from scripts.simple_feature_computation import simple_feature_computer
 from scripts.logging_manager import CentralLoggingManager
 from scripts.io_safe_scan import safe_scan_parquet, write_features_strict, dedupe_symbols
@@ -320,27 +323,6 @@ def _assert_15m_rth_structure(df_idx: pd.DatetimeIndex):
     if not (24.0 <= med <= 28.0):
         raise AssertionError(f"Unexpected 15m RTH median bars/day: {med} (expected ~26)")
 
-def _get_schedule_df(cal, start, end) -> pd.DataFrame:
-    """Get schedule DataFrame using instance methods (not class methods)."""
-    try:
-        # Use instance schedule property, not class method
-        sched = cal.schedule.loc[start:end]
-        if not isinstance(sched, pd.DataFrame):
-            raise TypeError(f"calendar.schedule returned {type(sched).__name__}, expected DataFrame")
-        if not {"open","close"}.issubset(set(sched.columns)):
-            raise AssertionError("calendar schedule missing open/close columns")
-        return sched
-    except Exception as e:
-        raise RuntimeError(f"Failed to get schedule for {start} to {end}: {e}")
-
-def _calculate_expected_bars_per_session(sched_df: pd.DataFrame, timeframe_minutes: int) -> pd.Series:
-    """Calculate expected bars per session based on session duration and timeframe."""
-    # Calculate session duration in minutes
-    session_duration_min = (sched_df["close"] - sched_df["open"]).dt.total_seconds() / 60
-    # Calculate expected bars (with tolerance for clock drift)
-    expected_bars = (session_duration_min / timeframe_minutes).round().astype(int)
-    return expected_bars
-
 def _rollup_5m_to_15m(df_5m: pl.DataFrame) -> pl.DataFrame:
     """Roll up 5m RTH data to 15m by aggregating 3 consecutive 5m bars."""
     return (
@@ -644,13 +626,10 @@ class StreamingFeatureBuilder:
         self.io_config = self.config.get('io', {})
         self.output_config = self.config.get('output', {})
         
-        # Initialize memory manager for monitoring (singleton semantics in manager)
+        # Initialize memory manager for monitoring and batch sizing; each symbol is
+        # processed under track_batch so the batch size follows its measured peak RSS
         self.memory_manager = MemoryManager()
         
-        # Track batch scaling
-        self._last_memory_check = 0
-        self._consecutive_low_usage = 0
-        
         # Polars streaming is enabled by default in newer versions
         # No need to explicitly enable it
         
@@ -690,7 +669,8 @@ class StreamingFeatureBuilder:
         processed_count = 0
         for i, symbol in enumerate(symbols):
             try:
-                self._process_symbol(symbol, input_paths, output_path)
+                with self.memory_manager.track_batch() as trace:
+                    trace.rows = self._process_symbol(symbol, input_paths, output_path) or 0
                 processed_count += 1
                 
                 # Memory check every 10 symbols
@@ -714,8 +694,8 @@ class StreamingFeatureBuilder:
         # Write schema manifest and run metrics
         self._write_schema_and_metrics(output_path, symbols, processed_count)
     
-    def _process_symbol(self, symbol: str, input_paths: List[str], output_path: Path):
-        """Process a single symbol with streaming using dataset scanning"""
+    def _process_symbol(self, symbol: str, input_paths: List[str], output_path: Path) -> Optional[int]:
+        """Process a single symbol with streaming using dataset scanning; returns the raw rows loaded"""
         print(f"🔄 Processing symbol: {symbol}")
         logger.info(f"Processing symbol: {symbol}")
         
@@ -940,75 +920,33 @@ class StreamingFeatureBuilder:
                         df_pd = df_pd[~df_pd.index.duplicated(keep="last")]
                         df_pd = df_pd.sort_index()
                         
-                        # Time-of-day minutes in UTC (int16 is plenty)
-                        tod_min = (df_pd.index.hour * 60 + df_pd.index.minute).astype("int16")
-                        df_pd["tod_min"] = tod_min
-                        
-                        # Session date key in UTC (no tz). Useful for per-session counts & joins.
-                        df_pd["session_utc"] = df_pd.index.tz_convert("UTC").date
-
-                        from scripts.bootstrap import load_cal_guarded
-                        cal = load_cal_guarded("XNYS")
-                        
-                        # Unified RTH slicer using reference minute inside bar
-                        delta = pd.to_timedelta("15min")
-                        ts_end = df_pd.index
-                        ts_start = ts_end - delta
-                        ts_ref = ts_end - pd.Timedelta(minutes=1)
-
-                        # Get schedule using instance methods
-                        start_date = (ts_ref[0] - pd.Timedelta(days=2)).date()
-                        end_date = (ts_ref[-1] + pd.Timedelta(days=2)).date()
-                        sessions = cal.sessions_in_range(start_date, end_date)
-                        sched_df = _get_schedule_df(cal, sessions[0], sessions[-1])
-
-                        # Calculate expected bars per session for validation
-                        expected_bars_per_session = _calculate_expected_bars_per_session(sched_df, 15)
-                        # Log compact summary instead of giant list
-                        vals, counts = np.unique(expected_bars_per_session, return_counts=True)
-                        logger.info(f"{symbol}: Expected 15m bars/session distribution: {dict(zip(vals.tolist(), counts.tolist()))}")
-
-                        # Use proper Polars coercion to get epoch nanoseconds
-                        open_i8 = sched_df["open"].dt.epoch("ns").to_numpy()
-                        close_i8 = sched_df["close"].dt.epoch("ns").to_numpy()
-                        ref_i8 = ts_ref.dt.epoch("ns").to_numpy()
-
-                        idx = np.searchsorted(open_i8, ref_i8, side="right") - 1
-                        idx = np.clip(idx, 0, len(open_i8) - 1)
-                        valid = (ref_i8 >= open_i8[idx]) & (ref_i8 <= close_i8[idx])
-
-                        ts_start_i8 = ts_start.dt.epoch("ns").to_numpy()
-                        ts_end_i8 = ts_end.dt.epoch("ns").to_numpy()
-                        bar_len_i8 = (ts_end_i8 - ts_start_i8)
-
-                        open_for_bar_i8 = open_i8[idx]
-                        close_for_bar_i8 = close_i8[idx]
-
-                        ov_start = np.maximum(ts_start_i8, open_for_bar_i8)
-                        ov_end = np.minimum(ts_end_i8, close_for_bar_i8)
-                        ov_i8 = np.maximum(ov_end - ov_start, 0)
-
-                        keep = valid & (ov_i8 >= bar_len_i8)  # strict inside RTH
+                        # Unified RTH slicer: right-labeled bars wholly inside an XNYS session
+                        # (holidays and early closes included), looked up in the precomputed
+                        # session table on UTC int64 timestamps
+                        from DATA_PROCESSING.utils.session_calendar import NS_PER_MINUTE, session_calendar_for
+                        ts_end_i8 = df_pd.index.as_unit("ns").asi8
+                        cal = session_calendar_for(ts_end_i8, exchange="XNYS")
+                        keep = cal.bar_in_session(ts_end_i8, 15)
                         df_pd_rth = df_pd.loc[keep]
 
                         # Sanity log with improved validation
                         try:
-                            et_dates = pd.Series(df_pd_rth.index.tz_convert("America/New_York").date)
-                            per_day = et_dates.value_counts()
-                            mean_bd = float(per_day.mean()) if len(per_day) else 0.0
+                            # Session of each kept bar (its reference minute lies inside the session)
+                            sess = cal.session_index(ts_end_i8[keep] - NS_PER_MINUTE, closed="both")
+                            counts = np.bincount(sess, minlength=len(cal))
+                            with_data = np.flatnonzero(counts)
+                            mean_bd = float(counts[with_data].mean()) if len(with_data) else 0.0
                             logger.info(f"{symbol}: RTH_DIRECT pre={len(df_pd)} post={len(df_pd_rth)} freq=15min mean_bars/day≈{mean_bd:.2f}")
                             
                             # Validate against expected bars using session-based approach
-                            if len(per_day) > 0:
-                                # Create expected map from schedule
-                                expected_map = dict(zip(sched_df.index.date, expected_bars_per_session))
-                                
-                                # Count actual bars per session
-                                counts = df_pd_rth.groupby("session_utc").size()
-                                expected = pd.Series({d: expected_map.get(d, 26) for d in counts.index})
+                            if len(with_data) > 0:
+                                expected_bars_per_session = cal.expected_bars(15)[with_data]
+                                # Log compact summary instead of giant list
+                                vals, n_sessions = np.unique(expected_bars_per_session, return_counts=True)
+                                logger.info(f"{symbol}: Expected 15m bars/session distribution: {dict(zip(vals.tolist(), n_sessions.tolist()))}")
                                 
                                 # % complete averaged across sessions
-                                session_pct = (counts / expected).clip(upper=1.0)
+                                session_pct = np.minimum(counts[with_data] / expected_bars_per_session, 1.0)
                                 overall_pct = session_pct.mean() * 100.0
                                 complete_sessions = int((session_pct == 1.0).sum())
                                 total_sessions = len(session_pct)
@@ -1070,14 +1008,21 @@ class StreamingFeatureBuilder:
             df_ny = df_ny.with_columns([
                 pl.col("ts_ny").dt.convert_time_zone("UTC").alias("ts_utc")
             ]).drop(["ts"]).rename({"ts_utc": "ts"})
-            df_processed = df_ny.drop(["ts_ny", "tod_min"])  # keep is_ext_hours
+            df_processed = df_ny.drop([c for c in ("ts_ny", "tod_min") if c in df_ny.columns])  # keep is_ext_hours
             
             # Remove extra columns to match 5m schema (296 columns)
             columns_to_remove = ["ny_date", "__index_level_0__", "is_ext_hours"]
             df_processed = df_processed.drop([col for col in columns_to_remove if col in df_processed.columns])
             # Emit per-day bars summary and completeness using post-slice data (best-effort)
             try:
-                per_day_df = df_ny.group_by(pl.col("ts_ny").dt.date().alias("date")).agg(pl.len().alias("n")).sort("date")
+                # Bars per NY date via the session table (UTC lookups, no per-row tz conversion)
+                from DATA_PROCESSING.utils.session_calendar import epoch_ns, session_calendar_for
+                ts_i8 = epoch_ns(df_ny, "ts")
+                ny_days = session_calendar_for(ts_i8)
+                day = ny_days.day_index(ts_i8)
+                day_counts = np.bincount(day[day >= 0], minlength=len(ny_days))
+                with_data = np.flatnonzero(day_counts)
+                per_day_df = pl.DataFrame({"date": ny_days.sessions[with_data], "n": day_counts[with_data]})
                 mean_bars = per_day_df.select(pl.col("n").mean()).item()
                 p10 = per_day_df.select(pl.col("n").quantile(0.10, interpolation='nearest')).item()
                 p90 = per_day_df.select(pl.col("n").quantile(0.90, interpolation='nearest')).item()
@@ -1086,38 +1031,26 @@ class StreamingFeatureBuilder:
                 expected_emp = 0
                 try:
                     if session_mode == "RTH" and per_day_df.height > 0:
-                        # Get actual session dates and calculate per-session completeness
-                        actual_dates = per_day_df.select("date").to_series().to_list()
-                        actual_bars = per_day_df.select("n").to_series().to_list()
-                        
-                        # Load calendar to get expected bars per session
-                        from scripts.bootstrap import load_cal_guarded
-                        cal = load_cal_guarded("XNYS")
+                        # Expected bars per XNYS session (early closes included) for each date with data
+                        sessions = session_calendar_for(ts_i8, exchange="XNYS")
+                        actual_dates = ny_days.sessions[with_data]
+                        actual_bars = day_counts[with_data]
+                        expected_bars_per_session = sessions.expected_bars(expect_minutes(TF(str(self.timeframe))))
+                        expected_for_actual = np.full(len(actual_dates), 26)  # fallback to 26 for 15m
+                        if len(sessions):
+                            pos = np.minimum(np.searchsorted(sessions.sessions, actual_dates), len(sessions) - 1)
+                            is_session = sessions.sessions[pos] == actual_dates
+                            expected_for_actual[is_session] = expected_bars_per_session[pos[is_session]]
                         
-                        if len(actual_dates) > 0:
-                            start_date = min(actual_dates)
-                            end_date = max(actual_dates)
-                            sessions = cal.sessions_in_range(start_date, end_date)
-                            sched_df = _get_schedule_df(cal, sessions[0], sessions[-1])
-                            
-                            # Calculate expected bars per session
-                            expected_bars_per_session = _calculate_expected_bars_per_session(sched_df, int(self.timeframe.total_seconds() / 60))
-                            
-                            # Match actual dates to expected bars
-                            session_to_expected = dict(zip(sched_df.index.date, expected_bars_per_session))
-                            expected_for_actual = [session_to_expected.get(date, 26) for date in actual_dates]  # fallback to 26 for 15m
+                        # Calculate completeness
+                        if len(expected_for_actual):
+                            complete_ratio = float(np.mean(actual_bars / expected_for_actual))
+                            expected_emp = int(expected_for_actual.mean())
                             
-                            # Calculate completeness
-                            if expected_for_actual:
-                                completeness_values = [actual / expected for actual, expected in zip(actual_bars, expected_for_actual)]
-                                mean_completeness = sum(completeness_values) / len(completeness_values)
-                                complete_ratio = mean_completeness
-                                expected_emp = int(sum(expected_for_actual) / len(expected_for_actual))
-                                
-                                # Log ext_hours fraction if available
-                                if "is_ext_hours" in df_ny.columns:
-                                    ext_fraction = df_ny.select(pl.col("is_ext_hours").mean()).item()
-                                    logger.info(f"{symbol}: ext_hours fraction: {ext_fraction:.1%}")
+                            # Log ext_hours fraction if available
+                            if "is_ext_hours" in df_ny.columns:
+                                ext_fraction = df_ny.select(pl.col("is_ext_hours").mean()).item()
+                                logger.info(f"{symbol}: ext_hours fraction: {ext_fraction:.1%}")
                                     
                 except Exception as e_cal:
                     logger.warning(f"{symbol}: Could not calculate per-session completeness: {e_cal}")
@@ -1182,6 +1115,7 @@ class StreamingFeatureBuilder:
         self._check_and_scale_batch_size()
         
         print(f"✅ {symbol}: features built successfully")
+        return len(df)
     
     def _validate_symbol_data(self, features: pl.LazyFrame, symbol: str) -> bool:
         """Validate schema and coverage for a symbol"""
@@ -1277,46 +1211,11 @@ class StreamingFeatureBuilder:
             return False
 
     def _check_and_scale_batch_size(self):
-        """Check memory usage and dynamically scale batch size."""
-        import time
-        
-        current_time = time.time()
-        
-        # Only check every 10 seconds to avoid overhead
-        if current_time - self._last_memory_check < 10:
-            return
-            
-        self._last_memory_check = current_time
-        
-        try:
-            # Get current memory usage
-            sys_usage = self.memory_manager.get_system_memory_usage()
-            memory_percent = sys_usage["system_percent"]
-            
-            # Scale up if memory usage is low
-            if memory_percent < 0.6:  # Less than 60% memory usage
-                self._consecutive_low_usage += 1
-                if self._consecutive_low_usage >= 2:  # 2 consecutive low usage checks
-                    # Scale up batch size
-                    new_batch = self.memory_manager._current_batch_size * 2
-                    max_batch = 25000000  # Cap at 25M
-                    if new_batch <= max_batch:
-                        self.memory_manager._current_batch_size = new_batch
-                        self._consecutive_low_usage = 0
-                        logger.info(f"Scaled batch size up to {self.memory_manager._current_batch_size:,} rows (memory: {memory_percent:.1%})")
-            else:
-                self._consecutive_low_usage = 0
-                
-            # Scale down if memory usage is high
-            if memory_percent > 0.85:
-                new_batch = self.memory_manager._current_batch_size // 2
-                min_batch = 10000000  # Don't go below 10M
-                if new_batch >= min_batch:
-                    self.memory_manager._current_batch_size = new_batch
-                    logger.warning(f"Scaled batch size down to {self.memory_manager._current_batch_size:,} rows (memory: {memory_percent:.1%})")
-                    
-        except Exception as e:
-            logger.warning(f"Dynamic scaling failed: {e}")
+        """Re-pick the batch size: from the measured cost per row once symbols have been tracked, else from memory usage."""
+        previous = self.memory_manager.get_batch_size()
+        batch_size = self.memory_manager.dynamic_scale_batch_size()
+        if batch_size != previous:
+            logger.info(f"Batch size {previous:,} -> {batch_size:,} rows")
 
     def _get_volume_policy(self, symbol: str) -> str:
         """Get volume policy for a symbol (with overrides)"""
@@ -1440,7 +1339,7 @@ class StreamingFeatureBuilder:
         """Process features with batch size optimization"""
         try:
             # Get current batch size from memory manager
-            batch_size = self.memory_manager._current_batch_size
+            batch_size = self.memory_manager.get_batch_size()
             
             # Construct proper file path for this symbol
             symbol_output_path = self._get_symbol_output_path(symbol, output_path)
@@ -1633,12 +1532,14 @@ class StreamingFeatureBuilder:
                 logger.warning(f"No data to validate for {symbol}")
                 return False
             
-            # Convert to date and count bars per day
-            df_with_date = df.with_columns(
-                pl.col("ts").dt.convert_time_zone("America/New_York").dt.date().alias("date")
-            )
-            
-            bars_per_day = df_with_date.group_by("date").agg(pl.len().alias("count")).sort("date")
+            # Count bars per NY date via the session table (UTC lookups, no per-row tz conversion)
+            from DATA_PROCESSING.utils.session_calendar import epoch_ns, session_calendar_for
+            ts_i8 = epoch_ns(df, "ts")
+            ny_days = session_calendar_for(ts_i8)
+            day = ny_days.day_index(ts_i8)
+            day_counts = np.bincount(day[day >= 0], minlength=len(ny_days))
+            with_data = np.flatnonzero(day_counts)
+            bars_per_day = pl.DataFrame({"date": ny_days.sessions[with_data], "count": day_counts[with_data]})
             total_days = bars_per_day.height
             if total_days == 0:
                 logger.warning(f"No trading days found for {symbol}")
@@ -41,6 +41,9 @@ from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing as mp
 
 # Add project root to path
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
 
 from ml.barrier_targets import (
     add_barrier_targets_to_dataframe,
@@ -363,64 +366,82 @@ class SmartBarrierProcessor:
             return {"symbol": symbol, "status": "error", "message": str(e)}
     
     def process_symbols_parallel(self, symbols: List[str], batch_size: int = 20):
-        """Process symbols in parallel with batching for memory management."""
-        logger.info(f"Processing {len(symbols)} symbols with {self.n_workers} workers in batches of {batch_size}")
+        """
+        Process symbols in parallel with batching for memory management.
         
-        # Process in batches to manage memory
-        total_batches = (len(symbols) + batch_size - 1) // batch_size
+        batch_size is the largest batch; after each batch the measured peak RSS per row
+        (this process plus its workers) decides how many symbols the next batch may hold.
+        """
+        from DATA_PROCESSING.utils.memory_manager import MemoryManager
+        memory_manager = MemoryManager()
+        logger.info(f"Processing {len(symbols)} symbols with {self.n_workers} workers in batches of up to {batch_size}")
         
-        for batch_idx in range(total_batches):
-            batch_start = batch_idx * batch_size
-            batch_end = min(batch_start + batch_size, len(symbols))
-            batch_symbols = symbols[batch_start:batch_end]
+        max_batch_size = batch_size
+        batch_start = 0
+        batch_idx = 0
+        
+        while batch_start < len(symbols):
+            batch_symbols = symbols[batch_start:batch_start + batch_size]
+            batch_start += len(batch_symbols)
+            batch_idx += 1
+            n_workers = min(self.n_workers, len(batch_symbols))
             
-            logger.info(f"Processing batch {batch_idx + 1}/{total_batches} ({len(batch_symbols)} symbols)")
+            logger.info(f"Processing batch {batch_idx} ({len(batch_symbols)} symbols, {len(symbols) - batch_start} remaining)")
             
-            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
-                # Submit batch tasks
-                future_to_symbol = {
-                    executor.submit(self.process_symbol_file, symbol): symbol 
-                    for symbol in batch_symbols
-                }
-                
-                # Process results as they complete
-                for future in as_completed(future_to_symbol):
-                    symbol = future_to_symbol[future]
+            batch_rows = 0
+            with memory_manager.track_batch(include_children=True) as trace:
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    # Submit batch tasks
+                    future_to_symbol = {
+                        executor.submit(self.process_symbol_file, symbol): symbol 
+                        for symbol in batch_symbols
+                    }
                     
-                    try:
-                        result = future.result()
+                    # Process results as they complete
+                    for future in as_completed(future_to_symbol):
+                        symbol = future_to_symbol[future]
                         
-                        if result["status"] == "success":
-                            self.completed_symbols.add(symbol)
-                            self.stats["completed_symbols"] += 1
-                            logger.info(f"✅ {symbol}: {result['files_processed']} files, {result['rows_processed']} rows in {result['processing_time']:.2f}s")
-                        else:
+                        try:
+                            result = future.result()
+                            
+                            if result["status"] == "success":
+                                self.completed_symbols.add(symbol)
+                                self.stats["completed_symbols"] += 1
+                                batch_rows += result["rows_processed"]
+                                logger.info(f"✅ {symbol}: {result['files_processed']} files, {result['rows_processed']} rows in {result['processing_time']:.2f}s")
+                            else:
+                                self.failed_symbols.add(symbol)
+                                self.stats["failed_symbols"] += 1
+                                logger.error(f"❌ {symbol}: {result['message']}")
+                            
+                        except Exception as e:
                             self.failed_symbols.add(symbol)
                             self.stats["failed_symbols"] += 1
-                            logger.error(f"❌ {symbol}: {result['message']}")
+                            logger.error(f"❌ {symbol}: Exception - {e}")
                         
-                    except Exception as e:
-                        self.failed_symbols.add(symbol)
-                        self.stats["failed_symbols"] += 1
-                        logger.error(f"❌ {symbol}: Exception - {e}")
-                    
-                    # Small delay to reduce CPU heat
-                    time.sleep(self.throttle_delay)
+                        # Small delay to reduce CPU heat
+                        time.sleep(self.throttle_delay)
+                
+                # Only n_workers symbols are in memory at once
+                trace.rows = batch_rows * n_workers // len(batch_symbols)
             
             # Memory cleanup after each batch
             import gc
             gc.collect()
             
+            if batch_rows > 0:
+                batch_size = memory_manager.units_per_batch(batch_rows / len(batch_symbols), max_batch_size)
+            
             # Save progress after each batch
             self.save_progress()
             self.print_progress()
             
-            logger.info(f"Batch {batch_idx + 1} completed: {self.stats['completed_symbols']} successful, {self.stats['failed_symbols']} failed")
+            logger.info(f"Batch {batch_idx} completed: {self.stats['completed_symbols']} successful, {self.stats['failed_symbols']} failed")
             
             # Longer delay between batches to let CPU cool down
-            if batch_idx < total_batches - 1:  # Don't delay after last batch
+            if batch_start < len(symbols):  # Don't delay after last batch
                 time.sleep(self.throttle_delay * 10)
-                logger.info("💤 Cooling down CPU between batches...")
+                logger.info(f"💤 Cooling down CPU between batches (next batch: {batch_size} symbols)...")
     
     def print_progress(self):
         """Print current progress."""
@@ -483,7 +504,7 @@ def main():
     parser.add_argument("--barrier-sizes", nargs="+", type=float, default=[0.3, 0.5, 0.8],
                        help="Barrier sizes")
     parser.add_argument("--n-workers", type=int, default=8, help="Number of parallel workers")
-    parser.add_argument("--batch-size", type=int, default=20, help="Process symbols in batches for memory management")
+    parser.add_argument("--batch-size", type=int, default=20, help="Largest symbol batch; smaller batches are used when measured memory per row requires it")
     parser.add_argument("--throttle-delay", type=float, default=0.2, help="Delay in seconds between operations to reduce CPU heat (default: 0.2)")
     parser.add_argument("--resume", action="store_true", help="Resume from previous run")
     parser.add_argument("--force", action="store_true", help="Force reprocessing of all symbols (ignore existing targets)")
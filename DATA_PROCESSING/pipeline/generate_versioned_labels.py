@@ -297,7 +297,8 @@ def main():
     parser.add_argument("--n-workers", type=int, default=None,
                        help="Number of parallel workers (default: min(8, num_symbols, cpu_count))")
     parser.add_argument("--batch-size", type=int, default=5,
-                       help="Process symbols in batches for memory management (default: 5)")
+                       help="Largest symbol batch; smaller batches are used when measured memory "
+                            "per row requires it (default: 5)")
     
     args = parser.parse_args()
     
@@ -361,47 +362,65 @@ def main():
         logger.error("No valid symbol directories found")
         return
     
-    # Process symbols in parallel batches
+    # Process symbols in parallel batches. --batch-size is the largest batch; after each
+    # batch the measured peak RSS per row (this process plus its workers) decides how
+    # many symbols the next batch may hold.
+    from DATA_PROCESSING.utils.memory_manager import MemoryManager
+    memory_manager = MemoryManager()
     results = []
-    total_batches = (len(symbol_tasks) + args.batch_size - 1) // args.batch_size
+    batch_size = args.batch_size
+    batch_start = 0
+    batch_idx = 0
     
-    for batch_idx in range(total_batches):
-        batch_start = batch_idx * args.batch_size
-        batch_end = min(batch_start + args.batch_size, len(symbol_tasks))
-        batch_tasks = symbol_tasks[batch_start:batch_end]
+    while batch_start < len(symbol_tasks):
+        batch_tasks = symbol_tasks[batch_start:batch_start + batch_size]
+        batch_start += len(batch_tasks)
+        batch_idx += 1
+        n_workers = min(args.n_workers, len(batch_tasks))
         
         logger.info(f"\n{'='*60}")
-        logger.info(f"Processing batch {batch_idx + 1}/{total_batches} ({len(batch_tasks)} symbols)")
+        logger.info(f"Processing batch {batch_idx} ({len(batch_tasks)} symbols, "
+                    f"{len(symbol_tasks) - batch_start} remaining)")
         logger.info(f"{'='*60}")
         
-        with ProcessPoolExecutor(max_workers=args.n_workers) as executor:
-            # Submit batch tasks
-            future_to_symbol = {
-                executor.submit(process_symbol_worker, task): task[0]
-                for task in batch_tasks
-            }
+        batch_rows = 0
+        with memory_manager.track_batch(include_children=True) as trace:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                # Submit batch tasks
+                future_to_symbol = {
+                    executor.submit(process_symbol_worker, task): task[0]
+                    for task in batch_tasks
+                }
+                
+                # Process results as they complete
+                for future in as_completed(future_to_symbol):
+                    symbol = future_to_symbol[future]
+                    try:
+                        result = future.result()
+                        results.append(result)
+                        
+                        if result["status"] == "success":
+                            batch_rows += result["rows_processed"]
+                            logger.info(f"  ✅ {symbol}: {result['files_processed']} files, {result['rows_processed']} rows")
+                        else:
+                            logger.error(f"  ❌ {symbol}: {result['message']}")
+                    except Exception as e:
+                        logger.error(f"  ❌ {symbol}: Exception - {e}")
+                        results.append({"symbol": symbol, "status": "error", "message": str(e)})
             
-            # Process results as they complete
-            for future in as_completed(future_to_symbol):
-                symbol = future_to_symbol[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    if result["status"] == "success":
-                        logger.info(f"  ✅ {symbol}: {result['files_processed']} files, {result['rows_processed']} rows")
-                    else:
-                        logger.error(f"  ❌ {symbol}: {result['message']}")
-                except Exception as e:
-                    logger.error(f"  ❌ {symbol}: Exception - {e}")
-                    results.append({"symbol": symbol, "status": "error", "message": str(e)})
+            # Only n_workers symbols are in memory at once
+            trace.rows = batch_rows * n_workers // len(batch_tasks)
         
         # Memory cleanup after each batch
         import gc
         gc.collect()
         
-        if batch_idx < total_batches - 1:
-            logger.info(f"💤 Batch {batch_idx + 1} completed, starting next batch...")
+        if batch_rows > 0:
+            batch_size = memory_manager.units_per_batch(batch_rows / len(batch_tasks), args.batch_size)
+        
+        if batch_start < len(symbol_tasks):
+            logger.info(f"💤 Batch {batch_idx} completed, next batch: {batch_size} symbols "
+                        f"({memory_manager.get_batch_size():,} rows)")
     
     # Create metadata file
     successful_symbols = [r["symbol"] for r in results if r["status"] == "success"]
@@ -16,6 +16,7 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 # utils/session_normalize.py
+import numpy as np
 import polars as pl
 from datetime import time
 
@@ -30,51 +31,55 @@ GRID = {
     "1h":  {"minutes": {0},                                  "bars":  6, "start": time(10,0), "end": time(16,0)},
 }
 
+def _rth_calendar(ts_ns: np.ndarray, interval: str):
+    """Every NY calendar date with the interval's RTH window (no per-row tz conversion)."""
+    from DATA_PROCESSING.utils.session_calendar import session_calendar_for
+    g = GRID[interval]
+    return session_calendar_for(ts_ns, open_time=g["start"], close_time=g["end"], tz=NY)
+
 def normalize_interval(df: pl.DataFrame, interval: str) -> pl.DataFrame:
     """
     Enforce NYSE RTH and on-grid timestamps for 5m/15m/30m/1h.
     Assumes df has a UTC 'ts' column (tz-naive or tz=UTC).
     Returns 'ts' back in UTC.
     """
+    from DATA_PROCESSING.utils.session_calendar import NS_PER_MINUTE, epoch_ns
+
     if interval not in GRID:
         raise ValueError(f"Unsupported interval: {interval}")
 
     g = GRID[interval]
-    # Ensure tz-aware, convert to NY
-    df = df.with_columns(
-        pl.col("ts").dt.replace_time_zone("UTC").dt.convert_time_zone(NY).alias("ts_ny")
-    )
+    # Ensure tz-aware UTC (metadata only; the instants are unchanged)
+    df = df.with_columns(pl.col("ts").dt.replace_time_zone("UTC"))
+    ts_ns = epoch_ns(df)
+    cal = _rth_calendar(ts_ns, interval)
 
-    # RTH time window
-    df = df.filter(
-        (pl.col("ts_ny").dt.time() >= g["start"]) &
-        (pl.col("ts_ny").dt.time() <  g["end"])
-    )
+    # RTH time window: [start, end) of the NY session, looked up in UTC
+    sess = cal.session_index(ts_ns, closed="left")
+    in_rth = sess >= 0
 
-    # Minute grid
-    df = df.filter(pl.col("ts_ny").dt.minute().is_in(list(g["minutes"])))
+    # Minute grid: NY minute-of-hour from the minutes elapsed since the session start
+    minutes_since_open = (ts_ns - cal.open_ns[np.maximum(sess, 0)]) // NS_PER_MINUTE
+    on_grid = np.isin((minutes_since_open + g["start"].minute) % 60, list(g["minutes"]))
 
     # De-dup + sort
-    df = df.unique(subset=["ts_ny"]).sort("ts_ny")
-
-    # Back to UTC
-    return df.with_columns(pl.col("ts_ny").dt.convert_time_zone("UTC").alias("ts")).drop("ts_ny")
+    return df.filter(pl.Series(in_rth & on_grid)).unique(subset=["ts"]).sort("ts")
 
 def assert_bars_per_day(df: pl.DataFrame, interval: str, min_full_day_frac: float = 0.90):
     """
     Checks what fraction of trading days have the expected full-day bar count for the interval.
     Tolerates holidays/early-closes by using a fraction threshold.
     """
+    from DATA_PROCESSING.utils.session_calendar import epoch_ns
+
     g = GRID[interval]
-    counts = (
-        df.with_columns(
-            pl.col("ts").dt.replace_time_zone("UTC").dt.convert_time_zone(NY).dt.truncate("1d").alias("day")
-        )
-        .group_by("day").len().rename({"len": "bars"})
-    )
-    if counts.is_empty():
+    ts_ns = epoch_ns(df) if df.height else np.empty(0, dtype=np.int64)
+    day = _rth_calendar(ts_ns, interval).day_index(ts_ns)
+    counts = np.bincount(day[day >= 0])
+    counts = counts[counts > 0]
+    if counts.size == 0:
         raise AssertionError("No data after normalization.")
-    frac_full = (counts["bars"] == g["bars"]).mean()
+    frac_full = (counts == g["bars"]).mean()
     if frac_full < min_full_day_frac:
         raise AssertionError(
             f"{interval}: only {frac_full:.1%} of days have full {g['bars']} bars. "
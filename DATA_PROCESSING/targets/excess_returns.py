@@ -39,16 +39,14 @@ def rolling_beta(asset_ret: pd.Series, mkt_ret: pd.Series, win: int = 60) -> pd.
     
     Args:
         asset_ret: Asset returns
-        mkt_ret: Market returns
+        mkt_ret: Market returns (aligned to asset_ret's index by label)
         win: Rolling window size
     
     Returns:
-        Rolling beta series
+        Rolling beta series (a DataFrame of betas if asset_ret holds one column per symbol)
     """
-    cov = asset_ret.rolling(win).cov(mkt_ret)
-    var = mkt_ret.rolling(win).var()
-    beta = cov / var
-    return beta
+    from DATA_PROCESSING.utils.rolling_moments import rolling_slope
+    return rolling_slope(asset_ret, mkt_ret, win)
 
 
 def future_excess_return(asset_ret: pd.Series, mkt_ret: pd.Series, H: int) -> pd.Series:
@@ -23,6 +23,8 @@ Common utilities used across data processing modules:
 - logging_setup: Centralized logging configuration
 - schema_validator: Schema validation and expectations
 - io_helpers: I/O utilities for Polars (io_safe_scan)
+- rolling_moments: O(n) rolling mean/var/cov/corr/slope/R² kernels
+- session_calendar: Precomputed per-date session table (UTC open/close, expected bars)
 - bootstrap: Exchange calendar loading with guards
 """
 
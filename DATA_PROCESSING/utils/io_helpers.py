@@ -16,10 +16,14 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import polars as pl
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Mapping, Dict, List, Literal
+from typing import Any, Iterable, Mapping, Dict, List, Literal, Optional, Tuple
 import glob
 import logging
+import os
+import threading
 
 log = logging.getLogger(__name__)
 DType = pl.datatypes.DataType
@@ -87,14 +91,111 @@ def canonicalize_base_dtypes(lf: pl.LazyFrame,
 
     return lf.with_columns(exprs) if exprs else lf
 
+@dataclass(frozen=True)
+class ParquetFileInfo:
+    """Footer metadata of one parquet file (no data pages are read)."""
+    path: str
+    mtime_ns: int
+    size: int
+    num_rows: int
+    schema: pl.Schema
+    ts_min: Any = None
+    ts_max: Any = None
+
+
+# path -> ParquetFileInfo, valid while (mtime_ns, size) are unchanged
+_PLAN_CACHE: Dict[str, ParquetFileInfo] = {}
+_PLAN_LOCK = threading.Lock()
+
+
+def _read_footer(path: str, st: os.stat_result, time_col: str) -> ParquetFileInfo:
+    import pyarrow.parquet as pq
+
+    md = pq.read_metadata(path)
+    arrow_schema = md.schema.to_arrow_schema()
+    schema = pl.from_arrow(arrow_schema.empty_table()).schema
+
+    ts_min = ts_max = None
+    if time_col in arrow_schema.names:
+        col_idx = md.schema.names.index(time_col) if time_col in md.schema.names else None
+        if col_idx is not None:
+            for rg in range(md.num_row_groups):
+                stats = md.row_group(rg).column(col_idx).statistics
+                if stats is None or not stats.has_min_max:
+                    ts_min = ts_max = None
+                    break
+                ts_min = stats.min if ts_min is None else min(ts_min, stats.min)
+                ts_max = stats.max if ts_max is None else max(ts_max, stats.max)
+    return ParquetFileInfo(path=path, mtime_ns=st.st_mtime_ns, size=st.st_size, num_rows=md.num_rows,
+                           schema=schema, ts_min=ts_min, ts_max=ts_max)
+
+
+def plan_parquet_files(paths: Iterable[str], time_col: str = "ts",
+                       max_workers: Optional[int] = None) -> List[ParquetFileInfo]:
+    """
+    Row counts, schemas and min/max timestamps for each file, from footers only.
+
+    Footers are read in one parallel pass; results are cached per path and reused
+    while the file's mtime and size are unchanged.
+    """
+    paths = list(paths)
+    stats = {p: os.stat(p) for p in paths}
+    infos: Dict[str, ParquetFileInfo] = {}
+    missing = []
+    with _PLAN_LOCK:
+        for p in paths:
+            cached = _PLAN_CACHE.get(p)
+            st = stats[p]
+            if cached is not None and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+                infos[p] = cached
+            else:
+                missing.append(p)
+
+    if missing:
+        workers = max_workers or min(32, (os.cpu_count() or 1) * 4, len(missing))
+        if workers <= 1 or len(missing) == 1:
+            fresh = [_read_footer(p, stats[p], time_col) for p in missing]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                fresh = list(pool.map(lambda p: _read_footer(p, stats[p], time_col), missing))
+        with _PLAN_LOCK:
+            for info in fresh:
+                _PLAN_CACHE[info.path] = info
+                infos[info.path] = info
+    return [infos[p] for p in paths]
+
+
+def _volume_fraction_buckets(paths: List[str]) -> Dict[str, int]:
+    """Non-integer volume counts by split-factor bucket (~1/2, ~1/3, ~1/4, other), one scan."""
+    f = pl.col("volume").cast(pl.Float64, strict=False)
+    frac = (f % 1).abs()
+    bucket = (
+        pl.when((frac - 0.5).abs() < 0.01).then(pl.lit("~1/2"))
+        .when((frac - (1/3)).abs() < 0.01).then(pl.lit("~1/3"))
+        .when((frac - 0.25).abs() < 0.01).then(pl.lit("~1/4"))
+        .otherwise(pl.lit("other"))
+    )
+    df = (
+        pl.scan_parquet(paths)
+        .select("volume")
+        .filter(f.is_not_null() & (frac != 0))
+        .group_by(bucket.alias("bucket")).len()
+        .collect(engine="streaming")
+    )
+    return {r[0]: int(r[1]) for r in df.iter_rows()}
+
+
 def safe_scan_parquet(
     paths_glob: str | Iterable[str],
     canonical_dtypes: Mapping[str, str],
     volume_policy: Policy = "coerce",
+    time_col: str = "ts",
 ) -> pl.LazyFrame:
     """
-    Deterministic, lazy per-file normalization:
-      - Scan each file lazily
+    Deterministic, lazy normalization over many parquet files:
+      - Plan from footer metadata only (row counts, schemas, min/max ts; cached by mtime/size)
+      - One lazy scan per run of consecutive same-schema files (sorted path order, i.e.
+        time order, is kept), with the schema pre-resolved
       - Canonicalize base dtypes (with explicit volume policy)
       - Concatenate lazily
       - Emit a single concise warning if lossy volume rounding occurred
@@ -108,12 +209,6 @@ def safe_scan_parquet(
         raise FileNotFoundError(f"No parquet sources at {paths_glob}")
 
     overrides = _map_yaml_dtypes(canonical_dtypes)
-    # Store volume policy separately since it's not a dtype
-    volume_policy_override = volume_policy
-
-    lfs: List[pl.LazyFrame] = []
-    lossy_volume_rows_total = 0
-    total_rows = 0
 
     # Best-effort symbol extraction from the first path (expects .../symbol=SYMBOL/...)
     symbol_hint = None
@@ -130,77 +225,51 @@ def safe_scan_parquet(
     except Exception:
         symbol_hint = "<unknown>"
 
-    for p in paths:
-        # Per-file scan
-        lfi = pl.scan_parquet(p)
+    plan = plan_parquet_files(paths, time_col=time_col)
+    total_rows = sum(info.num_rows for info in plan)
 
-        # Compute lossy metric for volume if target is Int64 and source can be float
-        names = set(lfi.collect_schema().names())
-        if volume_policy in ("coerce", "fail") and "volume" in names and overrides.get("volume") == pl.Int64:
-            try:
-                # Count total rows and non-integer volumes (pre-cast)
-                stats = (
-                    pl.scan_parquet(p)
-                    .select(
-                        total=pl.len(),
-                        rounded=(
-                            pl.col("volume").cast(pl.Float64, strict=False).is_not_null()
-                            & ((pl.col("volume").cast(pl.Float64, strict=False) % 1) != 0)
-                        ).sum(),
-                    )
-                ).collect(streaming=True)
-                total_rows += int(stats["total"][0])
-                lossy_volume_rows_total += int(stats["rounded"][0])
-            except Exception:
-                # Metric is best-effort; skip if unsupported
-                pass
+    # Split files into runs of consecutive same-schema files: one scan per run, and the
+    # runs concatenate back in sorted path order (grouping by schema would reorder rows)
+    runs: List[List[ParquetFileInfo]] = []
+    for info in plan:
+        if runs and runs[-1][0].schema == info.schema:
+            runs[-1].append(info)
+        else:
+            runs.append([info])
 
-        # Canonicalize columns/dtypes lazily - preserve raw volume as int, use config volume policy
-        canonical_dtypes_mapped = _map_yaml_dtypes(canonical_dtypes)
-        lfi = canonicalize_base_dtypes(lfi, canonical_dtypes_mapped, volume_policy=volume_policy_override)
-        lfs.append(lfi)
+    lfs: List[pl.LazyFrame] = []
+    for infos in runs:
+        schema = infos[0].schema
+        lfi = pl.scan_parquet([info.path for info in infos], schema=schema)
+        lfs.append(canonicalize_base_dtypes(lfi, overrides, volume_policy=volume_policy))
 
     # Concatenate lazily (dtypes aligned by canonicalization)
-    lf = pl.concat(lfs, how="vertical")
-
-    # Trigger planning cheaply to surface issues early
-    _ = lf.select(pl.len()).fetch(1)
-
-    if lossy_volume_rows_total > 0 and total_rows > 0:
-        pct = lossy_volume_rows_total / total_rows
-        # Gate warning at 2%; otherwise log at info
-        level = log.warning if pct >= 0.02 else log.info
-        msg = (
-            "Rounded %s non-integer 'volume' rows for %s (%0.2f%% of %s bars)."
-            % (f"{lossy_volume_rows_total:,}", symbol_hint, pct * 100.0, f"{total_rows:,}")
-        )
-        # If elevated rate, add split-factor fingerprint buckets (~1/2, ~1/3, ~1/4, other)
-        if pct >= 0.02:
+    lf = pl.concat(lfs, how="vertical") if len(lfs) > 1 else lfs[0]
+
+    # Lossy volume rounding can only come from files whose volume is not stored as an integer
+    if volume_policy in ("coerce", "fail") and overrides.get("volume") == pl.Int64:
+        float_volume = [info.path for info in plan
+                        if "volume" in info.schema and not info.schema["volume"].is_integer()]
+        if float_volume and total_rows > 0:
             try:
-                bucket_lfs: List[pl.LazyFrame] = []
-                for p in paths:
-                    f = pl.col("volume").cast(pl.Float64, strict=False)
-                    frac = (f % 1).abs()
-                    is_frac = f.is_not_null() & (frac != 0)
-                    bucket = (
-                        pl.when((frac - 0.5).abs() < 0.01).then(pl.lit("~1/2"))
-                        .when((frac - (1/3)).abs() < 0.01).then(pl.lit("~1/3"))
-                        .when((frac - 0.25).abs() < 0.01).then(pl.lit("~1/4"))
-                        .otherwise(pl.lit("other"))
-                    )
-                    bucket_lfs.append(
-                        pl.scan_parquet(p)
-                        .filter(is_frac)
-                        .select(bucket.alias("bucket"))
-                        .group_by("bucket").len()
-                    )
-                buckets_df = pl.concat(bucket_lfs, how="vertical").group_by("bucket").agg(pl.col("len").sum().alias("n")).collect(streaming=True)
-                b = {r[0]: int(r[1]) for r in buckets_df.iter_rows()}
-                msg += f" Buckets: ~1/2={b.get('~1/2',0)}, ~1/3={b.get('~1/3',0)}, ~1/4={b.get('~1/4',0)}, other={b.get('other',0)}."
+                buckets = _volume_fraction_buckets(float_volume)
             except Exception:
-                # Fingerprinting is best-effort
-                pass
-        level(msg)
+                # Metric is best-effort; skip if unsupported
+                buckets = {}
+            lossy_volume_rows_total = sum(buckets.values())
+            if lossy_volume_rows_total > 0:
+                pct = lossy_volume_rows_total / total_rows
+                # Gate warning at 2%; otherwise log at info
+                level = log.warning if pct >= 0.02 else log.info
+                msg = (
+                    "Rounded %s non-integer 'volume' rows for %s (%0.2f%% of %s bars)."
+                    % (f"{lossy_volume_rows_total:,}", symbol_hint, pct * 100.0, f"{total_rows:,}")
+                )
+                # If elevated rate, add split-factor fingerprint buckets (~1/2, ~1/3, ~1/4, other)
+                if pct >= 0.02:
+                    b = buckets
+                    msg += f" Buckets: ~1/2={b.get('~1/2',0)}, ~1/3={b.get('~1/3',0)}, ~1/4={b.get('~1/4',0)}, other={b.get('other',0)}."
+                level(msg)
 
     return lf
 
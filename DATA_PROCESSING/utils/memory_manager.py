@@ -27,15 +27,35 @@ import psutil
 import logging
 import gc
 import os
-import torch
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Callable, Dict, Any, Optional, Union
 import yaml
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+
+try:
+    import torch
+except ImportError:  # CPU-only data jobs (labels, features) run without torch
+    torch = None
 
 logger = logging.getLogger(__name__)
 
 
+def _cuda_available() -> bool:
+    return torch is not None and torch.cuda.is_available()
+
+
+def _batching_section() -> Dict[str, Any]:
+    """memory.batching from CONFIG/pipeline/memory.yaml ({} when the config layer is unavailable)."""
+    try:
+        from CONFIG.config_loader import get_cfg
+        return dict(get_cfg("memory.batching", default={}, config_name="memory_config") or {})
+    except Exception:
+        return {}
+
+
 @dataclass
 class MemoryConfig:
     """Memory configuration with sensible defaults."""
@@ -56,9 +76,23 @@ class MemoryConfig:
     parallel_jobs: int = 2
     sequential_training: bool = True
     
+    # Batch sizing: min_batch_rows floors the static, feature-count based size;
+    # min_tuned_batch_rows floors sizes picked from a measured batch cost
+    min_batch_rows: int = 10000000
+    max_batch_rows: int = 25000000
+    min_tuned_batch_rows: int = 10000
+    probe_rows: int = 20000
+    ewma_alpha: float = 0.3
+    
     @classmethod
     def load(cls, config_path: Union[str, Path] = "config/memory_limits.yaml") -> "MemoryConfig":
-        """Load configuration from YAML file with fallback to defaults."""
+        """
+        Load configuration from YAML file with fallback to defaults.
+
+        Batch sizing falls back to the memory.batching section of CONFIG/pipeline/memory.yaml;
+        a 'batching' section in config_path overrides it key by key.
+        """
+        batching = _batching_section()
         try:
             with open(config_path, 'r') as f:
                 data = yaml.safe_load(f) or {}
@@ -66,6 +100,7 @@ class MemoryConfig:
             system = data.get('system', {})
             gpu = data.get('gpu', {})
             training = data.get('training', {}).get('model_training', {})
+            batching.update(data.get('batching') or {})
             
             return cls(
                 max_memory_gb=system.get('max_memory_gb', 100.0),
@@ -79,10 +114,80 @@ class MemoryConfig:
                 batch_size_auto=training.get('batch_size_auto', True),
                 parallel_jobs=training.get('parallel_jobs', 2),
                 sequential_training=training.get('sequential_training', True),
+                min_batch_rows=batching.get('min_batch_rows', 10000000),
+                max_batch_rows=batching.get('max_batch_rows', 25000000),
+                min_tuned_batch_rows=batching.get('min_tuned_batch_rows', 10000),
+                probe_rows=batching.get('probe_rows', 20000),
+                ewma_alpha=batching.get('ewma_alpha', 0.3),
             )
         except Exception as e:
             logger.warning(f"Could not load memory config from {config_path}: {e}. Using defaults.")
-            return cls()
+            known = {f.name for f in fields(cls)}
+            return cls(**{k: v for k, v in batching.items() if k in known})
+
+
+@dataclass
+class BatchCost:
+    """Measured cost of a pipeline stage: peak RSS and wall time as linear functions of rows."""
+    bytes_per_row: float
+    seconds_per_row: float
+    base_bytes: float = 0.0
+    samples: int = 0
+
+    def rows_for_bytes(self, budget_bytes: float) -> int:
+        return int(max(budget_bytes - self.base_bytes, 0.0) / max(self.bytes_per_row, 1.0))
+
+
+@dataclass
+class BatchTrace:
+    """What track_batch measured; set rows inside the block when the count is only known afterwards."""
+    rows: int = 0
+    peak_bytes: float = 0.0
+    seconds: float = 0.0
+
+
+class _PeakRSSSampler:
+    """Polls process RSS (optionally plus its child processes) on a background thread and keeps the peak."""
+
+    def __init__(self, process: psutil.Process, interval_s: float = 0.005, include_children: bool = False):
+        self.process = process
+        self.interval_s = interval_s
+        self.include_children = include_children
+        self.start_rss = self._rss()
+        self.peak_rss = self.start_rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.peak_rss = max(self.peak_rss, self._rss())
+            except Exception:
+                return
+            self._stop.wait(self.interval_s)
+
+    def _rss(self) -> int:
+        rss = self.process.memory_info().rss
+        if self.include_children:
+            for child in self.process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:  # worker exited between listing and reading
+                    pass
+        return rss
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._rss())
+
+    @property
+    def peak_delta(self) -> int:
+        return max(self.peak_rss - self.start_rss, 0)
 
 
 class MemoryManager:
@@ -105,6 +210,11 @@ class MemoryManager:
         # Initialize memory monitoring
         self.process = psutil.Process(os.getpid())
         
+        # Measured stage cost (set by autotune_batch_size, refined by record_batch)
+        self._cost: Optional[BatchCost] = None
+        # Largest batch size known to be safe after a backpressure event (None = no cap)
+        self._pressure_ceiling: Optional[int] = None
+        
         # Dynamic backpressure state
         self._backpressure_active = False
         self._original_batch_size = self._compute_batch_size()
@@ -115,6 +225,7 @@ class MemoryManager:
         self._backoff_threshold = 0.85
         self._last_memory_check = 0
         self._consecutive_low_usage = 0
+
         
         logger.info(f"Memory manager initialized:")
         logger.info(f"System RAM limit: {self.config.max_memory_gb}GB")
@@ -147,11 +258,7 @@ class MemoryManager:
         available_memory_bytes = self.config.max_memory_gb * 1024**3 * self.config.headroom
         max_rows = int(available_memory_bytes / bytes_per_row)
         
-        # Ultra-aggressive bounds - start at 10M, cap at 25M
-        min_batch = 10000000  # Start with 10M rows (aggressive)
-        max_batch = 25000000   # Cap at 25M rows (ultra-aggressive)
-        
-        computed_batch = max(min_batch, min(max_rows, max_batch))
+        computed_batch = self._clamp_batch(max_rows)
         
         logger.info(f"Batch size computation: {self.n_features} features, {bytes_per_row} bytes/row")
         logger.info(f"Available memory: {available_memory_bytes / (1024**3):.1f}GB")
@@ -160,47 +267,96 @@ class MemoryManager:
         
         return computed_batch
 
-    def autotune_batch_size(self, probe_data, target_memory_gb: float = None) -> int:
-        """Autotune batch size based on actual memory usage of probe data."""
+    def _min_batch_rows(self) -> int:
+        """Static sizes keep the 10M-row floor; once a batch has been measured, the measurement may go lower."""
+        return self.config.min_tuned_batch_rows if self._cost is not None else self.config.min_batch_rows
+
+    def _clamp_batch(self, rows: int) -> int:
+        """Clamp to the configured bounds and to the ceiling learned from backpressure events."""
+        upper = self.config.max_batch_rows
+        if self._pressure_ceiling is not None:
+            upper = min(upper, self._pressure_ceiling)
+        return int(max(self._min_batch_rows(), min(rows, upper)))
+
+    def _batch_budget_bytes(self, target_memory_gb: Optional[float] = None) -> float:
+        """Bytes a single batch may use: the configured budget, capped by memory actually available."""
         if target_memory_gb is None:
             target_memory_gb = self.config.max_memory_gb * self.config.headroom
-        
+        available = psutil.virtual_memory().available * self.config.headroom
+        return min(target_memory_gb * 1024**3, available)
+
+    def _measure(self, stage_fn: Callable[[Any], Any], data) -> Dict[str, float]:
+        """Run stage_fn(data) once; returns its peak RSS increase and wall time."""
+        gc.collect()
+        t0 = time.perf_counter()
+        with _PeakRSSSampler(self.process) as sampler:
+            result = stage_fn(data)
+            del result
+        return {"rows": len(data), "peak_bytes": float(sampler.peak_delta),
+                "seconds": time.perf_counter() - t0}
+
+    def probe_stage(self, stage_fn: Callable[[Any], Any], probe_data) -> BatchCost:
+        """
+        Measure what a batch of the real stage costs.
+
+        Runs stage_fn on two probe slices (probe_rows/2 and probe_rows rows) and fits
+        peak_bytes = base_bytes + bytes_per_row * rows (likewise for time). The
+        intercept absorbs fixed per-call overhead, so small probes do not
+        overstate the per-row cost.
+        """
+        n = min(self.config.probe_rows, len(probe_data))
+        small = max(n // 2, 1)
+        m1 = self._measure(stage_fn, probe_data[:small])
+        m2 = self._measure(stage_fn, probe_data[:n])
+
+        drows = m2["rows"] - m1["rows"]
+        if drows > 0 and m2["peak_bytes"] > m1["peak_bytes"]:
+            bytes_per_row = (m2["peak_bytes"] - m1["peak_bytes"]) / drows
+            base_bytes = max(m1["peak_bytes"] - bytes_per_row * m1["rows"], 0.0)
+        else:
+            bytes_per_row = m2["peak_bytes"] / max(m2["rows"], 1)
+            base_bytes = 0.0
+        # Never trust a probe below the raw size of the input rows
+        floor = self.n_features * 4 * self.config.overhead_factor
+        if hasattr(probe_data, 'memory_usage'):
+            floor = max(floor, probe_data[:n].memory_usage(deep=True).sum() / max(n, 1))
+        bytes_per_row = max(bytes_per_row, floor)
+        seconds_per_row = m2["seconds"] / max(m2["rows"], 1)
+
+        self._cost = BatchCost(bytes_per_row=bytes_per_row, seconds_per_row=seconds_per_row,
+                               base_bytes=base_bytes, samples=2)
+        return self._cost
+
+    def autotune_batch_size(self, probe_data, target_memory_gb: float = None,
+                            stage_fn: Optional[Callable[[Any], Any]] = None) -> int:
+        """
+        Autotune batch size from the measured cost of a probe batch.
+
+        With stage_fn, the real stage is run on a probe slice of probe_data and its
+        peak RSS and runtime are fitted per row (see probe_stage). Without it, the
+        per-row size of the probe data itself is used.
+        """
         try:
-            # Process a small probe (20k rows)
-            probe_size = min(20000, len(probe_data))
-            probe_sample = probe_data[:probe_size]
-            
-            # Measure memory before
-            memory_before = self.process.memory_info().rss
-            
-            # Process the probe (this would be your actual feature computation)
-            # For now, we'll estimate based on data size
-            if hasattr(probe_sample, 'memory_usage'):
-                memory_used = probe_sample.memory_usage(deep=True).sum()
+            if stage_fn is not None:
+                cost = self.probe_stage(stage_fn, probe_data)
             else:
-                # Fallback estimation
-                memory_used = len(probe_sample) * self.n_features * 4 * self.config.overhead_factor
-            
-            # Measure memory after
-            memory_after = self.process.memory_info().rss
-            actual_memory_delta = memory_after - memory_before
-            
-            # Calculate bytes per row
-            bytes_per_row = max(actual_memory_delta / probe_size, memory_used / probe_size)
-            
-            # Calculate optimal batch size
-            target_memory_bytes = target_memory_gb * 1024**3
-            optimal_batch = int(target_memory_bytes / bytes_per_row)
-            
-            # Apply bounds
-            min_batch = 250000
-            max_batch = 1000000
-            tuned_batch = max(min_batch, min(optimal_batch, max_batch))
+                probe_size = min(self.config.probe_rows, len(probe_data))
+                probe_sample = probe_data[:probe_size]
+                if hasattr(probe_sample, 'memory_usage'):
+                    memory_used = probe_sample.memory_usage(deep=True).sum()
+                else:
+                    memory_used = probe_size * self.n_features * 4
+                bytes_per_row = memory_used * self.config.overhead_factor / max(probe_size, 1)
+                cost = self._cost = BatchCost(bytes_per_row=bytes_per_row, seconds_per_row=0.0)
+
+            budget = self._batch_budget_bytes(target_memory_gb)
+            optimal_batch = cost.rows_for_bytes(budget)
+            tuned_batch = self._clamp_batch(optimal_batch)
             
             logger.info(f"Autotune results:")
-            logger.info(f"  Probe size: {probe_size:,} rows")
-            logger.info(f"  Memory delta: {actual_memory_delta / (1024**2):.1f} MB")
-            logger.info(f"  Bytes per row: {bytes_per_row:.1f}")
+            logger.info(f"  Bytes per row: {cost.bytes_per_row:.1f} (+{cost.base_bytes / (1024**2):.1f} MB fixed)")
+            logger.info(f"  Seconds per 1M rows: {cost.seconds_per_row * 1e6:.2f}")
+            logger.info(f"  Batch budget: {budget / (1024**3):.2f} GB")
             logger.info(f"  Optimal batch: {optimal_batch:,} rows")
             logger.info(f"  Tuned batch: {tuned_batch:,} rows")
             
@@ -212,10 +368,62 @@ class MemoryManager:
             logger.warning(f"Autotune failed: {e}, using default batch size")
             return self._current_batch_size
 
+    def record_batch(self, rows: int, peak_bytes: float, seconds: float) -> int:
+        """
+        Feed back the observed cost of a processed batch and re-pick the batch size.
+
+        The per-row cost is updated with an exponentially weighted average, so the
+        batch size follows the real peak of the stage as data characteristics drift.
+        """
+        if rows <= 0:
+            return self._current_batch_size
+        observed_bpr = max(peak_bytes - (self._cost.base_bytes if self._cost else 0.0), 0.0) / rows
+        observed_spr = seconds / rows
+        if self._cost is None:
+            self._cost = BatchCost(bytes_per_row=max(observed_bpr, 1.0), seconds_per_row=observed_spr, samples=1)
+        else:
+            a = self.config.ewma_alpha
+            # React immediately to a more expensive batch; decay slowly toward cheaper ones
+            if observed_bpr > self._cost.bytes_per_row:
+                self._cost.bytes_per_row = observed_bpr
+            else:
+                self._cost.bytes_per_row = (1 - a) * self._cost.bytes_per_row + a * observed_bpr
+            self._cost.seconds_per_row = (1 - a) * self._cost.seconds_per_row + a * observed_spr
+            self._cost.samples += 1
+
+        if not self._backpressure_active:
+            self._current_batch_size = self._clamp_batch(self._cost.rows_for_bytes(self._batch_budget_bytes()))
+        return self._current_batch_size
+
+    @contextmanager
+    def track_batch(self, rows: int = 0, include_children: bool = False):
+        """
+        Measure peak RSS and time of the enclosed batch and feed it to record_batch.
+
+        Yields a BatchTrace; stages that only learn the row count while processing set
+        trace.rows inside the block. include_children adds the RSS of worker processes
+        (process pools) to the measurement. Nothing is recorded if the block raises.
+        """
+        trace = BatchTrace(rows=rows)
+        t0 = time.perf_counter()
+        with _PeakRSSSampler(self.process, include_children=include_children) as sampler:
+            yield trace
+        trace.peak_bytes = float(sampler.peak_delta)
+        trace.seconds = time.perf_counter() - t0
+        self.record_batch(trace.rows, trace.peak_bytes, trace.seconds)
+
+    def units_per_batch(self, rows_per_unit: float, max_units: int) -> int:
+        """
+        How many work units (e.g. whole symbols) of rows_per_unit rows fit the current batch size.
+
+        For stages that batch units rather than rows; at least 1, at most max_units.
+        """
+        if rows_per_unit <= 0:
+            return max(max_units, 1)
+        return int(max(1, min(max_units, self.get_batch_size() // rows_per_unit)))
+
     def dynamic_scale_batch_size(self) -> int:
         """Dynamically scale batch size based on current memory usage."""
-        import time
-        
         current_time = time.time()
         
         # Only check every 5 seconds to avoid overhead
@@ -225,6 +433,11 @@ class MemoryManager:
         self._last_memory_check = current_time
         
         try:
+            # With a measured cost, size batches directly from the memory currently available
+            if self._cost is not None and not self._backpressure_active:
+                self._current_batch_size = self._clamp_batch(self._cost.rows_for_bytes(self._batch_budget_bytes()))
+                return self._current_batch_size
+
             # Get current memory usage
             sys_usage = self.get_system_memory_usage()
             memory_percent = sys_usage["system_percent"]
@@ -233,9 +446,8 @@ class MemoryManager:
             if memory_percent < 0.6:  # Less than 60% memory usage
                 self._consecutive_low_usage += 1
                 if self._consecutive_low_usage >= 3:  # 3 consecutive low usage checks
-                    new_batch = int(self._current_batch_size * self._scale_factor)
-                    max_batch = 25000000  # Cap at 25M
-                    if new_batch <= max_batch:
+                    new_batch = self._clamp_batch(int(self._current_batch_size * self._scale_factor))
+                    if new_batch > self._current_batch_size:
                         self._current_batch_size = new_batch
                         self._consecutive_low_usage = 0
                         logger.info(f"Scaled batch size up to {self._current_batch_size:,} rows (memory: {memory_percent:.1%})")
@@ -244,9 +456,8 @@ class MemoryManager:
                 
             # Scale down if memory usage is high
             if memory_percent > self._backoff_threshold:
-                new_batch = int(self._current_batch_size / self._scale_factor)
-                min_batch = 10000000  # Don't go below 10M
-                if new_batch >= min_batch:
+                new_batch = self._clamp_batch(int(self._current_batch_size / self._scale_factor))
+                if new_batch < self._current_batch_size:
                     self._current_batch_size = new_batch
                     logger.warning(f"Scaled batch size down to {self._current_batch_size:,} rows (memory: {memory_percent:.1%})")
                     
@@ -275,7 +486,7 @@ class MemoryManager:
     def get_gpu_memory_usage(self) -> Dict[str, float]:
         """Get current GPU memory usage."""
         try:
-            if torch.cuda.is_available():
+            if _cuda_available():
                 gpu_memory = torch.cuda.memory_allocated() / (1024**3)
                 gpu_total = torch.cuda.get_device_properties(0).total_memory / (1024**3)
                 return {
@@ -343,6 +554,9 @@ class MemoryManager:
             
         logger.warning("Applying memory backpressure...")
         
+        # Batches this large caused pressure: cap later scale-ups below this size
+        self._pressure_ceiling = max(self._min_batch_rows(), int(self._current_batch_size * 0.75))
+        
         # Reduce batch size by half
         self._current_batch_size = max(1000, self._current_batch_size // 2)
         
@@ -350,7 +564,7 @@ class MemoryManager:
         gc.collect()
         
         # Clear CUDA cache if available
-        if torch.cuda.is_available():
+        if _cuda_available():
             torch.cuda.empty_cache()
         
         self._backpressure_active = True
@@ -363,10 +577,11 @@ class MemoryManager:
             
         logger.info("Releasing memory backpressure...")
         
-        # Gradually restore batch size
+        # Gradually restore batch size (never past the size that caused pressure)
         self._current_batch_size = min(
             self._original_batch_size,
-            int(self._current_batch_size * 1.5)
+            int(self._current_batch_size * 1.5),
+            self._pressure_ceiling or self._original_batch_size,
         )
         
         self._backpressure_active = False
@@ -385,7 +600,7 @@ class MemoryManager:
             gc.collect()
         
         # Clear CUDA cache
-        if torch.cuda.is_available():
+        if _cuda_available():
             torch.cuda.empty_cache()
         
         # Log memory usage after cleanup
@@ -415,7 +630,7 @@ class MemoryManager:
         # GPU parameters if VRAM is available
         if self.config.max_vram_gb > 0:
             try:
-                if torch.cuda.is_available():
+                if _cuda_available():
                     params.update({
                         "device": "cuda",
                         "tree_method": "hist",
@@ -450,14 +665,17 @@ class MemoryManager:
                 "system_limit_gb": self.config.max_memory_gb,
                 "gpu_limit_gb": self.config.max_vram_gb,
                 "batch_size": self.get_batch_size(),
+                "bytes_per_row": self._cost.bytes_per_row if self._cost else None,
+                "seconds_per_row": self._cost.seconds_per_row if self._cost else None,
+                "pressure_ceiling": self._pressure_ceiling,
                 "backpressure_active": self._backpressure_active,
                 "headroom": self.config.headroom,
                 "overhead_factor": self.config.overhead_factor
             },
             "environment": {
                 "cuda_visible_devices": os.environ.get("CUDA_VISIBLE_DEVICES", "not set"),
-                "cuda_available": torch.cuda.is_available(),
-                "gpu_count": torch.cuda.device_count() if torch.cuda.is_available() else 0
+                "cuda_available": _cuda_available(),
+                "gpu_count": torch.cuda.device_count() if _cuda_available() else 0
             }
         }
 
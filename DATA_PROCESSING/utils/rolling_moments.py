@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Rolling Moments Kernels
+
+Rolling mean, variance, covariance, correlation, OLS slope and R² from windowed
+cumulative sums: O(n) per series regardless of window length, and vectorized
+over columns (2-D input = one series per column; a 1-D regressor broadcasts
+against every column, e.g. one market series against many assets).
+
+NaNs are skipped pairwise: a window's statistic uses the rows where both inputs
+are finite, and is NaN when fewer than min_periods such rows exist.
+
+Precision: sums are formed over overlapping chunks of _CHUNK_ROWS rows, with y
+centered per chunk and the time regressor kept as small exact integers, so
+differences of cumulative sums do not lose precision on long series. Centered
+sums below _REL_EPS of the running sum of squares are cancellation noise and
+count as zero, so flat windows give NaN corr/slope/R² and zero variance.
+
+Pandas inputs are aligned by label: x is reindexed onto y's index before the
+kernel runs, as pandas' own rolling cov/corr would align them.
+"""
+
+
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame]
+
+_CHUNK_ROWS = 1 << 16
+_REL_EPS = 1e-12
+
+
+def _window_sum(a: np.ndarray, window: int) -> np.ndarray:
+    c = np.cumsum(a, axis=0)
+    if window < len(c):
+        c[window:] = c[window:] - c[:-window]
+    return c
+
+
+def _pair_moments(x: Optional[np.ndarray], y: np.ndarray, window: int):
+    """Per-row window count, means and centered co-moment sums of (x, y); x=None means time."""
+    if x is None:
+        x = np.arange(len(y), dtype=np.float64).reshape((-1,) + (1,) * (y.ndim - 1))
+        x = np.broadcast_to(x, y.shape)
+        x0 = 0.0  # keep time integral: its sums stay exact in float64
+    else:
+        x, y = np.broadcast_arrays(x, y)
+        x0 = None
+    valid = np.isfinite(x) & np.isfinite(y)
+    with np.errstate(invalid="ignore"):
+        if x0 is None:
+            x0 = np.nanmean(np.where(valid, x, np.nan), axis=0) if valid.any() else 0.0
+        y0 = np.nanmean(np.where(valid, y, np.nan), axis=0) if valid.any() else 0.0
+    x0 = np.nan_to_num(x0)
+    y0 = np.nan_to_num(y0)
+    xc = np.where(valid, x - x0, 0.0)
+    yc = np.where(valid, y - y0, 0.0)
+
+    cnt = _window_sum(valid.astype(np.float64), window)
+    sx = _window_sum(xc, window)
+    sy = _window_sum(yc, window)
+    sxx = _window_sum(xc * xc, window)
+    syy = _window_sum(yc * yc, window)
+    sxy = _window_sum(xc * yc, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mx = sx / cnt
+        my = sy / cnt
+        cxx = sxx - sx * mx
+        cyy = syy - sy * my
+    # Window sums are differences of running sums, so their rounding error scales with the running sum of squares
+    cxx = np.where(cxx > _REL_EPS * np.cumsum(xc * xc, axis=0), cxx, 0.0)
+    cyy = np.where(cyy > _REL_EPS * np.cumsum(yc * yc, axis=0), cyy, 0.0)
+    with np.errstate(invalid="ignore"):
+        cxy = sxy - sx * my
+    return cnt, mx + x0, my + y0, cxx, cyy, cxy
+
+
+def _rolling(stat: str, x: Optional[ArrayLike], y: ArrayLike, window: int,
+             min_periods: Optional[int], ddof: int = 1) -> ArrayLike:
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    min_periods = window if min_periods is None else max(int(min_periods), 1)
+    template = y if isinstance(y, (pd.Series, pd.DataFrame)) else x
+    if (isinstance(x, (pd.Series, pd.DataFrame)) and isinstance(y, (pd.Series, pd.DataFrame))
+            and not x.index.equals(y.index)):
+        x = x.reindex(y.index)
+    ya = np.asarray(y, dtype=np.float64)
+    xa = None if x is None else np.asarray(x, dtype=np.float64)
+    if xa is not None and xa.ndim == 1 and ya.ndim == 2:
+        xa = xa[:, None]
+    if xa is not None and ya.ndim == 1 and xa.ndim == 2:
+        ya = ya[:, None]
+
+    n = len(ya)
+    out = None
+    for start in range(0, max(n, 1), _CHUNK_ROWS):
+        lo = max(0, start - (window - 1))
+        stop = min(n, start + _CHUNK_ROWS)
+        cnt, mx, my, cxx, cyy, cxy = _pair_moments(None if xa is None else xa[lo:stop], ya[lo:stop], window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if stat == "mean":
+                res = my
+            elif stat == "var":
+                res = cyy / (cnt - ddof)
+            elif stat == "cov":
+                res = cxy / (cnt - ddof)
+            elif stat == "corr":
+                res = cxy / np.sqrt(cxx * cyy)
+            elif stat == "slope":
+                res = cxy / cxx
+            elif stat == "r2":
+                res = cxy * cxy / (cxx * cyy)
+            else:
+                raise ValueError(f"Unknown rolling statistic: {stat}")
+        res = np.where(cnt >= min_periods, res, np.nan)
+        if stat in ("var", "cov"):
+            res = np.where(cnt - ddof > 0, res, np.nan)
+        if stat in ("corr", "slope", "r2"):
+            res = np.where(np.isfinite(res), res, np.nan)
+        if stat == "corr":
+            res = np.clip(res, -1.0, 1.0)
+        res = res[start - lo:]
+        if out is None:
+            out = np.empty((n,) + res.shape[1:], dtype=np.float64)
+        out[start:stop] = res
+
+    if isinstance(template, pd.DataFrame):
+        return pd.DataFrame(out, index=template.index, columns=template.columns)
+    if isinstance(template, pd.Series):
+        return pd.Series(out.reshape(-1) if out.ndim > 1 else out, index=template.index, name=template.name)
+    return out
+
+
+def rolling_mean(y: ArrayLike, window: int, min_periods: Optional[int] = None) -> ArrayLike:
+    """Rolling mean of each column."""
+    return _rolling("mean", None, y, window, min_periods)
+
+
+def rolling_var(y: ArrayLike, window: int, min_periods: Optional[int] = None, ddof: int = 1) -> ArrayLike:
+    """Rolling variance of each column."""
+    return _rolling("var", None, y, window, min_periods, ddof=ddof)
+
+
+def rolling_cov(y: ArrayLike, x: ArrayLike, window: int, min_periods: Optional[int] = None,
+                ddof: int = 1) -> ArrayLike:
+    """Rolling covariance of y with x."""
+    return _rolling("cov", x, y, window, min_periods, ddof=ddof)
+
+
+def rolling_corr(y: ArrayLike, x: Optional[ArrayLike], window: int, min_periods: Optional[int] = None) -> ArrayLike:
+    """Rolling correlation of y with x (x=None: with time)."""
+    return _rolling("corr", x, y, window, min_periods)
+
+
+def rolling_slope(y: ArrayLike, x: Optional[ArrayLike], window: int, min_periods: Optional[int] = None) -> ArrayLike:
+    """Rolling OLS slope of y on x (x=None: on time); with x = market returns this is beta."""
+    return _rolling("slope", x, y, window, min_periods)
+
+
+def rolling_r2(y: ArrayLike, x: Optional[ArrayLike], window: int, min_periods: Optional[int] = None) -> ArrayLike:
+    """Rolling R² of the OLS fit of y on x (x=None: on time)."""
+    return _rolling("r2", x, y, window, min_periods)
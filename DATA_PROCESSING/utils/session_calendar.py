@@ -0,0 +1,192 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Precomputed Session Calendar
+
+RTH filtering and bars-per-day checks used to convert every row of every symbol to
+America/New_York and rebuild the exchange schedule per symbol. A SessionCalendar is
+a small table with one row per local date (or exchange session):
+
+- day_start_ns / day_end_ns: local midnight bounds, UTC epoch ns
+- open_ns / close_ns: session open/close, UTC epoch ns
+- expected_bars(interval): bars per session for a bar interval
+
+Row-level questions (which local day / session is this bar in, is it inside RTH)
+are np.searchsorted lookups on the int64 UTC timestamps, with no timezone conversion.
+Tables cover whole calendar years and are cached, so every symbol in a build shares one.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+NY = "America/New_York"
+NS_PER_MINUTE = 60_000_000_000
+_NS_PER_DAY = 1440 * NS_PER_MINUTE
+
+DateLike = Union[date, datetime, str, np.datetime64, pd.Timestamp, int]
+
+
+@dataclass(frozen=True)
+class SessionCalendar:
+    """One row per local date (regular calendar) or per exchange session, ascending."""
+    sessions: np.ndarray      # datetime64[D] local session dates
+    day_start_ns: np.ndarray  # int64 UTC ns of local midnight
+    day_end_ns: np.ndarray    # int64 UTC ns of the next local midnight
+    open_ns: np.ndarray       # int64 UTC ns
+    close_ns: np.ndarray      # int64 UTC ns
+    tz: str = NY
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def expected_bars(self, interval_minutes: int) -> np.ndarray:
+        """Bars per session for a bar interval (early closes get fewer)."""
+        return np.rint((self.close_ns - self.open_ns) / (interval_minutes * NS_PER_MINUTE)).astype(np.int64)
+
+    def frame(self, interval_minutes: Optional[int] = None) -> pl.DataFrame:
+        """The table as a DataFrame, with expected_bars when an interval is given."""
+        cols = {
+            "session": self.sessions,
+            "day_start_ns": self.day_start_ns,
+            "day_end_ns": self.day_end_ns,
+            "open_ns": self.open_ns,
+            "close_ns": self.close_ns,
+        }
+        if interval_minutes is not None:
+            cols["expected_bars"] = self.expected_bars(interval_minutes)
+        return pl.DataFrame(cols)
+
+    def day_index(self, ts_ns: np.ndarray) -> np.ndarray:
+        """Row of the local day containing each timestamp; -1 when outside the table."""
+        ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        if not len(self):
+            return np.full(len(ts_ns), -1)
+        idx = np.searchsorted(self.day_start_ns, ts_ns, side="right") - 1
+        inside = (idx >= 0) & (ts_ns < self.day_end_ns[np.maximum(idx, 0)])
+        return np.where(inside, idx, -1)
+
+    def session_index(self, ts_ns: np.ndarray, closed: str = "left") -> np.ndarray:
+        """
+        Row of the session containing each timestamp; -1 outside every session.
+        closed: "left" = [open, close), "right" = (open, close], "both" = [open, close]
+        """
+        ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        if not len(self):
+            return np.full(len(ts_ns), -1)
+        idx = np.searchsorted(self.open_ns, ts_ns, side="left" if closed == "right" else "right") - 1
+        close = self.close_ns[np.maximum(idx, 0)]
+        before_close = ts_ns < close if closed == "left" else ts_ns <= close
+        return np.where((idx >= 0) & before_close, idx, -1)
+
+    def bar_in_session(self, bar_end_ns: np.ndarray, bar_minutes: int) -> np.ndarray:
+        """True for right-labeled bars (end - bar_minutes, end] lying wholly inside one session."""
+        bar_end_ns = np.asarray(bar_end_ns, dtype=np.int64)
+        sess = self.session_index(bar_end_ns - NS_PER_MINUTE, closed="both")
+        if not len(self):
+            return np.zeros(len(bar_end_ns), dtype=bool)
+        safe = np.maximum(sess, 0)
+        return ((sess >= 0)
+                & (bar_end_ns - bar_minutes * NS_PER_MINUTE >= self.open_ns[safe])
+                & (bar_end_ns <= self.close_ns[safe]))
+
+
+def _to_date(value: DateLike) -> date:
+    if isinstance(value, (int, np.integer)):
+        return pd.Timestamp(int(value), unit="ns").date()
+    ts = pd.Timestamp(value)
+    return (ts.tz_convert("UTC") if ts.tzinfo is not None else ts).date()
+
+
+def _local_ns(dates: pd.DatetimeIndex, offset: pd.Timedelta, tz: str) -> np.ndarray:
+    return (dates + offset).tz_localize(tz, nonexistent="shift_forward", ambiguous=False).as_unit("ns").asi8
+
+
+@lru_cache(maxsize=16)
+def _build(first_year: int, last_year: int, exchange: Optional[str], open_time: time,
+           close_time: time, tz: str) -> SessionCalendar:
+    if exchange is None:
+        dates = pd.date_range(f"{first_year}-01-01", f"{last_year}-12-31", freq="D")
+        open_ns = _local_ns(dates, pd.Timedelta(hours=open_time.hour, minutes=open_time.minute), tz)
+        close_ns = _local_ns(dates, pd.Timedelta(hours=close_time.hour, minutes=close_time.minute), tz)
+    else:
+        from DATA_PROCESSING.utils.bootstrap import load_cal_guarded
+        cal = load_cal_guarded(exchange)
+        first = max(pd.Timestamp(f"{first_year}-01-01"), pd.Timestamp(cal.first_session).tz_localize(None))
+        last = min(pd.Timestamp(f"{last_year}-12-31"), pd.Timestamp(cal.last_session).tz_localize(None))
+        sessions = cal.sessions_in_range(first, last)
+        sched = cal.schedule.loc[sessions[0]:sessions[-1]] if len(sessions) else cal.schedule.iloc[:0]
+        dates = pd.DatetimeIndex(sched.index).tz_localize(None).normalize()
+        open_ns = pd.DatetimeIndex(sched["open"]).as_unit("ns").asi8
+        close_ns = pd.DatetimeIndex(sched["close"]).as_unit("ns").asi8
+
+    return SessionCalendar(
+        sessions=dates.values.astype("datetime64[D]"),
+        day_start_ns=_local_ns(dates, pd.Timedelta(0), tz),
+        day_end_ns=_local_ns(dates, pd.Timedelta(days=1), tz),
+        open_ns=np.asarray(open_ns, dtype=np.int64),
+        close_ns=np.asarray(close_ns, dtype=np.int64),
+        tz=tz,
+    )
+
+
+def session_calendar(
+    start: DateLike,
+    end: DateLike,
+    exchange: Optional[str] = None,
+    open_time: time = time(9, 30),
+    close_time: time = time(16, 0),
+    tz: str = NY,
+) -> SessionCalendar:
+    """
+    Session table covering [start, end], widened to whole calendar years (cached).
+
+    Args:
+        start, end: Dates, timestamps or UTC epoch ns
+        exchange: exchange_calendars name (e.g. "XNYS") for real sessions, holidays and
+                  early closes; None = every calendar date with open_time..close_time in tz
+        open_time, close_time: Local session bounds when exchange is None
+        tz: Local timezone of the sessions
+    """
+    return _build(_to_date(start).year, _to_date(end).year, exchange, open_time, close_time, tz)
+
+
+def session_calendar_for(ts_ns: np.ndarray, **kwargs) -> SessionCalendar:
+    """session_calendar covering the local dates of UTC epoch-ns timestamps."""
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    ts_ns = ts_ns[ts_ns != np.iinfo(np.int64).min]  # nulls (see epoch_ns)
+    if not len(ts_ns):
+        ts_ns = np.array([pd.Timestamp.now("UTC").value], dtype=np.int64)
+    return session_calendar(int(ts_ns.min()) - _NS_PER_DAY, int(ts_ns.max()) + _NS_PER_DAY, **kwargs)
+
+
+def epoch_ns(df: pl.DataFrame, col: str = "ts") -> np.ndarray:
+    """
+    UTC epoch ns of a timestamp column as int64. Naive datetimes are taken as UTC,
+    Int64 columns as epoch ns already; nulls map to int64 min (outside every table).
+    """
+    dtype = df.schema[col]
+    expr = pl.col(col)
+    if isinstance(dtype, pl.Datetime):
+        expr = expr.dt.epoch("ns")
+    return df.select(expr.cast(pl.Int64).fill_null(np.iinfo(np.int64).min)).to_series().to_numpy()
@@ -0,0 +1,62 @@
+"""
+Unit tests for the rolling moments kernels.
+
+Tests that flat windows give NaN trend/beta statistics instead of cancellation
+noise, and that pandas inputs are aligned by label rather than by position.
+"""
+
+import numpy as np
+import pandas as pd
+from DATA_PROCESSING.utils.rolling_moments import rolling_corr, rolling_slope, rolling_var
+
+
+def test_flat_segment_gives_nan_corr_and_zero_var():
+    """Test that a flat price segment yields NaN correlation with time and zero variance."""
+    for level in (1.0, 100.0, 4500.0, 1e5):
+        rng = np.random.default_rng(0)
+        prices = pd.Series(level * np.exp(np.cumsum(rng.normal(0, 0.01, 5000))))
+        prices.iloc[2000:2300] = prices.iloc[2000] * 1.0001
+        window = 50
+
+        corr = rolling_corr(prices, None, window, min_periods=2)
+        var = rolling_var(prices, window)
+        flat = slice(2000 + window - 1, 2300)
+
+        assert corr.iloc[flat].isna().all(), f"flat windows at level {level} should have NaN trend"
+        assert (var.iloc[flat] == 0.0).all()
+        # Windows that move still match pandas
+        expected = prices.rolling(window, min_periods=2).corr(pd.Series(np.arange(len(prices), dtype=float)))
+        moving = slice(window, 2000)
+        np.testing.assert_allclose(corr.iloc[moving], expected.iloc[moving], atol=1e-8)
+
+
+def test_flat_market_gives_nan_beta():
+    """Test that a constant regressor yields NaN slope rather than a huge finite beta."""
+    rng = np.random.default_rng(1)
+    asset = pd.Series(rng.normal(0, 0.01, 500))
+    mkt = pd.Series(rng.normal(0, 0.01, 500))
+    mkt.iloc[200:300] = 0.0123
+
+    beta = rolling_slope(asset, mkt, 60)
+
+    assert beta.iloc[259:300].isna().all()
+    assert beta.iloc[60:200].notna().all()
+
+
+def test_slope_aligns_pandas_inputs_by_label():
+    """Test that reordered or longer market series are aligned to the asset index."""
+    rng = np.random.default_rng(2)
+    asset = pd.Series(rng.normal(size=300))
+    mkt = pd.Series(rng.normal(size=400))
+
+    for other in (mkt.iloc[::-1], mkt.iloc[50:].sample(frac=1.0, random_state=0)):
+        beta = rolling_slope(asset, other, 60)
+        aligned = other.reindex(asset.index)
+        expected = asset.rolling(60).cov(aligned) / aligned.rolling(60).var()
+        assert beta.index.equals(asset.index)
+        np.testing.assert_allclose(beta, expected, atol=1e-10)
+
+    frame = pd.DataFrame({"A": asset, "B": -asset})
+    betas = rolling_slope(frame, mkt.iloc[::-1], 60)
+    np.testing.assert_allclose(betas["B"], -betas["A"], atol=1e-12)
+    np.testing.assert_allclose(betas["A"], rolling_slope(asset, mkt, 60), atol=1e-10)
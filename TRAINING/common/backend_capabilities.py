@@ -0,0 +1,294 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Backend Capability Registry
+
+Whether a GPU backend works (LightGBM CUDA/OpenCL, XGBoost CUDA, CatBoost GPU) is
+found out by fitting a tiny model on it. That fit used to be repeated by every
+evaluator for every target; here each (backend, device) is probed once per process
+and the outcome is shared by all trainers and evaluators.
+
+Successful probes are also kept in a per-host JSON file, valid while the backend's
+library version and CUDA_VISIBLE_DEVICES match and for at most
+gpu.detection.probe_cache.max_age_days, so later runs on the same host skip the
+probe entirely. Failures that cannot change between runs (library not installed,
+XGBoost built without CUDA, no usable nvidia-smi) are kept too, but only for
+gpu.detection.probe_cache.failure_max_age_hours, so CPU-only hosts do not re-probe
+on every run. Any other failure (busy device, driver hiccup during the fit) is
+remembered for the current process only: it must not disable a GPU for later runs.
+Disable the file with gpu.detection.probe_cache.enabled=false or
+TRAINER_NO_PROBE_CACHE=1; call clear_capability_cache() after changing drivers.
+"""
+
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Add CONFIG directory to path for centralized config loading
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_CONFIG_DIR = _REPO_ROOT / "CONFIG"
+if str(_CONFIG_DIR) not in sys.path:
+    sys.path.insert(0, str(_CONFIG_DIR))
+
+_CONFIG_AVAILABLE = False
+try:
+    from config_loader import get_cfg
+    _CONFIG_AVAILABLE = True
+except ImportError:
+    logger.debug("Config loader not available; using default backend probe settings")
+
+# Distribution whose version invalidates a backend's cached outcomes
+_DISTRIBUTIONS = {"lightgbm": "lightgbm", "xgboost": "xgboost", "catboost": "catboost"}
+
+
+@dataclass(frozen=True)
+class Capability:
+    """Outcome of one (backend, device) probe."""
+    available: bool
+    error: Optional[str] = None
+    cached: bool = False  # True when read from the per-host file instead of probed
+
+
+class _Unsupported(RuntimeError):
+    """Probe failure that holds for this host and build, not just this attempt."""
+
+
+# Failures persisted with the short TTL; everything else is retried next run
+_PERSISTENT_FAILURES = (ImportError, _Unsupported)
+
+_CAPABILITIES: Dict[str, Capability] = {}
+_LOCK = threading.Lock()
+
+
+def _get_config() -> Dict[str, Any]:
+    cfg = {
+        "enabled": True,
+        "cache_dir": None,
+        "max_age_days": 7,  # FALLBACK_DEFAULT_OK
+        "failure_max_age_hours": 6,  # FALLBACK_DEFAULT_OK
+    }
+    if _CONFIG_AVAILABLE:
+        try:
+            section = get_cfg("gpu.detection.probe_cache", default={}, config_name="gpu_config") or {}
+            cfg.update({k: v for k, v in section.items() if k in cfg})
+        except Exception as e:
+            logger.debug(f"Failed to load backend probe cache config: {e}")
+    return cfg
+
+
+def _test_shape(backend: str) -> Dict[str, int]:
+    """Size of the throwaway probe model (gpu.<backend>.test_*)."""
+    rounds_key = "test_iterations" if backend == "catboost" else "test_n_estimators"
+    shape = {"rounds": 1, "samples": 10, "features": 5}
+    if _CONFIG_AVAILABLE:
+        try:
+            shape["rounds"] = int(get_cfg(f"gpu.{backend}.{rounds_key}", default=1, config_name="gpu_config"))
+            shape["samples"] = int(get_cfg(f"gpu.{backend}.test_samples", default=10, config_name="gpu_config"))
+            shape["features"] = int(get_cfg(f"gpu.{backend}.test_features", default=5, config_name="gpu_config"))
+        except Exception as e:
+            logger.debug(f"Failed to load {backend} probe size: {e}")
+    return shape
+
+
+def _probe_data(shape: Dict[str, int]):
+    rng = np.random.default_rng(0)
+    return rng.random((shape["samples"], shape["features"])), rng.random(shape["samples"])
+
+
+def _probe_lightgbm(device: str, gpu_device_id: int = 0, gpu_platform_id: int = 0) -> None:
+    import lightgbm as lgb
+    shape = _test_shape("lightgbm")
+    params = {"device": device, "gpu_device_id": gpu_device_id}
+    if device == "gpu":
+        params["gpu_platform_id"] = gpu_platform_id
+    lgb.LGBMRegressor(n_estimators=shape["rounds"], verbose=-1, **params).fit(*_probe_data(shape))
+
+
+def _probe_xgboost(device: str) -> None:
+    import xgboost as xgb
+    if not xgb.build_info().get("USE_CUDA", False):
+        raise _Unsupported("XGBoost built without CUDA support")
+    # A CUDA runtime without a reachable driver can stall the fit; ask nvidia-smi first
+    from TRAINING.common.subprocess_utils import safe_subprocess_run
+    try:
+        result = safe_subprocess_run(["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"], timeout=2)
+    except FileNotFoundError:
+        raise _Unsupported("nvidia-smi not found, no NVIDIA driver on this host")
+    if result.returncode != 0:
+        raise _Unsupported("nvidia-smi failed, GPU not accessible")
+    shape = _test_shape("xgboost")
+    # device="cuda" + hist is the XGBoost 2.0+ API; "gpu_hist" is the legacy (< 2.0) one
+    params = {"tree_method": "gpu_hist"} if device == "gpu_hist" else {"tree_method": "hist", "device": device}
+    xgb.XGBRegressor(n_estimators=shape["rounds"], verbosity=0, **params).fit(*_probe_data(shape))
+
+
+def _probe_catboost(device: str, devices: str = "0") -> None:
+    import catboost as cb
+    shape = _test_shape("catboost")
+    cb.CatBoostRegressor(task_type=device, devices=devices, iterations=shape["rounds"],
+                         verbose=False).fit(*_probe_data(shape))
+
+
+_PROBES: Dict[str, Callable[..., None]] = {
+    "lightgbm": _probe_lightgbm,
+    "xgboost": _probe_xgboost,
+    "catboost": _probe_catboost,
+}
+
+
+def _key(backend: str, device: str, params: Dict[str, Any]) -> str:
+    return f"{backend}:{device}:" + json.dumps(params, sort_keys=True, default=str)
+
+
+def _fingerprint(backend: str) -> Dict[str, str]:
+    """What a cached outcome must match to be reused: library version and visible GPUs."""
+    from importlib import metadata
+    try:
+        version = metadata.version(_DISTRIBUTIONS[backend])
+    except metadata.PackageNotFoundError:
+        version = "missing"
+    return {"version": version, "cuda_visible_devices": os.getenv("CUDA_VISIBLE_DEVICES", "unset")}
+
+
+def _cache_path(cfg: Dict[str, Any]) -> Optional[Path]:
+    if not cfg["enabled"] or os.getenv("TRAINER_NO_PROBE_CACHE", "0") in ("1", "true", "True"):
+        return None
+    default_dir = Path(os.getenv("TRAINER_TMP", tempfile.gettempdir())) / "backend_probes"
+    cache_dir = Path(os.getenv("BACKEND_PROBE_CACHE_DIR") or cfg["cache_dir"] or default_dir)
+    return cache_dir / f"{socket.gethostname()}.json"
+
+
+def _read_disk(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_disk(path: Path, key: str, record: Dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entries = _read_disk(path)
+        entries[key] = record
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug(f"Backend probe cache not written ({path}): {e}")
+
+
+def _is_fresh(record: Dict[str, Any], cfg: Dict[str, Any]) -> bool:
+    """Whether a per-host record may be reused: successes for max_age_days (0 = no limit),
+    persistent failures for failure_max_age_hours (0 = never reused)."""
+    age_s = time.time() - float(record.get("probed_at", 0))
+    if record.get("available"):
+        max_age_s = float(cfg["max_age_days"]) * 86400.0
+        return max_age_s <= 0 or age_s <= max_age_s
+    if record.get("persistent"):
+        return age_s <= float(cfg["failure_max_age_hours"]) * 3600.0
+    return False
+
+
+def backend_capability(backend: str, device: str, **params) -> Capability:
+    """
+    Whether `backend` can train on `device`, probed at most once per process.
+
+    Args:
+        backend: "lightgbm" (device "cuda" or "gpu" for OpenCL), "xgboost" ("cuda", or
+                 "gpu_hist" for the legacy API) or "catboost" ("GPU")
+        device: Device as the backend names it
+        **params: Device selection passed to the probe (gpu_device_id, gpu_platform_id, devices)
+    """
+    key = _key(backend, device, params)
+    with _LOCK:
+        if key in _CAPABILITIES:
+            return _CAPABILITIES[key]
+
+        cvd = os.getenv("CUDA_VISIBLE_DEVICES")
+        if device != "gpu" and cvd in ("-1", ""):
+            # CUDA devices hidden for this process; OpenCL ("gpu") may still see one
+            capability = Capability(False, "GPU hidden via CUDA_VISIBLE_DEVICES")
+            _CAPABILITIES[key] = capability
+            return capability
+
+        cfg = _get_config()
+        path = _cache_path(cfg)
+        fingerprint = _fingerprint(backend)
+        if path is not None:
+            record = _read_disk(path).get(key)
+            if record and record.get("fingerprint") == fingerprint and _is_fresh(record, cfg):
+                capability = Capability(bool(record["available"]), record.get("error"), cached=True)
+                _CAPABILITIES[key] = capability
+                logger.debug(f"Backend capability {key}: {capability.available} (cached in {path})")
+                return capability
+
+        started = time.perf_counter()
+        persistent = False
+        try:
+            _PROBES[backend](device, **params)
+            capability = Capability(True)
+        except Exception as e:
+            capability = Capability(False, f"{type(e).__name__}: {e}")
+            persistent = isinstance(e, _PERSISTENT_FAILURES)
+        logger.debug(f"Probed {key}: available={capability.available} "
+                     f"({time.perf_counter() - started:.2f}s){'' if capability.available else ' - ' + capability.error}")
+
+        _CAPABILITIES[key] = capability
+        if path is not None and (capability.available or persistent and float(cfg["failure_max_age_hours"]) > 0):
+            _write_disk(path, key, {
+                "available": capability.available,
+                "error": capability.error,
+                "persistent": persistent,
+                "fingerprint": fingerprint,
+                "probed_at": time.time(),
+            })
+        return capability
+
+
+def backend_available(backend: str, device: str, **params) -> bool:
+    """backend_capability(...).available"""
+    return backend_capability(backend, device, **params).available
+
+
+def capabilities() -> Dict[str, Dict[str, Any]]:
+    """Every outcome known to this process, keyed by "backend:device:params"."""
+    with _LOCK:
+        return {key: asdict(capability) for key, capability in _CAPABILITIES.items()}
+
+
+def clear_capability_cache(disk: bool = True) -> None:
+    """Forget outcomes (e.g. after a driver change) so the next call probes again."""
+    with _LOCK:
+        _CAPABILITIES.clear()
+        path = _cache_path(_get_config()) if disk else None
+        if path is not None and path.exists():
+            path.unlink()
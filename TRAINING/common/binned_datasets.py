@@ -0,0 +1,434 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Reusable Binned GBDT Datasets
+
+LightGBM and XGBoost spend a large share of each fit re-binning the same feature
+matrix: per CV fold, per family and per auto-fix iteration. This module bins a
+(panel, feature set) matrix once and derives fold/validation sets by row index:
+
+- LightGBM: the full matrix is constructed once as an lgb.Dataset (bin mappers +
+  binned columns). With ``persist`` enabled (opt-in) it is also saved with
+  save_binary, so reruns on the same panel load it instead of binning. Folds are ``Dataset.subset(indices)``, which copies binned
+  rows without recomputing bins. Labels are set per use, so one binned panel serves
+  every target.
+- XGBoost: the quantile sketch of the full matrix is built once as a
+  QuantileDMatrix and passed as ``ref`` to the per-fold QuantileDMatrix, which then
+  only quantizes rows against the shared cuts. XGBoost cannot serialize a
+  QuantileDMatrix, so this reuse is in-process only.
+
+Keys are the content fingerprint of X plus the bin-affecting parameters and library
+version. fit_lgbm_on_indices trains with lgb.train on index subsets and returns a
+LightGBMBoosterRegressor (the estimator surface callers use, over the public Booster
+API); fit_xgb_on_indices attaches the booster to the XGBoost estimator, as the GPU
+path in XGBoostTrainer does.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from TRAINING.common.preprocess_cache import array_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Add CONFIG directory to path for centralized config loading
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_CONFIG_DIR = _REPO_ROOT / "CONFIG"
+if str(_CONFIG_DIR) not in sys.path:
+    sys.path.insert(0, str(_CONFIG_DIR))
+
+_CONFIG_AVAILABLE = False
+try:
+    from config_loader import get_cfg
+    _CONFIG_AVAILABLE = True
+except ImportError:
+    logger.debug("Config loader not available; using default binned dataset settings")
+
+# LightGBM parameters (and aliases) that change how a Dataset is binned/constructed.
+# Everything else is a training parameter and does not affect the cache key.
+LGB_DATASET_PARAMS = frozenset({
+    "max_bin", "max_bins", "max_bin_by_feature", "min_data_in_bin",
+    "bin_construct_sample_cnt", "subsample_for_bin",
+    "data_random_seed", "data_seed", "seed", "random_seed", "random_state",
+    "feature_pre_filter", "min_data_in_leaf", "min_child_samples", "min_data_per_leaf", "min_data", "min_samples_leaf",
+    "use_missing", "zero_as_missing",
+    "categorical_feature", "cat_feature", "categorical_column", "cat_column",
+    "linear_tree", "linear_trees", "forcedbins_filename",
+    "enable_bundle", "is_enable_bundle", "bundle", "max_conflict_rate",
+    "is_enable_sparse", "is_sparse", "enable_sparse", "sparse", "sparse_threshold",
+    "pre_partition", "is_pre_partition",
+    "two_round", "two_round_loading", "use_two_round_loading",
+})
+
+
+def _get_config() -> Dict[str, Any]:
+    cfg = {
+        "enabled": True,
+        "persist": False,  # FALLBACK_DEFAULT_OK
+        "cache_dir": None,
+        "max_entries": 2,  # FALLBACK_DEFAULT_OK
+        "max_disk_gb": 2.0,  # FALLBACK_DEFAULT_OK
+    }
+    if _CONFIG_AVAILABLE:
+        try:
+            section = get_cfg("preprocessing.binned_datasets", default={}, config_name="preprocessing_config") or {}
+            cfg.update({k: v for k, v in section.items() if k in cfg})
+        except Exception as e:
+            logger.debug(f"Failed to load binned dataset config: {e}")
+    return cfg
+
+
+def _default_cache_dir() -> Path:
+    base = os.getenv("BINNED_DATASET_CACHE_DIR") or os.path.join(
+        os.getenv("TRAINER_TMP", os.getenv("TRAINING_TMPDIR", tempfile.gettempdir())), "binned_datasets"
+    )
+    return Path(base)
+
+
+def _index_array(idx) -> np.ndarray:
+    """Row selector as a sorted int32 index array (LightGBM subsets require ascending indices)."""
+    idx = np.asarray(idx)
+    if idx.dtype == bool:
+        idx = np.flatnonzero(idx)
+    return np.sort(idx.astype(np.int32, copy=False))
+
+
+class BinnedDatasetCache:
+    """Process-level cache of binned LightGBM Datasets and XGBoost quantile references."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, persist: Optional[bool] = None,
+                 max_entries: Optional[int] = None, max_disk_gb: Optional[float] = None):
+        cfg = _get_config()
+        self.cache_dir = Path(cache_dir or cfg["cache_dir"] or _default_cache_dir())
+        self.persist = cfg["persist"] if persist is None else persist
+        self.max_entries = int(cfg["max_entries"] if max_entries is None else max_entries)
+        self.max_disk_bytes = float(cfg["max_disk_gb"] if max_disk_gb is None else max_disk_gb) * 1e9
+        self._lgb: "OrderedDict[str, Any]" = OrderedDict()
+        self._xgb: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {"lgb_memory_hits": 0, "lgb_disk_hits": 0, "lgb_builds": 0,
+                      "xgb_hits": 0, "xgb_builds": 0}
+
+    # ------------------------------------------------------------------ keys
+
+    @staticmethod
+    def lgb_dataset_params(params: Dict[str, Any]) -> Dict[str, Any]:
+        """The bin-affecting subset of LightGBM params."""
+        return {k: params[k] for k in sorted(params) if k in LGB_DATASET_PARAMS}
+
+    def _lgb_key(self, fingerprint: str, dataset_params: Dict[str, Any]) -> str:
+        import hashlib
+        import lightgbm as lgb
+        blob = json.dumps([fingerprint, dataset_params, lgb.__version__], sort_keys=True, default=str)
+        return hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+
+    def _remember(self, store: "OrderedDict[str, Any]", key: str, value: Any):
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > max(0, self.max_entries):
+            store.popitem(last=False)
+
+    # ------------------------------------------------------------- LightGBM
+
+    def lgb_full(self, X: np.ndarray, params: Dict[str, Any], fingerprint: Optional[str] = None):
+        """
+        Constructed lgb.Dataset over all rows of X, binned with the dataset params in ``params``.
+
+        The returned Dataset is shared: callers should only derive subsets from it
+        (see lgb_subsets) rather than mutate it.
+        """
+        import lightgbm as lgb
+
+        dataset_params = self.lgb_dataset_params(params)
+        key = self._lgb_key(fingerprint or array_fingerprint(X), dataset_params)
+        with self._lock:
+            full = self._lgb.get(key)
+            if full is not None:
+                self._lgb.move_to_end(key)
+                self.stats["lgb_memory_hits"] += 1
+                return full
+
+            path = self.cache_dir / f"lgb-{key}.bin"
+            if self.persist and path.exists():
+                try:
+                    full = lgb.Dataset(str(path), params=dict(dataset_params, verbose=-1)).construct()
+                    os.utime(path)  # LRU signal for disk eviction
+                    self.stats["lgb_disk_hits"] += 1
+                    logger.info(f"Loaded binned LightGBM dataset from {path.name} ({full.num_data()} rows)")
+                except Exception as e:
+                    logger.warning(f"Failed to load binned dataset {path}: {e}; rebuilding")
+                    full = None
+
+            if full is None:
+                n = X.shape[0]
+                # Placeholder label: the real label is set per use (bins depend on X only)
+                full = lgb.Dataset(np.asarray(X), label=np.zeros(n, dtype=np.float32),
+                                   params=dict(dataset_params, verbose=-1), free_raw_data=True).construct()
+                self.stats["lgb_builds"] += 1
+                logger.info(f"Binned LightGBM dataset: {n} rows x {X.shape[1]} features")
+                if self.persist:
+                    self._save_lgb(full, path)
+
+            self._remember(self._lgb, key, full)
+            return full
+
+    def _save_lgb(self, full, path: Path):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            full.save_binary(str(tmp))
+            os.replace(tmp, path)
+            self._evict_disk()
+        except Exception as e:
+            logger.warning(f"Failed to persist binned dataset to {path}: {e}")
+
+    def _evict_disk(self):
+        """Delete least recently used binary datasets beyond max_disk_gb."""
+        if self.max_disk_bytes <= 0 or not self.cache_dir.exists():
+            return
+        files = []
+        for path in self.cache_dir.glob("lgb-*.bin"):
+            try:
+                st = path.stat()
+                files.append((st.st_mtime, st.st_size, path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+                logger.debug(f"Evicted binned dataset {path.name}")
+            except OSError:
+                pass
+
+    def lgb_subsets(self, X: np.ndarray, y: np.ndarray, params: Dict[str, Any],
+                    index_sets: Sequence, fingerprint: Optional[str] = None) -> List[Any]:
+        """
+        Constructed row subsets of the binned panel, one per index set, labelled with y.
+
+        Subsets share the panel's bin mappers, so a validation subset is directly
+        usable in valid_sets alongside a training subset.
+        """
+        full = self.lgb_full(X, params, fingerprint=fingerprint)
+        y = np.asarray(y, dtype=np.float32).ravel()
+        with self._lock:
+            # Subsets copy the label at construction, so set it on the shared panel and
+            # construct every subset before releasing the lock
+            full.set_label(y)
+            return [full.subset(_index_array(idx)).construct() for idx in index_sets]
+
+    # -------------------------------------------------------------- XGBoost
+
+    def xgb_reference(self, X: np.ndarray, max_bin: int = 256, fingerprint: Optional[str] = None):
+        """QuantileDMatrix holding the quantile cuts of all rows of X."""
+        import hashlib
+        import xgboost as xgb
+
+        blob = json.dumps([fingerprint or array_fingerprint(X), int(max_bin), xgb.__version__])
+        key = hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+        with self._lock:
+            ref = self._xgb.get(key)
+            if ref is not None:
+                self._xgb.move_to_end(key)
+                self.stats["xgb_hits"] += 1
+                return ref
+            ref = xgb.QuantileDMatrix(np.asarray(X), max_bin=int(max_bin))
+            self.stats["xgb_builds"] += 1
+            logger.info(f"Built XGBoost quantile reference: {X.shape[0]} rows x {X.shape[1]} features")
+            self._remember(self._xgb, key, ref)
+            return ref
+
+    def xgb_subsets(self, X: np.ndarray, y: np.ndarray, index_sets: Sequence, max_bin: int = 256,
+                    weight: Optional[np.ndarray] = None, fingerprint: Optional[str] = None) -> List[Any]:
+        """Per-index-set QuantileDMatrix quantized against the shared panel cuts (first set = training)."""
+        import xgboost as xgb
+
+        ref = self.xgb_reference(X, max_bin=max_bin, fingerprint=fingerprint)
+        X = np.asarray(X)
+        y = np.asarray(y).ravel()
+        out = []
+        for idx in index_sets:
+            rows = _index_array(idx)
+            w = None if weight is None else np.asarray(weight).ravel()[rows]
+            # XGBoost requires evaluation matrices to reference the training matrix;
+            # it carries the panel cuts, so every set shares the same bins
+            out.append(xgb.QuantileDMatrix(X[rows], label=y[rows], weight=w,
+                                           ref=out[0] if out else ref, max_bin=int(max_bin)))
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._lgb.clear()
+            self._xgb.clear()
+
+
+_SHARED_CACHE: Optional[BinnedDatasetCache] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_binned_dataset_cache() -> Optional[BinnedDatasetCache]:
+    """The process-wide cache, or None when disabled in preprocessing config."""
+    global _SHARED_CACHE
+    if not _get_config()["enabled"]:
+        return None
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = BinnedDatasetCache()
+        return _SHARED_CACHE
+
+
+# LGBMRegressor params that are not LightGBM training params
+_LGB_SKLEARN_ONLY_PARAMS = frozenset({"n_estimators", "importance_type", "class_weight", "silent"})
+
+
+def _lgb_train_params(model) -> Dict[str, Any]:
+    """lgb.train params equivalent to a LightGBM sklearn estimator's get_params()."""
+    params = {}
+    for k, v in model.get_params().items():
+        if k in _LGB_SKLEARN_ONLY_PARAMS or v is None:
+            continue
+        if k == "random_state" and not isinstance(v, (int, np.integer)):
+            continue  # RandomState instances have no lgb.train equivalent
+        params[k] = v
+    params.setdefault("objective", "regression")
+    if "num_threads" in params:
+        params.pop("n_jobs", None)  # same setting under its sklearn alias
+    return params
+
+
+class LightGBMBoosterRegressor:
+    """
+    Regressor over a Booster trained by fit_lgbm_on_indices.
+
+    Exposes the LGBMRegressor attributes the trainers and ranking code read
+    (predict, feature_importances_, booster_, best_iteration_, ...) using only the
+    public Booster API, so it does not depend on LightGBM's sklearn internals.
+    """
+
+    def __init__(self, booster, params: Dict[str, Any], evals_result: Dict,
+                 importance_type: str = "split"):
+        self.booster_ = booster
+        self.evals_result_ = evals_result
+        self.best_iteration_ = booster.best_iteration
+        self.best_score_ = booster.best_score
+        self.n_features_in_ = booster.num_feature()
+        self.importance_type = importance_type
+        self._params = dict(params)
+
+    def get_params(self, deep: bool = True) -> Dict[str, Any]:
+        return dict(self._params)
+
+    @property
+    def n_estimators_(self) -> int:
+        return self.booster_.current_iteration()
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        return self.booster_.feature_importance(importance_type=self.importance_type)
+
+    def predict(self, X, **kwargs) -> np.ndarray:
+        # Booster.predict uses the best iteration by default, like LGBMRegressor.predict
+        return self.booster_.predict(X, **kwargs)
+
+
+def fit_lgbm_on_indices(model, X: np.ndarray, y: np.ndarray, train_idx, valid_idx=None,
+                        callbacks: Optional[list] = None,
+                        fingerprint: Optional[str] = None) -> Optional[LightGBMBoosterRegressor]:
+    """
+    Train a LightGBM regressor's configuration on rows train_idx of X, validating on
+    valid_idx, using the binned panel cache. ``model`` is only read (get_params).
+
+    Returns:
+        The fitted LightGBMBoosterRegressor, or None if the cache is disabled or the
+        estimator is not supported (classifiers/rankers); the caller should then fit
+        ``model`` itself.
+    """
+    import lightgbm as lgb
+
+    cache = get_binned_dataset_cache()
+    if cache is None or not isinstance(model, lgb.LGBMRegressor):
+        return None
+
+    params = _lgb_train_params(model)
+    index_sets = [train_idx] if valid_idx is None else [train_idx, valid_idx]
+    datasets = cache.lgb_subsets(X, y, params, index_sets, fingerprint=fingerprint)
+
+    evals_result: Dict = {}
+    callbacks = list(callbacks or []) + [lgb.record_evaluation(evals_result)]
+    booster = lgb.train(
+        params=params,
+        train_set=datasets[0],
+        num_boost_round=model.n_estimators,
+        valid_sets=datasets[1:],
+        callbacks=callbacks,
+    )
+    booster.free_dataset()
+    return LightGBMBoosterRegressor(booster, model.get_params(), evals_result,
+                                    importance_type=model.importance_type)
+
+
+def fit_xgb_on_indices(model, X: np.ndarray, y: np.ndarray, train_idx, valid_idx=None,
+                       fingerprint: Optional[str] = None) -> bool:
+    """
+    Fit an XGBoost regressor on rows train_idx of X (hist method), validating on
+    valid_idx, with the panel's quantile sketch reused across calls.
+
+    Returns:
+        True if the model was fitted; False if the cache is disabled or the estimator is
+        not supported, in which case the caller should use fit().
+    """
+    import xgboost as xgb
+
+    cache = get_binned_dataset_cache()
+    if cache is None or not isinstance(model, xgb.XGBRegressor):
+        return False
+    params = model.get_xgb_params()
+    if params.get("tree_method") not in (None, "hist", "auto"):
+        return False
+
+    max_bin = int(params.get("max_bin") or 256)  # XGBoost default max_bin  # DESIGN_CONSTANT_OK
+    index_sets = [train_idx] if valid_idx is None else [train_idx, valid_idx]
+    matrices = cache.xgb_subsets(X, y, index_sets, max_bin=max_bin, fingerprint=fingerprint)
+
+    evals = [(matrices[1], "validation_0")] if valid_idx is not None else []
+    evals_result: Dict = {}
+    booster = xgb.train(
+        params,
+        matrices[0],
+        num_boost_round=model.get_num_boosting_rounds(),
+        evals=evals,
+        early_stopping_rounds=model.early_stopping_rounds if evals else None,
+        evals_result=evals_result,
+        verbose_eval=False,
+    )
+    # Same attachment the GPU path in XGBoostTrainer uses
+    model._Booster = booster
+    model.evals_result_ = evals_result
+    return True
@@ -39,7 +39,7 @@ import random
 import hashlib
 import logging
 import numpy as np
-from typing import Iterable, Optional, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +65,112 @@ def stable_seed_from(parts: Iterable[str|int], modulo: int = 2**31-1) -> int:
     h = hashlib.sha256(("::".join(map(str, parts))).encode("utf-8")).hexdigest()
     return int(h[:12], 16) % modulo  # 12 hex ~ 48 bits → int32 range
 
+class _PostImportLoader:
+    """Loader proxy that runs the deferred hooks after the real loader executes the module."""
+
+    def __init__(self, loader, fullname: str):
+        self._loader = loader
+        self._fullname = fullname
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        _run_import_hooks(self._fullname, module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _PostImportFinder:
+    """Meta-path finder that wraps the loader of modules with pending import hooks."""
+
+    def __init__(self):
+        self._resolving = set()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in _IMPORT_HOOKS or fullname in self._resolving:
+            return None
+        import importlib.util
+        self._resolving.add(fullname)
+        try:
+            spec = importlib.util.find_spec(fullname)
+        finally:
+            self._resolving.discard(fullname)
+        if spec is not None and spec.loader is not None:
+            spec.loader = _PostImportLoader(spec.loader, fullname)
+        return spec
+
+
+_IMPORT_HOOKS: Dict[str, List[Callable[[Any], None]]] = {}
+_POST_IMPORT_FINDER = _PostImportFinder()
+
+
+def _run_import_hooks(fullname: str, module) -> None:
+    for hook in _IMPORT_HOOKS.pop(fullname, []):
+        try:
+            hook(module)
+        except Exception as e:
+            logger.warning(f"Post-import hook for {fullname} failed: {e}")
+
+
+def when_imported(fullname: str, hook: Callable[[Any], None]) -> None:
+    """
+    Run hook(module) once the top-level module is imported (immediately if it already is).
+
+    Used to defer framework seeding/configuration without importing the framework.
+    """
+    import sys
+    module = sys.modules.get(fullname)
+    if module is not None:
+        hook(module)
+        return
+    _IMPORT_HOOKS.setdefault(fullname, []).append(hook)
+    if _POST_IMPORT_FINDER not in sys.meta_path:
+        sys.meta_path.insert(0, _POST_IMPORT_FINDER)
+
+
+def _seed_torch(torch, s: int, deterministic_algorithms: bool) -> None:
+    torch.manual_seed(s)
+    if torch.cuda.is_available():
+        torch.cuda.manual_seed_all(s)
+    if deterministic_algorithms:
+        # Stronger setting (may raise on non-deterministic ops)
+        torch.use_deterministic_algorithms(True, warn_only=False)
+    # CUDNN flags
+    try:
+        import torch.backends.cudnn as cudnn
+        cudnn.deterministic = True
+        cudnn.benchmark = False
+    except Exception:
+        pass
+    logger.info("✅ PyTorch determinism set")
+
+
+def _seed_tensorflow(tf, s: int) -> None:
+    tf.random.set_seed(s)
+
+    # Configure GPU memory growth for 8GB+ GPUs
+    try:
+        gpus = tf.config.experimental.list_physical_devices('GPU')
+        if gpus:
+            for gpu in gpus:
+                tf.config.experimental.set_memory_growth(gpu, True)
+                # Set memory limit to 8GB (8192 MB) - full utilization
+                tf.config.experimental.set_virtual_device_configuration(
+                    gpu,
+                    [tf.config.experimental.VirtualDeviceConfiguration(memory_limit=8192)]
+                )
+                logger.info("✅ TensorFlow GPU memory configured (8GB limit)")
+        else:
+            logger.info("✅ TensorFlow CPU mode")
+    except Exception as e:
+        logger.warning(f"TensorFlow GPU config failed: {e}")
+
+    logger.info("✅ TensorFlow seed set")
+
+
 def set_global_determinism(
     base_seed: int = 42,
     threads: int = None,  # Auto-detect optimal threads
@@ -171,52 +277,11 @@ def set_global_determinism(
     except Exception as e:
         logger.warning(f"NumPy seed setting failed: {e}")
 
-    # PyTorch (optional)
-    try:
-        import torch
-        torch.manual_seed(s)
-        if torch.cuda.is_available():
-            torch.cuda.manual_seed_all(s)
-        if deterministic_algorithms:
-            # Stronger setting (may raise on non-deterministic ops)
-            torch.use_deterministic_algorithms(True, warn_only=False)
-        # CUDNN flags
-        try:
-            import torch.backends.cudnn as cudnn
-            cudnn.deterministic = True
-            cudnn.benchmark = False
-        except Exception:
-            pass
-        logger.info("✅ PyTorch determinism set")
-    except Exception:
-        logger.info("PyTorch not available")
-
-    # TensorFlow (optional) - skip in child processes if requested
+    # PyTorch / TensorFlow (optional): seeded now if already imported, otherwise on
+    # first import, so entry points don't pay for frameworks they never use
+    when_imported("torch", lambda torch: _seed_torch(torch, s, deterministic_algorithms))
     if tf_on and os.getenv("TRAINER_CHILD_NO_TF", "0") != "1":
-        try:
-            import tensorflow as tf
-            tf.random.set_seed(s)
-            
-            # Configure GPU memory growth for 8GB+ GPUs
-            try:
-                gpus = tf.config.experimental.list_physical_devices('GPU')
-                if gpus:
-                    for gpu in gpus:
-                        tf.config.experimental.set_memory_growth(gpu, True)
-                        # Set memory limit to 8GB (8192 MB) - full utilization
-                        tf.config.experimental.set_virtual_device_configuration(
-                            gpu,
-                            [tf.config.experimental.VirtualDeviceConfiguration(memory_limit=8192)]
-                        )
-                        logger.info("✅ TensorFlow GPU memory configured (8GB limit)")
-                else:
-                    logger.info("✅ TensorFlow CPU mode")
-            except Exception as e:
-                logger.warning(f"TensorFlow GPU config failed: {e}")
-            
-            logger.info("✅ TensorFlow seed set")
-        except Exception:
-            logger.info("TensorFlow not available")
+        when_imported("tensorflow", lambda tf: _seed_tensorflow(tf, s))
 
     # Tree learners default to CPU for strict reproducibility if requested
     if prefer_cpu_tree_train:
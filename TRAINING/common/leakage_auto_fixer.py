@@ -32,7 +32,7 @@ import logging
 import yaml
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Set, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
 
 # Add project root to path
@@ -77,6 +77,104 @@ class AutoFixInfo:
     backup_files: List[str] = None  # List of backup files created
 
 
+@dataclass
+class IncrementalRerunState:
+    """
+    Panel state kept alive across incremental auto-fix iterations.
+    
+    The feature matrix is loaded once by the first (full) training pass and
+    converted to an ndarray at most once (``values``). Later iterations only flip
+    entries in ``column_mask`` for newly excluded features; leak detection reads
+    the panel through that mask, so the panel is never reloaded or copied.
+    """
+    X: Any  # Full feature matrix (pd.DataFrame or np.ndarray), never modified
+    y: Any
+    feature_names: List[str]
+    column_mask: Any  # np.ndarray[bool], True = feature still active
+    symbols: Optional[Any] = None
+    fold_splits: Optional[List[Any]] = None  # Cached (train_idx, test_idx) pairs, reused every iteration
+    family_importance: Dict[str, Dict[str, float]] = field(default_factory=dict)  # family -> feature -> importance
+    run_metadata: Dict[str, Any] = field(default_factory=dict)  # task_type, data_interval_minutes, target_column
+    _values: Any = field(default=None, repr=False)
+    
+    @classmethod
+    def from_training_results(cls, training_results: Dict[str, Any]) -> 'IncrementalRerunState':
+        """Build state from the results of the initial full training pass."""
+        import numpy as np
+        
+        feature_names = list(training_results.get('feature_names', []))
+        return cls(
+            X=training_results.get('X'),
+            y=training_results.get('y'),
+            feature_names=feature_names,
+            column_mask=np.ones(len(feature_names), dtype=bool),
+            symbols=training_results.get('symbols'),
+            fold_splits=training_results.get('fold_splits'),
+            family_importance=dict(training_results.get('family_importance') or {}),
+            run_metadata={
+                k: training_results[k]
+                for k in ('task_type', 'data_interval_minutes', 'target_column')
+                if k in training_results
+            }
+        )
+    
+    @property
+    def values(self) -> Any:
+        """Full panel as an ndarray (converted once; no copy if X already is one)."""
+        if self._values is None:
+            import numpy as np
+            self._values = self.X.to_numpy() if hasattr(self.X, 'to_numpy') else np.asarray(self.X)
+        return self._values
+    
+    @property
+    def active_indices(self) -> Any:
+        """Column positions of features that are still active."""
+        import numpy as np
+        return np.flatnonzero(self.column_mask)
+    
+    @property
+    def active_feature_names(self) -> List[str]:
+        """Names of features that are still active, in panel order."""
+        return [self.feature_names[i] for i in self.active_indices]
+    
+    def exclude(self, feature_names: List[str]) -> List[str]:
+        """
+        Mask out features in place.
+        
+        Returns:
+            Names that were active before this call (i.e. newly excluded)
+        """
+        positions = {name: i for i, name in enumerate(self.feature_names)}
+        newly_excluded = []
+        for name in feature_names:
+            idx = positions.get(name)
+            if idx is not None and self.column_mask[idx]:
+                self.column_mask[idx] = False
+                newly_excluded.append(name)
+        
+        # Excluded features no longer carry importance for any family
+        for family, importances in self.family_importance.items():
+            self.family_importance[family] = {
+                f: imp for f, imp in importances.items() if f not in newly_excluded
+            }
+        return newly_excluded
+    
+    def aggregated_importance(self) -> Dict[str, float]:
+        """Mean of per-family normalized importances over active features."""
+        totals: Dict[str, float] = {}
+        n_families = 0
+        for importances in self.family_importance.values():
+            total = sum(abs(v) for v in importances.values())
+            if total <= 0:
+                continue
+            n_families += 1
+            for feat, imp in importances.items():
+                totals[feat] = totals.get(feat, 0.0) + abs(imp) / total
+        if n_families == 0:
+            return {}
+        return {feat: val / n_families for feat, val in totals.items()}
+
+
 class LeakageAutoFixer:
     """
     Automatically detects and fixes data leakage by:
@@ -259,16 +357,31 @@ class LeakageAutoFixer:
         data_interval_minutes: int = 5,
         model_importance: Optional[Dict[str, float]] = None,  # feature -> importance
         train_score: Optional[float] = None,  # Perfect score indicates leakage
-        test_score: Optional[float] = None
+        test_score: Optional[float] = None,
+        column_mask: Optional[Any] = None  # bool per feature_names entry; False = masked out
     ) -> List[LeakageDetection]:
         """
         Detect leaking features using multiple methods.
         
         Filters out features that are already excluded to avoid redundant detections.
+        With ``column_mask``, X and feature_names describe the full panel and only
+        the active columns are evaluated; rows and columns are gathered together
+        from X, so the panel itself is never copied.
         
         Returns:
             List of LeakageDetection objects
         """
+        import numpy as np
+        import pandas as pd
+        
+        # Column positions evaluated (None = every column of X)
+        columns = None
+        if column_mask is not None:
+            column_mask = np.asarray(column_mask, dtype=bool)
+            if not column_mask.all():
+                columns = np.flatnonzero(column_mask)
+                feature_names = [feature_names[i] for i in columns]
+        
         # Filter out already-excluded features from detection
         # (These shouldn't be in feature_names if filtering worked, but check anyway)
         excluded_exact, excluded_prefixes = self._load_excluded_features()
@@ -277,6 +390,10 @@ class LeakageAutoFixer:
             if not self._is_already_excluded(f)
         ]
         
+        # Build the matrix once; every method below reads it by row/column index arrays
+        X_values = X.to_numpy() if isinstance(X, pd.DataFrame) else np.asarray(X)
+        y_values = y.to_numpy() if isinstance(y, pd.Series) else np.asarray(y)
+        
         if len(candidate_features) < len(feature_names):
             logger.debug(
                 f"Filtered out {len(feature_names) - len(candidate_features)} "
@@ -336,21 +453,7 @@ class LeakageAutoFixer:
                 # CRITICAL: When we have perfect score but no importances, we MUST compute them
                 # Otherwise we can't identify which features are causing the leakage
                 try:
-                    import pandas as pd
-                    import numpy as np
                     from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-                    from sklearn.linear_model import LogisticRegression, LinearRegression
-                    
-                    # Convert to DataFrame if needed
-                    if not isinstance(X, pd.DataFrame):
-                        X_df = pd.DataFrame(X, columns=feature_names)
-                    else:
-                        X_df = X
-                    
-                    if not isinstance(y, pd.Series):
-                        y_series = pd.Series(y)
-                    else:
-                        y_series = y
                     
                     # Get deterministic seed
                     try:
@@ -368,13 +471,15 @@ class LeakageAutoFixer:
                         quick_model = RandomForestRegressor(n_estimators=50, max_depth=10, random_state=leak_seed, n_jobs=1)
                     
                     # Use sample if data is too large
-                    if len(X_df) > 10000:
-                        sample_idx = np.random.RandomState(leak_seed).choice(len(X_df), size=10000, replace=False)
-                        X_sample = X_df.iloc[sample_idx]
-                        y_sample = y_series.iloc[sample_idx]
+                    if len(X_values) > 10000:
+                        sample_idx = np.random.RandomState(leak_seed).choice(len(X_values), size=10000, replace=False)
                     else:
-                        X_sample = X_df
-                        y_sample = y_series
+                        sample_idx = np.arange(len(X_values))
+                    if columns is None:
+                        X_sample = X_values[sample_idx]
+                    else:
+                        X_sample = X_values[np.ix_(sample_idx, columns)]
+                    y_sample = y_values[sample_idx]
                     
                     quick_model.fit(X_sample, y_sample)
                     
@@ -419,26 +524,11 @@ class LeakageAutoFixer:
                             ))
                     logger.debug(f"Method 1: Pattern-based fallback found {len(detections)} detections")
         
-        # Method 2: Leakage sentinels
+        # Method 2: Leakage sentinels (one batch on the training matrix)
         try:
             sentinel = LeakageSentinel()
             
-            # Convert to DataFrame if needed
-            import pandas as pd
-            import numpy as np
-            
-            if not isinstance(X, pd.DataFrame):
-                X_df = pd.DataFrame(X, columns=feature_names)
-            else:
-                X_df = X
-            
-            if not isinstance(y, pd.Series):
-                y_series = pd.Series(y)
-            else:
-                y_series = y
-            
-            # Train a simple model for sentinel tests
-            # Use sklearn models for fast training
+            # Simple sklearn models for fast sentinel fits
             try:
                 from sklearn.linear_model import LogisticRegression, LinearRegression
                 from sklearn.model_selection import train_test_split
@@ -452,42 +542,20 @@ class LeakageAutoFixer:
                 except:
                     leak_seed = 42  # FALLBACK_DEFAULT_OK
                 
-                if task_type == 'classification':
-                    simple_model = LogisticRegression(random_state=leak_seed, solver='liblinear', max_iter=100)
-                else:
-                    simple_model = LinearRegression()
-                
                 # Train on subset for speed
-                if len(X_df) > 10000:
-                    X_sample, _, y_sample, _ = train_test_split(X_df, y_series, train_size=10000, random_state=leak_seed, stratify=y_series if task_type == 'classification' else None)
-                else:
-                    X_sample, y_sample = X_df, y_series
-                
-                simple_model.fit(X_sample, y_sample)
-                
-                # Shifted target test (requires model)
-                shifted_result = sentinel.shifted_target_test(
-                    simple_model, X_sample.values, y_sample.values, horizon=1
-                )
-                if not shifted_result.passed and shifted_result.score > 0.7:
-                    # High score on shifted target = features encode future info
-                    # Mark top features as suspicious
-                    if model_importance:
-                        top_suspicious = sorted(model_importance.items(), key=lambda x: x[1], reverse=True)[:5]
-                        for feat_name, importance in top_suspicious:
-                            if feat_name in candidate_features:
-                                detections.append(LeakageDetection(
-                                    feature_name=feat_name,
-                                    confidence=0.8,
-                                    reason=f"High importance in shifted-target test failure (score={shifted_result.score:.3f})",
-                                    source="shifted_target_test",
-                                    suggested_action=self._suggest_action(feat_name)
-                                ))
+                sample_rows = None
+                if len(y_values) > 10000:
+                    sample_rows, _ = train_test_split(
+                        np.arange(len(y_values)), train_size=10000, random_state=leak_seed,
+                        stratify=y_values if task_type == 'classification' else None
+                    )
                 
-                # Symbol holdout test (requires train/test split by symbol)
+                # Symbol holdout split (requires at least two symbols)
+                holdout = None
+                train_syms = test_syms = None
+                holdout_seed = leak_seed
                 if symbols is not None and len(symbols.unique()) >= 2:
                     try:
-                        from sklearn.model_selection import train_test_split as sk_train_test_split
                         unique_symbols = symbols.unique()
                         # Use symbol-specific seed for holdout test
                         holdout_seed = stable_seed_from(['leakage_holdout', target_name]) if BASE_SEED is not None else leak_seed
@@ -502,56 +570,76 @@ class LeakageAutoFixer:
                             symbol_holdout_test_size = float(auto_fixer_cfg.get('symbol_holdout_test_size', 0.2))
                         except Exception:
                             symbol_holdout_test_size = 0.2  # FALLBACK_DEFAULT_OK
-                        train_syms, test_syms = sk_train_test_split(
+                        train_syms, test_syms = train_test_split(
                             unique_symbols, test_size=symbol_holdout_test_size, random_state=holdout_seed
                         )
-                        X_train_sym = X_df[symbols.isin(train_syms)]
-                        y_train_sym = y_series[symbols.isin(train_syms)]
-                        X_test_sym = X_df[symbols.isin(test_syms)]
-                        y_test_sym = y_series[symbols.isin(test_syms)]
-                        
-                        if len(X_train_sym) > 100 and len(X_test_sym) > 100:
-                            holdout_model = LogisticRegression(random_state=holdout_seed, solver='liblinear', max_iter=100) if task_type == 'classification' else LinearRegression()
-                            holdout_model.fit(X_train_sym, y_train_sym)
-                            
-                            holdout_result = sentinel.symbol_holdout_test(
-                                holdout_model, X_train_sym.values, y_train_sym.values,
-                                X_test_sym.values, y_test_sym.values,
-                                train_symbols=list(train_syms), test_symbols=list(test_syms)
-                            )
-                            if not holdout_result.passed:
-                                # Large train/test gap = symbol-specific leakage
-                                if model_importance:
-                                    top_suspicious = sorted(model_importance.items(), key=lambda x: x[1], reverse=True)[:5]
-                                    for feat_name, importance in top_suspicious:
-                                        if feat_name in candidate_features:
-                                            detections.append(LeakageDetection(
-                                                feature_name=feat_name,
-                                                confidence=0.7,
-                                                reason=f"High importance in symbol-holdout test failure (diff={holdout_result.details.get('gap', 0):.3f})",
-                                                source="symbol_holdout_test",
-                                                suggested_action=self._suggest_action(feat_name)
-                                            ))
+                        symbol_values = np.asarray(symbols)
+                        train_idx = np.flatnonzero(np.isin(symbol_values, train_syms))
+                        test_idx = np.flatnonzero(np.isin(symbol_values, test_syms))
+                        if len(train_idx) > 100 and len(test_idx) > 100:
+                            holdout = (train_idx, test_idx)
                     except Exception as e:
                         logger.debug(f"Symbol holdout test skipped: {e}")
                 
-                # Randomized time test (requires model)
-                randomized_result = sentinel.randomized_time_test(
-                    simple_model, X_sample.values, y_sample.values
-                )
-                if not randomized_result.passed and randomized_result.score > 0.7:
+                def make_model(name):
+                    seed = holdout_seed if name == 'symbol_holdout' else leak_seed
+                    if task_type == 'classification':
+                        return LogisticRegression(random_state=seed, solver='liblinear', max_iter=100)
+                    return LinearRegression()
+                
+                sentinel_results = {
+                    result.test_name: result
+                    for result in sentinel.run_batch(
+                        X_values, y_values, make_model, horizon=1, rows=sample_rows, holdout=holdout,
+                        columns=columns,
+                        train_symbols=list(train_syms) if holdout is not None else None,
+                        test_symbols=list(test_syms) if holdout is not None else None
+                    )
+                }
+                top_suspicious = []
+                if model_importance:
+                    top_suspicious = [
+                        feat_name for feat_name, _ in
+                        sorted(model_importance.items(), key=lambda x: x[1], reverse=True)[:5]
+                        if feat_name in candidate_features
+                    ]
+                
+                shifted_result = sentinel_results.get('shifted_target')
+                if shifted_result is not None and not shifted_result.passed and shifted_result.score > 0.7:
+                    # High score on shifted target = features encode future info
+                    # Mark top features as suspicious
+                    for feat_name in top_suspicious:
+                        detections.append(LeakageDetection(
+                            feature_name=feat_name,
+                            confidence=0.8,
+                            reason=f"High importance in shifted-target test failure (score={shifted_result.score:.3f})",
+                            source="shifted_target_test",
+                            suggested_action=self._suggest_action(feat_name)
+                        ))
+                
+                holdout_result = sentinel_results.get('symbol_holdout')
+                if holdout_result is not None and not holdout_result.passed:
+                    # Large train/test gap = symbol-specific leakage
+                    for feat_name in top_suspicious:
+                        detections.append(LeakageDetection(
+                            feature_name=feat_name,
+                            confidence=0.7,
+                            reason=f"High importance in symbol-holdout test failure (diff={holdout_result.details.get('gap', 0):.3f})",
+                            source="symbol_holdout_test",
+                            suggested_action=self._suggest_action(feat_name)
+                        ))
+                
+                randomized_result = sentinel_results.get('randomized_time')
+                if randomized_result is not None and not randomized_result.passed and randomized_result.score > 0.7:
                     # High score on randomized time = features encode temporal info incorrectly
-                    if model_importance:
-                        top_suspicious = sorted(model_importance.items(), key=lambda x: x[1], reverse=True)[:5]
-                        for feat_name, importance in top_suspicious:
-                            if feat_name in candidate_features:
-                                detections.append(LeakageDetection(
-                                    feature_name=feat_name,
-                                    confidence=0.75,
-                                    reason=f"High importance in randomized-time test failure (score={randomized_result.score:.3f})",
-                                    source="randomized_time_test",
-                                    suggested_action=self._suggest_action(feat_name)
-                                ))
+                    for feat_name in top_suspicious:
+                        detections.append(LeakageDetection(
+                            feature_name=feat_name,
+                            confidence=0.75,
+                            reason=f"High importance in randomized-time test failure (score={randomized_result.score:.3f})",
+                            source="randomized_time_test",
+                            suggested_action=self._suggest_action(feat_name)
+                        ))
             except Exception as e:
                 logger.debug(f"Sentinel tests skipped (need model): {e}")
         except Exception as e:
@@ -1093,20 +1181,38 @@ class LeakageAutoFixer:
         max_iterations: int = 5,
         min_confidence: Optional[float] = None,  # Load from config if None
         target_column: str = None,
+        max_features: Optional[int] = None,  # Max features fixed per iteration (None = no limit)
+        incremental: Optional[bool] = None,  # Load from config if None
+        rerun_function=None,  # Incremental re-evaluation: (state, families, **training_kwargs) -> results
         **training_kwargs
     ) -> Dict[str, Any]:
         """
         Run training in a loop, detecting and fixing leaks until clean.
         
+        In incremental mode, ``training_function`` runs once to load the panel and
+        train every family. Later iterations keep that panel in an
+        ``IncrementalRerunState``, mask out the newly excluded columns and call
+        ``rerun_function`` only for the families whose importance flagged a leak,
+        reusing the cached fold splits. Leak detection reads the panel through the
+        state's column mask. ``training_function`` should then also return
+        ``family_importance`` (family -> feature -> importance) and may return
+        ``fold_splits``; ``rerun_function`` returns the same keys for the
+        re-evaluated families plus ``train_score``/``test_score``.
+        
         Args:
             training_function: Function that runs training and returns results
             max_iterations: Maximum number of fix iterations
             min_confidence: Minimum confidence to auto-fix (loads from config if None)
             target_column: Target column name
+            max_features: Maximum number of features fixed per iteration (None = no limit)
+            incremental: Warm-start later iterations (loads from config if None;
+                requires rerun_function, otherwise falls back to full reruns)
+            rerun_function: Function that re-evaluates a subset of families on the masked panel
             **training_kwargs: Additional arguments to pass to training function
         
         Returns:
-            Dict with final results and fix history
+            Dict with final results and fix history (each entry carries the
+            iteration's ``updates`` dict and ``AutoFixInfo``)
         """
         # Load min_confidence from config if not provided
         if min_confidence is None:
@@ -1121,8 +1227,17 @@ class LeakageAutoFixer:
             except Exception:
                 min_confidence = 0.7
         
+        incremental_cfg = self._load_incremental_config()
+        if incremental is None:
+            incremental = incremental_cfg['enabled']
+        if incremental and rerun_function is None:
+            logger.warning("Incremental auto-fix requested without rerun_function - falling back to full reruns")
+            incremental = False
+        
         self.iteration_count = 0
         fix_history = []
+        state: Optional[IncrementalRerunState] = None
+        rerun_families: Optional[List[str]] = None
         
         for iteration in range(max_iterations):
             self.iteration_count = iteration + 1
@@ -1130,15 +1245,31 @@ class LeakageAutoFixer:
             logger.info(f"Auto-Fix Iteration {self.iteration_count}/{max_iterations}")
             logger.info(f"{'='*70}")
             
-            # Run training
-            logger.info("Running training...")
-            training_results = training_function(**training_kwargs)
+            if state is None:
+                # Run training (always a full pass on the first iteration)
+                logger.info("Running training...")
+                training_results = training_function(**training_kwargs)
+                if incremental:
+                    state = IncrementalRerunState.from_training_results(training_results)
+            else:
+                training_results = self._run_incremental_iteration(
+                    state, rerun_function, rerun_families, training_kwargs
+                )
             
             # Extract results
-            X = training_results.get('X')
-            y = training_results.get('y')
-            feature_names = training_results.get('feature_names', [])
-            model_importance = training_results.get('model_importance', {})
+            if state is not None:
+                # Full panel + column mask: excluded columns are skipped, not copied out
+                X = state.values
+                y = state.y
+                feature_names = state.feature_names
+                column_mask = state.column_mask
+                model_importance = training_results.get('model_importance') or state.aggregated_importance()
+            else:
+                X = training_results.get('X')
+                y = training_results.get('y')
+                feature_names = training_results.get('feature_names', [])
+                column_mask = None
+                model_importance = training_results.get('model_importance', {})
             train_score = training_results.get('train_score')
             test_score = training_results.get('test_score')
             symbols = training_results.get('symbols')
@@ -1153,7 +1284,8 @@ class LeakageAutoFixer:
                 symbols=symbols, task_type=task_type,
                 data_interval_minutes=data_interval_minutes,
                 model_importance=model_importance,
-                train_score=train_score, test_score=test_score
+                train_score=train_score, test_score=test_score,
+                column_mask=column_mask
             )
             
             if not detections:
@@ -1178,9 +1310,10 @@ class LeakageAutoFixer:
             
             # Apply fixes
             logger.info(f"Applying fixes for {len(detections)} leaks...")
-            updates = self.apply_fixes(
+            updates, autofix_info = self.apply_fixes(
                 detections, 
                 min_confidence=min_confidence, 
+                max_features=max_features,
                 dry_run=False,
                 target_name=target_column,  # Use target_column from training_kwargs if available
                 max_backups_per_target=None  # Use instance config
@@ -1189,10 +1322,22 @@ class LeakageAutoFixer:
             fix_history.append({
                 'iteration': self.iteration_count,
                 'detections': [d.__dict__ for d in detections],
-                'updates': updates
+                'updates': updates,
+                'autofix_info': autofix_info
             })
             
-            logger.info(f"✅ Applied fixes. Re-running training in next iteration...")
+            if state is not None:
+                leak_names_sorted = sorted(leak_names)
+                rerun_families = self._families_flagging_leaks(
+                    leak_names_sorted, state.family_importance,
+                    min_share=incremental_cfg['family_importance_share']
+                )
+                newly_excluded = state.exclude(leak_names_sorted)
+                logger.info(f"✅ Applied fixes. Masked {len(newly_excluded)} columns; "
+                           f"re-evaluating {len(rerun_families)}/{len(state.family_importance)} families "
+                           f"in next iteration: {rerun_families}")
+            else:
+                logger.info(f"✅ Applied fixes. Re-running training in next iteration...")
         
         logger.warning(f"⚠️  Reached max iterations ({max_iterations}). Some leaks may remain.")
         return {
@@ -1202,6 +1347,71 @@ class LeakageAutoFixer:
             'remaining_leaks': list(self.detected_leaks.keys())
         }
     
+    def _load_incremental_config(self) -> Dict[str, Any]:
+        """Load incremental auto-fix settings from safety config."""
+        try:
+            from CONFIG.config_loader import get_safety_config
+            safety_cfg = get_safety_config()
+            safety_section = safety_cfg.get('safety', {})
+            leakage_cfg = safety_section.get('leakage_detection', {})
+            incremental_cfg = leakage_cfg.get('auto_fixer', {}).get('incremental', {})
+            return {
+                'enabled': bool(incremental_cfg.get('enabled', False)),
+                'family_importance_share': float(incremental_cfg.get('family_importance_share', 0.05))
+            }
+        except Exception:
+            return {'enabled': False, 'family_importance_share': 0.05}  # FALLBACK_DEFAULT_OK
+    
+    @staticmethod
+    def _families_flagging_leaks(
+        leak_names: List[str],
+        family_importance: Dict[str, Dict[str, float]],
+        min_share: float
+    ) -> List[str]:
+        """
+        Return families whose importance flagged at least one leak.
+        
+        A family flags a leak when that feature holds at least ``min_share`` of the
+        family's total importance. If no family flags any leak (e.g. the leak came
+        from a pattern or sentinel check), every family is re-evaluated.
+        """
+        flagged = []
+        for family, importances in family_importance.items():
+            total = sum(abs(v) for v in importances.values())
+            if total <= 0:
+                continue
+            if any(abs(importances.get(name, 0.0)) / total >= min_share for name in leak_names):
+                flagged.append(family)
+        return sorted(flagged) if flagged else sorted(family_importance.keys())
+    
+    def _run_incremental_iteration(
+        self,
+        state: IncrementalRerunState,
+        rerun_function,
+        families: Optional[List[str]],
+        training_kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Re-evaluate only the flagged families on the masked panel and merge into state."""
+        logger.info(f"Running incremental re-evaluation ({len(state.active_indices)}/{len(state.feature_names)} "
+                   f"columns active, families={families})...")
+        results = rerun_function(state=state, families=families, **training_kwargs) or {}
+        
+        # Cache fold splits produced on the first incremental pass so later passes reuse them
+        if state.fold_splits is None and results.get('fold_splits') is not None:
+            state.fold_splits = results['fold_splits']
+        
+        # Families not re-evaluated keep their previous importance (already pruned by exclude())
+        active = set(state.active_feature_names)
+        for family, importances in (results.get('family_importance') or {}).items():
+            state.family_importance[family] = {
+                f: imp for f, imp in importances.items() if f in active
+            }
+        
+        merged = dict(state.run_metadata)
+        merged.update(results)
+        merged.setdefault('symbols', state.symbols)
+        return merged
+    
     @staticmethod
     def list_backups(target_name: Optional[str] = None, backup_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
         """
@@ -1433,11 +1643,16 @@ def auto_fix_leakage(
     target_column: str,
     max_iterations: int = 5,
     min_confidence: float = 0.7,
+    rerun_function=None,
+    incremental: Optional[bool] = None,
     **training_kwargs
 ) -> Dict[str, Any]:
     """
     Convenience function to run auto-fix loop.
     
+    Pass ``rerun_function`` to warm-start later iterations (see
+    ``LeakageAutoFixer.run_auto_fix_loop``); ``incremental`` then defaults to True.
+    
     Example:
         def my_training():
             # ... run training ...
@@ -1456,6 +1671,8 @@ def auto_fix_leakage(
         max_iterations=max_iterations,
         min_confidence=min_confidence,
         target_column=target_column,
+        incremental=True if incremental is None and rerun_function is not None else incremental,
+        rerun_function=rerun_function,
         **training_kwargs
     )
 
@@ -20,12 +20,18 @@ Leakage Sentinels
 
 Automated tests to detect data leakage in models.
 These tests catch leakage that might slip through structural rules.
+
+LeakageSentinel.run_batch runs all sentinels as one job on an already-built
+training matrix: shifted and time-permuted labels are extra label columns,
+the base sample and symbol holdout are row index arrays into X, and the
+independent fits run concurrently under the process thread budget.
 """
 
 import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, Any, Optional, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional, Sequence, Tuple, List
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -56,7 +62,8 @@ class LeakageSentinel:
         shifted_target_threshold: Optional[float] = None,  # Load from config if None
         symbol_holdout_train_threshold: Optional[float] = None,  # Load from config if None
         symbol_holdout_test_threshold: Optional[float] = None,  # Load from config if None
-        randomized_time_threshold: Optional[float] = None  # Load from config if None
+        randomized_time_threshold: Optional[float] = None,  # Load from config if None
+        n_jobs: Optional[int] = None  # Load from config if None
     ):
         """
         Initialize leakage sentinel with thresholds.
@@ -66,6 +73,7 @@ class LeakageSentinel:
             symbol_holdout_train_threshold: If train score > this, flag for investigation (loads from config if None)
             symbol_holdout_test_threshold: If test score < this (with high train), flag as leaky (loads from config if None)
             randomized_time_threshold: If model score > this on time-shuffled data, flag as leaky (loads from config if None)
+            n_jobs: Worker threads for run_batch (loads from config if None; None = process thread budget)
         """
         # Load thresholds from config if not provided
         try:
@@ -84,6 +92,8 @@ class LeakageSentinel:
                 symbol_holdout_test_threshold = float(sentinel_cfg.get('symbol_holdout_test_threshold', 0.3))
             if randomized_time_threshold is None:
                 randomized_time_threshold = float(sentinel_cfg.get('randomized_time_threshold', 0.5))
+            if n_jobs is None:
+                n_jobs = sentinel_cfg.get('n_jobs')
         except Exception:
             # Fallback to defaults
             if shifted_target_threshold is None:
@@ -99,6 +109,103 @@ class LeakageSentinel:
         self.symbol_holdout_train_threshold = symbol_holdout_train_threshold
         self.symbol_holdout_test_threshold = symbol_holdout_test_threshold
         self.randomized_time_threshold = randomized_time_threshold
+        self.n_jobs = n_jobs
+    
+    def _shuffle_seed(self) -> int:
+        """Deterministic seed for the randomized-time shuffle (from the determinism system)."""
+        try:
+            from TRAINING.common.determinism import BASE_SEED, stable_seed_from
+            # Generate seed based on target name if available
+            if hasattr(self, 'target_name') and self.target_name:
+                return stable_seed_from(['leakage_sentinel', self.target_name, 'shuffle'])
+            return BASE_SEED if BASE_SEED is not None else 42  # FALLBACK_DEFAULT_OK
+        except Exception:
+            return 42  # FALLBACK_DEFAULT_OK
+    
+    def _shifted_target_result(self, score: float, horizon: int, n_samples: int) -> SentinelResult:
+        # Check if score is suspiciously high
+        passed = score <= self.shifted_target_threshold
+        
+        warning = None
+        if not passed:
+            warning = (
+                f"🚨 LEAKAGE ALERT: Model performs well on shifted target "
+                f"(score={score:.3f} > threshold={self.shifted_target_threshold}). "
+                f"Features may look into future."
+            )
+        
+        return SentinelResult(
+            test_name="shifted_target",
+            passed=passed,
+            score=float(score),
+            threshold=self.shifted_target_threshold,
+            warning=warning,
+            details={
+                'horizon': horizon,
+                'n_samples': n_samples
+            }
+        )
+    
+    def _symbol_holdout_result(
+        self,
+        train_score: float,
+        test_score: float,
+        train_symbols: List[str] = None,
+        test_symbols: List[str] = None
+    ) -> SentinelResult:
+        # Check for suspicious gap
+        high_train = train_score > self.symbol_holdout_train_threshold
+        low_test = test_score < self.symbol_holdout_test_threshold
+        passed = not (high_train and low_test)
+        
+        warning = None
+        if not passed:
+            symbol_info = ""
+            if train_symbols and test_symbols:
+                symbol_info = f" (train: {train_symbols[:3]}, test: {test_symbols[:3]})"
+            warning = (
+                f"🚨 LEAKAGE ALERT: Large train/test gap "
+                f"(train={train_score:.3f}, test={test_score:.3f}){symbol_info}. "
+                f"Possible symbol-specific leakage."
+            )
+        
+        return SentinelResult(
+            test_name="symbol_holdout",
+            passed=passed,
+            score=float(test_score),
+            threshold=self.symbol_holdout_test_threshold,
+            warning=warning,
+            details={
+                'train_score': float(train_score),
+                'test_score': float(test_score),
+                'gap': float(train_score - test_score),
+                'train_symbols': train_symbols,
+                'test_symbols': test_symbols
+            }
+        )
+    
+    def _randomized_time_result(self, score: float, n_samples: int) -> SentinelResult:
+        # Check if score is suspiciously high (should be random)
+        passed = score <= self.randomized_time_threshold
+        
+        warning = None
+        if not passed:
+            warning = (
+                f"🚨 LEAKAGE ALERT: Model performs well on time-shuffled data "
+                f"(score={score:.3f} > threshold={self.randomized_time_threshold}). "
+                f"Features may encode future info or label proxies."
+            )
+        
+        return SentinelResult(
+            test_name="randomized_time",
+            passed=passed,
+            score=float(score),
+            threshold=self.randomized_time_threshold,
+            warning=warning,
+            details={
+                'n_samples': n_samples
+            }
+        )
     
     def shifted_target_test(
         self,
@@ -159,28 +266,7 @@ class LeakageSentinel:
                     from sklearn.metrics import r2_score
                     score_shifted = r2_score(y_shifted_valid, preds)
             
-            # Check if score is suspiciously high
-            passed = score_shifted <= self.shifted_target_threshold
-            
-            warning = None
-            if not passed:
-                warning = (
-                    f"🚨 LEAKAGE ALERT: Model performs well on shifted target "
-                    f"(score={score_shifted:.3f} > threshold={self.shifted_target_threshold}). "
-                    f"Features may look into future."
-                )
-            
-            return SentinelResult(
-                test_name="shifted_target",
-                passed=passed,
-                score=float(score_shifted),
-                threshold=self.shifted_target_threshold,
-                warning=warning,
-                details={
-                    'horizon': horizon,
-                    'n_samples': len(y_shifted_valid)
-                }
-            )
+            return self._shifted_target_result(score_shifted, horizon, len(y_shifted_valid))
         
         except Exception as e:
             logger.warning(f"Shifted target test failed: {e}")
@@ -253,36 +339,7 @@ class LeakageSentinel:
                     from sklearn.metrics import r2_score
                     test_score = r2_score(y_test, preds_test)
             
-            # Check for suspicious gap
-            high_train = train_score > self.symbol_holdout_train_threshold
-            low_test = test_score < self.symbol_holdout_test_threshold
-            passed = not (high_train and low_test)
-            
-            warning = None
-            if not passed:
-                symbol_info = ""
-                if train_symbols and test_symbols:
-                    symbol_info = f" (train: {train_symbols[:3]}, test: {test_symbols[:3]})"
-                warning = (
-                    f"🚨 LEAKAGE ALERT: Large train/test gap "
-                    f"(train={train_score:.3f}, test={test_score:.3f}){symbol_info}. "
-                    f"Possible symbol-specific leakage."
-                )
-            
-            return SentinelResult(
-                test_name="symbol_holdout",
-                passed=passed,
-                score=float(test_score),
-                threshold=self.symbol_holdout_test_threshold,
-                warning=warning,
-                details={
-                    'train_score': float(train_score),
-                    'test_score': float(test_score),
-                    'gap': float(train_score - test_score),
-                    'train_symbols': train_symbols,
-                    'test_symbols': test_symbols
-                }
-            )
+            return self._symbol_holdout_result(train_score, test_score, train_symbols, test_symbols)
         
         except Exception as e:
             logger.warning(f"Symbol holdout test failed: {e}")
@@ -320,17 +377,7 @@ class LeakageSentinel:
         try:
             # Shuffle time index but keep feature-target pairs
             indices = np.arange(len(X))
-            # Use deterministic seed from determinism system
-            try:
-                from TRAINING.common.determinism import BASE_SEED, stable_seed_from
-                # Generate seed based on target name if available
-                if hasattr(self, 'target_name') and self.target_name:
-                    shuffle_seed = stable_seed_from(['leakage_sentinel', self.target_name, 'shuffle'])
-                else:
-                    shuffle_seed = BASE_SEED if BASE_SEED is not None else 42  # FALLBACK_DEFAULT_OK
-            except:
-                shuffle_seed = 42  # FALLBACK_DEFAULT_OK
-            np.random.seed(shuffle_seed)
+            np.random.seed(self._shuffle_seed())
             np.random.shuffle(indices)
             
             X_shuffled = X[indices]
@@ -352,27 +399,7 @@ class LeakageSentinel:
                     from sklearn.metrics import r2_score
                     score_shuffled = r2_score(y_shuffled, preds)
             
-            # Check if score is suspiciously high (should be random)
-            passed = score_shuffled <= self.randomized_time_threshold
-            
-            warning = None
-            if not passed:
-                warning = (
-                    f"🚨 LEAKAGE ALERT: Model performs well on time-shuffled data "
-                    f"(score={score_shuffled:.3f} > threshold={self.randomized_time_threshold}). "
-                    f"Features may encode future info or label proxies."
-                )
-            
-            return SentinelResult(
-                test_name="randomized_time",
-                passed=passed,
-                score=float(score_shuffled),
-                threshold=self.randomized_time_threshold,
-                warning=warning,
-                details={
-                    'n_samples': len(X)
-                }
-            )
+            return self._randomized_time_result(score_shuffled, len(X))
         
         except Exception as e:
             logger.warning(f"Randomized time test failed: {e}")
@@ -453,3 +480,187 @@ class LeakageSentinel:
         
         return results
 
+    
+    def run_batch(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        model_factory: Callable[[str], Any],
+        horizon: int = None,
+        rows: Optional[Sequence[int]] = None,
+        holdout: Optional[Tuple[Sequence[int], Sequence[int]]] = None,
+        columns: Optional[Sequence[int]] = None,
+        train_symbols: List[str] = None,
+        test_symbols: List[str] = None,
+        model: Any = None,
+        scorer: Optional[Callable[[np.ndarray, np.ndarray], float]] = None,
+        enabled_tests: List[str] = None,
+        n_jobs: Optional[int] = None
+    ) -> List[SentinelResult]:
+        """
+        Run the enabled sentinels as one batch job on the built training matrix.
+        
+        X is never rebuilt per test. The base model is fit on X[rows] and predicted
+        once; the shifted-target and randomized-time tests score that prediction
+        against extra label columns (y rolled by horizon in matrix row order, and
+        y[rows] under one seeded permutation, which breaks every feature/target
+        pair). The symbol-holdout model is fit on the train index array and scored
+        on both. The base and holdout fits are independent and run concurrently,
+        each single-threaded (BLAS/OpenMP).
+        
+        Args:
+            X: Training matrix (n_samples, n_features), rows in time order
+            y: Target array
+            model_factory: model_factory(name) -> unfitted estimator, for "base" and "symbol_holdout"
+            horizon: Target horizon in bars (shifted-target test skipped if None)
+            rows: Row indices of the base sample (default: all rows)
+            holdout: (train_idx, test_idx) row indices of a symbol holdout split
+            columns: Column positions of X to use (default: all); gathered together
+                with the rows of each fit/predict, so X is never copied whole
+            train_symbols: Training symbols (for logging)
+            test_symbols: Test symbols (for logging)
+            model: Already-fitted base model (skips the base fit)
+            scorer: scorer(y_true, y_pred) -> float (default: what estimator.score returns)
+            enabled_tests: List of test names to run (default: all)
+            n_jobs: Worker threads (default: self.n_jobs, else the process thread budget)
+        
+        Returns:
+            List of SentinelResult objects, in run_all_tests order
+        """
+        from TRAINING.common.permutation_importance import default_scorer
+        from TRAINING.common.threads import effective_threads
+        
+        if enabled_tests is None:
+            enabled_tests = ['shifted_target', 'symbol_holdout', 'randomized_time']
+        run_shifted = 'shifted_target' in enabled_tests and horizon is not None
+        run_randomized = 'randomized_time' in enabled_tests
+        run_holdout = 'symbol_holdout' in enabled_tests and holdout is not None
+        if 'symbol_holdout' in enabled_tests and holdout is None:
+            logger.debug("Symbol holdout test skipped: holdout indices not provided")
+        
+        X = np.asarray(X)
+        y = np.asarray(y)
+        rows = np.arange(len(y)) if rows is None else np.sort(np.asarray(rows, dtype=np.int64))
+        all_rows = len(rows) == len(y)
+        if columns is not None:
+            columns = np.asarray(columns, dtype=np.int64)
+        
+        def take(idx):
+            if columns is None:
+                return X if idx is None else X[idx]
+            return X[:, columns] if idx is None else X[np.ix_(idx, columns)]
+        
+        # Independent fits: name -> (fit rows, predict rows...); None = the whole matrix
+        jobs: Dict[str, Tuple[Optional[np.ndarray], List[Optional[np.ndarray]]]] = {}
+        if run_shifted or run_randomized:
+            base_rows = None if all_rows else rows
+            jobs['base'] = (base_rows, [base_rows])
+        if run_holdout:
+            train_idx, test_idx = (np.asarray(idx, dtype=np.int64) for idx in holdout)
+            jobs['symbol_holdout'] = (train_idx, [train_idx, test_idx])
+        
+        def fit_predict(name):
+            fit_rows, predict_rows = jobs[name]
+            try:
+                if name == 'base' and model is not None:
+                    est = model
+                else:
+                    est = model_factory(name)
+                    est.fit(take(fit_rows), y if fit_rows is None else y[fit_rows])
+                return est, [est.predict(take(idx)) for idx in predict_rows]
+            except Exception as e:
+                return e
+        
+        workers = max(1, min(effective_threads(n_jobs or self.n_jobs), len(jobs)))
+        if workers == 1:
+            outcomes = {name: fit_predict(name) for name in jobs}
+        else:
+            # Workers share the thread budget: keep each fit single-threaded (OpenMP/BLAS)
+            from threadpoolctl import threadpool_limits
+            with threadpool_limits(limits=1), ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = dict(zip(jobs, pool.map(fit_predict, jobs)))
+        
+        results = []
+        base = outcomes.get('base')
+        
+        # Shifted-target test: prediction vs. y rolled by horizon, on rows whose shifted label is valid
+        if run_shifted:
+            try:
+                if isinstance(base, Exception):
+                    raise base
+                est, (pred,) = base
+                y_shifted = np.roll(y, horizon)
+                valid = rows >= horizon
+                if not valid.any():
+                    result = SentinelResult(
+                        test_name="shifted_target",
+                        passed=True,
+                        score=0.0,
+                        threshold=self.shifted_target_threshold,
+                        warning="Insufficient data for shifted target test"
+                    )
+                else:
+                    score = (scorer or default_scorer(est))(y_shifted[rows[valid]], pred[valid])
+                    result = self._shifted_target_result(score, horizon, int(valid.sum()))
+            except Exception as e:
+                logger.warning(f"Shifted target test failed: {e}")
+                result = SentinelResult(
+                    test_name="shifted_target",
+                    passed=True,  # Pass on error (don't block)
+                    score=0.0,
+                    threshold=self.shifted_target_threshold,
+                    warning=f"Test failed: {e}"
+                )
+            results.append(result)
+            if result.warning:
+                logger.warning(result.warning)
+        
+        # Symbol-holdout test: separate fit on the train symbols' rows
+        if run_holdout:
+            try:
+                holdout_outcome = outcomes['symbol_holdout']
+                if isinstance(holdout_outcome, Exception):
+                    raise holdout_outcome
+                est, (pred_train, pred_test) = holdout_outcome
+                score_fn = scorer or default_scorer(est)
+                result = self._symbol_holdout_result(
+                    score_fn(y[train_idx], pred_train), score_fn(y[test_idx], pred_test),
+                    train_symbols, test_symbols
+                )
+            except Exception as e:
+                logger.warning(f"Symbol holdout test failed: {e}")
+                result = SentinelResult(
+                    test_name="symbol_holdout",
+                    passed=True,  # Pass on error
+                    score=0.0,
+                    threshold=self.symbol_holdout_test_threshold,
+                    warning=f"Test failed: {e}"
+                )
+            results.append(result)
+            if result.warning:
+                logger.warning(result.warning)
+        
+        # Randomized-time test: prediction vs. y[rows] under one seeded row permutation
+        if run_randomized:
+            try:
+                if isinstance(base, Exception):
+                    raise base
+                est, (pred,) = base
+                perm = np.random.RandomState(self._shuffle_seed()).permutation(len(rows))
+                score = (scorer or default_scorer(est))(y[rows][perm], pred)
+                result = self._randomized_time_result(score, len(rows))
+            except Exception as e:
+                logger.warning(f"Randomized time test failed: {e}")
+                result = SentinelResult(
+                    test_name="randomized_time",
+                    passed=True,  # Pass on error
+                    score=0.0,
+                    threshold=self.randomized_time_threshold,
+                    warning=f"Test failed: {e}"
+                )
+            results.append(result)
+            if result.warning:
+                logger.warning(result.warning)
+        
+        logger.debug(f"Leakage sentinels: {len(results)} tests from {len(jobs)} fits (workers={workers})")
+        return results
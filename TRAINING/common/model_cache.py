@@ -0,0 +1,265 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Content-Addressed Model Cache
+
+Reruns of train_models_for_interval_comprehensive after changing one target or one
+family's config should only retrain what changed. A trained (target, family) model is
+stored under a key derived from everything that determines it:
+
+- data: fingerprint of X, y and the feature list (the panel after row filtering/capping)
+- family, strategy, routed trainer config (objective, weights/groups fingerprints)
+- the family's resolved model config (load_model_config)
+- the global seed (TRAINING.common.determinism.BASE_SEED)
+- library versions (numpy, sklearn, lightgbm, xgboost, torch, tensorflow, ngboost)
+
+Layout: {cache_dir}/{key[:2]}/{key}/{model.joblib, meta.json}. Entries are written
+atomically (temp dir + rename) and evicted by age and total size (least recently
+used first). The cache is opt-in: enable it with pipeline.model_cache.enabled=true,
+--model-cache or TRAINER_MODEL_CACHE=1 (--no-model-cache / TRAINER_NO_MODEL_CACHE=1
+always wins). Entries default to <repo>/.cache/model_cache with a 5 GB budget.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Add CONFIG directory to path for centralized config loading
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_CONFIG_DIR = _REPO_ROOT / "CONFIG"
+if str(_CONFIG_DIR) not in sys.path:
+    sys.path.insert(0, str(_CONFIG_DIR))
+
+_CONFIG_AVAILABLE = False
+try:
+    from config_loader import get_cfg
+    _CONFIG_AVAILABLE = True
+except ImportError:
+    logger.debug("Config loader not available; using default model cache settings")
+
+# Distributions whose version can change a trained model
+VERSIONED_PACKAGES = ("numpy", "scikit-learn", "lightgbm", "xgboost", "torch", "tensorflow", "ngboost")
+
+# Sequences longer than this are hashed instead of embedded in the key payload
+_INLINE_SEQUENCE_LIMIT = 64  # DESIGN_CONSTANT_OK
+
+
+def _get_config() -> Dict[str, Any]:
+    cfg = {
+        "enabled": False,
+        "cache_dir": None,
+        "max_gb": 5.0,  # FALLBACK_DEFAULT_OK
+        "max_age_days": 30,  # FALLBACK_DEFAULT_OK
+    }
+    if _CONFIG_AVAILABLE:
+        try:
+            section = get_cfg("pipeline.model_cache", default={}, config_name="pipeline_config") or {}
+            cfg.update({k: v for k, v in section.items() if k in cfg})
+        except Exception as e:
+            logger.debug(f"Failed to load model cache config: {e}")
+    return cfg
+
+
+def model_cache_enabled(override: Optional[bool] = None) -> bool:
+    """Explicit override > TRAINER_NO_MODEL_CACHE / TRAINER_MODEL_CACHE env > pipeline.model_cache.enabled."""
+    if override is not None:
+        return bool(override)
+    if os.getenv("TRAINER_NO_MODEL_CACHE", "0") in ("1", "true", "True"):
+        return False
+    if os.getenv("TRAINER_MODEL_CACHE", "0") in ("1", "true", "True"):
+        return True
+    return bool(_get_config()["enabled"])
+
+
+def library_versions() -> Dict[str, str]:
+    """Installed versions of VERSIONED_PACKAGES (metadata only, nothing is imported)."""
+    from importlib import metadata
+    versions = {}
+    for dist in VERSIONED_PACKAGES:
+        try:
+            versions[dist] = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            versions[dist] = "missing"
+    return versions
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-stable form of a config value; large arrays/lists become content hashes."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, np.ndarray) or (isinstance(value, (list, tuple)) and len(value) > _INLINE_SEQUENCE_LIMIT):
+        from TRAINING.common.preprocess_cache import array_fingerprint
+        try:
+            return {"__array__": array_fingerprint(np.asarray(value))}
+        except Exception:
+            pass
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def data_fingerprint(X: np.ndarray, y: np.ndarray, feature_names: Optional[Sequence[str]]) -> str:
+    """Fingerprint of the training panel: X, y and the feature list."""
+    from TRAINING.common.preprocess_cache import array_fingerprint
+    names = list(feature_names) if feature_names is not None else None
+    blob = json.dumps([array_fingerprint(X), array_fingerprint(y), names], default=str)
+    return hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+
+
+def resolved_family_config(family: str) -> Dict[str, Any]:
+    """The family's model config as its trainer will load it (empty if unavailable)."""
+    try:
+        from config_loader import load_model_config
+        return load_model_config(family) or {}
+    except Exception as e:
+        logger.debug(f"Could not resolve model config for {family}: {e}")
+        return {}
+
+
+class ModelCache:
+    """On-disk cache of trained models and their metrics."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_gb: Optional[float] = None,
+                 max_age_days: Optional[float] = None):
+        cfg = _get_config()
+        default_dir = _REPO_ROOT / ".cache" / "model_cache"
+        self.cache_dir = Path(cache_dir or os.getenv("MODEL_CACHE_DIR") or cfg["cache_dir"] or default_dir)
+        self.max_bytes = float(cfg["max_gb"] if max_gb is None else max_gb) * 1e9
+        self.max_age_s = float(cfg["max_age_days"] if max_age_days is None else max_age_days) * 86400.0
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0}
+
+    def key(self, family: str, data_fp: str, strategy: str, trainer_config: Dict[str, Any],
+            family_config: Optional[Dict[str, Any]] = None) -> str:
+        from TRAINING.common.determinism import BASE_SEED
+        payload = {
+            "family": family,
+            "data": data_fp,
+            "strategy": strategy,
+            "trainer_config": _canonical(trainer_config),
+            "family_config": _canonical(family_config if family_config is not None else resolved_family_config(family)),
+            "seed": BASE_SEED,
+            "versions": library_versions(),
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.blake2b(blob.encode(), digest_size=20).hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """(model, metrics) for key, or None on a miss/expired/corrupt entry."""
+        import joblib
+
+        entry = self._entry_dir(key)
+        meta_path = entry / "meta.json"
+        if not meta_path.exists():
+            self.stats["misses"] += 1
+            return None
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if self.max_age_s > 0 and time.time() - float(meta.get("created_at", 0)) > self.max_age_s:
+                shutil.rmtree(entry, ignore_errors=True)
+                self.stats["misses"] += 1
+                return None
+            model = joblib.load(entry / "model.joblib")
+            os.utime(meta_path)  # LRU signal for eviction
+        except Exception as e:
+            logger.warning(f"Discarding unreadable model cache entry {key}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return model, meta.get("metrics", {})
+
+    def put(self, key: str, model: Any, metrics: Optional[Dict[str, Any]] = None,
+            info: Optional[Dict[str, Any]] = None) -> bool:
+        """Store a trained model; returns False (and caches nothing) if it cannot be pickled."""
+        import joblib
+
+        entry = self._entry_dir(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=entry.parent))
+        try:
+            joblib.dump(model, tmp / "model.joblib")
+            meta = {
+                "key": key,
+                "created_at": time.time(),
+                "metrics": _canonical(metrics or {}),
+                "info": _canonical(info or {}),
+                "size_bytes": (tmp / "model.joblib").stat().st_size,
+            }
+            with open(tmp / "meta.json", "w") as f:
+                json.dump(meta, f, indent=2)
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        except Exception as e:
+            logger.warning(f"Model not cached ({(info or {}).get('family', '?')}): {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        self.stats["stores"] += 1
+        self.evict()
+        return True
+
+    def evict(self):
+        """Drop entries older than max_age_days, then least recently used ones beyond max_gb."""
+        if not self.cache_dir.exists():
+            return
+        now = time.time()
+        entries = []
+        for meta_path in self.cache_dir.glob("*/*/meta.json"):
+            try:
+                st = meta_path.stat()
+                size = sum(p.stat().st_size for p in meta_path.parent.iterdir())
+            except OSError:
+                continue
+            entries.append((st.st_mtime, size, meta_path.parent))
+
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, entry in sorted(entries):
+            expired = self.max_age_s > 0 and now - mtime > self.max_age_s
+            over_budget = self.max_bytes > 0 and total > self.max_bytes
+            if not (expired or over_budget):
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            self.stats["evicted"] += 1
+            logger.debug(f"Evicted cached model {entry.name}")
+
+
+def get_model_cache(override: Optional[bool] = None) -> Optional[ModelCache]:
+    """A ModelCache, or None when caching is disabled."""
+    if not model_cache_enabled(override):
+        return None
+    return ModelCache()
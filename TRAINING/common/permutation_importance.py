@@ -0,0 +1,186 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Batched Permutation Importance
+
+sklearn's permutation_importance copies X for every (feature, repeat) and calls
+predict once per copy. This engine instead:
+
+- scores the unpermuted baseline once
+- keeps one working buffer per worker holding `batch` stacked copies of X; block k
+  gets one (feature, repeat) column permuted in place, and is restored after the
+  batch, so X is never copied per feature
+- predicts all blocks of a batch in a single model call
+- spreads batches over a thread pool sized by TRAINING.common.threads, capped so
+  that all workers' buffers together stay within batch_max_mb (a single worker with
+  one copy of X when X alone exceeds it)
+
+Permutations are seeded per (random_state, feature, repeat), so results do not
+depend on batch size or worker count. Scores come from a `scorer(y, y_pred)`
+callable (default: R² for regressors, accuracy for classifiers, i.e. what
+estimator.score returns); importance = baseline - permuted score.
+"""
+
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Add CONFIG directory to path for centralized config loading
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_CONFIG_DIR = _REPO_ROOT / "CONFIG"
+if str(_CONFIG_DIR) not in sys.path:
+    sys.path.insert(0, str(_CONFIG_DIR))
+
+_CONFIG_AVAILABLE = False
+try:
+    from config_loader import get_cfg
+    _CONFIG_AVAILABLE = True
+except ImportError:
+    logger.debug("Config loader not available; using default permutation importance settings")
+
+
+def _get_config() -> dict:
+    cfg = {
+        "batch_max_mb": 256,  # FALLBACK_DEFAULT_OK
+        "n_jobs": None,
+    }
+    if _CONFIG_AVAILABLE:
+        try:
+            section = get_cfg("preprocessing.multi_model_feature_selection.permutation",
+                              default={}, config_name="preprocessing_config") or {}
+            cfg.update({k: v for k, v in section.items() if k in cfg})
+        except Exception as e:
+            logger.debug(f"Failed to load permutation importance config: {e}")
+    return cfg
+
+
+@dataclass
+class PermutationImportanceResult:
+    """Same fields as sklearn's permutation_importance Bunch, plus the baseline score."""
+    importances: np.ndarray        # (n_features, n_repeats); NaN for features not evaluated
+    importances_mean: np.ndarray
+    importances_std: np.ndarray
+    baseline_score: float
+
+
+def default_scorer(model) -> Callable[[np.ndarray, np.ndarray], float]:
+    """Scorer matching estimator.score: accuracy for classifiers, R² otherwise."""
+    from sklearn.base import is_classifier
+    from sklearn.metrics import accuracy_score, r2_score
+    return accuracy_score if is_classifier(model) else r2_score
+
+
+def _permutation(random_state: int, feature: int, repeat: int, n: int) -> np.ndarray:
+    return np.random.default_rng([int(random_state), int(feature), int(repeat)]).permutation(n)
+
+
+def batched_permutation_importance(
+    model,
+    X: np.ndarray,
+    y: np.ndarray,
+    n_repeats: int = 5,
+    random_state: int = 0,
+    features: Optional[Sequence[int]] = None,
+    scorer: Optional[Callable[[np.ndarray, np.ndarray], float]] = None,
+    batch_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+) -> PermutationImportanceResult:
+    """
+    Permutation importance with one baseline and batched, in-place permutations.
+
+    Args:
+        model: Fitted estimator with predict()
+        X: Feature matrix (n_samples, n_features)
+        y: Targets
+        n_repeats: Permutations per feature
+        random_state: Base seed
+        features: Column indices to evaluate (default: all)
+        scorer: scorer(y_true, y_pred) -> float, higher is better (default: see default_scorer)
+        batch_size: Permuted copies of X per predict call (default: from batch_max_mb)
+        n_jobs: Worker threads (default: config, else the process thread budget)
+    """
+    from TRAINING.common.threads import effective_threads
+
+    X = np.asarray(X)
+    if not np.issubdtype(X.dtype, np.floating):
+        X = X.astype(np.float64)
+    y = np.asarray(y)
+    n, p = X.shape
+    scorer = scorer or default_scorer(model)
+    features = list(range(p)) if features is None else [int(j) for j in features]
+
+    baseline = float(scorer(y, model.predict(X)))
+    tasks: List[Tuple[int, int]] = [(j, r) for j in features for r in range(n_repeats)]
+
+    cfg = _get_config()
+    workers = effective_threads(n_jobs or cfg["n_jobs"])
+    budget = float(cfg["batch_max_mb"]) * 2**20
+    if batch_size is None:
+        batch_size = int(budget / max(workers, 1) // max(X.nbytes, 1))
+    batch_size = max(1, min(int(batch_size), len(tasks)))
+    batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+    # Every worker holds batch_size copies of X: fewer workers rather than more copies
+    buffers_in_budget = int(budget // max(batch_size * X.nbytes, 1))
+    workers = max(1, min(workers, len(batches), buffers_in_budget))
+
+    importances = np.full((p, n_repeats), np.nan)
+
+    def run(worker_batches):
+        from sklearn import config_context
+
+        # One working buffer per worker: `batch_size` stacked copies of X
+        buf = np.tile(X, (batch_size, 1))
+        # Permuted blocks only rearrange values of X, which the baseline predict validated;
+        # skip sklearn's per-call finiteness scan over the whole buffer (thread-local setting)
+        with config_context(assume_finite=True):
+            for batch in worker_batches:
+                for k, (j, r) in enumerate(batch):
+                    buf[k * n:(k + 1) * n, j] = X[_permutation(random_state, j, r, n), j]
+                pred = model.predict(buf[:len(batch) * n])
+                for k, (j, r) in enumerate(batch):
+                    importances[j, r] = baseline - float(scorer(y, pred[k * n:(k + 1) * n]))
+                    buf[k * n:(k + 1) * n, j] = X[:, j]  # restore
+
+    if workers == 1:
+        run(batches)
+    else:
+        # Workers share the thread budget: keep each predict single-threaded (OpenMP/BLAS)
+        from threadpoolctl import threadpool_limits
+        with threadpool_limits(limits=1), ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, [batches[w::workers] for w in range(workers)]))
+
+    evaluated = importances[features]
+    mean = np.zeros(p)
+    std = np.zeros(p)
+    mean[features] = evaluated.mean(axis=1)
+    std[features] = evaluated.std(axis=1)
+    logger.debug(f"Permutation importance: {len(features)} features x {n_repeats} repeats, "
+                 f"{len(batches)} predict calls (batch={batch_size}, workers={workers})")
+    return PermutationImportanceResult(
+        importances=importances,
+        importances_mean=mean,
+        importances_std=std,
+        baseline_score=baseline,
+    )
@@ -0,0 +1,237 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Shared Preprocessing Cache
+
+BaseModelTrainer.preprocess_data fits the same column mask and imputer on the same
+(X, y) for every family trained on a target. This cache computes the train-mode
+result once per process, keyed by a content fingerprint of X and y plus the
+imputation strategy, and hands every trainer the same read-only arrays. Each trainer
+still gets its own colmask / fitted imputer copy, so predict() and saved models are
+unchanged.
+
+The fingerprint hashes the raw bytes of X and y (blake2b, in row chunks, so
+non-contiguous inputs are fine); hashing is a single streaming pass and far cheaper
+than the per-column median fit it replaces.
+"""
+
+import copy
+import hashlib
+import logging
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Add CONFIG directory to path for centralized config loading
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_CONFIG_DIR = _REPO_ROOT / "CONFIG"
+if str(_CONFIG_DIR) not in sys.path:
+    sys.path.insert(0, str(_CONFIG_DIR))
+
+_CONFIG_AVAILABLE = False
+try:
+    from config_loader import get_cfg
+    _CONFIG_AVAILABLE = True
+except ImportError:
+    logger.debug("Config loader not available; using default preprocessing cache settings")
+
+# Rows hashed per update call (bounds the temporary contiguous copy for strided inputs)
+_HASH_CHUNK_BYTES = 64 << 20  # DESIGN_CONSTANT_OK
+
+
+@dataclass(frozen=True)
+class PreprocessedData:
+    """Train-mode preprocessing result shared across trainers (arrays are read-only)."""
+    X: np.ndarray          # float32 (n_finite_rows, n_kept_cols), imputed + guarded
+    y: np.ndarray          # float64 (n_finite_rows,), guarded
+    colmask: np.ndarray    # bool (n_input_cols,)
+    imputer: object        # fitted SimpleImputer
+
+    @property
+    def nbytes(self) -> int:
+        return self.X.nbytes + self.y.nbytes
+
+
+def _get_cache_config() -> Tuple[bool, int]:
+    enabled, max_entries = True, 1  # FALLBACK_DEFAULT_OK
+    if _CONFIG_AVAILABLE:
+        try:
+            enabled = bool(get_cfg("preprocessing.cache.enabled", default=True, config_name="preprocessing_config"))
+            max_entries = int(get_cfg("preprocessing.cache.max_entries", default=1, config_name="preprocessing_config"))
+        except Exception as e:
+            logger.debug(f"Failed to load preprocessing cache config: {e}")
+    return enabled, max(0, max_entries)
+
+
+# Fingerprints of read-only arrays that own their data (e.g. cached preprocessing
+# output) cannot go stale, so they are memoized by identity while the array lives
+_FROZEN_FINGERPRINTS = {}
+
+
+def array_fingerprint(a: np.ndarray) -> str:
+    """Content fingerprint of an array (dtype, shape and raw values)."""
+    a = np.asarray(a)
+    frozen = not a.flags.writeable and a.flags.owndata
+    if frozen:
+        hit = _FROZEN_FINGERPRINTS.get(id(a))
+        if hit is not None and hit[0]() is a:
+            return hit[1]
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{a.dtype.str}|{a.shape}".encode())
+    if a.size:
+        flat = a.reshape(a.shape[0], -1) if a.ndim > 1 else a.reshape(-1, 1)
+        rows = max(1, _HASH_CHUNK_BYTES // max(1, flat.shape[1] * a.itemsize))
+        for start in range(0, flat.shape[0], rows):
+            h.update(memoryview(np.ascontiguousarray(flat[start:start + rows])).cast("B"))
+    fingerprint = h.hexdigest()
+
+    if frozen:
+        key = id(a)
+        _FROZEN_FINGERPRINTS[key] = (weakref.ref(a, lambda _ref, key=key: _FROZEN_FINGERPRINTS.pop(key, None)), fingerprint)
+    return fingerprint
+
+
+class PreprocessCache:
+    """Process-level LRU of train-mode preprocessing results."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._entries: "OrderedDict[tuple, PreprocessedData]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _limit(self) -> int:
+        return self._max_entries if self._max_entries is not None else _get_cache_config()[1]
+
+    def get_or_compute(self, X: np.ndarray, y: np.ndarray, strategy: str) -> PreprocessedData:
+        """
+        Return the shared preprocessing result for (X, y, strategy), computing it on a miss.
+
+        The lock is held while computing, so concurrent trainers on the same target
+        wait for the first fit instead of repeating it.
+        """
+        key = (array_fingerprint(X), array_fingerprint(y), strategy)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                logger.info("Preprocess cache hit: %d rows, %d cols (strategy=%s)",
+                            entry.X.shape[0], entry.X.shape[1], strategy)
+                return entry
+
+            self.misses += 1
+            entry = compute_preprocessing(X, y, strategy)
+            limit = self._limit()
+            if limit > 0:
+                self._entries[key] = entry
+                while len(self._entries) > limit:
+                    self._entries.popitem(last=False)
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def compute_preprocessing(X: np.ndarray, y: np.ndarray, strategy: str) -> PreprocessedData:
+    """Train-mode preprocessing: finite-y filter, all-NaN column drop, imputation, guards."""
+    from sklearn.impute import SimpleImputer
+    from TRAINING.common.safety import guard_features, guard_targets
+
+    # Cast to float32 for speed (2x memory reduction + faster BLAS)
+    # Use C-contiguous for optimal cache performance
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    y = np.asarray(y, dtype=np.float64).ravel()
+    mask = np.isfinite(y)
+    if not mask.any():
+        raise ValueError("No finite targets after filtering")
+    if not mask.all():
+        X, y = X[mask], y[mask]
+
+    # Drop all-NaN columns on TRAIN only
+    colmask = np.isfinite(X).any(axis=0)
+    if not colmask.any():
+        raise ValueError("All columns are NaN")
+    if not colmask.all():
+        X = X[:, colmask]
+
+    imputer = SimpleImputer(strategy=strategy)
+    X = imputer.fit_transform(X)
+
+    # Apply global safety guards
+    X = np.ascontiguousarray(guard_features(X), dtype=np.float32)
+    y = np.asarray(guard_targets(y))
+    # Own the buffers so freezing them below makes them truly immutable
+    if not X.flags.owndata:
+        X = X.copy()
+    if not y.flags.owndata:
+        y = y.copy()
+
+    X.setflags(write=False)
+    y.setflags(write=False)
+    colmask.setflags(write=False)
+    return PreprocessedData(X=X, y=y, colmask=colmask, imputer=imputer)
+
+
+_SHARED_CACHE: Optional[PreprocessCache] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_preprocess_cache() -> Optional[PreprocessCache]:
+    """The process-wide cache, or None when disabled in preprocessing config."""
+    global _SHARED_CACHE
+    enabled, _ = _get_cache_config()
+    if not enabled:
+        return None
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = PreprocessCache()
+        return _SHARED_CACHE
+
+
+def clear_preprocess_cache():
+    """Drop all cached preprocessing results (e.g. between targets to free memory)."""
+    if _SHARED_CACHE is not None:
+        _SHARED_CACHE.clear()
+
+
+def preprocess_train(X: np.ndarray, y: np.ndarray, strategy: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, object]:
+    """
+    Train-mode preprocessing through the shared cache.
+
+    Returns:
+        (X, y, colmask, imputer): X/y are shared read-only arrays; colmask and imputer
+        are private copies the caller may keep as trainer state.
+    """
+    cache = get_preprocess_cache()
+    entry = cache.get_or_compute(X, y, strategy) if cache is not None else compute_preprocessing(X, y, strategy)
+    return entry.X, entry.y, entry.colmask.copy(), copy.deepcopy(entry.imputer)
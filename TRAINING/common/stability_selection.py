@@ -0,0 +1,181 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Stability Selection Engine
+
+Bootstrap stability selection used to refit LassoCV/LogisticRegressionCV on a
+freshly resampled copy of X for every bootstrap, one after another. This engine:
+
+- fits the CV model once on the full panel (the pooled solution) to pick the
+  regularization strength
+- expresses each bootstrap as a sample-weight vector (multinomial resample
+  counts), so X is never fancy-indexed and rows keep their time order for the
+  purged CV splitter
+- fits each bootstrap at the pooled regularization, warm-started from the
+  pooled coefficients (refit_cv=True keeps a full CV search per bootstrap)
+- spreads bootstraps over a thread pool that shares X read-only; sklearn still
+  copies X inside each sample-weighted fit, so the pool is capped at the number
+  of those per-fit copies that fit the memory budget
+
+Bootstrap weights are seeded per (random_state, bootstrap), so frequencies do
+not depend on the worker count.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# float64 copies of X one sample-weighted fit can hold: Lasso validates X to
+# Fortran order, centers it and rescales it by sqrt(w); LogisticRegression only validates
+_X_COPIES_PER_FIT = {False: 3, True: 1}
+
+
+@dataclass
+class StabilitySelectionResult:
+    selection_frequency: np.ndarray  # (n_features,) selected count / n_bootstrap
+    n_bootstrap: int
+    n_success: int
+    regularization: Optional[float]  # pooled alpha (Lasso) or C (logistic); None if the pooled fit failed
+
+
+def bootstrap_weights(n: int, random_state: int, bootstrap: int) -> np.ndarray:
+    """Resample counts of a size-n bootstrap drawn with replacement, as float weights."""
+    rng = np.random.default_rng([int(random_state), int(bootstrap)])
+    return np.bincount(rng.integers(0, n, size=n), minlength=n).astype(np.float64)
+
+
+def _memory_workers(n_samples: int, n_features: int, classification: bool,
+                   max_memory_mb: Optional[float] = None) -> int:
+    """Bootstrap workers whose private copies of X fit in max_memory_mb (default: half the available RAM)."""
+    per_worker = _X_COPIES_PER_FIT[bool(classification)] * n_samples * n_features * 8
+    if max_memory_mb is None:
+        import psutil
+        budget = psutil.virtual_memory().available * 0.5
+    else:
+        budget = float(max_memory_mb) * 2**20
+    return max(1, int(budget // max(per_worker, 1)))
+
+
+def _selected(model, threshold: float) -> np.ndarray:
+    coef = model.coef_[0] if len(model.coef_.shape) > 1 else model.coef_
+    return np.abs(coef) > threshold
+
+
+def stability_selection(
+    X: np.ndarray,
+    y: np.ndarray,
+    classification: bool,
+    cv: Any,
+    n_bootstrap: int = 50,
+    random_state: int = 0,
+    Cs: int = 10,
+    max_iter: int = 1000,
+    cv_n_jobs: int = 1,
+    n_jobs: Optional[int] = None,
+    refit_cv: bool = False,
+    threshold: float = 1e-6,
+    max_memory_mb: Optional[float] = None,
+) -> StabilitySelectionResult:
+    """
+    Fraction of bootstraps in which each feature gets a non-zero coefficient.
+
+    Args:
+        X: Feature matrix (n_samples, n_features), shared read-only by all workers
+        y: Targets
+        classification: LogisticRegression(CV) if True, Lasso(CV) otherwise
+        cv: CV splitter for the pooled fit (and per-bootstrap fits when refit_cv)
+        n_bootstrap: Number of bootstraps
+        random_state: Seed for the estimators and the bootstrap weights
+        Cs: Number of C values for LogisticRegressionCV
+        max_iter: Solver iterations
+        cv_n_jobs: n_jobs of the CV estimators
+        n_jobs: Bootstrap worker threads (default: the process thread budget)
+        refit_cv: Run the full CV search in every bootstrap instead of warm-starting
+            from the pooled solution
+        threshold: |coef| above which a feature counts as selected
+        max_memory_mb: Memory the workers' per-fit copies of X may use together
+            (default: half the available RAM); caps the worker count
+    """
+    from sklearn.linear_model import Lasso, LassoCV, LogisticRegression, LogisticRegressionCV
+    from TRAINING.common.threads import effective_threads
+
+    X = np.asarray(X)
+    y = np.asarray(y)
+    n, p = X.shape
+
+    def make_cv():
+        if classification:
+            return LogisticRegressionCV(Cs=Cs, cv=cv, max_iter=max_iter, n_jobs=cv_n_jobs, random_state=random_state)
+        return LassoCV(cv=cv, max_iter=max_iter, n_jobs=cv_n_jobs, random_state=random_state)
+
+    try:
+        pooled = make_cv().fit(X, y)
+    except Exception as e:
+        logger.debug(f"Stability selection: pooled fit failed: {e}")
+        return StabilitySelectionResult(np.zeros(p), n_bootstrap, 0, None)
+    regularization = float(np.ravel(pooled.C_)[0]) if classification else float(pooled.alpha_)
+
+    def fit_one(b: int) -> Optional[np.ndarray]:
+        w = bootstrap_weights(n, random_state, b)
+        try:
+            if refit_cv:
+                model = make_cv()
+            elif classification:
+                model = LogisticRegression(C=regularization, max_iter=max_iter, warm_start=True,
+                                           random_state=random_state)
+                model.coef_ = pooled.coef_.copy()
+                model.intercept_ = np.array(pooled.intercept_, copy=True)
+            else:
+                model = Lasso(alpha=regularization, max_iter=max_iter, warm_start=True, random_state=random_state)
+                model.coef_ = pooled.coef_.copy()
+            model.fit(X, y, sample_weight=w)
+            return _selected(model, threshold)
+        except Exception as e:
+            # Skip failed bootstrap iterations (expected for some degenerate cases)
+            logger.debug(f"Stability selection: bootstrap {b} failed: {e}")
+            return None
+
+    workers = max(1, min(effective_threads(n_jobs), n_bootstrap,
+                         _memory_workers(n, p, classification, max_memory_mb)))
+    if workers == 1:
+        selections = [fit_one(b) for b in range(n_bootstrap)]
+    else:
+        # Workers share the thread budget: keep each solver single-threaded (BLAS/OpenMP)
+        from threadpoolctl import threadpool_limits
+        with threadpool_limits(limits=1), ThreadPoolExecutor(max_workers=workers) as pool:
+            selections = list(pool.map(fit_one, range(n_bootstrap)))
+
+    counts = np.zeros(p)
+    n_success = 0
+    for sel in selections:
+        if sel is not None:
+            counts += sel
+            n_success += 1
+    logger.debug(f"Stability selection: {n_success}/{n_bootstrap} bootstraps, "
+                 f"{'C' if classification else 'alpha'}={regularization:.4g}, workers={workers}")
+    return StabilitySelectionResult(
+        selection_frequency=counts / max(n_bootstrap, 1),
+        n_bootstrap=n_bootstrap,
+        n_success=n_success,
+        regularization=regularization,
+    )
@@ -8,19 +8,35 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 import pandas as pd
 import numpy as np
 
 from TRAINING.decisioning.policies import DecisionPolicy, evaluate_policies
+from TRAINING.utils.reproducibility_index import ReproducibilityIndex
 from TRAINING.decisioning.bayesian_policy import (
     BayesianPatchPolicy, PatchTemplate, compute_reward
 )
 
 logger = logging.getLogger(__name__)
 
+# Index columns a decision reads (policies, trend, predictions, Bayesian baseline) plus the
+# identity keys needed to deduplicate rows; only these are read from the run index
+DECISION_COLUMNS = [
+    "mode", "symbol", "model_family", "cohort_id", "run_id", "segment_id", "run_started_at",
+    "cs_auc", "next_pred", "next_pred_sym_auc", "n_features_selected", "pos_rate",
+    "jaccard_topK", "route_entropy", "route_changed",
+]
+
+# Process-level cache of cohort histories: key -> (index version, sorted cohort rows)
+_HISTORY_CACHE_MAX = 64  # DESIGN_CONSTANT_OK
+_history_cache: "OrderedDict[tuple, Tuple[tuple, pd.DataFrame]]" = OrderedDict()
+_history_cache_lock = threading.Lock()
+
 
 @dataclass
 class DecisionResult:
@@ -76,13 +92,15 @@ class DecisionEngine:
         Initialize decision engine.
         
         Args:
-            index_path: Path to index.parquet
+            index_path: Path to REPRODUCIBILITY/index.parquet (the run index is read
+                from the partitioned index/ directory next to it, plus this file if present)
             policies: List of decision policies (default: use default policies)
             apply_mode: If True, decisions can modify config (default: False = assist mode)
             use_bayesian: If True, enable Bayesian patch policy (default: False)
             base_dir: Base directory for Bayesian state (required if use_bayesian=True)
         """
         self.index_path = Path(index_path)
+        self.run_index = ReproducibilityIndex.from_index_path(self.index_path)
         self.apply_mode = apply_mode
         self.policies = policies or DecisionPolicy.get_default_policies()
         self.use_bayesian = use_bayesian
@@ -121,11 +139,70 @@ class DecisionEngine:
                 logger.warning(f"Failed to initialize Bayesian policy: {e}. Continuing without it.")
                 self.use_bayesian = False
     
+    def _decision_columns(self) -> List[str]:
+        columns = list(DECISION_COLUMNS)
+        metric = getattr(self.bayesian_policy, 'reward_metric', None)
+        if metric and metric not in columns:
+            columns.append(metric)
+        return columns
+    
+    def cohort_history(
+        self,
+        cohort_id: str,
+        segment_id: Optional[int] = None,
+        phase: Optional[str] = None,
+        target: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Index rows of one cohort (optionally one segment), sorted by run_started_at.
+        
+        Reads only this cohort's rows (cohort_id predicate pushed into the parquet
+        reader) and only the columns decisions use; phase/target additionally prune
+        index partitions. Results are cached per process and reused until the
+        index changes (see ReproducibilityIndex.version).
+        """
+        columns = self._decision_columns()
+        key = (str(self.run_index.repro_dir), cohort_id, phase, target, tuple(columns))
+        version = self.run_index.version()
+        
+        with _history_cache_lock:
+            cached = _history_cache.get(key)
+            if cached is not None and cached[0] == version:
+                _history_cache.move_to_end(key)
+                history = cached[1]
+            else:
+                history = None
+        
+        if history is None:
+            df = self.run_index.query(
+                phase=phase,
+                target=target,
+                filters=[('cohort_id', '==', cohort_id)],
+                columns=columns
+            )
+            # Projected columns absent from every row come back all-NaN; drop them so
+            # "column missing" checks in policies behave as on the full index
+            keep = [c for c in df.columns if c in ('phase', 'target', 'cohort_id') or df[c].notna().any()]
+            history = df[keep].sort_values('run_started_at') if len(df) > 0 else df[keep]
+            with _history_cache_lock:
+                _history_cache[key] = (version, history)
+                _history_cache.move_to_end(key)
+                while len(_history_cache) > _HISTORY_CACHE_MAX:
+                    _history_cache.popitem(last=False)
+        
+        if segment_id is not None:
+            if 'segment_id' not in history.columns:
+                return history.iloc[0:0].copy()
+            return history[history['segment_id'] == segment_id].copy()
+        return history.copy()
+    
     def evaluate(
         self,
         cohort_id: str,
         run_id: str,
-        segment_id: Optional[int] = None
+        segment_id: Optional[int] = None,
+        phase: Optional[str] = None,
+        target: Optional[str] = None
     ) -> DecisionResult:
         """
         Evaluate decisions for a run.
@@ -134,12 +211,14 @@ class DecisionEngine:
             cohort_id: Cohort identifier
             run_id: Run identifier
             segment_id: Optional segment identifier
+            phase: Optional phase to restrict the cohort history to
+            target: Optional target to restrict the cohort history to
         
         Returns:
             DecisionResult
         """
-        if not self.index_path.exists():
-            logger.warning(f"Index file not found: {self.index_path}, returning no-op decision")
+        if not self.run_index.exists():
+            logger.warning(f"Run index not found under: {self.run_index.repro_dir}, returning no-op decision")
             return DecisionResult(
                 run_id=run_id,
                 cohort_id=cohort_id,
@@ -150,7 +229,7 @@ class DecisionEngine:
             )
         
         try:
-            df = pd.read_parquet(self.index_path)
+            cohort_data = self.cohort_history(cohort_id, segment_id, phase=phase, target=target)
         except Exception as e:
             logger.error(f"Failed to load index: {e}")
             return DecisionResult(
@@ -162,13 +241,6 @@ class DecisionEngine:
                 decision_reason_codes=[]
             )
         
-        # Filter to cohort/segment
-        mask = df['cohort_id'] == cohort_id
-        if segment_id is not None:
-            mask &= df['segment_id'] == segment_id
-        
-        cohort_data = df[mask].sort_values('run_started_at')
-        
         if len(cohort_data) == 0:
             logger.debug(f"No data for cohort {cohort_id}, returning no-op decision")
             return DecisionResult(
@@ -408,20 +480,15 @@ class DecisionEngine:
         if not self.use_bayesian or not self.bayesian_policy:
             return
         
-        if not self.index_path.exists():
+        if not self.run_index.exists():
             return
         
         try:
-            df = pd.read_parquet(self.index_path)
+            # Get cohort data to compute baseline
+            cohort_data = self.cohort_history(decision_result.cohort_id, decision_result.segment_id)
         except Exception:
             return
         
-        # Get cohort data to compute baseline
-        mask = df['cohort_id'] == decision_result.cohort_id
-        if decision_result.segment_id is not None:
-            mask &= df['segment_id'] == decision_result.segment_id
-        
-        cohort_data = df[mask].sort_values('run_started_at')
         if len(cohort_data) < 2:  # Need at least 2 runs to compute reward
             return
         
@@ -20,26 +20,252 @@ Live Rolling Buffers for Sequential Models
 ==========================================
 
 Ring buffers for maintaining rolling windows of sequential data during live inference.
+
+All symbols share one preallocated (S, T, F) float32 array (SeqPanelBuffer). Each
+symbol owns a slot with a head pointer, so a push writes one (F,) row in place and
+advances the head; no data is shifted. Validity is tracked incrementally (rows are
+validated on push, fill counts and last-update times are kept per slot), so readiness
+for every symbol is one vectorized comparison. Ready windows are gathered into a
+single (B, T, F) batch for one model call per bar.
 """
 
 
 import numpy as np
 import torch
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Sequence
 from datetime import datetime, timedelta
 import time
 
 logger = logging.getLogger(__name__)
 
+
+def _to_epoch(timestamp: datetime) -> float:
+    """Seconds since epoch for TTL arithmetic (naive datetimes are local time, like datetime.now())."""
+    return timestamp.timestamp()
+
+
+class SeqPanelBuffer:
+    """
+    Multi-symbol ring buffer backed by a single preallocated (S, T, F) array.
+
+    Slot s holds symbol s's window; heads[s] is the row the next push writes to, which
+    (once the slot is full) is also the oldest row. Capacity grows by doubling when new
+    symbols arrive, so the array is reallocated O(log S) times at most.
+    """
+
+    def __init__(self, T: int, F: int, ttl_seconds: float = 300.0, initial_capacity: int = 64):
+        """
+        Initialize panel buffer.
+
+        Args:
+            T: Sequence length (lookback bars)
+            F: Number of features
+            ttl_seconds: Time-to-live for data validity
+            initial_capacity: Number of symbol slots to preallocate
+        """
+        self.T = T
+        self.F = F
+        self.ttl_seconds = ttl_seconds
+
+        capacity = max(1, int(initial_capacity))
+        self.data = np.zeros((capacity, T, F), dtype=np.float32)
+        self.heads = np.zeros(capacity, dtype=np.int64)
+        self.fill_counts = np.zeros(capacity, dtype=np.int64)
+        self.last_update_epoch = np.full(capacity, np.nan, dtype=np.float64)
+        self.last_update = np.empty(capacity, dtype=object)
+        self.slots: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self._offsets = np.arange(T, dtype=np.int64)
+
+    @property
+    def capacity(self) -> int:
+        return self.data.shape[0]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.slots
+
+    def _grow(self, min_capacity: int):
+        new_capacity = self.capacity
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+
+        n = len(self.symbols)
+        data = np.zeros((new_capacity, self.T, self.F), dtype=np.float32)
+        data[:n] = self.data[:n]
+        self.data = data
+        for name in ('heads', 'fill_counts', 'last_update_epoch', 'last_update'):
+            old = getattr(self, name)
+            new = np.empty(new_capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            new[n:] = np.nan if name == 'last_update_epoch' else (None if name == 'last_update' else 0)
+            setattr(self, name, new)
+        logger.debug(f"SeqPanelBuffer grown to {new_capacity} slots")
+
+    def slot(self, symbol: str) -> int:
+        """Get or allocate the slot for a symbol."""
+        slot = self.slots.get(symbol)
+        if slot is None:
+            slot = len(self.symbols)
+            if slot >= self.capacity:
+                self._grow(slot + 1)
+            self.slots[symbol] = slot
+            self.symbols.append(symbol)
+            logger.debug(f"Allocated slot {slot} for symbol: {symbol}")
+        return slot
+
+    def _slots_for(self, symbols: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.slots[s] for s in symbols), dtype=np.int64, count=len(symbols))
+
+    def push(self, symbol: str, x_row: np.ndarray, timestamp: Optional[datetime] = None) -> bool:
+        """
+        Push one feature row for a symbol (O(F)).
+
+        Returns:
+            True if successful, False if invalid
+        """
+        if x_row.shape != (self.F,):
+            logger.error(f"Invalid feature shape: {x_row.shape}, expected ({self.F},)")
+            return False
+
+        # Rejecting non-finite rows here is what lets readiness skip rescanning the window
+        if not np.isfinite(x_row).all():
+            logger.warning("Invalid features (NaN/inf), skipping update")
+            return False
+
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        slot = self.slot(symbol)
+        head = self.heads[slot]
+        self.data[slot, head] = x_row
+        self.heads[slot] = (head + 1) % self.T
+        if self.fill_counts[slot] < self.T:
+            self.fill_counts[slot] += 1
+        self.last_update[slot] = timestamp
+        self.last_update_epoch[slot] = _to_epoch(timestamp)
+        return True
+
+    def push_many(self, symbols: Sequence[str], rows: np.ndarray,
+                  timestamp: Optional[datetime] = None) -> np.ndarray:
+        """
+        Push one bar for many symbols at once.
+
+        Args:
+            symbols: Unique symbol names, one per row
+            rows: Feature rows of shape (len(symbols), F)
+            timestamp: Optional timestamp shared by all rows
+
+        Returns:
+            Boolean array, True where the row was accepted
+        """
+        rows = np.asarray(rows)
+        if rows.shape != (len(symbols), self.F):
+            logger.error(f"Invalid feature shape: {rows.shape}, expected ({len(symbols)}, {self.F})")
+            return np.zeros(len(symbols), dtype=bool)
+        if len(set(symbols)) != len(symbols):
+            raise ValueError("push_many requires unique symbols (one row per symbol per bar)")
+
+        accepted = np.isfinite(rows).all(axis=1)
+        if not accepted.all():
+            logger.warning(f"Invalid features (NaN/inf) for {int((~accepted).sum())} symbols, skipping those updates")
+        if not accepted.any():
+            return accepted
+
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        for symbol, ok in zip(symbols, accepted):
+            if ok:
+                self.slot(symbol)
+        slots = self._slots_for([s for s, ok in zip(symbols, accepted) if ok])
+        heads = self.heads[slots]
+        self.data[slots, heads] = rows[accepted]
+        self.heads[slots] = (heads + 1) % self.T
+        self.fill_counts[slots] = np.minimum(self.fill_counts[slots] + 1, self.T)
+        self.last_update[slots] = timestamp
+        self.last_update_epoch[slots] = _to_epoch(timestamp)
+        return accepted
+
+    def ready_mask(self, now: Optional[datetime] = None) -> np.ndarray:
+        """
+        Readiness of every allocated slot: full and updated within the TTL.
+
+        Returns:
+            Boolean array of shape (len(self),), aligned with self.symbols
+        """
+        n = len(self.symbols)
+        now_epoch = _to_epoch(now) if now is not None else time.time()
+        age = now_epoch - self.last_update_epoch[:n]
+        # NaN age (never updated) compares False
+        return (self.fill_counts[:n] >= self.T) & (age <= self.ttl_seconds)
+
+    def ready_symbols(self, now: Optional[datetime] = None) -> List[str]:
+        """Symbols whose windows are ready for inference."""
+        return [self.symbols[i] for i in np.flatnonzero(self.ready_mask(now))]
+
+    def is_ready(self, symbol: str) -> bool:
+        slot = self.slots.get(symbol)
+        if slot is None or self.fill_counts[slot] < self.T:
+            return False
+        age = time.time() - self.last_update_epoch[slot]
+        return bool(age <= self.ttl_seconds)
+
+    def windows(self, symbols: Sequence[str]) -> np.ndarray:
+        """
+        Gather chronological windows for symbols (oldest row first).
+
+        Returns:
+            Array of shape (len(symbols), T, F)
+        """
+        slots = self._slots_for(symbols)
+        idx = (self.heads[slots, None] + self._offsets) % self.T
+        return self.data[slots[:, None], idx]
+
+    def window(self, symbol: str) -> np.ndarray:
+        """Chronological (T, F) window for one symbol (copy)."""
+        slot = self.slots[symbol]
+        head = self.heads[slot]
+        data = self.data[slot]
+        if head == 0:
+            return data.copy()
+        return np.concatenate((data[head:], data[:head]))
+
+    def reset(self, symbol: str):
+        """Reset one symbol's slot to empty state (the slot stays allocated)."""
+        slot = self.slots.get(symbol)
+        if slot is None:
+            return
+        self.data[slot].fill(0.0)
+        self.heads[slot] = 0
+        self.fill_counts[slot] = 0
+        self.last_update_epoch[slot] = np.nan
+        self.last_update[slot] = None
+
+    def reset_all(self):
+        """Reset all slots."""
+        n = len(self.symbols)
+        self.data[:n].fill(0.0)
+        self.heads[:n] = 0
+        self.fill_counts[:n] = 0
+        self.last_update_epoch[:n] = np.nan
+        self.last_update[:n] = None
+
+
 class SeqRingBuffer:
     """
     Ring buffer for maintaining rolling sequences of features.
     
     Maintains a (T, F) buffer where T is the sequence length and F is the number of features.
+    Standalone buffers own a one-slot SeqPanelBuffer; buffers handed out by SeqBufferManager
+    are views onto a slot of the shared panel.
     """
     
-    def __init__(self, T: int, F: int, ttl_seconds: float = 300.0):
+    def __init__(self, T: int, F: int, ttl_seconds: float = 300.0,
+                 panel: Optional[SeqPanelBuffer] = None, symbol: str = '__single__'):
         """
         Initialize ring buffer.
         
@@ -47,18 +273,39 @@ class SeqRingBuffer:
             T: Sequence length (lookback bars)
             F: Number of features
             ttl_seconds: Time-to-live for data validity
+            panel: Shared panel buffer to view into (default: a private one-slot panel)
+            symbol: Symbol whose slot this buffer views
         """
         self.T = T
         self.F = F
         self.ttl_seconds = ttl_seconds
-        
-        # Initialize buffer
-        self.buffer = np.zeros((T, F), dtype=np.float32)
-        self.fill_count = 0
-        self.last_update = None
-        self.valid_mask = np.zeros(T, dtype=bool)
+        self._panel = panel if panel is not None else SeqPanelBuffer(T, F, ttl_seconds, initial_capacity=1)
+        self._symbol = symbol
+        self._panel.slot(symbol)
         
         logger.debug(f"SeqRingBuffer initialized: T={T}, F={F}, ttl={ttl_seconds}s")
+
+    @property
+    def _slot(self) -> int:
+        return self._panel.slots[self._symbol]
+
+    @property
+    def fill_count(self) -> int:
+        return int(self._panel.fill_counts[self._slot])
+
+    @property
+    def last_update(self) -> Optional[datetime]:
+        return self._panel.last_update[self._slot]
+
+    @property
+    def buffer(self) -> np.ndarray:
+        """Chronological (T, F) contents (copy)."""
+        return self._panel.window(self._symbol)
+
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """Validity per chronological row (the newest fill_count rows are valid)."""
+        return np.arange(self.T) >= self.T - self.fill_count
     
     def push(self, x_row: np.ndarray, timestamp: Optional[datetime] = None) -> bool:
         """
@@ -71,32 +318,7 @@ class SeqRingBuffer:
         Returns:
             True if successful, False if invalid
         """
-        # Validate input
-        if x_row.shape != (self.F,):
-            logger.error(f"Invalid feature shape: {x_row.shape}, expected ({self.F},)")
-            return False
-        
-        # Check for NaN or infinite values
-        if np.isnan(x_row).any() or np.isinf(x_row).any():
-            logger.warning("Invalid features (NaN/inf), skipping update")
-            return False
-        
-        # Update timestamp
-        if timestamp is None:
-            timestamp = datetime.now()
-        self.last_update = timestamp
-        
-        # Roll buffer and add new data
-        self.buffer = np.roll(self.buffer, -1, axis=0)
-        self.buffer[-1, :] = x_row
-        
-        # Update fill count and validity
-        self.fill_count = min(self.fill_count + 1, self.T)
-        self.valid_mask = np.roll(self.valid_mask, -1)
-        self.valid_mask[-1] = True
-        
-        logger.debug(f"Pushed features: fill_count={self.fill_count}/{self.T}")
-        return True
+        return self._panel.push(self._symbol, x_row, timestamp)
     
     def ready(self) -> bool:
         """
@@ -105,24 +327,15 @@ class SeqRingBuffer:
         Returns:
             True if buffer is full and data is fresh
         """
-        # Check if buffer is full
-        if self.fill_count < self.T:
-            return False
-        
-        # Check TTL
-        if self.last_update is None:
+        # Pushes reject NaN/inf, so a full, fresh buffer is valid without rescanning it
+        if self.fill_count < self.T or self.last_update is None:
             return False
         
-        age_seconds = (datetime.now() - self.last_update).total_seconds()
+        age_seconds = time.time() - self._panel.last_update_epoch[self._slot]
         if age_seconds > self.ttl_seconds:
             logger.warning(f"Buffer data too old: {age_seconds:.1f}s > {self.ttl_seconds}s")
             return False
         
-        # Check for any invalid data in the buffer
-        if np.isnan(self.buffer).any() or np.isinf(self.buffer).any():
-            logger.warning("Buffer contains invalid data (NaN/inf)")
-            return False
-        
         return True
     
     def view(self) -> np.ndarray:
@@ -130,9 +343,9 @@ class SeqRingBuffer:
         Get current buffer view.
         
         Returns:
-            Buffer copy of shape (T, F)
+            Buffer copy of shape (T, F), oldest row first
         """
-        return self.buffer.copy()
+        return self._panel.window(self._symbol)
     
     def get_sequence(self) -> torch.Tensor:
         """
@@ -145,15 +358,12 @@ class SeqRingBuffer:
             raise RuntimeError("Buffer not ready for inference")
         
         # Convert to tensor and add batch dimension
-        sequence = torch.from_numpy(self.buffer).float().unsqueeze(0)  # [1, T, F]
+        sequence = torch.from_numpy(self.view()).float().unsqueeze(0)  # [1, T, F]
         return sequence
     
     def reset(self):
         """Reset buffer to empty state."""
-        self.buffer.fill(0.0)
-        self.fill_count = 0
-        self.last_update = None
-        self.valid_mask.fill(False)
+        self._panel.reset(self._symbol)
         logger.debug("Buffer reset")
     
     def get_status(self) -> Dict[str, Any]:
@@ -165,7 +375,7 @@ class SeqRingBuffer:
         """
         age_seconds = None
         if self.last_update is not None:
-            age_seconds = (datetime.now() - self.last_update).total_seconds()
+            age_seconds = float(time.time() - self._panel.last_update_epoch[self._slot])
         
         return {
             'fill_count': self.fill_count,
@@ -174,16 +384,20 @@ class SeqRingBuffer:
             'last_update': self.last_update,
             'age_seconds': age_seconds,
             'ttl_seconds': self.ttl_seconds,
-            'has_nan': np.isnan(self.buffer).any(),
-            'has_inf': np.isinf(self.buffer).any()
+            # Non-finite rows are rejected on push
+            'has_nan': False,
+            'has_inf': False
         }
 
 class SeqBufferManager:
     """
     Manager for multiple symbol ring buffers.
+
+    All symbols live in one SeqPanelBuffer; per-symbol SeqRingBuffer objects are thin
+    views onto their slot.
     """
     
-    def __init__(self, T: int, F: int, ttl_seconds: float = 300.0):
+    def __init__(self, T: int, F: int, ttl_seconds: float = 300.0, initial_capacity: int = 64):
         """
         Initialize buffer manager.
         
@@ -191,10 +405,12 @@ class SeqBufferManager:
             T: Sequence length
             F: Number of features
             ttl_seconds: TTL for data validity
+            initial_capacity: Number of symbol slots to preallocate
         """
         self.T = T
         self.F = F
         self.ttl_seconds = ttl_seconds
+        self.panel = SeqPanelBuffer(T, F, ttl_seconds, initial_capacity=initial_capacity)
         self.buffers: Dict[str, SeqRingBuffer] = {}
         
         logger.info(f"SeqBufferManager initialized: T={T}, F={F}, ttl={ttl_seconds}s")
@@ -210,7 +426,8 @@ class SeqBufferManager:
             Ring buffer for the symbol
         """
         if symbol not in self.buffers:
-            self.buffers[symbol] = SeqRingBuffer(self.T, self.F, self.ttl_seconds)
+            self.buffers[symbol] = SeqRingBuffer(self.T, self.F, self.ttl_seconds,
+                                                 panel=self.panel, symbol=symbol)
             logger.debug(f"Created buffer for symbol: {symbol}")
         
         return self.buffers[symbol]
@@ -228,8 +445,27 @@ class SeqBufferManager:
         Returns:
             True if successful
         """
-        buffer = self.get_buffer(symbol)
-        return buffer.push(features, timestamp)
+        if symbol not in self.buffers:
+            self.get_buffer(symbol)
+        return self.panel.push(symbol, features, timestamp)
+
+    def push_bar(self, symbols: Sequence[str], features: np.ndarray,
+                 timestamp: Optional[datetime] = None) -> np.ndarray:
+        """
+        Push one bar for many symbols in a single vectorized write.
+
+        Args:
+            symbols: Unique symbol names
+            features: Feature rows of shape (len(symbols), F)
+            timestamp: Optional timestamp shared by all rows
+
+        Returns:
+            Boolean array, True where the row was accepted
+        """
+        for symbol in symbols:
+            if symbol not in self.buffers:
+                self.get_buffer(symbol)
+        return self.panel.push_many(symbols, features, timestamp)
     
     def is_ready(self, symbol: str) -> bool:
         """
@@ -241,10 +477,7 @@ class SeqBufferManager:
         Returns:
             True if ready
         """
-        if symbol not in self.buffers:
-            return False
-        
-        return self.buffers[symbol].ready()
+        return self.panel.is_ready(symbol)
     
     def get_sequence(self, symbol: str) -> Optional[torch.Tensor]:
         """
@@ -260,6 +493,21 @@ class SeqBufferManager:
             return None
         
         return self.buffers[symbol].get_sequence()
+
+    def get_sequences(self, symbols: Sequence[str]) -> Tuple[List[str], Optional[torch.Tensor]]:
+        """
+        Gather the ready windows among symbols into one batch.
+
+        Args:
+            symbols: Symbol names
+
+        Returns:
+            (ready_symbols, tensor of shape [B, T, F]) or (ready_symbols, None) if none are ready
+        """
+        ready = [s for s in symbols if self.panel.is_ready(s)]
+        if not ready:
+            return ready, None
+        return ready, torch.from_numpy(self.panel.windows(ready))
     
     def get_ready_symbols(self) -> List[str]:
         """
@@ -268,7 +516,7 @@ class SeqBufferManager:
         Returns:
             List of ready symbols
         """
-        return [symbol for symbol, buffer in self.buffers.items() if buffer.ready()]
+        return self.panel.ready_symbols()
     
     def get_status(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -281,13 +529,11 @@ class SeqBufferManager:
     
     def reset_symbol(self, symbol: str):
         """Reset buffer for a symbol."""
-        if symbol in self.buffers:
-            self.buffers[symbol].reset()
+        self.panel.reset(symbol)
     
     def reset_all(self):
         """Reset all buffers."""
-        for buffer in self.buffers.values():
-            buffer.reset()
+        self.panel.reset_all()
         logger.info("All buffers reset")
 
 class LiveSeqInference:
@@ -295,7 +541,8 @@ class LiveSeqInference:
     Live inference handler for sequential models.
     """
     
-    def __init__(self, model, buffer_manager: SeqBufferManager, device: str = 'cpu'):
+    def __init__(self, model, buffer_manager: SeqBufferManager, device: str = 'cpu',
+                 max_batch_size: Optional[int] = None):
         """
         Initialize live inference handler.
         
@@ -303,10 +550,12 @@ class LiveSeqInference:
             model: Trained sequential model
             buffer_manager: Buffer manager
             device: Device for inference
+            max_batch_size: Optional cap on windows per forward pass (None = all ready symbols)
         """
         self.model = model
         self.buffer_manager = buffer_manager
         self.device = device
+        self.max_batch_size = max_batch_size
         
         # Move model to device
         if hasattr(model, 'to'):
@@ -344,10 +593,24 @@ class LiveSeqInference:
         except Exception as e:
             logger.error(f"Prediction failed for {symbol}: {e}")
             return None
+
+    def _forward(self, batch: torch.Tensor) -> np.ndarray:
+        """One forward pass over a [B, T, F] batch; returns B scalar predictions."""
+        with torch.no_grad():
+            prediction = self.model(batch.to(self.device))
+        if isinstance(prediction, torch.Tensor):
+            prediction = prediction.detach().cpu().numpy()
+        prediction = np.asarray(prediction, dtype=np.float64).reshape(batch.shape[0], -1)
+        if prediction.shape[1] != 1:
+            raise ValueError(f"Expected one output per window, got shape {prediction.shape}")
+        return prediction[:, 0]
     
     def predict_batch(self, symbols: List[str]) -> Dict[str, Optional[float]]:
         """
         Make predictions for multiple symbols.
+
+        Ready windows are gathered into one [B, T, F] batch (chunked by max_batch_size)
+        and scored in a single model call; symbols that are not ready map to None.
         
         Args:
             symbols: List of symbol names
@@ -355,17 +618,30 @@ class LiveSeqInference:
         Returns:
             Dictionary of {symbol: prediction}
         """
-        results = {}
-        for symbol in symbols:
-            results[symbol] = self.predict(symbol)
+        results: Dict[str, Optional[float]] = {symbol: None for symbol in symbols}
+        ready, batch = self.buffer_manager.get_sequences(symbols)
+        if batch is None:
+            return results
+
+        chunk = self.max_batch_size or len(ready)
+        for start in range(0, len(ready), chunk):
+            chunk_symbols = ready[start:start + chunk]
+            try:
+                predictions = self._forward(batch[start:start + chunk])
+            except Exception as e:
+                logger.error(f"Batched prediction failed for {len(chunk_symbols)} symbols: {e}")
+                continue
+            for symbol, value in zip(chunk_symbols, predictions):
+                results[symbol] = float(value)
         return results
     
     def predict_ready_symbols(self) -> Dict[str, float]:
         """
-        Make predictions for all ready symbols.
+        Make predictions for all ready symbols in one batched forward pass.
         
         Returns:
             Dictionary of {symbol: prediction} for ready symbols
         """
         ready_symbols = self.buffer_manager.get_ready_symbols()
-        return self.predict_batch(ready_symbols)
+        results = self.predict_batch(ready_symbols)
+        return {symbol: value for symbol, value in results.items() if value is not None}
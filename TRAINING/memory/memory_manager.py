@@ -26,7 +26,7 @@ import psutil
 import logging
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterable, Optional, Tuple
 import numpy as np
 import pandas as pd
 
@@ -166,6 +166,51 @@ class MemoryManager:
         except Exception as e:
             logger.warning(f"Aggressive cleanup failed: {e}")
     
+    def _sampling_config(self) -> Dict[str, Any]:
+        """memory.sampling settings (row budget for training panels)."""
+        cfg = {
+            'enabled': True,
+            'headroom_fraction': 0.6,  # FALLBACK_DEFAULT_OK
+            'panel_copies': 3.0,  # FALLBACK_DEFAULT_OK
+            'bytes_per_value': 8,  # FALLBACK_DEFAULT_OK
+            'min_rows': 100000,  # FALLBACK_DEFAULT_OK
+            'family_multipliers': {'default': 4.0},  # FALLBACK_DEFAULT_OK
+        }
+        if _CONFIG_AVAILABLE:
+            try:
+                section = get_cfg("memory.sampling", default={}, config_name="memory_config") or {}
+                cfg.update({k: v for k, v in section.items() if k in cfg})
+            except Exception as e:
+                logger.debug(f"Failed to load memory sampling config: {e}, using defaults")
+        cfg.update({k: v for k, v in self.config.get('sampling', {}).items() if k in cfg})
+        return cfg
+    
+    def training_row_budget(self, n_features: int, families: Optional[Iterable[str]] = None) -> Optional[int]:
+        """
+        Rows of an (n_rows, n_features) training panel that fit in current memory headroom.
+        
+        Peak bytes per row = n_features * bytes_per_value * (panel_copies + family multiplier),
+        using the most memory-hungry of `families`. Returns None if sampling is disabled or
+        memory cannot be measured.
+        """
+        cfg = self._sampling_config()
+        if not cfg['enabled']:
+            return None
+        available_bytes = self.get_memory_usage()['system_available_gb'] * 1024**3
+        if available_bytes <= 0:
+            return None
+        
+        multipliers = cfg['family_multipliers'] or {}
+        default_mult = float(multipliers.get('default', 4.0))  # FALLBACK_DEFAULT_OK
+        family_mult = max((float(multipliers.get(f, default_mult)) for f in (families or [])), default=default_mult)
+        bytes_per_row = max(int(n_features), 1) * float(cfg['bytes_per_value']) * (float(cfg['panel_copies']) + family_mult)
+        
+        rows = int(available_bytes * float(cfg['headroom_fraction']) / bytes_per_row)
+        budget = max(rows, int(cfg['min_rows']))
+        logger.info(f"💾 Row budget: {budget:,} rows x {n_features} features "
+                   f"({available_bytes / 1024**3:.1f}GB available, {bytes_per_row:.0f} B/row peak, families={list(families or [])})")
+        return budget
+    
     def cap_data(self, X: np.ndarray, y: np.ndarray, max_samples: int) -> Tuple[np.ndarray, np.ndarray]:
         """Cap data to prevent memory issues (mega script approach)."""
         if len(X) <= max_samples:
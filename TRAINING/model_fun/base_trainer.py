@@ -404,36 +404,19 @@ class BaseModelTrainer(ABC):
     
     def preprocess_data(self, X: np.ndarray, y: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
         """Preprocess data with robust imputer and column handling"""
-        # Cast to float32 for speed (2x memory reduction + faster BLAS)
-        # Use C-contiguous for optimal cache performance
-        X = np.ascontiguousarray(X, dtype=np.float32)
-        
         if y is not None:
-            # Training mode: fit imputer and colmask
-            y = np.asarray(y, dtype=np.float64).ravel()
-            mask = np.isfinite(y)
-            if not mask.any():
-                raise ValueError("No finite targets after filtering")
-            X, y = X[mask], y[mask]
-            
-            # Drop all-NaN columns on TRAIN only
-            self.colmask = np.isfinite(X).any(axis=0)
-            if not self.colmask.any():
-                raise ValueError("All columns are NaN")
-            X = X[:, self.colmask]
-            
-            # Fit imputer on training data
-            self.imputer = SimpleImputer(strategy="median")
-            X = self.imputer.fit_transform(X)
-            
-            # Apply global safety guards
-            X = guard_features(X)
-            y = guard_targets(y)
+            # Training mode: colmask + imputer are fitted once per (X, y, strategy) and
+            # shared across families; X/y come back as read-only views of the cached result
+            from TRAINING.common.preprocess_cache import preprocess_train
+            X, y, self.colmask, self.imputer = preprocess_train(X, y, self._get_imputation_strategy())
             
             logger.info("Preprocessed train: %d rows, %d cols", X.shape[0], X.shape[1])
             return X, y
         
         # Inference mode: reuse colmask + imputer
+        # Cast to float32 for speed (2x memory reduction + faster BLAS)
+        # Use C-contiguous for optimal cache performance
+        X = np.ascontiguousarray(X, dtype=np.float32)
         if self.colmask is not None:
             if X.shape[1] >= self.colmask.size:
                 X = X[:, self.colmask]
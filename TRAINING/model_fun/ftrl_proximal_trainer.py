@@ -13,12 +13,25 @@ GNU Affero General Public License for more details.
 
 You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+FTRL-Proximal online regressor.
+
+The trainer consumes time-ordered chunks through FTRLProximalRegressor.partial_fit, so
+memory is bounded by the chunk size. Two entry points:
+
+- train(): in-memory X (pipeline path); the training rows are streamed in row order.
+- train_from_parquet(): streams feature/target columns straight from parquet files,
+  k-way merged by time across files.
+
+Per-coordinate adaptive learning rates and L1/L2 follow McMahan et al. (2013), with
+minibatch-averaged gradients. Features are standardized online (running mean/variance,
+NaN -> running mean), so no global imputer is needed for streamed data. State (z, n and
+scaler statistics) can be saved and used to warm-start the next day's run.
 """
 
 import numpy as np, logging, sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
-from sklearn.linear_model import SGDRegressor
 from sklearn.model_selection import train_test_split
 from .base_trainer import BaseModelTrainer
 logger = logging.getLogger(__name__)
@@ -37,6 +50,253 @@ try:
 except ImportError:
     logger.debug("config_loader not available; using hardcoded defaults")
 
+
+class FTRLProximalRegressor:
+    """
+    FTRL-Proximal linear regressor (squared loss) with online feature standardization.
+
+    Weights live in the standardized feature space; coef_/intercept_ are reported in
+    the original feature scale.
+    """
+
+    def __init__(self, alpha: float, beta: float, l1: float, l2: float,
+                 batch_size: int, clip: float):
+        self.alpha = float(alpha)
+        self.beta = float(beta)
+        self.l1 = float(l1)
+        self.l2 = float(l2)
+        self.batch_size = int(batch_size)
+        self.clip = float(clip)
+        self.feature_names: Optional[List[str]] = None
+        self.n_features_in_ = 0
+        self.n_seen_ = 0
+        # Accumulators (last coordinate is the intercept)
+        self.z_: Optional[np.ndarray] = None
+        self.n_: Optional[np.ndarray] = None
+        # Online scaler (Chan et al. parallel mean/variance)
+        self.count_: Optional[np.ndarray] = None
+        self.mean_: Optional[np.ndarray] = None
+        self.m2_: Optional[np.ndarray] = None
+
+    # ------------------------------------------------------------------ state
+
+    def _init_state(self, n_features: int):
+        self.n_features_in_ = n_features
+        self.z_ = np.zeros(n_features + 1)
+        self.n_ = np.zeros(n_features + 1)
+        self.count_ = np.zeros(n_features)
+        self.mean_ = np.zeros(n_features)
+        self.m2_ = np.zeros(n_features)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "z": self.z_, "n": self.n_,
+            "count": self.count_, "mean": self.mean_, "m2": self.m2_,
+            "n_seen": np.int64(self.n_seen_),
+            "feature_names": np.asarray(self.feature_names or [], dtype=object),
+        }
+
+    def set_state(self, state: Dict[str, Any], feature_names: Optional[Sequence[str]] = None):
+        """
+        Load accumulators, aligning by feature name when both sides have names
+        (features new to this run start at zero weight and empty scaler stats).
+        """
+        old_names = [str(f) for f in state.get("feature_names", [])]
+        n_old = len(state["z"]) - 1
+        if feature_names is None or not old_names:
+            self._init_state(n_old)
+            src = np.arange(n_old)
+            dst = np.arange(n_old)
+            self.feature_names = list(feature_names) if feature_names is not None else (old_names or None)
+        else:
+            self._init_state(len(feature_names))
+            pos = {name: i for i, name in enumerate(old_names)}
+            pairs = [(i, pos[name]) for i, name in enumerate(feature_names) if name in pos]
+            dst = np.array([d for d, _ in pairs], dtype=np.int64)
+            src = np.array([s for _, s in pairs], dtype=np.int64)
+            self.feature_names = list(feature_names)
+            if len(pairs) < len(feature_names):
+                logger.info(f"[FTRLProximal] Warm start: {len(feature_names) - len(pairs)} new features start from zero")
+
+        self.z_[dst] = state["z"][src]
+        self.n_[dst] = state["n"][src]
+        self.z_[-1] = state["z"][-1]
+        self.n_[-1] = state["n"][-1]
+        self.count_[dst] = state["count"][src]
+        self.mean_[dst] = state["mean"][src]
+        self.m2_[dst] = state["m2"][src]
+        self.n_seen_ = int(state.get("n_seen", 0))
+        return self
+
+    def save_state(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, **self.get_state())
+        return path if path.suffix == ".npz" else path.with_name(path.name + ".npz")
+
+    def load_state(self, path: Union[str, Path], feature_names: Optional[Sequence[str]] = None):
+        with np.load(Path(path), allow_pickle=True) as data:
+            state = {k: data[k] for k in data.files}
+        return self.set_state(state, feature_names)
+
+    # ----------------------------------------------------------------- fitting
+
+    def _update_scaler(self, X: np.ndarray):
+        finite = np.isfinite(X)
+        cnt = finite.sum(axis=0).astype(np.float64)
+        has = cnt > 0
+        if not has.any():
+            return
+        Xz = np.where(finite, X, 0.0)
+        batch_mean = np.divide(Xz.sum(axis=0), cnt, out=np.zeros_like(cnt), where=has)
+        batch_m2 = np.where(finite, (X - batch_mean) ** 2, 0.0).sum(axis=0)
+        total = self.count_ + cnt
+        delta = batch_mean - self.mean_
+        safe_total = np.where(has, total, 1.0)
+        self.mean_ = np.where(has, self.mean_ + delta * cnt / safe_total, self.mean_)
+        self.m2_ = np.where(has, self.m2_ + batch_m2 + delta ** 2 * self.count_ * cnt / safe_total, self.m2_)
+        self.count_ = total
+
+    def _standardize(self, X: np.ndarray) -> np.ndarray:
+        var = np.divide(self.m2_, self.count_, out=np.zeros_like(self.m2_), where=self.count_ > 1)
+        std = np.sqrt(var)
+        std[std < 1e-9] = 1.0
+        Xs = (np.asarray(X, dtype=np.float64) - self.mean_) / std
+        np.nan_to_num(Xs, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        np.clip(Xs, -self.clip, self.clip, out=Xs)
+        return Xs
+
+    def _weights(self) -> np.ndarray:
+        l1 = np.full_like(self.z_, self.l1)
+        l1[-1] = 0.0  # Intercept is not L1-penalized
+        w = -(self.z_ - np.sign(self.z_) * l1) / ((self.beta + np.sqrt(self.n_)) / self.alpha + self.l2)
+        w[np.abs(self.z_) <= l1] = 0.0
+        return w
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray, feature_names: Optional[Sequence[str]] = None):
+        """Update the model with one chunk of rows (in the order given)."""
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if self.z_ is None:
+            self._init_state(X.shape[1])
+            if feature_names is not None:
+                self.feature_names = list(feature_names)
+        elif X.shape[1] != self.n_features_in_:
+            raise ValueError(f"FTRL expected {self.n_features_in_} features, got {X.shape[1]}")
+
+        keep = np.isfinite(y)
+        if not keep.all():
+            X, y = X[keep], y[keep]
+        if len(y) == 0:
+            return self
+
+        self._update_scaler(X)
+        Xs = self._standardize(X)
+        for start in range(0, len(y), self.batch_size):
+            xb = Xs[start:start + self.batch_size]
+            w = self._weights()
+            residual = xb @ w[:-1] + w[-1] - y[start:start + self.batch_size]
+            g = np.empty_like(w)
+            g[:-1] = xb.T @ residual / len(xb)
+            g[-1] = residual.mean()
+            sigma = (np.sqrt(self.n_ + g * g) - np.sqrt(self.n_)) / self.alpha
+            self.z_ += g - sigma * w
+            self.n_ += g * g
+        self.n_seen_ += len(y)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.z_ is None:
+            raise ValueError("FTRLProximalRegressor has not seen any data")
+        w = self._weights()
+        return self._standardize(X) @ w[:-1] + w[-1]
+
+    @property
+    def coef_(self) -> np.ndarray:
+        var = np.divide(self.m2_, self.count_, out=np.zeros_like(self.m2_), where=self.count_ > 1)
+        std = np.sqrt(var)
+        std[std < 1e-9] = 1.0
+        return self._weights()[:-1] / std
+
+    @property
+    def intercept_(self) -> float:
+        w = self._weights()
+        return float(w[-1] - np.sum(self.coef_ * self.mean_))
+
+
+def iter_row_chunks(n_rows: int, chunk_rows: int) -> Iterator[slice]:
+    """Consecutive row slices of at most chunk_rows rows."""
+    for start in range(0, n_rows, max(1, int(chunk_rows))):
+        yield slice(start, min(n_rows, start + chunk_rows))
+
+
+def iter_parquet_chunks(paths: Sequence[Union[str, Path]], feature_names: Sequence[str], target: str,
+                        chunk_rows: int, time_col: Optional[str] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream (X, y) chunks from parquet files, reading only the needed columns.
+
+    With time_col, files (each sorted by time, e.g. one per symbol) are k-way merged so
+    chunks come out in global time order; rows are released up to the smallest
+    "latest buffered time" across open files, so memory stays at roughly one record
+    batch per file plus one chunk. Without time_col, files are read in the given order.
+    """
+    import pyarrow.parquet as pq
+
+    feature_names = list(feature_names)
+    columns = feature_names + [target] + ([time_col] if time_col else [])
+
+    def batches(path):
+        pf = pq.ParquetFile(str(path))
+        available = set(pf.schema_arrow.names)
+        missing = [c for c in columns if c not in available]
+        if missing:
+            raise KeyError(f"{path}: missing columns {missing[:5]}")
+        for batch in pf.iter_batches(batch_size=chunk_rows, columns=columns):
+            df = batch.to_pandas()
+            X = df[feature_names].to_numpy(dtype=np.float32)
+            y = df[target].to_numpy(dtype=np.float32)
+            t = df[time_col].to_numpy() if time_col else None
+            yield t, X, y
+
+    if not time_col:
+        for path in paths:
+            for _, X, y in batches(path):
+                yield X, y
+        return
+
+    readers = [batches(p) for p in paths]
+    pending: List[Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = [None] * len(readers)
+    done = [False] * len(readers)
+    while True:
+        # Every open file needs buffered rows to bound the merge watermark
+        for i, reader in enumerate(readers):
+            while not done[i] and (pending[i] is None or len(pending[i][0]) == 0):
+                nxt = next(reader, None)
+                if nxt is None:
+                    done[i] = True
+                else:
+                    pending[i] = nxt
+        live = [i for i in range(len(readers)) if pending[i] is not None and len(pending[i][0])]
+        if not live:
+            return
+        open_ends = [pending[i][0][-1] for i in live if not done[i]]
+        watermark = min(open_ends) if open_ends else None
+
+        ts, Xs, ys = [], [], []
+        for i in live:
+            t, X, y = pending[i]
+            cut = len(t) if watermark is None else int(np.searchsorted(t, watermark, side="right"))
+            if cut:
+                ts.append(t[:cut]); Xs.append(X[:cut]); ys.append(y[:cut])
+                pending[i] = (t[cut:], X[cut:], y[cut:])
+        t = np.concatenate(ts)
+        order = np.argsort(t, kind="stable")
+        X = np.concatenate(Xs)[order]
+        y = np.concatenate(ys)[order]
+        for rows in iter_row_chunks(len(y), chunk_rows):
+            yield X[rows], y[rows]
+
+
 class FTRLProximalTrainer(BaseModelTrainer):
     def __init__(self, config: Dict[str, Any] = None):
         # Load centralized config if available and no config provided
@@ -47,63 +307,134 @@ class FTRLProximalTrainer(BaseModelTrainer):
             except Exception as e:
                 logger.warning(f"Failed to load centralized config: {e}. Using hardcoded defaults.")
                 config = {}
-        
+
         super().__init__(config or {})
-        
+
         # DEPRECATED: Hardcoded defaults kept for backward compatibility
         # To change these, edit CONFIG/model_config/ftrl_proximal.yaml
-        self.config.setdefault("learning_rate", self.config.get("alpha", 0.0001))  # Support old "alpha" key
+        # FTRL alpha/beta (per-coordinate learning rate alpha / (beta + sqrt(sum g^2)))
+        self.config.setdefault("learning_rate", 0.5)  # FALLBACK_DEFAULT_OK (standardized features)
+        self.config.setdefault("beta", 1.0)
         self.config.setdefault("l1_regularization_strength", self.config.get("l1_ratio", 0.15))  # Support old key
-        self.config.setdefault("max_iter", 2000)
-        self.config.setdefault("tol", 1e-4)
-        self.config.setdefault("learning_rate_schedule", "optimal")
+        self.config.setdefault("l2_regularization_strength", 1.0)
+        self.config.setdefault("epochs", 1)  # Passes over the stream (1 = pure online)
+        self.config.setdefault("chunk_rows", 100_000)  # Rows held in memory per partial_fit call
+        self.config.setdefault("minibatch_rows", 256)  # Rows per FTRL update within a chunk
+        self.config.setdefault("clip", 5.0)  # Clip standardized features to +/- clip
 
-    def train(self, X_tr: np.ndarray, y_tr: np.ndarray, 
+    def train(self, X_tr: np.ndarray, y_tr: np.ndarray,
               X_va=None, y_va=None, feature_names: List[str] = None, **kwargs) -> Any:
-        # 1) Preprocess data
+        """
+        Train on in-memory data by streaming the training rows in row (time) order.
+
+        kwargs:
+            warm_start: state file (.npz), FTRLProximalRegressor or FTRLProximalTrainer
+                to continue from (e.g. yesterday's weights)
+        """
+        # 1) Preprocess data; names follow the columns preprocessing keeps (colmask)
+        n_in = np.shape(X_tr)[1]
         X_tr, y_tr = self.preprocess_data(X_tr, y_tr)
-        self.feature_names = feature_names or [f"f{i}" for i in range(X_tr.shape[1])]
-        
-        # 2) Split only if no external validation provided
+        names = list(feature_names) if feature_names is not None else [f"f{i}" for i in range(n_in)]
+        if self.colmask is not None and len(names) == len(self.colmask):
+            names = [name for name, keep in zip(names, self.colmask) if keep]
+        self.feature_names = names
+
+        # 2) Split only if no external validation provided (indices keep the stream in row order)
+        train_rows = np.arange(X_tr.shape[0])
         if X_va is None or y_va is None:
             test_size, random_state = self._get_test_split_params()
-            X_tr, X_va, y_tr, y_va = train_test_split(
-                X_tr, y_tr, test_size=test_size, random_state=random_state
+            train_rows, val_rows = train_test_split(
+                train_rows, test_size=test_size, random_state=random_state
             )
-        
-        # 3) Build model with safe defaults
-        model = self._build_model()
-        
-        # 4) Train
-        self.fit_with_threads(model, X_tr, y_tr)
-        
+            train_rows = np.sort(train_rows)
+            X_va, y_va = X_tr[val_rows], y_tr[val_rows]
+        else:
+            X_va, _ = self.preprocess_data(X_va, None)
+
+        # 3) Build model (optionally warm-started)
+        model = self._build_model(kwargs.get("warm_start"))
+
+        # 4) Train: time-ordered chunks through partial_fit
+        for epoch in range(int(self.config["epochs"])):
+            for rows in iter_row_chunks(len(train_rows), self.config["chunk_rows"]):
+                idx = train_rows[rows]
+                model.partial_fit(X_tr[idx], y_tr[idx], feature_names=self.feature_names)
+            self._log_validation(model, X_va, y_va, epoch)
+
         # 5) Store state and sanity check
         self.model = model
         self.is_trained = True
-        self.post_fit_sanity(X_tr, "FTRLProximal")
+        self.post_fit_sanity(X_tr[train_rows[:1024]], "FTRLProximal")
+        return self.model
+
+    def train_from_parquet(self, paths: Sequence[Union[str, Path]], feature_names: List[str], target: str,
+                           time_col: Optional[str] = None, warm_start=None,
+                           validation: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Any:
+        """
+        Train by streaming feature/target columns from parquet in bounded memory.
+
+        No global imputer/column mask is fitted: the model standardizes and imputes
+        online, and predict() feeds raw features to it.
+        """
+        self.feature_names = list(feature_names)
+        self.colmask = None
+        self.imputer = None
+        model = self._build_model(warm_start)
+        for epoch in range(int(self.config["epochs"])):
+            for X, y in iter_parquet_chunks(paths, self.feature_names, target,
+                                            self.config["chunk_rows"], time_col=time_col):
+                model.partial_fit(X, y, feature_names=self.feature_names)
+            if validation is not None:
+                self._log_validation(model, validation[0], validation[1], epoch)
+
+        self.model = model
+        self.is_trained = True
+        logger.info(f"[FTRLProximal] Streamed {model.n_seen_} rows from {len(paths)} parquet files")
         return self.model
 
     def predict(self, X: np.ndarray) -> np.ndarray:
         if not self.is_trained:
             raise ValueError("Model not trained yet")
-        Xp, _ = self.preprocess_data(X, None)
+        if self.imputer is None and self.colmask is None:
+            Xp = np.asarray(X, dtype=np.float32)  # Streamed model: online scaler handles NaN
+        else:
+            Xp, _ = self.preprocess_data(X, None)
         preds = self.model.predict(Xp)
         return np.nan_to_num(preds, nan=0.0).astype(np.float32)
 
-    def _build_model(self):
-        """Build FTRLProximal model with safe defaults"""
-        alpha = self.config.get("learning_rate", self.config.get("alpha", 0.0001))
-        l1_ratio = self.config.get("l1_regularization_strength", self.config.get("l1_ratio", 0.15))
-        learning_rate_schedule = self.config.get("learning_rate_schedule", self.config.get("learning_rate", "optimal"))
-        
-        model = SGDRegressor(
-            penalty="elasticnet",
-            alpha=alpha,
-            l1_ratio=l1_ratio,
-            max_iter=self.config["max_iter"],
-            tol=self.config["tol"],
-            learning_rate=learning_rate_schedule,
-            random_state=self._get_random_state(),
-            **self.config.get("sgd_params", {})
+    def save_state(self, path: Union[str, Path]) -> Path:
+        """Save FTRL accumulators and scaler statistics for warm-starting a later run."""
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+        return self.model.save_state(path)
+
+    def _log_validation(self, model: FTRLProximalRegressor, X_va, y_va, epoch: int):
+        if X_va is None or y_va is None or len(y_va) == 0:
+            return
+        y_va = np.asarray(y_va, dtype=np.float64).ravel()
+        ok = np.isfinite(y_va)
+        if not ok.any():
+            return
+        rmse = float(np.sqrt(np.mean((model.predict(np.asarray(X_va)[ok]) - y_va[ok]) ** 2)))
+        logger.info(f"[FTRLProximal] epoch {epoch + 1}: {model.n_seen_} rows seen, val RMSE={rmse:.6g}")
+
+    def _build_model(self, warm_start=None) -> FTRLProximalRegressor:
+        """Build FTRL-Proximal model, optionally continuing from saved state"""
+        model = FTRLProximalRegressor(
+            alpha=self.config["learning_rate"],
+            beta=self.config["beta"],
+            l1=self.config["l1_regularization_strength"],
+            l2=self.config["l2_regularization_strength"],
+            batch_size=self.config["minibatch_rows"],
+            clip=self.config["clip"],
         )
-        return model
\ No newline at end of file
+        if warm_start is None:
+            return model
+        if isinstance(warm_start, FTRLProximalTrainer):
+            warm_start = warm_start.model
+        if isinstance(warm_start, FTRLProximalRegressor):
+            model.set_state(warm_start.get_state(), self.feature_names)
+        else:
+            model.load_state(warm_start, self.feature_names)
+        logger.info(f"[FTRLProximal] Warm start from {model.n_seen_} previously seen rows")
+        return model
@@ -84,6 +84,7 @@ class LightGBMTrainer(BaseModelTrainer):
         self.feature_names = feature_names or [f"f{i}" for i in range(X_tr.shape[1])]
         
         # 2) Split only if no external validation provided
+        idx_tr = idx_va = None
         if X_va is None or y_va is None:
             # Use deterministic seed from determinism system
             try:
@@ -92,8 +93,10 @@ class LightGBMTrainer(BaseModelTrainer):
             except:
                 split_seed = 42  # FALLBACK_DEFAULT_OK
             test_size, random_state = self._get_test_split_params()
-            X_tr, X_va, y_tr, y_va = train_test_split(
-                X_tr, y_tr, test_size=test_size, random_state=random_state
+            # Split row indices (same partition as splitting the arrays) so the binned
+            # panel can be subset instead of re-binning X_tr/X_va
+            idx_tr, idx_va = train_test_split(
+                np.arange(X_tr.shape[0]), test_size=test_size, random_state=random_state
             )
         
         # 3) Build model with safe defaults
@@ -111,11 +114,17 @@ class LightGBMTrainer(BaseModelTrainer):
             pass
         
         # Train the model (thread_guard is already applied by isolation runner)
-        model.fit(
-            X_tr, y_tr,
-            eval_set=[(X_va, y_va)],
-            callbacks=[lgb.early_stopping(self.config["early_stopping_rounds"], verbose=False)]
-        )
+        callbacks = [lgb.early_stopping(self.config["early_stopping_rounds"], verbose=False)]
+        if idx_tr is not None:
+            from TRAINING.common.binned_datasets import fit_lgbm_on_indices
+            binned_model = fit_lgbm_on_indices(model, X_tr, y_tr, idx_tr, idx_va, callbacks=callbacks)
+            if binned_model is not None:
+                model = binned_model
+            else:
+                model.fit(X_tr[idx_tr], y_tr[idx_tr], eval_set=[(X_tr[idx_va], y_tr[idx_va])], callbacks=callbacks)
+            X_tr = X_tr[idx_tr[:1024]]  # rows for post_fit_sanity
+        else:
+            model.fit(X_tr, y_tr, eval_set=[(X_va, y_va)], callbacks=callbacks)
         
         # 5) Store state and sanity check
         self.model = model
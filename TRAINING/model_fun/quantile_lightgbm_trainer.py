@@ -153,9 +153,10 @@ class QuantileLightGBMTrainer(BaseModelTrainer):
         
         # 2) Split for validation (crucial for quantile + early stopping)
         test_size, random_state = self._get_test_split_params()
-        X_tr, X_va, y_tr, y_va = train_test_split(
-            X, y, test_size=test_size, random_state=random_state, shuffle=False  # Chronological for time series
+        idx_tr, idx_va = train_test_split(
+            np.arange(X.shape[0]), test_size=test_size, random_state=random_state, shuffle=False  # Chronological for time series
         )
+        X_tr, X_va, y_tr, y_va = X[idx_tr], X[idx_va], y[idx_tr], y[idx_va]
         
         # 3) Get thread count
         omp = self._threads()
@@ -170,12 +171,17 @@ class QuantileLightGBMTrainer(BaseModelTrainer):
         except Exception:
             pass
         
-        # 4) Build LightGBM datasets
-        lgb_tr = lgb.Dataset(X_tr, label=y_tr, free_raw_data=False)
-        lgb_va = lgb.Dataset(X_va, label=y_va, reference=lgb_tr, free_raw_data=False)
-        
-        # 5) Setup params and callbacks
+        # 4) Setup params, then LightGBM datasets (binned panel subsets when the cache is enabled)
         params = self._safe_params(num_threads=omp, alpha=self.config["alpha"])
+        from TRAINING.common.binned_datasets import get_binned_dataset_cache
+        binned_cache = get_binned_dataset_cache()
+        if binned_cache is not None:
+            lgb_tr, lgb_va = binned_cache.lgb_subsets(X, y, params, [idx_tr, idx_va])
+        else:
+            lgb_tr = lgb.Dataset(X_tr, label=y_tr, free_raw_data=False)
+            lgb_va = lgb.Dataset(X_va, label=y_va, reference=lgb_tr, free_raw_data=False)
+        
+        # 5) Setup callbacks
         rounds = self.config["n_estimators"]
         esr = self.config["early_stopping_rounds"]
         budget = self.config["time_budget_sec"]
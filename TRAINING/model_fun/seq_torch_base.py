@@ -57,6 +57,10 @@ else:
 
 logger = logging.getLogger(__name__)
 
+def _is_lazy_windows(X) -> bool:
+    """True for SequenceWindows (duck-typed so this module does not import training_strategies)."""
+    return hasattr(X, "gather") and hasattr(X, "end_positions")
+
 class _SeqDataset(Dataset):
     """Simple dataset for sequential data."""
     def __init__(self, X, y):
@@ -69,6 +73,29 @@ class _SeqDataset(Dataset):
     def __getitem__(self, i): 
         return self.X[i], self.y[i]
 
+class _WindowDataset(Dataset):
+    """
+    Batch-level dataset over SequenceWindows.
+
+    Indexed with a list of window positions (via a BatchSampler), it gathers the
+    whole [B, T, F] batch from the shared 2D matrix in one strided take instead of
+    holding a materialized (N', T, F) copy. Forked DataLoader workers read the
+    parent's matrix (or memmap) without copying it.
+    """
+    def __init__(self, windows, y, positions):
+        self.windows = windows
+        self.y = np.asarray(y, dtype=np.float32).reshape(-1)
+        self.positions = np.asarray(positions, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, batch):
+        idx = self.positions[np.asarray(batch, dtype=np.int64)]
+        xb = torch.from_numpy(self.windows.gather(idx))
+        yb = torch.from_numpy(self.y[idx]).view(-1, 1)
+        return xb, yb
+
 class SeqTorchTrainerBase:
     """Minimal, reusable PyTorch training loop for (B, T, F) → scalar."""
     
@@ -108,6 +135,23 @@ class SeqTorchTrainerBase:
         """Create train/validation data loaders."""
         n = len(X)
         v = max(1024, int(0.1 * n))
+
+        if _is_lazy_windows(X):
+            # Lazy windows: samplers yield whole batches of window positions
+            from torch.utils.data import BatchSampler, RandomSampler, SequentialSampler
+            ds_tr = _WindowDataset(X, y, np.arange(n - v))
+            ds_va = _WindowDataset(X, y, np.arange(n - v, n))
+            kw = dict(
+                batch_size=None,
+                num_workers=self.config["num_workers"],
+                pin_memory=self.config["pin_memory"],
+            )
+            bs = self.config["batch_size"]
+            return (
+                DataLoader(ds_tr, sampler=BatchSampler(RandomSampler(ds_tr), bs, drop_last=False), **kw),
+                DataLoader(ds_va, sampler=BatchSampler(SequentialSampler(ds_va), bs, drop_last=False), **kw),
+            )
+
         ds_tr = _SeqDataset(X[:-v], y[:-v])
         ds_va = _SeqDataset(X[-v:], y[-v:])
         
@@ -208,8 +252,16 @@ class SeqTorchTrainerBase:
     def predict(self, X):
         """Make predictions on new data."""
         self.model.eval()
-        X = torch.as_tensor(X, dtype=torch.float32, device=self.device)
         preds = []
+
+        if _is_lazy_windows(X):
+            # Gather one chunk of windows at a time rather than the full 3D array
+            for i in range(0, len(X), 4096):
+                xb = torch.from_numpy(X.gather(np.arange(i, min(i + 4096, len(X))))).to(self.device)
+                preds.append(self.model(xb).float().detach().cpu().numpy().reshape(-1))
+            return np.nan_to_num(np.concatenate(preds), nan=0.0).astype(np.float32)
+
+        X = torch.as_tensor(X, dtype=torch.float32, device=self.device)
         
         for i in range(0, len(X), 4096):
             out = self.model(X[i:i+4096])
@@ -77,11 +77,14 @@ class XGBoostTrainer(BaseModelTrainer):
         self.feature_names = feature_names or [f"f{i}" for i in range(X_tr.shape[1])]
         
         # 2) Split only if no external validation provided
+        # Row indices are kept so the CPU path can reuse the binned panel (same partition as splitting the arrays)
+        X_all, y_all, idx_tr, idx_va = X_tr, y_tr, None, None
         if X_va is None or y_va is None:
             test_size, random_state = self._get_test_split_params()
-            X_tr, X_va, y_tr, y_va = train_test_split(
-                X_tr, y_tr, test_size=test_size, random_state=random_state
+            idx_tr, idx_va = train_test_split(
+                np.arange(X_all.shape[0]), test_size=test_size, random_state=random_state
             )
+            X_tr, X_va, y_tr, y_va = X_all[idx_tr], X_all[idx_va], y_all[idx_tr], y_all[idx_va]
         
         # 3) Determine if GPU is available
         cpu_only = kwargs.get("cpu_only", False)
@@ -194,12 +197,14 @@ class XGBoostTrainer(BaseModelTrainer):
                         raise
                 
             else:
-                # CPU training - use standard fit
-                model.fit(
-                    X_tr, y_tr,
-                    eval_set=[(X_va, y_va)],
-                    verbose=False
-                )
+                # CPU training - binned panel subsets when available, else standard fit
+                from TRAINING.common.binned_datasets import fit_xgb_on_indices
+                if idx_tr is None or not fit_xgb_on_indices(model, X_all, y_all, idx_tr, idx_va):
+                    model.fit(
+                        X_tr, y_tr,
+                        eval_set=[(X_va, y_va)],
+                        verbose=False
+                    )
         
         except Exception as e:
             # Cleanup on error
@@ -218,7 +223,7 @@ class XGBoostTrainer(BaseModelTrainer):
         self.post_fit_sanity(X_sample, "XGBoost")
         
         # 7) Final cleanup of training data
-        del X_tr, X_va, y_tr, y_va, X_sample
+        del X_tr, X_va, y_tr, y_va, X_sample, X_all, y_all
         gc.collect()
         
         return self.model
@@ -231,70 +236,20 @@ class XGBoostTrainer(BaseModelTrainer):
         return np.nan_to_num(preds, nan=0.0).astype(np.float32)
 
     def _check_gpu_available(self) -> bool:
-        """Check if GPU is available for XGBoost"""
+        """Check if GPU is available for XGBoost (probed once per process, see TRAINING.common.backend_capabilities)"""
         import os
+        from TRAINING.common.backend_capabilities import backend_capability
         cvd = os.getenv("CUDA_VISIBLE_DEVICES", "unset")
-        logger.info(f"[XGBoost] Checking GPU availability (CVD={cvd})")
-        
-        # If GPU is explicitly hidden, don't try to use it
-        if cvd == "-1" or cvd == "":
-            logger.info("[XGBoost] GPU hidden via CUDA_VISIBLE_DEVICES, using CPU")
-            return False
         
-        try:
-            import xgboost as xgb
-            # Check build info first
-            build_info = xgb.build_info()
-            use_cuda = build_info.get('USE_CUDA', False)
-            logger.info(f"[XGBoost] Build info: USE_CUDA={use_cuda}")
-            
-            # If not built with CUDA, definitely can't use GPU
-            if not use_cuda:
-                logger.info("[XGBoost] Built without CUDA support, using CPU")
-                return False
-            
-            # Check if CUDA runtime is actually available
-            try:
-                from TRAINING.common.subprocess_utils import safe_subprocess_run
-                import subprocess
-                result = safe_subprocess_run(
-                    ['nvidia-smi', '--query-gpu=name', '--format=csv,noheader'],
-                    timeout=2
-                )
-                if result.returncode != 0:
-                    logger.info("[XGBoost] nvidia-smi failed, GPU not accessible")
-                    return False
-            except (FileNotFoundError, subprocess.TimeoutExpired, OSError) as e:
-                # OSError can occur with readline library conflicts (symbol lookup errors)
-                # safe_subprocess_run already logs helpful messages for readline conflicts
-                logger.info(f"[XGBoost] nvidia-smi not available, GPU not accessible: {e}")
-                return False
-            
-            # Try to actually use GPU - this is the real test
-            # XGBoost 3.x uses device='cuda' with tree_method='hist' (not gpu_hist)
-            try:
-                test_data = xgb.DMatrix([[1, 2, 3]], label=[1])
-                # Try with device='cuda' (XGBoost 3.x API)
-                xgb.train({"device": "cuda", "tree_method": "hist", "max_depth": 1}, test_data, num_boost_round=1)
-                logger.info("[XGBoost] ✅ GPU available and working!")
-                return True
-            except (ValueError, RuntimeError) as ve:
-                # ValueError/RuntimeError means GPU isn't available or not properly configured
-                error_msg = str(ve).lower()
-                if "device" in error_msg or "cuda" in error_msg or "gpu" in error_msg:
-                    logger.warning(f"[XGBoost] ❌ GPU not available: {ve}")
-                    logger.info("[XGBoost] Falling back to CPU (tree_method='hist')")
-                    return False
-                raise  # Re-raise if it's a different error
-            except Exception as e:
-                # Any other error means GPU isn't working
-                logger.warning(f"[XGBoost] ❌ GPU test failed: {e}")
-                logger.info("[XGBoost] Falling back to CPU (tree_method='hist')")
-                return False
-        except Exception as e:
-            logger.warning(f"[XGBoost] ❌ Error checking GPU: {e}")
-            logger.info("[XGBoost] Falling back to CPU (tree_method='hist')")
-            return False
+        # Build info, nvidia-smi and a one-round CUDA fit (XGBoost 3.x: device='cuda' with tree_method='hist')
+        probe = backend_capability('xgboost', 'cuda')
+        source = "cached" if probe.cached else "probed"
+        if probe.available:
+            logger.info(f"[XGBoost] ✅ GPU available and working ({source}, CVD={cvd})")
+            return True
+        logger.info(f"[XGBoost] GPU not available ({source}, CVD={cvd}): {probe.error}")
+        logger.info("[XGBoost] Falling back to CPU (tree_method='hist')")
+        return False
     
     def _build_model(self, cpu_only: bool = False):
         """Build XGBoost model with safe defaults"""
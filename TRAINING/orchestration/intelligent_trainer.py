@@ -50,14 +50,8 @@ _TRAINING_ROOT = Path(__file__).resolve().parents[1]
 if str(_TRAINING_ROOT) not in sys.path:
     sys.path.insert(0, str(_TRAINING_ROOT))
 
-# Import ranking/selection modules
-from TRAINING.ranking import (
-    rank_targets,
-    discover_targets,
-    load_target_configs,
-    select_features_for_target,
-    load_multi_model_config
-)
+# Ranking/selection modules (TRAINING.ranking) are imported where used: they pull in
+# LightGBM/sklearn, which --help and cached runs should not pay for
 
 # Import new config system (optional - for backward compatibility)
 try:
@@ -794,6 +788,8 @@ class IntelligentTrainer:
                 top_targets = [r['target_name'] for r in cached[:top_n]]
                 return top_targets
         
+        from TRAINING.ranking import discover_targets, load_target_configs, rank_targets
+        
         # Discover or load targets
         try:
             # Try to discover targets from data
@@ -954,6 +950,8 @@ class IntelligentTrainer:
             )
             feature_selection_config = build_feature_selection_config(temp_exp)
         
+        from TRAINING.ranking import load_multi_model_config, select_features_for_target
+        
         # LEGACY: Load config if not provided
         if multi_model_config is None and feature_selection_config is None:
             multi_model_config = load_multi_model_config()
@@ -1082,6 +1080,7 @@ class IntelligentTrainer:
         try:
             from TRAINING.decisioning.decision_engine import DecisionEngine
             from TRAINING.utils.cohort_metadata_extractor import extract_cohort_metadata
+            from TRAINING.utils.reproducibility_index import ReproducibilityIndex
             
             # Try to extract cohort metadata early (for decision loading)
             # This is approximate - actual cohort_id will be computed later
@@ -1101,22 +1100,23 @@ class IntelligentTrainer:
                     
                     # Try to get segment_id from index
                     repro_dir = self.output_dir.parent / "REPRODUCIBILITY"
-                    index_file = repro_dir / "index.parquet"
-                    if index_file.exists():
+                    run_index = ReproducibilityIndex(repro_dir)
+                    if run_index.exists():
                         try:
-                            import pandas as pd
-                            df = pd.read_parquet(index_file)
-                            cohort_mask = df['cohort_id'] == cohort_id
-                            if cohort_mask.any() and 'segment_id' in df.columns:
+                            df = run_index.query(
+                                filters=[('cohort_id', '==', cohort_id)],
+                                columns=['cohort_id', 'segment_id']
+                            )
+                            if len(df) > 0 and df['segment_id'].notna().any():
                                 # Get latest segment_id for this cohort
-                                segment_id = int(df[cohort_mask]['segment_id'].iloc[-1])
+                                segment_id = int(df['segment_id'].dropna().iloc[-1])
                         except Exception:
                             pass
                 
                 if cohort_id and (decision_apply_mode or decision_dry_run):
                     repro_dir = self.output_dir.parent / "REPRODUCIBILITY"
                     index_file = repro_dir / "index.parquet"
-                    if index_file.exists():
+                    if ReproducibilityIndex(repro_dir).exists():
                         engine = DecisionEngine(index_file, apply_mode=decision_apply_mode)
                         latest_decision = engine.load_latest(cohort_id, base_dir=self.output_dir.parent)
                         
@@ -1274,6 +1274,7 @@ class IntelligentTrainer:
         elif targets is None:
             # Fallback: discover all targets
             logger.info("Discovering all targets from data...")
+            from TRAINING.ranking import discover_targets
             sample_symbol = self.symbols[0]
             targets_dict = discover_targets(sample_symbol, self.data_dir)
             targets = list(targets_dict.keys())
@@ -1802,6 +1803,10 @@ Examples:
                        help='Never refresh cache (use existing only)')
     parser.add_argument('--no-cache', action='store_true',
                        help='Disable caching entirely')
+    parser.add_argument('--model-cache', action='store_true',
+                       help='Reuse cached models whose data/config/seed match (see pipeline.model_cache)')
+    parser.add_argument('--no-model-cache', action='store_true',
+                       help='Always retrain models instead of reusing cached ones (see pipeline.model_cache)')
     
     # Config files
     parser.add_argument('--target-ranking-config', type=Path,
@@ -1817,6 +1822,11 @@ Examples:
     
     args = parser.parse_args()
     
+    if args.model_cache:
+        os.environ["TRAINER_MODEL_CACHE"] = "1"
+    if args.no_model_cache or args.no_cache:
+        os.environ["TRAINER_NO_MODEL_CACHE"] = "1"
+    
     # NEW: Load experiment config if provided (PREFERRED)
     experiment_config = None
     if args.experiment_config and _NEW_CONFIG_AVAILABLE:
@@ -2312,6 +2322,7 @@ Examples:
     )
     
     # Load configs (legacy support)
+    from TRAINING.ranking import load_multi_model_config, load_target_configs
     target_ranking_config = None
     if args.target_ranking_config:
         target_ranking_config = load_target_configs(args.target_ranking_config)
@@ -22,20 +22,34 @@ Extracted from SCRIPTS/rank_target_predictability.py and SCRIPTS/multi_model_fea
 to enable integration into the training pipeline while preserving leakage-free behavior.
 """
 
-from .target_ranker import (
-    TargetPredictabilityScore,
-    evaluate_target_predictability,
-    rank_targets,
-    discover_targets,
-    load_target_configs
-)
-
-from .feature_selector import (
-    FeatureImportanceResult,
-    select_features_for_target,
-    rank_features_multi_model,
-    load_multi_model_config
-)
+# Exports are resolved lazily (PEP 562): importing the package (or a light submodule)
+# must not pull in target_ranker/feature_selector and their model dependencies.
+_LAZY_EXPORTS = {
+    'TargetPredictabilityScore': '.target_ranker',
+    'evaluate_target_predictability': '.target_ranker',
+    'rank_targets': '.target_ranker',
+    'discover_targets': '.target_ranker',
+    'load_target_configs': '.target_ranker',
+    'FeatureImportanceResult': '.feature_selector',
+    'select_features_for_target': '.feature_selector',
+    'rank_features_multi_model': '.feature_selector',
+    'load_multi_model_config': '.feature_selector',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     'TargetPredictabilityScore',
@@ -48,4 +62,3 @@ __all__ = [
     'rank_features_multi_model',
     'load_multi_model_config',
 ]
-
@@ -290,16 +290,21 @@ def select_features_for_target(
                     horizon_minutes = _extract_horizon(target_column, leakage_config) if target_column else None
                     data_interval_minutes = detected_interval
                     
+                    # Folds are planned once per target/symbol (saved under output_dir for reruns)
+                    # and the same plan is handed to the importance producers
+                    from TRAINING.utils.purged_time_series_split import fold_plan_path
                     cv_splitter = harness.split_policy(
                         time_vals=time_vals, groups=None,
-                        horizon_minutes=horizon_minutes, data_interval_minutes=data_interval_minutes
+                        horizon_minutes=horizon_minutes, data_interval_minutes=data_interval_minutes,
+                        fold_plan=fold_plan_path(output_dir, target_column, view, symbol_to_process) if output_dir else None
                     )
                     
                     # Run importance producers
                     model_metrics, model_scores, mean_importance, suspicious_features, \
                     all_feature_importances, fold_timestamps = harness.run_importance_producers(
                         X=X, y=y, feature_names=feature_names, time_vals=time_vals,
-                        task_type=None, resolved_config=resolved_config
+                        task_type=None, resolved_config=resolved_config,
+                        fold_plan=cv_splitter.plan(len(X))
                     )
                     
                     # Save stability snapshots for each model family (same as target ranking)
@@ -407,12 +412,15 @@ def select_features_for_target(
                         # Use detected_interval from build_panel
                         data_interval_minutes = detected_interval
                         
-                        # Create split policy (same as target ranking)
+                        # Create split policy (same as target ranking). Folds are planned once
+                        # (saved under output_dir for reruns) and shared with the importance producers
+                        from TRAINING.utils.purged_time_series_split import fold_plan_path
                         cv_splitter = harness.split_policy(
                             time_vals=time_vals,
                             groups=None,
                             horizon_minutes=horizon_minutes,
-                            data_interval_minutes=data_interval_minutes
+                            data_interval_minutes=data_interval_minutes,
+                            fold_plan=fold_plan_path(output_dir, target_column, view) if output_dir else None
                         )
                         
                         # Run importance producers using same harness as target ranking
@@ -423,7 +431,8 @@ def select_features_for_target(
                             feature_names=feature_names,
                             time_vals=time_vals,
                             task_type=None,  # Will be inferred
-                            resolved_config=resolved_config  # Use resolved_config from build_panel
+                            resolved_config=resolved_config,  # Use resolved_config from build_panel
+                            fold_plan=cv_splitter.plan(len(X))
                         )
                     
                         # Convert to ImportanceResult format for aggregation
@@ -122,6 +122,96 @@ class ImportanceResult:
     train_score: float
 
 
+class ImportanceTensor:
+    """
+    Importances of many (symbol, family) results as one dense float32 array of shape
+    (slot, family, feature) over a shared feature index.
+    
+    Results can be merged as they arrive (add/extend), e.g. as each symbol finishes.
+    A slot is one symbol (a repeated (symbol, family) result gets its own slot).
+    Cells of (slot, family) pairs without a result are NaN; a result's unreported
+    features count as 0 within its family, as in a fillna(0) concat.
+    """
+    
+    def __init__(self, results: Optional[List[ImportanceResult]] = None):
+        self.features: List[str] = []
+        self.families: List[str] = []
+        self._feature_index = pd.Index([], dtype=object)
+        self._family_idx: Dict[str, int] = {}
+        self._slot_idx: Dict[Tuple[str, int], int] = {}
+        self._seen: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._values = np.full((0, 0, 0), np.nan, dtype=np.float32)
+        self._present = np.zeros((0, 0), dtype=bool)      # (slot, family)
+        self._has_feature = np.zeros((0, 0), dtype=bool)  # (family, feature)
+        self.n_slots = 0
+        self.n_results: Dict[str, int] = defaultdict(int)
+        if results:
+            self.extend(results)
+    
+    def _grow(self, n_slots: int, n_families: int, n_features: int) -> None:
+        cap = self._values.shape
+        if n_slots <= cap[0] and n_families <= cap[1] and n_features <= cap[2]:
+            return
+        new_cap = tuple(max(need, c * 2 if need > c else c, 1) for need, c in zip((n_slots, n_families, n_features), cap))
+        values = np.full(new_cap, np.nan, dtype=np.float32)
+        values[:cap[0], :cap[1], :cap[2]] = self._values
+        present = np.zeros(new_cap[:2], dtype=bool)
+        present[:cap[0], :cap[1]] = self._present
+        has_feature = np.zeros(new_cap[1:], dtype=bool)
+        has_feature[:cap[1], :cap[2]] = self._has_feature
+        self._values, self._present, self._has_feature = values, present, has_feature
+    
+    def add(self, result: ImportanceResult) -> None:
+        scores = result.importance_scores
+        cols = self._feature_index.get_indexer(scores.index)
+        if (cols < 0).any():
+            new_names = list(dict.fromkeys(scores.index[cols < 0]))
+            self.features.extend(new_names)
+            self._feature_index = pd.Index(self.features, dtype=object)
+            cols = self._feature_index.get_indexer(scores.index)
+        if result.model_family not in self._family_idx:
+            self._family_idx[result.model_family] = len(self.families)
+            self.families.append(result.model_family)
+        occurrence = self._seen[(result.symbol, result.model_family)]
+        self._seen[(result.symbol, result.model_family)] += 1
+        slot_key = (result.symbol, occurrence)
+        if slot_key not in self._slot_idx:
+            self._slot_idx[slot_key] = self.n_slots
+            self.n_slots += 1
+        self._grow(self.n_slots, len(self.families), len(self.features))
+        
+        slot = self._slot_idx[slot_key]
+        fam = self._family_idx[result.model_family]
+        self._values[slot, fam, cols] = np.asarray(scores.values, dtype=np.float32)
+        self._present[slot, fam] = True
+        self._has_feature[fam, cols] = True
+        self.n_results[result.model_family] += 1
+    
+    def extend(self, results: List[ImportanceResult]) -> None:
+        for result in results:
+            self.add(result)
+    
+    def family_scores(self, method: str = 'mean') -> np.ndarray:
+        """
+        Per-family aggregate across symbols, shape (family, feature); NaN where the
+        family never reported the feature.
+        """
+        S, F, P = self.n_slots, len(self.families), len(self.features)
+        present = self._present[:S, :F]
+        values = np.nan_to_num(self._values[:S, :F, :P], nan=0.0)
+        if method == 'median':
+            values = np.where(present[:, :, None], values, np.nan)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                scores = np.nanmedian(values, axis=0).astype(np.float64)
+        else:
+            counts = present.sum(axis=0).astype(np.float64)
+            sums = np.einsum('sf,sfp->fp', present.astype(np.float64), values)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                scores = sums / counts[:, None]
+        return np.where(self._has_feature[:F, :P], scores, np.nan)
+
+
 def normalize_importance(
     raw_importance: Optional[Union[np.ndarray, pd.Series]],
     n_features: int,
@@ -858,9 +948,9 @@ def extract_permutation_importance(model, X: np.ndarray, y: np.ndarray,
                                    model_family: Optional[str] = None,
                                    target_column: Optional[str] = None,
                                    symbol: Optional[str] = None) -> pd.Series:
-    """Extract permutation importance"""
+    """Extract permutation importance (batched engine: one baseline, in-place permutations)"""
     try:
-        from sklearn.inspection import permutation_importance
+        from TRAINING.common.permutation_importance import batched_permutation_importance
         
         # Need y for permutation importance
         if y is None:
@@ -877,11 +967,10 @@ def extract_permutation_importance(model, X: np.ndarray, y: np.ndarray,
             seed_parts.append(target_column)
         perm_seed = stable_seed_from(seed_parts)
         
-        result = permutation_importance(
+        result = batched_permutation_importance(
             model, X, y,
             n_repeats=n_repeats,
-            random_state=perm_seed,
-            n_jobs=1
+            random_state=perm_seed
         )
         
         return pd.Series(result.importances_mean, index=feature_names)
@@ -899,7 +988,8 @@ def train_model_and_get_importance(
     feature_names: List[str],
     data_interval_minutes: int = 5,  # Data bar interval (default: 5 minutes)
     target_column: Optional[str] = None,  # Target column name for horizon extraction
-    symbol: Optional[str] = None  # Symbol name for deterministic seed generation
+    symbol: Optional[str] = None,  # Symbol name for deterministic seed generation
+    fold_plan: Optional[Any] = None  # FoldPlan or path of a saved one for the purged CV (stability_selection)
 ) -> Tuple[Any, pd.Series, str]:
     """Train a single model family and extract importance"""
     
@@ -947,47 +1037,32 @@ def train_model_and_get_importance(
             try:
                 from CONFIG.config_loader import get_cfg
                 # SST: All values from config, no hardcoded defaults
+                from TRAINING.common.backend_capabilities import backend_available
                 test_enabled = get_cfg('gpu.lightgbm.test_enabled', default=True, config_name='gpu_config')
-                test_n_estimators = get_cfg('gpu.lightgbm.test_n_estimators', default=1, config_name='gpu_config')
-                test_samples = get_cfg('gpu.lightgbm.test_samples', default=10, config_name='gpu_config')
-                test_features = get_cfg('gpu.lightgbm.test_features', default=5, config_name='gpu_config')
                 gpu_device_id = get_cfg('gpu.lightgbm.gpu_device_id', default=0, config_name='gpu_config')
                 gpu_platform_id = get_cfg('gpu.lightgbm.gpu_platform_id', default=0, config_name='gpu_config')
                 try_cuda_first = get_cfg('gpu.lightgbm.try_cuda_first', default=True, config_name='gpu_config')
                 preferred_device = get_cfg('gpu.lightgbm.device', default='cuda', config_name='gpu_config')
                 
+                # Probes run once per process (and are cached per host), not per symbol
+                cuda_params = {'device': 'cuda', 'gpu_device_id': gpu_device_id}
+                opencl_params = {'device': 'gpu', 'gpu_platform_id': gpu_platform_id, 'gpu_device_id': gpu_device_id}
                 if test_enabled and try_cuda_first:
-                    # Try CUDA first (fastest)
-                    try:
-                        test_model = LGBMRegressor(device='cuda', n_estimators=test_n_estimators, gpu_device_id=gpu_device_id, verbose=-1)
-                        test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
-                        gpu_params = {'device': 'cuda', 'gpu_device_id': gpu_device_id}
-                    except Exception:
-                        try:
-                            # Try OpenCL
-                            test_model = LGBMRegressor(device='gpu', n_estimators=test_n_estimators, gpu_platform_id=gpu_platform_id, gpu_device_id=gpu_device_id, verbose=-1)
-                            test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
-                            gpu_params = {'device': 'gpu', 'gpu_platform_id': gpu_platform_id, 'gpu_device_id': gpu_device_id}
-                        except Exception:
-                            pass  # Fallback to CPU silently
+                    # Try CUDA first (fastest), then OpenCL; fallback to CPU silently
+                    if backend_available('lightgbm', 'cuda', gpu_device_id=gpu_device_id):
+                        gpu_params = cuda_params
+                    elif backend_available('lightgbm', 'gpu', gpu_device_id=gpu_device_id, gpu_platform_id=gpu_platform_id):
+                        gpu_params = opencl_params
                 elif test_enabled and preferred_device in ['cuda', 'gpu']:
-                    # Use preferred device directly
-                    try:
-                        if preferred_device == 'cuda':
-                            test_model = LGBMRegressor(device='cuda', n_estimators=test_n_estimators, gpu_device_id=gpu_device_id, verbose=-1)
-                            gpu_params = {'device': 'cuda', 'gpu_device_id': gpu_device_id}
-                        else:
-                            test_model = LGBMRegressor(device='gpu', n_estimators=test_n_estimators, gpu_platform_id=gpu_platform_id, gpu_device_id=gpu_device_id, verbose=-1)
-                            gpu_params = {'device': 'gpu', 'gpu_platform_id': gpu_platform_id, 'gpu_device_id': gpu_device_id}
-                        test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
-                    except Exception:
-                        pass  # Fallback to CPU silently
+                    # Use preferred device directly; fallback to CPU silently
+                    if preferred_device == 'cuda':
+                        if backend_available('lightgbm', 'cuda', gpu_device_id=gpu_device_id):
+                            gpu_params = cuda_params
+                    elif backend_available('lightgbm', 'gpu', gpu_device_id=gpu_device_id, gpu_platform_id=gpu_platform_id):
+                        gpu_params = opencl_params
                 elif preferred_device in ['cuda', 'gpu']:
                     # Skip test, use preferred device from config
-                    if preferred_device == 'cuda':
-                        gpu_params = {'device': 'cuda', 'gpu_device_id': gpu_device_id}
-                    else:
-                        gpu_params = {'device': 'gpu', 'gpu_platform_id': gpu_platform_id, 'gpu_device_id': gpu_device_id}
+                    gpu_params = cuda_params if preferred_device == 'cuda' else opencl_params
             except Exception:
                 pass  # Fallback to CPU silently
             
@@ -1053,25 +1128,16 @@ def train_model_and_get_importance(
                 xgb_tree_method = get_cfg('gpu.xgboost.tree_method', default='hist', config_name='gpu_config')
                 # Note: gpu_id removed in XGBoost 3.1+, use device='cuda:0' format if needed
                 test_enabled = get_cfg('gpu.xgboost.test_enabled', default=True, config_name='gpu_config')
-                test_n_estimators = get_cfg('gpu.xgboost.test_n_estimators', default=1, config_name='gpu_config')
-                test_samples = get_cfg('gpu.xgboost.test_samples', default=10, config_name='gpu_config')
-                test_features = get_cfg('gpu.xgboost.test_features', default=5, config_name='gpu_config')
                 
                 if xgb_device == 'cuda':
                     if test_enabled:
-                        # XGBoost 3.1+ uses device='cuda' with tree_method='hist' (gpu_id removed)
-                        try:
-                            test_model = xgb.XGBRegressor(tree_method='hist', device='cuda', n_estimators=test_n_estimators, verbosity=0)
-                            test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
+                        # Probed once per process (and cached per host), not per symbol
+                        from TRAINING.common.backend_capabilities import backend_available
+                        # XGBoost 2.0+ uses device='cuda' with tree_method='hist'; fall back to legacy tree_method='gpu_hist'
+                        if backend_available('xgboost', 'cuda'):
                             gpu_params = {'tree_method': xgb_tree_method, 'device': 'cuda'}
-                        except Exception:
-                            # Try legacy API: tree_method='gpu_hist' (for XGBoost < 2.0)
-                            try:
-                                test_model = xgb.XGBRegressor(tree_method='gpu_hist', n_estimators=test_n_estimators, verbosity=0)
-                                test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
-                                gpu_params = {'tree_method': 'gpu_hist'}  # Legacy API doesn't use device parameter
-                            except Exception:
-                                pass  # Fallback to CPU silently
+                        elif backend_available('xgboost', 'gpu_hist'):
+                            gpu_params = {'tree_method': 'gpu_hist'}  # Legacy API doesn't use device parameter
                     else:
                         # Skip test, use config values directly
                         gpu_params = {'tree_method': xgb_tree_method, 'device': 'cuda'}
@@ -1201,19 +1267,13 @@ def train_model_and_get_importance(
                 devices = get_cfg('gpu.catboost.devices', default='0', config_name='gpu_config')
                 thread_count = get_cfg('gpu.catboost.thread_count', default=8, config_name='gpu_config')
                 test_enabled = get_cfg('gpu.catboost.test_enabled', default=True, config_name='gpu_config')
-                test_iterations = get_cfg('gpu.catboost.test_iterations', default=1, config_name='gpu_config')
-                test_samples = get_cfg('gpu.catboost.test_samples', default=10, config_name='gpu_config')
-                test_features = get_cfg('gpu.catboost.test_features', default=5, config_name='gpu_config')
                 
                 if task_type == 'GPU':
                     if test_enabled:
-                        # Try GPU (CatBoost uses task_type='GPU' or devices parameter)
-                        try:
-                            test_model = cb.CatBoostRegressor(task_type='GPU', devices=devices, iterations=test_iterations, verbose=False)
-                            test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
+                        # Try GPU (CatBoost uses task_type='GPU' or devices parameter); probed once per process
+                        from TRAINING.common.backend_capabilities import backend_available
+                        if backend_available('catboost', 'GPU', devices=devices):
                             gpu_params = {'task_type': 'GPU', 'devices': devices}
-                        except Exception:
-                            pass  # Fallback to CPU silently
                     else:
                         # Skip test, use config values directly
                         gpu_params = {'task_type': 'GPU', 'devices': devices}
@@ -1807,9 +1867,6 @@ def train_model_and_get_importance(
     
     elif model_family == 'stability_selection':
         # Stability Selection - Bootstrap-based feature selection
-        from sklearn.linear_model import LassoCV
-        from sklearn.linear_model import LogisticRegressionCV
-        
         # Determine task type
         unique_vals = np.unique(y[~np.isnan(y)])
         is_binary = len(unique_vals) == 2 and set(unique_vals).issubset({0, 1, 0.0, 1.0})
@@ -1841,7 +1898,7 @@ def train_model_and_get_importance(
         # NOTE: Using row-count based purging (legacy). For better accuracy, use time-based purging:
         # purged_cv = PurgedTimeSeriesSplit(n_splits=3, purge_overlap_time=pd.Timedelta(minutes=target_horizon_minutes), time_column_values=timestamps)
         n_splits = model_config.get('n_splits', 3)  # Number of CV splits (configurable)
-        purged_cv = PurgedTimeSeriesSplit(n_splits=n_splits, purge_overlap=purge_overlap)
+        purged_cv = PurgedTimeSeriesSplit(n_splits=n_splits, purge_overlap=purge_overlap, fold_plan=fold_plan)
         
         n_bootstrap = model_config.get('n_bootstrap', 50)  # Reduced for speed
         # Get random_state from SST (determinism system) - no hardcoded defaults
@@ -1852,33 +1909,27 @@ def train_model_and_get_importance(
         stability_max_iter = model_config.get('max_iter', 1000)  # Max iterations for LassoCV/LogisticRegressionCV
         stability_n_jobs = model_config.get('n_jobs', 1)  # Parallel jobs
         
-        stability_scores = np.zeros(X.shape[1])
-        
-        for _ in range(n_bootstrap):
-            indices = np.random.choice(len(X), size=len(X), replace=True)
-            X_boot, y_boot = X[indices], y[indices]
-            
-            try:
-                # Clean config to prevent double random_state argument
-                from TRAINING.utils.config_cleaner import clean_config_for_estimator
-                if is_binary or is_multiclass:
-                    lr_config = {'Cs': stability_cs, 'cv': purged_cv, 'max_iter': stability_max_iter, 'n_jobs': stability_n_jobs}
-                    lr_config_clean = clean_config_for_estimator(LogisticRegressionCV, lr_config, extra_kwargs={'random_state': stability_random_state}, family_name='stability_selection')
-                    model = LogisticRegressionCV(**lr_config_clean, random_state=stability_random_state)
-                else:
-                    lasso_config = {'cv': purged_cv, 'max_iter': stability_max_iter, 'n_jobs': stability_n_jobs}
-                    lasso_config_clean = clean_config_for_estimator(LassoCV, lasso_config, extra_kwargs={'random_state': stability_random_state}, family_name='stability_selection')
-                    model = LassoCV(**lasso_config_clean, random_state=stability_random_state)
-                
-                model.fit(X_boot, y_boot)
-                stability_scores += (np.abs(model.coef_[0] if len(model.coef_.shape) > 1 else model.coef_) > 1e-6).astype(int)
-            except Exception as e:
-                # Skip failed bootstrap iterations (expected for some degenerate cases)
-                logger.debug(f"    stability_selection: Bootstrap iteration failed: {e}")
-                continue
+        stability_bootstrap_n_jobs = model_config.get('bootstrap_n_jobs')  # None = process thread budget
+        stability_refit_cv = model_config.get('refit_cv_per_bootstrap', False)
+        
+        # Bootstraps are sample-weight vectors over X (time order kept for the purged CV),
+        # fitted in parallel and warm-started from the pooled CV solution
+        from TRAINING.common.stability_selection import stability_selection
+        stability_result = stability_selection(
+            X, y,
+            classification=bool(is_binary or is_multiclass),
+            cv=purged_cv,
+            n_bootstrap=n_bootstrap,
+            random_state=stability_random_state,
+            Cs=stability_cs,
+            max_iter=stability_max_iter,
+            cv_n_jobs=stability_n_jobs,
+            n_jobs=stability_bootstrap_n_jobs,
+            refit_cv=stability_refit_cv,
+        )
         
-        # Normalize to 0-1 (fraction of times selected)
-        raw_importance = stability_scores / n_bootstrap
+        # Fraction of bootstraps in which each feature was selected (0-1)
+        raw_importance = stability_result.selection_frequency
         
         # Use normalize_importance to handle edge cases (all zeros, NaN, etc.)
         importance_values, fallback_reason = normalize_importance(
@@ -2061,6 +2112,12 @@ def process_single_symbol(
         # Track per-model reproducibility
         per_model_reproducibility = []
         
+        # CV folds for this symbol's panel are planned once and kept under output_dir for reruns
+        fold_plan = None
+        if output_dir is not None:
+            from TRAINING.utils.purged_time_series_split import fold_plan_path
+            fold_plan = fold_plan_path(output_dir, target_column, symbol=symbol)
+        
         for family_name, family_config in model_families_config.items():
             if not family_config.get('enabled', False):
                 continue
@@ -2071,7 +2128,8 @@ def process_single_symbol(
                     family_name, family_config, X_arr, y_arr, feature_names,
                     data_interval_minutes=detected_interval,
                     target_column=target_column,
-                    symbol=symbol  # Pass symbol for deterministic seed generation
+                    symbol=symbol,  # Pass symbol for deterministic seed generation
+                    fold_plan=fold_plan
                 )
                 
                 if importance is not None and importance.sum() > 0:
@@ -2274,32 +2332,32 @@ def aggregate_multi_model_importance(
     model_families_config: Dict[str, Dict[str, Any]],
     aggregation_config: Dict[str, Any],
     top_n: Optional[int] = None,
-    all_family_statuses: Optional[List[Dict[str, Any]]] = None  # Optional: for logging excluded families
+    all_family_statuses: Optional[List[Dict[str, Any]]] = None,  # Optional: for logging excluded families
+    importance_tensor: Optional[ImportanceTensor] = None  # Optional: results already merged incrementally
 ) -> Tuple[pd.DataFrame, List[str]]:
     """
     Aggregate feature importance across models AND symbols
     
     Strategy:
-    1. Group by model family
+    1. Gather importances into one (symbol, family, feature) array (ImportanceTensor)
     2. Aggregate within each family across symbols
     3. Weight by family weight
     4. Combine across families
     5. Rank by consensus
+    
+    All steps are array reductions over the shared feature index.
     """
     
-    if not all_results:
+    if not all_results and (importance_tensor is None or importance_tensor.n_slots == 0):
         logger.warning("⚠️  No results to aggregate - all model families may have failed or returned empty importance")
         return pd.DataFrame(), []
     
-    # Group results by model family
-    family_results = defaultdict(list)
-    for result in all_results:
-        family_results[result.model_family].append(result)
+    tensor = importance_tensor if importance_tensor is not None else ImportanceTensor(all_results)
     
     # Log which families were excluded due to failures (if status info available)
     if all_family_statuses:
         enabled_families = set(f for f, cfg in model_families_config.items() if cfg.get('enabled', False))
-        families_with_results = set(family_results.keys())
+        families_with_results = set(tensor.families)
         families_without_results = enabled_families - families_with_results
         
         if families_without_results:
@@ -2314,58 +2372,55 @@ def aggregate_multi_model_importance(
         
         logger.info(f"✅ Aggregating {len(families_with_results)} model families with results: {', '.join(sorted(families_with_results))}")
     
-    # Aggregate within each family
-    family_scores = {}
-    boruta_scores = None  # Store separately for gatekeeper role
-    
-    for family_name, results in family_results.items():
-        # Combine importances across symbols for this family
-        importances_df = pd.concat(
-            [r.importance_scores for r in results],
-            axis=1,
-            sort=False
-        ).fillna(0)
-        
-        # Aggregate across symbols (mean by default)
-        method = aggregation_config.get('per_symbol_method', 'mean')
-        if method == 'mean':
-            family_score = importances_df.mean(axis=1)
-        elif method == 'median':
-            family_score = importances_df.median(axis=1)
-        else:
-            family_score = importances_df.mean(axis=1)
-        
+    # Aggregate within each family across symbols (mean by default), shape (family, feature)
+    method = aggregation_config.get('per_symbol_method', 'mean')
+    per_family = tensor.family_scores('median' if method == 'median' else 'mean')
+    all_features = np.asarray(tensor.features, dtype=object)
+    
+    scorer_families = []
+    scorer_rows = []
+    boruta_row = None  # Store separately for gatekeeper role
+    for f, family_name in enumerate(tensor.families):
+        family_score = per_family[f]
         # Apply family weight
         weight = model_families_config[family_name].get('weight', 1.0)
         
         # CRITICAL: Boruta is NOT included in base consensus - it's a gatekeeper, not a scorer
         if family_name == 'boruta':
-            boruta_scores = family_score  # Store for gatekeeper role only
-            logger.info(f"🔒 {family_name}: Aggregated {len(results)} symbols (gatekeeper, excluded from base consensus)")
+            boruta_row = family_score  # Store for gatekeeper role only
+            logger.info(f"🔒 {family_name}: Aggregated {tensor.n_results[family_name]} symbols (gatekeeper, excluded from base consensus)")
         else:
-            family_scores[family_name] = family_score * weight
-            logger.info(f"📊 {family_name}: Aggregated {len(results)} symbols, "
-                       f"weight={weight}, top={family_score.idxmax()}")
+            scorer_families.append(family_name)
+            scorer_rows.append(family_score * weight)
+            top = all_features[int(np.nanargmax(family_score))] if np.isfinite(family_score).any() else None
+            logger.info(f"📊 {family_name}: Aggregated {tensor.n_results[family_name]} symbols, "
+                       f"weight={weight}, top={top}")
     
     # Combine across families (EXCLUDING Boruta - it's a gatekeeper, not a scorer)
-    if not family_scores:
+    if not scorer_rows:
         logger.warning("No model family results available (all families may have failed or been disabled)")
         return pd.DataFrame(), []
     
-    combined_df = pd.DataFrame(family_scores)
+    # (scorer family, feature); features only Boruta reported are not part of the consensus
+    combined = np.vstack(scorer_rows)
+    keep = np.isfinite(combined).any(axis=0)
+    combined = combined[:, keep]
+    features = all_features[keep]
+    reported = np.isfinite(combined)
+    n_reported = reported.sum(axis=0)
     
     # Calculate BASE consensus score (from non-Boruta families only)
     # Keep this separate from final score so we can see Boruta's effect
     cross_model_method = aggregation_config.get('cross_model_method', 'weighted_mean')
-    if cross_model_method == 'weighted_mean':
-        consensus_score_base = combined_df.mean(axis=1)
-    elif cross_model_method == 'median':
-        consensus_score_base = combined_df.median(axis=1)
-    elif cross_model_method == 'geometric_mean':
-        # Geometric mean (good for multiplicative effects)
-        consensus_score_base = np.exp(np.log(combined_df + 1e-10).mean(axis=1))
-    else:
-        consensus_score_base = combined_df.mean(axis=1)
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if cross_model_method == 'median':
+            consensus_score_base = np.nanmedian(combined, axis=0)
+        elif cross_model_method == 'geometric_mean':
+            # Geometric mean (good for multiplicative effects)
+            consensus_score_base = np.exp(np.nanmean(np.log(combined + 1e-10), axis=0))
+        else:
+            consensus_score_base = np.nansum(combined, axis=0) / n_reported
     
     # BORUTA GATEKEEPER: Apply Boruta as statistical gate (bonus/penalty system)
     # Boruta is not just another importance scorer - it's a robustness check
@@ -2373,10 +2428,12 @@ def aggregate_multi_model_importance(
     
     # Check if Boruta is enabled in config (even if no results)
     boruta_enabled = model_families_config.get('boruta', {}).get('enabled', False)
+    n_features = len(features)
     
-    if boruta_scores is not None:
+    if boruta_row is not None:
         boruta_bonus = aggregation_config.get('boruta_confirm_bonus', 0.2)  # Bonus for confirmed features
         boruta_penalty = aggregation_config.get('boruta_reject_penalty', -0.3)  # Penalty for rejected features
+        boruta_scores = boruta_row[keep]
         
         # Boruta scores: 1.0=confirmed, 0.3=tentative, 0.0=rejected
         # (Note: rejected is 0.0, not -1.0, to ensure positive sum for validation)
@@ -2384,23 +2441,22 @@ def aggregate_multi_model_importance(
         confirmed_threshold = aggregation_config.get('boruta_confirmed_threshold', 0.9)  # Configurable threshold
         tentative_threshold = aggregation_config.get('boruta_tentative_threshold', 0.1)  # Updated: 0.1 to distinguish from 0.0 (rejected)
         
-        confirmed_mask = boruta_scores >= confirmed_threshold  # Confirmed (score >= 0.9, typically = 1.0)
-        rejected_mask = boruta_scores <= 0.0  # Rejected (score = 0.0, updated from < 0.0)
-        tentative_mask = (boruta_scores > tentative_threshold) & (boruta_scores < confirmed_threshold)  # Tentative (between 0.1 and 0.9, typically = 0.3)
+        with np.errstate(invalid='ignore'):
+            confirmed_mask = boruta_scores >= confirmed_threshold  # Confirmed (score >= 0.9, typically = 1.0)
+            rejected_mask = boruta_scores <= 0.0  # Rejected (score = 0.0, updated from < 0.0)
+            tentative_mask = (boruta_scores > tentative_threshold) & (boruta_scores < confirmed_threshold)  # Tentative (between 0.1 and 0.9, typically = 0.3)
         
         # Calculate Boruta gate effect (bonus/penalty per feature)
-        boruta_gate_effect = pd.Series(0.0, index=consensus_score_base.index)
-        boruta_gate_effect[confirmed_mask] = boruta_bonus
-        boruta_gate_effect[rejected_mask] = boruta_penalty
         # Tentative features get no modifier (neutral = 0.0)
+        boruta_gate_effect = np.where(rejected_mask, boruta_penalty, np.where(confirmed_mask, boruta_bonus, 0.0))
         
         # Apply to base consensus to get final score
         consensus_score_final = consensus_score_base + boruta_gate_effect
         
         # Magnitude sanity check: warn if Boruta bonuses/penalties are too large relative to base consensus
         # Use explicit mathematical definition: ratio = max(|bonus|, |penalty|) / base_range
-        base_min = consensus_score_base.min()
-        base_max = consensus_score_base.max()
+        base_min = np.nanmin(consensus_score_base)
+        base_max = np.nanmax(consensus_score_base)
         base_range = max(base_max - base_min, 1e-9)  # Avoid division by zero
         
         # Calculate magnitude ratio (larger of bonus or penalty relative to base range)
@@ -2424,88 +2480,76 @@ def aggregate_multi_model_importance(
                 boruta_penalty
             )
         
-        logger.info(f"🔒 Boruta gatekeeper: {confirmed_mask.sum()} confirmed (+{boruta_bonus}), "
-                   f"{rejected_mask.sum()} rejected ({boruta_penalty}), "
-                   f"{tentative_mask.sum()} tentative (neutral)")
-        logger.debug(f"   Base consensus range: [{consensus_score_base.min():.3f}, {consensus_score_base.max():.3f}], "
-                    f"std={consensus_score_base.std():.3f}, magnitude_ratio={magnitude_ratio:.3f}")
+        logger.info(f"🔒 Boruta gatekeeper: {int(confirmed_mask.sum())} confirmed (+{boruta_bonus}), "
+                   f"{int(rejected_mask.sum())} rejected ({boruta_penalty}), "
+                   f"{int(tentative_mask.sum())} tentative (neutral)")
+        logger.debug(f"   Base consensus range: [{base_min:.3f}, {base_max:.3f}], "
+                    f"std={np.nanstd(consensus_score_base, ddof=1) if n_features > 1 else float('nan'):.3f}, "
+                    f"magnitude_ratio={magnitude_ratio:.3f}")
         
         # Calculate "Boruta changed ranking" metric: compare top-K sets before vs after gatekeeper
         # Use top_n if available, otherwise use a reasonable default (50) for comparison
-        top_k_for_comparison = top_n if top_n is not None else min(50, len(consensus_score_base))
-        if top_k_for_comparison > 0 and len(consensus_score_base) >= top_k_for_comparison:
-            # Get top-K features from base consensus (without Boruta)
-            top_base_features = set(
-                consensus_score_base.sort_values(ascending=False).head(top_k_for_comparison).index
-            )
-            # Get top-K features from final consensus (with Boruta)
-            top_final_features = set(
-                consensus_score_final.sort_values(ascending=False).head(top_k_for_comparison).index
-            )
+        top_k_for_comparison = top_n if top_n is not None else min(50, n_features)
+        if top_k_for_comparison > 0 and n_features >= top_k_for_comparison:
+            # Top-K features from base consensus (without Boruta) vs final consensus (with Boruta)
+            top_base_features = set(np.argsort(-consensus_score_base, kind='stable')[:top_k_for_comparison])
+            top_final_features = set(np.argsort(-consensus_score_final, kind='stable')[:top_k_for_comparison])
             # Symmetric difference: features that changed in top-K set
             changed_features = len(top_base_features ^ top_final_features)
             logger.info(f"   Boruta ranking impact: {changed_features} features changed in top-{top_k_for_comparison} set "
                        f"(base vs final). Ratio: {changed_features/top_k_for_comparison:.1%}")
         
-        # Store for summary_df
-        boruta_gate_effect_series = boruta_gate_effect
-        boruta_gate_scores_series = boruta_scores
-        boruta_confirmed_mask = confirmed_mask
-        boruta_rejected_mask = rejected_mask
-        boruta_tentative_mask = tentative_mask
-        
-    elif boruta_enabled:
-        # Boruta enabled but failed completely (no results from any symbol)
-        logger.warning("🔒 Boruta gatekeeper disabled or unavailable for this target (no effect). "
-                      "Boruta may have failed for all symbols or was disabled mid-run.")
-        # Set defaults: no effect
-        boruta_gate_effect_series = pd.Series(0.0, index=consensus_score_base.index)
-        boruta_gate_scores_series = pd.Series(0.0, index=consensus_score_base.index)
-        boruta_confirmed_mask = pd.Series(False, index=consensus_score_base.index)
-        boruta_rejected_mask = pd.Series(False, index=consensus_score_base.index)
-        boruta_tentative_mask = pd.Series(False, index=consensus_score_base.index)
-        consensus_score_final = consensus_score_base.copy()
     else:
-        # Boruta not enabled in config - explicit log for clarity
-        logger.debug("🔒 Boruta gatekeeper: disabled via config (no effect on consensus).")
-        boruta_gate_effect_series = pd.Series(0.0, index=consensus_score_base.index)
-        boruta_gate_scores_series = pd.Series(0.0, index=consensus_score_base.index)
-        boruta_confirmed_mask = pd.Series(False, index=consensus_score_base.index)
-        boruta_rejected_mask = pd.Series(False, index=consensus_score_base.index)
-        boruta_tentative_mask = pd.Series(False, index=consensus_score_base.index)
+        if boruta_enabled:
+            # Boruta enabled but failed completely (no results from any symbol)
+            logger.warning("🔒 Boruta gatekeeper disabled or unavailable for this target (no effect). "
+                          "Boruta may have failed for all symbols or was disabled mid-run.")
+        else:
+            # Boruta not enabled in config - explicit log for clarity
+            logger.debug("🔒 Boruta gatekeeper: disabled via config (no effect on consensus).")
+        # Set defaults: no effect
+        boruta_gate_effect = np.zeros(n_features)
+        boruta_scores = np.zeros(n_features)
+        confirmed_mask = np.zeros(n_features, dtype=bool)
+        rejected_mask = np.zeros(n_features, dtype=bool)
+        tentative_mask = np.zeros(n_features, dtype=bool)
         consensus_score_final = consensus_score_base.copy()
     
     # Calculate consensus metrics
-    n_models = combined_df.shape[1]
-    frequency = (combined_df > 0).sum(axis=1)
+    n_models = combined.shape[0]
+    with np.errstate(invalid='ignore'):
+        frequency = (combined > 0).sum(axis=0)
     frequency_pct = (frequency / n_models) * 100
     
     # Standard deviation across models (lower = more consensus)
-    consensus_std = combined_df.std(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        model_mean = np.nansum(combined, axis=0) / n_reported
+        centered = np.where(reported, combined - model_mean, 0.0)
+        consensus_std = np.where(n_reported > 1, np.sqrt((centered ** 2).sum(axis=0) / (n_reported - 1)), np.nan)
     
     # Create summary DataFrame with base and final consensus scores
     summary_df = pd.DataFrame({
-        'feature': consensus_score_base.index,
-        'consensus_score_base': consensus_score_base.values,  # Base consensus (without Boruta)
-        'consensus_score': consensus_score_final.values,  # Final consensus (with Boruta gatekeeper effect)
-        'boruta_gate_effect': boruta_gate_effect_series.values,  # Pure Boruta effect (final - base)
+        'feature': features,
+        'consensus_score_base': consensus_score_base,  # Base consensus (without Boruta)
+        'consensus_score': consensus_score_final,  # Final consensus (with Boruta gatekeeper effect)
+        'boruta_gate_effect': boruta_gate_effect,  # Pure Boruta effect (final - base)
         'n_models_agree': frequency,
         'consensus_pct': frequency_pct,
         'std_across_models': consensus_std,
     })
     
     # Add per-family scores (excluding Boruta from per-family columns - it's in gatekeeper section)
-    for family_name in family_scores.keys():
-        summary_df[f'{family_name}_score'] = combined_df[family_name].values
+    for row, family_name in zip(combined, scorer_families):
+        summary_df[f'{family_name}_score'] = row
     
     # Always add Boruta gatekeeper columns (even if disabled/failed - shows zeros/False)
-    summary_df['boruta_gate_score'] = boruta_gate_scores_series.values  # Raw Boruta scores (1.0/0.3/0.0)
-    summary_df['boruta_confirmed'] = boruta_confirmed_mask.values
-    summary_df['boruta_rejected'] = boruta_rejected_mask.values
-    summary_df['boruta_tentative'] = boruta_tentative_mask.values
+    summary_df['boruta_gate_score'] = boruta_scores  # Raw Boruta scores (1.0/0.3/0.0)
+    summary_df['boruta_confirmed'] = confirmed_mask
+    summary_df['boruta_rejected'] = rejected_mask
+    summary_df['boruta_tentative'] = tentative_mask
     
-    # Sort by final consensus score (with Boruta effect)
-    summary_df = summary_df.sort_values('consensus_score', ascending=False).reset_index(drop=True)
+    # Sort by final consensus score (with Boruta effect); stable, so ties keep feature order
+    summary_df = summary_df.sort_values('consensus_score', ascending=False, kind='mergesort').reset_index(drop=True)
     
     # Filter by minimum consensus if specified
     min_models = aggregation_config.get('require_min_models', 1)
@@ -3007,6 +3051,7 @@ def main():
     
     # Process symbols (sequential to avoid GPU/memory conflicts)
     all_results = []
+    importance_tensor = ImportanceTensor()  # Merged per symbol so aggregation does not re-align everything at the end
     all_family_statuses = []  # Collect status info for debugging
     for i, (symbol, path) in enumerate(labeled_files, 1):
         # Check if already completed
@@ -3024,6 +3069,7 @@ def main():
                         if r_dict.get('train_score') is None:
                             r_dict['train_score'] = math.nan
                         all_results.append(ImportanceResult(**r_dict))
+                        importance_tensor.add(all_results[-1])
             continue
         elif not args.resume:
             continue
@@ -3036,6 +3082,7 @@ def main():
                 config['sampling']['max_samples_per_symbol']
             )
             all_results.extend(results)
+            importance_tensor.extend(results)
             all_family_statuses.extend(family_statuses)
             
             # Save checkpoint after each symbol
@@ -3070,7 +3117,8 @@ def main():
         config['model_families'],
         config['aggregation'],
         args.top_n,
-        all_family_statuses=all_family_statuses  # Pass status info for logging excluded families
+        all_family_statuses=all_family_statuses,  # Pass status info for logging excluded families
+        importance_tensor=importance_tensor
     )
     
     if summary_df.empty:
@@ -330,7 +330,8 @@ def train_and_evaluate_models(
     data_interval_minutes: int = 5,  # Data bar interval (default: 5-minute bars)
     time_vals: Optional[np.ndarray] = None,  # Timestamps for each sample (for fold timestamp tracking)
     explicit_interval: Optional[Union[int, str]] = None,  # Explicit interval from config (for consistency)
-    experiment_config: Optional[Any] = None  # Optional ExperimentConfig (for data.bar_interval)
+    experiment_config: Optional[Any] = None,  # Optional ExperimentConfig (for data.bar_interval)
+    fold_plan: Optional[Any] = None  # FoldPlan or path of a saved one (reused across consumers/reruns)
 ) -> Tuple[Dict[str, Dict[str, float]], Dict[str, float], float, Dict[str, List[Tuple[str, float]]], Dict[str, Dict[str, float]], List[Dict[str, Any]]]:
     """
     Train multiple models and return task-aware metrics + importance magnitude
@@ -342,6 +343,8 @@ def train_and_evaluate_models(
         task_type: TaskType enum (REGRESSION, BINARY_CLASSIFICATION, MULTICLASS_CLASSIFICATION)
         model_families: List of model family names to use
         multi_model_config: Multi-model config dict
+        fold_plan: FoldPlan (or path of a saved one, see fold_plan_path) to split with;
+            reused when it matches the panel and purge, so reruns see identical folds
     
     Returns:
         model_metrics: Dict of {model_name: {metric_name: value}} per model (full metrics)
@@ -390,6 +393,11 @@ def train_and_evaluate_models(
         This prevents overfitting by stopping when validation performance plateaus.
         """
         scores = []
+        # Folds of one panel share a binned LightGBM/XGBoost dataset (fingerprinted once)
+        from TRAINING.common.binned_datasets import fit_lgbm_on_indices, fit_xgb_on_indices
+        from TRAINING.common.preprocess_cache import array_fingerprint
+        use_binned = isinstance(X, np.ndarray) and isinstance(y, np.ndarray)
+        x_fingerprint = array_fingerprint(X) if use_binned else None
         for fold_idx, (train_idx, val_idx) in enumerate(cv.split(X, y)):
             try:
                 X_train, X_val = X[train_idx], X[val_idx]
@@ -409,22 +417,31 @@ def train_and_evaluate_models(
                     # Check by module name for reliability (str(type()) can be fragile)
                     model_module = type(fold_model).__module__
                     if 'lightgbm' in model_module.lower():
-                        fold_model.fit(
-                            X_train, y_train,
-                            eval_set=[(X_val, y_val)],
-                            callbacks=[lgb.early_stopping(early_stopping_rounds, verbose=False)]
-                        )
+                        callbacks = [lgb.early_stopping(early_stopping_rounds, verbose=False)]
+                        binned_model = fit_lgbm_on_indices(
+                            fold_model, X, y, train_idx, val_idx, callbacks=callbacks, fingerprint=x_fingerprint
+                        ) if use_binned else None
+                        if binned_model is not None:
+                            fold_model = binned_model
+                        else:
+                            fold_model.fit(
+                                X_train, y_train,
+                                eval_set=[(X_val, y_val)],
+                                callbacks=callbacks
+                            )
                     # XGBoost style: early_stopping_rounds is set in constructor (XGBoost 2.0+)
                     # Don't pass it to fit() - it's already in the model
                     elif 'xgboost' in model_module.lower():
                         import xgboost as xgb
                         # XGBoost 2.0+ has early_stopping_rounds in constructor, not fit()
                         # Check if model already has it set, otherwise use eval_set only
-                        fold_model.fit(
-                            X_train, y_train,
-                            eval_set=[(X_val, y_val)],
-                            verbose=False
-                        )
+                        if not (use_binned and fit_xgb_on_indices(
+                                fold_model, X, y, train_idx, val_idx, fingerprint=x_fingerprint)):
+                            fold_model.fit(
+                                X_train, y_train,
+                                eval_set=[(X_val, y_val)],
+                                verbose=False
+                            )
                     else:
                         # Fallback: try eval_set without callbacks
                         fold_model.fit(X_train, y_train, eval_set=[(X_val, y_val)])
@@ -639,7 +656,8 @@ def train_and_evaluate_models(
         tscv = PurgedTimeSeriesSplit(
             n_splits=cv_folds, 
             purge_overlap_time=purge_time,
-            time_column_values=time_vals
+            time_column_values=time_vals,
+            fold_plan=fold_plan
         )
         if log_cfg.cv_detail:
             logger.info(f"  Using PurgedTimeSeriesSplit (TIME-BASED): {cv_folds} folds, purge_time={purge_time}")
@@ -952,26 +970,18 @@ def train_and_evaluate_models(
         try:
             # GPU settings (will fallback to CPU if GPU not available)
             gpu_params = {}
-            try:
-                # Try CUDA first (fastest)
-                # DESIGN_CONSTANT_OK: n_estimators=1 for diagnostic leakage detection only, not production behavior
-                test_model = lgb.LGBMRegressor(device='cuda', n_estimators=1, verbose=lgbm_backend_cfg.native_verbosity)
-                test_model.fit(np.random.rand(10, 5), np.random.rand(10))
+            # Try CUDA first (fastest), then OpenCL; probed once per process (and cached per host)
+            from TRAINING.common.backend_capabilities import backend_available
+            if backend_available('lightgbm', 'cuda', gpu_device_id=0):
                 gpu_params = {'device': 'cuda', 'gpu_device_id': 0}
                 if log_cfg.gpu_detail:
                     logger.info("  Using GPU (CUDA) for LightGBM")
-            except:
-                try:
-                    # Try OpenCL
-                    # DESIGN_CONSTANT_OK: n_estimators=1 for diagnostic leakage detection only, not production behavior
-                    test_model = lgb.LGBMRegressor(device='gpu', n_estimators=1, verbose=lgbm_backend_cfg.native_verbosity)
-                    test_model.fit(np.random.rand(10, 5), np.random.rand(10))
-                    gpu_params = {'device': 'gpu', 'gpu_platform_id': 0, 'gpu_device_id': 0}
-                    if log_cfg.gpu_detail:
-                        logger.info("  Using GPU (OpenCL) for LightGBM")
-                except:
-                    if log_cfg.gpu_detail:
-                        logger.info("  Using CPU for LightGBM")
+            elif backend_available('lightgbm', 'gpu', gpu_device_id=0, gpu_platform_id=0):
+                gpu_params = {'device': 'gpu', 'gpu_platform_id': 0, 'gpu_device_id': 0}
+                if log_cfg.gpu_detail:
+                    logger.info("  Using GPU (OpenCL) for LightGBM")
+            elif log_cfg.gpu_detail:
+                logger.info("  Using CPU for LightGBM")
             
             # Get config values
             lgb_config = get_model_config('lightgbm', multi_model_config)
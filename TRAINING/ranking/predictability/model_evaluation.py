@@ -194,6 +194,111 @@ def _compute_suspicion_score(
     return max(0.0, min(1.0, suspicion))
 
 
+def _autofix_train_score(
+    model_metrics: Optional[Dict[str, Dict[str, float]]],
+    accuracy_threshold: float,
+    r2_threshold: float
+) -> Optional[float]:
+    """
+    First above-threshold training score in model_metrics, for the auto-fixer.
+    
+    Classification prefers training_accuracy (in-sample) over CV accuracy;
+    regression prefers training_r2 (in-sample correlation) over CV R².
+    """
+    for model_name, metrics in (model_metrics or {}).items():
+        if not isinstance(metrics, dict):
+            continue
+        for key, threshold, label in (
+            ('training_accuracy', accuracy_threshold, "training accuracy"),
+            ('accuracy', accuracy_threshold, "CV accuracy"),
+            ('training_r2', r2_threshold, "training correlation"),
+            ('r2', r2_threshold, "CV R²"),
+        ):
+            if key in metrics and metrics[key] >= threshold:
+                logger.debug(f"Using {label} {metrics[key]:.4f} from {model_name} for auto-fixer")
+                return metrics[key]
+    return None
+
+
+def _run_incremental_auto_fix(
+    fixer: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    feature_names: List[str],
+    task_type: TaskType,
+    symbols: Optional[pd.Series],
+    target_column: str,
+    target_name: str,
+    data_interval_minutes: int,
+    feature_importances: Dict[str, Dict[str, float]],
+    model_importance: Dict[str, float],
+    train_score: Optional[float],
+    min_confidence: float,
+    max_features: int,
+    max_iterations: int,
+    accuracy_threshold: float,
+    r2_threshold: float,
+    train_kwargs: Dict[str, Any]
+) -> Optional[Any]:
+    """
+    Auto-fix loop that warm-starts from this evaluation's results.
+    
+    The first iteration reuses the models already trained here. Each rerun
+    trains only the families whose importance flagged a leak, on the columns
+    still active in the fixer's mask (train_kwargs are passed through to
+    train_and_evaluate_models).
+    
+    Returns:
+        AutoFixInfo of the last iteration that changed configs (else the last one), or None
+    """
+    is_classification = task_type in (TaskType.BINARY_CLASSIFICATION, TaskType.MULTICLASS_CLASSIFICATION)
+    
+    def initial_pass():
+        return {
+            'X': X, 'y': y, 'feature_names': feature_names,
+            'family_importance': feature_importances,
+            'model_importance': model_importance,
+            'train_score': train_score, 'test_score': None,  # CV scores are already validation scores
+            'symbols': symbols,
+            'task_type': 'classification' if is_classification else 'regression',
+            'data_interval_minutes': data_interval_minutes,
+            'target_column': target_column
+        }
+    
+    def rerun(state, families, **_):
+        # Trainers need a dense matrix: gather the active columns once for all flagged families
+        X_active = state.values[:, state.column_mask]
+        result = train_and_evaluate_models(
+            X_active, np.asarray(state.y), state.active_feature_names, task_type,
+            model_families=families, target_column=target_column,
+            data_interval_minutes=data_interval_minutes, **train_kwargs
+        )
+        rerun_metrics, _, _, _, rerun_importances, _, _ = result
+        return {
+            'family_importance': rerun_importances,
+            'train_score': _autofix_train_score(rerun_metrics, accuracy_threshold, r2_threshold),
+            'test_score': None
+        }
+    
+    loop_result = fixer.run_auto_fix_loop(
+        training_function=initial_pass,
+        max_iterations=max_iterations,
+        min_confidence=min_confidence,
+        target_column=target_name,
+        max_features=max_features,
+        incremental=True,
+        rerun_function=rerun
+    )
+    infos = [entry['autofix_info'] for entry in loop_result.get('fix_history', [])]
+    if not infos:
+        logger.info("🔍 Auto-fix detected no leaks (may need manual review)")
+        return None
+    modified = [info for info in infos if info.modified_configs]
+    logger.info(f"✅ Incremental auto-fix finished after {loop_result['iterations']} iteration(s) "
+               f"(success={loop_result['success']}, {len(modified)} iteration(s) updated configs)")
+    return modified[-1] if modified else infos[-1]
+
+
 def _log_canonical_summary(
     target_name: str,
     target_column: str,
@@ -426,7 +531,8 @@ def train_and_evaluate_models(
     explicit_interval: Optional[Union[int, str]] = None,  # Explicit interval from config (for consistency)
     experiment_config: Optional[Any] = None,  # Optional ExperimentConfig (for data.bar_interval)
     output_dir: Optional[Path] = None,  # Optional output directory for stability snapshots
-    resolved_config: Optional[Any] = None  # NEW: ResolvedConfig with correct purge/embargo (post-pruning)
+    resolved_config: Optional[Any] = None,  # NEW: ResolvedConfig with correct purge/embargo (post-pruning)
+    fold_plan: Optional[Any] = None  # FoldPlan or path of a saved one (reused across consumers/reruns)
 ) -> Tuple[Dict[str, Dict[str, float]], Dict[str, float], float, Dict[str, List[Tuple[str, float]]], Dict[str, Dict[str, float]], List[Dict[str, Any]]]:
     """
     Train multiple models and return task-aware metrics + importance magnitude
@@ -438,6 +544,8 @@ def train_and_evaluate_models(
         task_type: TaskType enum (REGRESSION, BINARY_CLASSIFICATION, MULTICLASS_CLASSIFICATION)
         model_families: List of model family names to use
         multi_model_config: Multi-model config dict
+        fold_plan: FoldPlan (or path of a saved one, see fold_plan_path) to split with;
+            reused when it matches the panel and purge, so reruns see identical folds
     
     Returns:
         model_metrics: Dict of {model_name: {metric_name: value}} per model (full metrics)
@@ -495,6 +603,11 @@ def train_and_evaluate_models(
         This prevents overfitting by stopping when validation performance plateaus.
         """
         scores = []
+        # Folds of one panel share a binned LightGBM/XGBoost dataset (fingerprinted once)
+        from TRAINING.common.binned_datasets import fit_lgbm_on_indices, fit_xgb_on_indices
+        from TRAINING.common.preprocess_cache import array_fingerprint
+        use_binned = isinstance(X, np.ndarray) and isinstance(y, np.ndarray)
+        x_fingerprint = array_fingerprint(X) if use_binned else None
         for fold_idx, (train_idx, val_idx) in enumerate(cv.split(X, y)):
             try:
                 X_train, X_val = X[train_idx], X[val_idx]
@@ -514,22 +627,31 @@ def train_and_evaluate_models(
                     # Check by module name for reliability (str(type()) can be fragile)
                     model_module = type(fold_model).__module__
                     if 'lightgbm' in model_module.lower():
-                        fold_model.fit(
-                            X_train, y_train,
-                            eval_set=[(X_val, y_val)],
-                            callbacks=[lgb.early_stopping(early_stopping_rounds, verbose=False)]
-                        )
+                        callbacks = [lgb.early_stopping(early_stopping_rounds, verbose=False)]
+                        binned_model = fit_lgbm_on_indices(
+                            fold_model, X, y, train_idx, val_idx, callbacks=callbacks, fingerprint=x_fingerprint
+                        ) if use_binned else None
+                        if binned_model is not None:
+                            fold_model = binned_model
+                        else:
+                            fold_model.fit(
+                                X_train, y_train,
+                                eval_set=[(X_val, y_val)],
+                                callbacks=callbacks
+                            )
                     # XGBoost style: early_stopping_rounds is set in constructor (XGBoost 2.0+)
                     # Don't pass it to fit() - it's already in the model
                     elif 'xgboost' in model_module.lower():
                         import xgboost as xgb
                         # XGBoost 2.0+ has early_stopping_rounds in constructor, not fit()
                         # Check if model already has it set, otherwise use eval_set only
-                        fold_model.fit(
-                            X_train, y_train,
-                            eval_set=[(X_val, y_val)],
-                            verbose=False
-                        )
+                        if not (use_binned and fit_xgb_on_indices(
+                                fold_model, X, y, train_idx, val_idx, fingerprint=x_fingerprint)):
+                            fold_model.fit(
+                                X_train, y_train,
+                                eval_set=[(X_val, y_val)],
+                                verbose=False
+                            )
                     else:
                         # Fallback: try eval_set without callbacks
                         fold_model.fit(X_train, y_train, eval_set=[(X_val, y_val)])
@@ -948,7 +1070,8 @@ def train_and_evaluate_models(
         tscv = PurgedTimeSeriesSplit(
             n_splits=cv_folds, 
             purge_overlap_time=purge_time,
-            time_column_values=time_vals
+            time_column_values=time_vals,
+            fold_plan=fold_plan
         )
         if log_cfg.cv_detail:
             logger.info(f"  Using PurgedTimeSeriesSplit (TIME-BASED): {cv_folds} folds, purge_time={purge_time}")
@@ -1282,44 +1405,40 @@ def train_and_evaluate_models(
             try:
                 from CONFIG.config_loader import get_cfg
                 # SST: All values from config, no hardcoded defaults
+                from TRAINING.common.backend_capabilities import backend_capability
                 test_enabled = get_cfg('gpu.lightgbm.test_enabled', default=True, config_name='gpu_config')
-                test_n_estimators = get_cfg('gpu.lightgbm.test_n_estimators', default=1, config_name='gpu_config')
-                test_samples = get_cfg('gpu.lightgbm.test_samples', default=10, config_name='gpu_config')
-                test_features = get_cfg('gpu.lightgbm.test_features', default=5, config_name='gpu_config')
                 gpu_device_id = get_cfg('gpu.lightgbm.gpu_device_id', default=0, config_name='gpu_config')
                 gpu_platform_id = get_cfg('gpu.lightgbm.gpu_platform_id', default=0, config_name='gpu_config')
                 try_cuda_first = get_cfg('gpu.lightgbm.try_cuda_first', default=True, config_name='gpu_config')
                 preferred_device = get_cfg('gpu.lightgbm.device', default='cuda', config_name='gpu_config')
                 
+                # Probes run once per process (and are cached per host), not per target
                 if test_enabled and try_cuda_first:
-                    # Try CUDA first (fastest)
-                    try:
-                        test_model = lgb.LGBMRegressor(device='cuda', n_estimators=test_n_estimators, gpu_device_id=gpu_device_id, verbose=lgbm_backend_cfg.native_verbosity)
-                        test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
+                    # Try CUDA first (fastest), then OpenCL
+                    cuda = backend_capability('lightgbm', 'cuda', gpu_device_id=gpu_device_id)
+                    opencl = None if cuda.available else backend_capability(
+                        'lightgbm', 'gpu', gpu_device_id=gpu_device_id, gpu_platform_id=gpu_platform_id)
+                    if cuda.available:
                         gpu_params = {'device': 'cuda', 'gpu_device_id': gpu_device_id}
                         logger.info(f"  ✅ Using GPU (CUDA) for LightGBM (device_id={gpu_device_id})")
-                    except Exception as cuda_error:
-                        # Try OpenCL
-                        try:
-                            test_model = lgb.LGBMRegressor(device='gpu', n_estimators=test_n_estimators, gpu_platform_id=gpu_platform_id, gpu_device_id=gpu_device_id, verbose=lgbm_backend_cfg.native_verbosity)
-                            test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
-                            gpu_params = {'device': 'gpu', 'gpu_platform_id': gpu_platform_id, 'gpu_device_id': gpu_device_id}
-                            logger.info(f"  ✅ Using GPU (OpenCL) for LightGBM (platform_id={gpu_platform_id}, device_id={gpu_device_id})")
-                        except Exception as opencl_error:
-                            logger.warning(f"  ⚠️  LightGBM GPU not available (CUDA: {cuda_error}, OpenCL: {opencl_error}), using CPU")
+                    elif opencl.available:
+                        gpu_params = {'device': 'gpu', 'gpu_platform_id': gpu_platform_id, 'gpu_device_id': gpu_device_id}
+                        logger.info(f"  ✅ Using GPU (OpenCL) for LightGBM (platform_id={gpu_platform_id}, device_id={gpu_device_id})")
+                    else:
+                        logger.warning(f"  ⚠️  LightGBM GPU not available (CUDA: {cuda.error}, OpenCL: {opencl.error}), using CPU")
                 elif test_enabled and preferred_device in ['cuda', 'gpu']:
                     # Use preferred device directly
-                    try:
-                        if preferred_device == 'cuda':
-                            test_model = lgb.LGBMRegressor(device='cuda', n_estimators=test_n_estimators, gpu_device_id=gpu_device_id, verbose=lgbm_backend_cfg.native_verbosity)
-                            gpu_params = {'device': 'cuda', 'gpu_device_id': gpu_device_id}
-                        else:
-                            test_model = lgb.LGBMRegressor(device='gpu', n_estimators=test_n_estimators, gpu_platform_id=gpu_platform_id, gpu_device_id=gpu_device_id, verbose=lgbm_backend_cfg.native_verbosity)
-                            gpu_params = {'device': 'gpu', 'gpu_platform_id': gpu_platform_id, 'gpu_device_id': gpu_device_id}
-                        test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
+                    if preferred_device == 'cuda':
+                        probe = backend_capability('lightgbm', 'cuda', gpu_device_id=gpu_device_id)
+                        candidate = {'device': 'cuda', 'gpu_device_id': gpu_device_id}
+                    else:
+                        probe = backend_capability('lightgbm', 'gpu', gpu_device_id=gpu_device_id, gpu_platform_id=gpu_platform_id)
+                        candidate = {'device': 'gpu', 'gpu_platform_id': gpu_platform_id, 'gpu_device_id': gpu_device_id}
+                    if probe.available:
+                        gpu_params = candidate
                         logger.info(f"  ✅ Using GPU ({preferred_device.upper()}) for LightGBM")
-                    except Exception as gpu_error:
-                        logger.warning(f"  ⚠️  LightGBM GPU ({preferred_device}) not available: {gpu_error}, using CPU")
+                    else:
+                        logger.warning(f"  ⚠️  LightGBM GPU ({preferred_device}) not available: {probe.error}, using CPU")
                 else:
                     # Skip test, use preferred device from config
                     if preferred_device in ['cuda', 'gpu']:
@@ -1648,18 +1767,16 @@ def train_and_evaluate_models(
                 # Compute and store full task-aware metrics (Pipeline handles preprocessing)
                 _compute_and_store_metrics('neural_network', model, X, y_for_training, primary_score, task_type)
             
-            baseline_score = model.score(X, y_for_training)
-            
-            perm_scores = []
-            for i in range(min(10, X.shape[1])):  # Sample 10 features
-                X_perm = X.copy()
-                # Use deterministic seed for permutation
-                from TRAINING.common.determinism import stable_seed_from
-                perm_seed = stable_seed_from(['permutation', target_column if 'target_column' in locals() else 'default', f'feature_{i}'])
-                np.random.seed(perm_seed)
-                np.random.shuffle(X_perm[:, i])
-                perm_score = model.score(X_perm, y_for_training)
-                perm_scores.append(abs(baseline_score - perm_score))
+            # Sample 10 features; one batched pass (shared baseline, no per-feature copy of X)
+            from TRAINING.common.determinism import stable_seed_from
+            from TRAINING.common.permutation_importance import batched_permutation_importance
+            n_perm_features = min(10, X.shape[1])
+            perm_seed = stable_seed_from(['permutation', target_column if 'target_column' in locals() else 'default'])
+            perm_result = batched_permutation_importance(
+                model, X, y_for_training, n_repeats=1, random_state=perm_seed,
+                features=range(n_perm_features)
+            )
+            perm_scores = np.abs(perm_result.importances[:n_perm_features, 0])
             
             importance_magnitudes.append(np.mean(perm_scores))
             
@@ -1681,27 +1798,22 @@ def train_and_evaluate_models(
                 # Note: gpu_id removed in XGBoost 3.1+, use device='cuda:0' format if needed
                 # For now, just use 'cuda' for default GPU
                 test_enabled = get_cfg('gpu.xgboost.test_enabled', default=True, config_name='gpu_config')
-                test_n_estimators = get_cfg('gpu.xgboost.test_n_estimators', default=1, config_name='gpu_config')
-                test_samples = get_cfg('gpu.xgboost.test_samples', default=10, config_name='gpu_config')
-                test_features = get_cfg('gpu.xgboost.test_features', default=5, config_name='gpu_config')
                 
                 if xgb_device == 'cuda':
                     if test_enabled:
-                        # XGBoost 3.1+ uses device='cuda' with tree_method='hist' (gpu_id removed)
-                        try:
-                            test_model = xgb.XGBRegressor(tree_method='hist', device='cuda', n_estimators=test_n_estimators, verbosity=0)
-                            test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
+                        # Probed once per process (and cached per host), not per target
+                        from TRAINING.common.backend_capabilities import backend_capability
+                        # XGBoost 2.0+ uses device='cuda' with tree_method='hist'; fall back to legacy tree_method='gpu_hist'
+                        cuda = backend_capability('xgboost', 'cuda')
+                        legacy = None if cuda.available else backend_capability('xgboost', 'gpu_hist')
+                        if cuda.available:
                             gpu_params = {'tree_method': xgb_tree_method, 'device': 'cuda'}
                             logger.info("  ✅ Using GPU (CUDA) for XGBoost")
-                        except Exception as gpu_test_error:
-                            # Try legacy API: tree_method='gpu_hist' (for XGBoost < 2.0)
-                            try:
-                                test_model = xgb.XGBRegressor(tree_method='gpu_hist', n_estimators=test_n_estimators, verbosity=0)
-                                test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
-                                gpu_params = {'tree_method': 'gpu_hist'}  # Legacy API doesn't use device parameter
-                                logger.info("  ✅ Using GPU (CUDA) for XGBoost (legacy API: gpu_hist)")
-                            except Exception as legacy_error:
-                                logger.warning(f"  ⚠️  XGBoost GPU test failed (new API: {gpu_test_error}, legacy API: {legacy_error}), falling back to CPU")
+                        elif legacy.available:
+                            gpu_params = {'tree_method': 'gpu_hist'}  # Legacy API doesn't use device parameter
+                            logger.info("  ✅ Using GPU (CUDA) for XGBoost (legacy API: gpu_hist)")
+                        else:
+                            logger.warning(f"  ⚠️  XGBoost GPU test failed (new API: {cuda.error}, legacy API: {legacy.error}), falling back to CPU")
                     else:
                         # Skip test, use config values directly
                         gpu_params = {'tree_method': xgb_tree_method, 'device': 'cuda'}
@@ -1864,21 +1976,18 @@ def train_and_evaluate_models(
                 devices = get_cfg('gpu.catboost.devices', default='0', config_name='gpu_config')
                 thread_count = get_cfg('gpu.catboost.thread_count', default=8, config_name='gpu_config')
                 test_enabled = get_cfg('gpu.catboost.test_enabled', default=True, config_name='gpu_config')
-                test_iterations = get_cfg('gpu.catboost.test_iterations', default=1, config_name='gpu_config')
-                test_samples = get_cfg('gpu.catboost.test_samples', default=10, config_name='gpu_config')
-                test_features = get_cfg('gpu.catboost.test_features', default=5, config_name='gpu_config')
                 
                 if task_type == 'GPU':
                     if test_enabled:
                         # Try GPU (CatBoost uses task_type='GPU' or devices parameter)
-                        # Test if GPU is available
-                        try:
-                            test_model = cb.CatBoostRegressor(task_type='GPU', devices=devices, iterations=test_iterations, verbose=False)
-                            test_model.fit(np.random.rand(test_samples, test_features), np.random.rand(test_samples))
+                        # Probed once per process (and cached per host), not per target
+                        from TRAINING.common.backend_capabilities import backend_capability
+                        probe = backend_capability('catboost', 'GPU', devices=devices)
+                        if probe.available:
                             gpu_params = {'task_type': 'GPU', 'devices': devices}
                             logger.info(f"  ✅ Using GPU (CUDA) for CatBoost (devices={devices})")
-                        except Exception as gpu_test_error:
-                            logger.warning(f"  ⚠️  CatBoost GPU test failed, falling back to CPU: {gpu_test_error}")
+                        else:
+                            logger.warning(f"  ⚠️  CatBoost GPU test failed, falling back to CPU: {probe.error}")
                     else:
                         # Skip test, use config values directly
                         gpu_params = {'task_type': 'GPU', 'devices': devices}
@@ -3564,6 +3673,13 @@ def evaluate_target_predictability(
     all_suspicious_features = {}
     fold_timestamps = None  # Initialize fold_timestamps for later use
     
+    # Folds are planned once per target/view/symbol and saved next to the rankings:
+    # auto-fix reruns and later runs on the same panel reuse them
+    fold_plan = None
+    if output_dir:
+        from TRAINING.utils.purged_time_series_split import fold_plan_path
+        fold_plan = fold_plan_path(output_dir, target_column, view, symbol)
+    
     try:
         # Use detected_interval from outer scope (already computed above)
         # No need to recompute here
@@ -3576,7 +3692,8 @@ def evaluate_target_predictability(
             explicit_interval=explicit_interval,  # Pass explicit interval for consistency
             experiment_config=experiment_config,  # Pass experiment config
             output_dir=output_dir,  # Pass output directory for stability snapshots
-            resolved_config=resolved_config  # Pass resolved config with correct purge/embargo (post-pruning)
+            resolved_config=resolved_config,  # Pass resolved config with correct purge/embargo (post-pruning)
+            fold_plan=fold_plan
         )
         
         if result is None or len(result) != 7:
@@ -3835,28 +3952,7 @@ def evaluate_target_predictability(
                 
                 # Get actual training accuracy from model_metrics (not CV scores)
                 # This is critical - we detected perfect training accuracy, so pass that value
-                actual_train_score = None
-                if model_metrics:
-                    for model_name, metrics in model_metrics.items():
-                        if isinstance(metrics, dict):
-                            # For classification, prefer training_accuracy (in-sample), fall back to CV accuracy
-                            if 'training_accuracy' in metrics and metrics['training_accuracy'] >= accuracy_threshold:
-                                actual_train_score = metrics['training_accuracy']
-                                logger.debug(f"Using training accuracy {actual_train_score:.4f} from {model_name} for auto-fixer")
-                                break
-                            elif 'accuracy' in metrics and metrics['accuracy'] >= accuracy_threshold:
-                                actual_train_score = metrics['accuracy']
-                                logger.debug(f"Using CV accuracy {actual_train_score:.4f} from {model_name} for auto-fixer")
-                                break
-                            # For regression, prefer training_r2 (in-sample correlation), fall back to CV R²
-                            elif 'training_r2' in metrics and metrics['training_r2'] >= r2_threshold:
-                                actual_train_score = metrics['training_r2']
-                                logger.debug(f"Using training correlation {actual_train_score:.4f} from {model_name} for auto-fixer")
-                                break
-                            elif 'r2' in metrics and metrics['r2'] >= r2_threshold:
-                                actual_train_score = metrics['r2']
-                                logger.debug(f"Using CV R² {actual_train_score:.4f} from {model_name} for auto-fixer")
-                                break
+                actual_train_score = _autofix_train_score(model_metrics, accuracy_threshold, r2_threshold)
                 
                 # Fallback to CV score if no perfect training score found
                 # CRITICAL: Use the same max_cv_score we computed above for consistency
@@ -3886,56 +3982,82 @@ def evaluate_target_predictability(
                 else:
                     logger.warning(f"   ⚠️  No aggregated importance available! feature_importances keys: {list(feature_importances.keys()) if feature_importances else 'None'}")
                 
-                # Detect leaks
-                detections = fixer.detect_leaking_features(
-                    X=X_df, y=y_series, feature_names=feature_names,
-                    target_column=target_column,
-                    symbols=pd.Series(symbols_array) if symbols_array is not None else None,
-                    task_type='classification' if task_type == TaskType.BINARY_CLASSIFICATION or task_type == TaskType.MULTICLASS_CLASSIFICATION else 'regression',
-                    data_interval_minutes=detected_interval,
-                    model_importance=avg_importance if avg_importance else None,
-                    train_score=actual_train_score,
-                    test_score=None  # CV scores are already validation scores
-                )
-                
-                if detections:
-                    logger.warning(f"🔧 Auto-detected {len(detections)} leaking features")
-                    # Apply fixes (with high confidence threshold to avoid false positives)
-                    updates, autofix_info = fixer.apply_fixes(
-                        detections, 
-                        min_confidence=auto_fix_min_confidence, 
+                incremental_cfg = fixer._load_incremental_config()
+                if incremental_cfg['enabled']:
+                    # Warm-start loop: mask leaks and retrain only the families that flagged them
+                    try:
+                        max_reruns = int(leakage_cfg.get('auto_rerun', {}).get('max_reruns', 3))
+                    except Exception:
+                        max_reruns = 3  # FALLBACK_DEFAULT_OK
+                    autofix_info = _run_incremental_auto_fix(
+                        fixer, X, y, feature_names, task_type,
+                        symbols=pd.Series(symbols_array) if symbols_array is not None else None,
+                        target_column=target_column, target_name=target_name,
+                        data_interval_minutes=detected_interval,
+                        feature_importances=feature_importances or {},
+                        model_importance=avg_importance,
+                        train_score=actual_train_score,
+                        min_confidence=auto_fix_min_confidence,
                         max_features=auto_fix_max_features,
-                        dry_run=False,
-                        target_name=target_name
+                        max_iterations=1 + max_reruns,
+                        accuracy_threshold=accuracy_threshold, r2_threshold=r2_threshold,
+                        train_kwargs=dict(
+                            multi_model_config=multi_model_config, time_vals=time_vals,
+                            explicit_interval=explicit_interval, experiment_config=experiment_config,
+                            resolved_config=resolved_config, fold_plan=fold_plan
+                        )
                     )
-                    if autofix_info.modified_configs:
-                        logger.info(f"✅ Auto-fixed leaks. Configs updated.")
-                        logger.info(f"   Updated: {len(updates.get('excluded_features_updates', {}).get('exact_patterns', []))} exact patterns, "
-                                  f"{len(updates.get('excluded_features_updates', {}).get('prefix_patterns', []))} prefix patterns")
-                        logger.info(f"   Rejected: {len(updates.get('feature_registry_updates', {}).get('rejected_features', []))} features in registry")
-                    else:
-                        logger.warning("⚠️  Auto-fix detected leaks but no configs were modified")
-                        logger.warning("   This usually means all detections were below confidence threshold")
-                        logger.warning(f"   Check logs above for confidence distribution details")
-                    # Log backup info if available
-                    if autofix_info.backup_files:
-                        logger.info(f"📦 Backup created: {len(autofix_info.backup_files)} backup file(s)")
                 else:
-                    logger.info("🔍 Auto-fix detected no leaks (may need manual review)")
-                    # Still create backup even when no leaks detected (to preserve state history)
-                    # This ensures we have a backup whenever auto-fix mode is triggered
-                    # But only if backup_configs is enabled
-                    backup_files = []
-                    if fixer.backup_configs:
-                        try:
-                            backup_files = fixer._backup_configs(
-                                target_name=target_name,
-                                max_backups_per_target=None  # Use instance config
-                            )
-                            if backup_files:
-                                logger.info(f"📦 Backup created (no leaks detected): {len(backup_files)} backup file(s)")
-                        except Exception as backup_error:
-                            logger.warning(f"Failed to create backup when no leaks detected: {backup_error}")
+                    # Detect leaks
+                    detections = fixer.detect_leaking_features(
+                        X=X_df, y=y_series, feature_names=feature_names,
+                        target_column=target_column,
+                        symbols=pd.Series(symbols_array) if symbols_array is not None else None,
+                        task_type='classification' if task_type == TaskType.BINARY_CLASSIFICATION or task_type == TaskType.MULTICLASS_CLASSIFICATION else 'regression',
+                        data_interval_minutes=detected_interval,
+                        model_importance=avg_importance if avg_importance else None,
+                        train_score=actual_train_score,
+                        test_score=None  # CV scores are already validation scores
+                    )
+                
+                    if detections:
+                        logger.warning(f"🔧 Auto-detected {len(detections)} leaking features")
+                        # Apply fixes (with high confidence threshold to avoid false positives)
+                        updates, autofix_info = fixer.apply_fixes(
+                            detections, 
+                            min_confidence=auto_fix_min_confidence, 
+                            max_features=auto_fix_max_features,
+                            dry_run=False,
+                            target_name=target_name
+                        )
+                        if autofix_info.modified_configs:
+                            logger.info(f"✅ Auto-fixed leaks. Configs updated.")
+                            logger.info(f"   Updated: {len(updates.get('excluded_features_updates', {}).get('exact_patterns', []))} exact patterns, "
+                                      f"{len(updates.get('excluded_features_updates', {}).get('prefix_patterns', []))} prefix patterns")
+                            logger.info(f"   Rejected: {len(updates.get('feature_registry_updates', {}).get('rejected_features', []))} features in registry")
+                        else:
+                            logger.warning("⚠️  Auto-fix detected leaks but no configs were modified")
+                            logger.warning("   This usually means all detections were below confidence threshold")
+                            logger.warning(f"   Check logs above for confidence distribution details")
+                        # Log backup info if available
+                        if autofix_info.backup_files:
+                            logger.info(f"📦 Backup created: {len(autofix_info.backup_files)} backup file(s)")
+                    else:
+                        logger.info("🔍 Auto-fix detected no leaks (may need manual review)")
+                        # Still create backup even when no leaks detected (to preserve state history)
+                        # This ensures we have a backup whenever auto-fix mode is triggered
+                        # But only if backup_configs is enabled
+                        backup_files = []
+                        if fixer.backup_configs:
+                            try:
+                                backup_files = fixer._backup_configs(
+                                    target_name=target_name,
+                                    max_backups_per_target=None  # Use instance config
+                                )
+                                if backup_files:
+                                    logger.info(f"📦 Backup created (no leaks detected): {len(backup_files)} backup file(s)")
+                            except Exception as backup_error:
+                                logger.warning(f"Failed to create backup when no leaks detected: {backup_error}")
             except Exception as e:
                 logger.warning(f"Auto-fix failed: {e}", exc_info=True)
         
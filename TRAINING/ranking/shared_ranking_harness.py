@@ -328,7 +328,8 @@ class RankingHarness:
         time_vals: np.ndarray,
         groups: Optional[np.ndarray] = None,
         horizon_minutes: Optional[float] = None,
-        data_interval_minutes: float = 5.0
+        data_interval_minutes: float = 5.0,
+        fold_plan: Optional[Any] = None
     ) -> Any:
         """
         Create split policy (PurgedTimeSeriesSplit) with time-based purging.
@@ -341,6 +342,7 @@ class RankingHarness:
             groups: Optional grouping array (for panel data)
             horizon_minutes: Target horizon in minutes (for purge calculation)
             data_interval_minutes: Data bar interval in minutes
+            fold_plan: FoldPlan or path of a saved one (see fold_plan_path) to reuse
         
         Returns:
             PurgedTimeSeriesSplit instance
@@ -374,7 +376,8 @@ class RankingHarness:
         cv_splitter = PurgedTimeSeriesSplit(
             n_splits=cv_folds,
             purge_overlap_time=purge_time,
-            time_column_values=time_vals
+            time_column_values=time_vals,
+            fold_plan=fold_plan
         )
         
         return cv_splitter
@@ -386,7 +389,8 @@ class RankingHarness:
         feature_names: List[str],
         time_vals: Optional[np.ndarray] = None,
         task_type: Any = None,
-        resolved_config: Optional[Any] = None
+        resolved_config: Optional[Any] = None,
+        fold_plan: Optional[Any] = None
     ) -> Tuple[Dict[str, Dict[str, float]], Dict[str, float], float, 
                Dict[str, List[Tuple[str, float]]], Dict[str, Dict[str, float]], 
                List[Dict[str, Any]]]:
@@ -406,6 +410,7 @@ class RankingHarness:
             time_vals: Timestamps for each sample
             task_type: TaskType enum
             resolved_config: Optional ResolvedConfig with purge/embargo
+            fold_plan: FoldPlan or path of a saved one, passed to train_and_evaluate_models
         
         Returns:
             Tuple of (model_metrics, model_scores, mean_importance, 
@@ -451,7 +456,8 @@ class RankingHarness:
             explicit_interval=self.explicit_interval,
             experiment_config=self.experiment_config,
             output_dir=self.output_dir,
-            resolved_config=resolved_config
+            resolved_config=resolved_config,
+            fold_plan=fold_plan
         )
         
         return results
@@ -492,6 +498,14 @@ class RankingHarness:
         """
         from TRAINING.utils.run_context import RunContext
         
+        # Reuse the splitter's fold plan (computed once) so every consumer sees the same folds
+        fold_plan = None
+        if hasattr(cv_splitter, 'plan') and X is not None:
+            try:
+                fold_plan = cv_splitter.plan(len(X))
+            except Exception as e:
+                logger.debug(f"Could not build fold plan: {e}")
+        
         ctx = RunContext(
             stage="FEATURE_SELECTION" if self.job_type == "rank_features" else "TARGET_RANKING",
             target_name=self.target_column,
@@ -506,6 +520,7 @@ class RankingHarness:
             embargo_minutes=embargo_minutes,
             data_interval_minutes=data_interval_minutes,
             cv_splitter=cv_splitter,
+            fold_plan=fold_plan,
             view=self.view,
             symbol=self.symbol
         )
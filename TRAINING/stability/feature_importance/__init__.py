@@ -6,7 +6,15 @@ Non-invasive hooks for tracking and analyzing feature importance stability acros
 
 from .schema import FeatureImportanceSnapshot
 from .io import save_importance_snapshot, load_snapshots, get_snapshot_base_dir
-from .analysis import analyze_stability_auto, compute_stability_metrics, save_stability_report
+from .store import ImportanceMatrix, load_importance_matrix, import_json_snapshots
+from .analysis import (
+    analyze_stability_auto,
+    compute_stability_metrics,
+    pairwise_top_k_overlap,
+    pairwise_rank_correlation,
+    adjacent_rank_correlation,
+    save_stability_report,
+)
 from .hooks import save_snapshot_hook, save_snapshot_from_series_hook, analyze_all_stability_hook
 
 __all__ = [
@@ -14,8 +22,14 @@ __all__ = [
     'save_importance_snapshot',
     'load_snapshots',
     'get_snapshot_base_dir',
+    'ImportanceMatrix',
+    'load_importance_matrix',
+    'import_json_snapshots',
     'analyze_stability_auto',
     'compute_stability_metrics',
+    'pairwise_top_k_overlap',
+    'pairwise_rank_correlation',
+    'adjacent_rank_correlation',
     'save_stability_report',
     'save_snapshot_hook',
     'save_snapshot_from_series_hook',
@@ -23,7 +23,7 @@ Compute stability metrics and generate reports for feature importance snapshots.
 
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import numpy as np
 
 try:
@@ -35,6 +35,7 @@ except ImportError:
 
 from .schema import FeatureImportanceSnapshot
 from .io import load_snapshots
+from .store import ImportanceMatrix, load_importance_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -98,46 +99,136 @@ def rank_correlation(s1: FeatureImportanceSnapshot, s2: FeatureImportanceSnapsho
     return float(tau) if not np.isnan(tau) else np.nan
 
 
+def _as_matrix(snapshots: Union[List[FeatureImportanceSnapshot], ImportanceMatrix]) -> ImportanceMatrix:
+    if isinstance(snapshots, ImportanceMatrix):
+        return snapshots
+    return ImportanceMatrix.from_snapshots(snapshots)
+
+
+def _top_k_mask(matrix: ImportanceMatrix, k: int) -> np.ndarray:
+    """Boolean (n_snapshots, n_features) mask of each snapshot's top-K features."""
+    with np.errstate(invalid="ignore"):
+        return np.nan_to_num(matrix.ranks, nan=np.inf) < k
+
+
+def pairwise_top_k_overlap(matrix: ImportanceMatrix, k: int = 20) -> np.ndarray:
+    """
+    Jaccard similarity of top-K feature sets for all snapshot pairs at once.
+    
+    Returns:
+        (n_snapshots, n_snapshots) matrix; 1.0 where both top-K sets are empty
+    """
+    top = _top_k_mask(matrix, k).astype(np.float64)
+    intersection = top @ top.T
+    sizes = top.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - intersection
+    with np.errstate(invalid="ignore", divide="ignore"):
+        overlap = np.where(union > 0, intersection / np.where(union > 0, union, 1.0), 1.0)
+    return overlap
+
+
+def pairwise_rank_correlation(
+    matrix: ImportanceMatrix,
+    max_block_elements: int = 8_000_000  # DESIGN_CONSTANT_OK: memory bound for sign blocks
+) -> np.ndarray:
+    """
+    Kendall tau between all snapshot pairs at once, over each pair's common features.
+    
+    Ranks within a snapshot are distinct (positions), so tau-b reduces to
+    concordant-minus-discordant over m(m-1)/2 for the m common features. The
+    concordance sums for every pair come from one matrix product of per-snapshot
+    sign blocks sign(rank[a] - rank[b]) (0 when either feature is absent), computed
+    over feature blocks to keep memory bounded.
+    
+    Returns:
+        (n_snapshots, n_snapshots) matrix; NaN where fewer than 3 common features
+    """
+    n_snap, n_feat = matrix.ranks.shape
+    present = ~np.isnan(matrix.ranks)
+    ranks = np.where(present, matrix.ranks, 0.0)
+    
+    concordance = np.zeros((n_snap, n_snap))
+    block = max(1, int(max_block_elements // max(1, n_snap * n_feat)))
+    for a0 in range(0, n_feat, block):
+        a1 = min(n_feat, a0 + block)
+        signs = np.sign(ranks[:, a0:a1, None] - ranks[:, None, :])
+        signs *= present[:, a0:a1, None] & present[:, None, :]
+        flat = signs.reshape(n_snap, -1)
+        concordance += flat @ flat.T
+    concordance /= 2.0  # Every unordered feature pair was counted twice
+    
+    presence = present.astype(np.float64)
+    common = presence @ presence.T
+    n_pairs = common * (common - 1) / 2.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tau = np.where(common >= 3, concordance / np.where(n_pairs > 0, n_pairs, 1.0), np.nan)
+    return tau
+
+
+def adjacent_rank_correlation(matrix: ImportanceMatrix) -> np.ndarray:
+    """
+    Kendall tau between consecutive snapshots (i, i+1), over each pair's common features.
+    
+    One O(F log F) Kendall per pair, so this stays cheap for long histories and wide
+    feature sets; pairwise_rank_correlation covers all pairs at O(S^2 F^2).
+    
+    Returns:
+        (n_snapshots - 1,) array; NaN where fewer than 3 common features
+    """
+    n_snap = matrix.n_snapshots
+    taus = np.full(max(n_snap - 1, 0), np.nan)
+    if not SCIPY_AVAILABLE:
+        logger.warning("scipy not available, cannot compute Kendall tau")
+        return taus
+    present = ~np.isnan(matrix.ranks)
+    for i in range(n_snap - 1):
+        common = present[i] & present[i + 1]
+        if common.sum() < 3:
+            continue
+        tau, _ = kendalltau(matrix.ranks[i, common], matrix.ranks[i + 1, common])
+        taus[i] = tau
+    return taus
+
+
 def selection_frequency(
-    snapshots: List[FeatureImportanceSnapshot],
+    snapshots: Union[List[FeatureImportanceSnapshot], ImportanceMatrix],
     top_k: int = 20
 ) -> Dict[str, float]:
     """
     Compute how often each feature appears in top-K across snapshots.
     
     Args:
-        snapshots: List of snapshots
+        snapshots: List of snapshots or an ImportanceMatrix
         top_k: Number of top features to consider
     
     Returns:
         Dictionary mapping feature names to selection frequency (0.0 to 1.0)
     """
-    counts: Dict[str, int] = {}
-    total = len(snapshots)
-    
-    if total == 0:
+    matrix = _as_matrix(snapshots)
+    if matrix.n_snapshots == 0:
         return {}
     
-    for snapshot in snapshots:
-        # Features are already sorted by importance (descending)
-        top_features = set(snapshot.features[:top_k])
-        for feat in top_features:
-            counts[feat] = counts.get(feat, 0) + 1
-    
-    # Convert to frequencies
-    return {feat: count / total for feat, count in counts.items()}
+    freq = _top_k_mask(matrix, top_k).mean(axis=0)
+    selected = np.flatnonzero(freq > 0)
+    return {matrix.features[j]: float(freq[j]) for j in selected}
 
 
 def compute_stability_metrics(
-    snapshots: List[FeatureImportanceSnapshot],
-    top_k: int = 20
+    snapshots: Union[List[FeatureImportanceSnapshot], ImportanceMatrix],
+    top_k: int = 20,
+    all_pairs: bool = False
 ) -> Dict[str, float]:
     """
     Compute stability metrics for a list of snapshots.
     
+    The headline metrics compare adjacent runs: top-K overlap from one vectorized
+    pass, Kendall tau from one O(F log F) correlation per adjacent pair. all_pairs=True
+    also reports means over every pair of runs (all-pairs Kendall is O(S^2 F^2)).
+    
     Args:
-        snapshots: List of snapshots to analyze
+        snapshots: Snapshots to analyze (oldest first), or an ImportanceMatrix
         top_k: Number of top features to consider for overlap
+        all_pairs: Also compute mean_overlap_all_pairs / mean_tau_all_pairs
     
     Returns:
         Dictionary with stability metrics:
@@ -146,8 +237,10 @@ def compute_stability_metrics(
         - mean_tau: Mean Kendall tau correlation
         - std_tau: Std dev of tau
         - n_comparisons: Number of pairwise comparisons
+        - mean_overlap_all_pairs / mean_tau_all_pairs: Means over every pair of runs (all_pairs only)
     """
-    if len(snapshots) < 2:
+    matrix = _as_matrix(snapshots)
+    if matrix.n_snapshots < 2:
         return {
             "mean_overlap": np.nan,
             "std_overlap": np.nan,
@@ -156,33 +249,28 @@ def compute_stability_metrics(
             "n_comparisons": 0,
         }
     
-    # Compute pairwise metrics (adjacent runs)
-    overlaps = []
-    taus = []
+    overlap = pairwise_top_k_overlap(matrix, k=top_k)
     
-    for i in range(len(snapshots) - 1):
-        s1 = snapshots[i]
-        s2 = snapshots[i + 1]
-        
-        overlap = top_k_overlap(s1, s2, k=top_k)
-        overlaps.append(overlap)
-        
-        tau = rank_correlation(s1, s2)
-        if not np.isnan(tau):
-            taus.append(tau)
+    # Adjacent runs = first off-diagonal
+    overlaps_array = np.diagonal(overlap, offset=1)
+    taus_adjacent = adjacent_rank_correlation(matrix)
+    taus_array = taus_adjacent[~np.isnan(taus_adjacent)]
     
-    # Compute statistics
-    overlaps_array = np.array(overlaps)
-    taus_array = np.array(taus) if taus else np.array([np.nan])
-    
-    return {
+    metrics = {
         "mean_overlap": float(np.nanmean(overlaps_array)),
         "std_overlap": float(np.nanstd(overlaps_array)),
-        "mean_tau": float(np.nanmean(taus_array)) if len(taus) > 0 else np.nan,
-        "std_tau": float(np.nanstd(taus_array)) if len(taus) > 0 else np.nan,
-        "n_comparisons": len(overlaps),
-        "n_snapshots": len(snapshots),
+        "mean_tau": float(np.mean(taus_array)) if len(taus_array) > 0 else np.nan,
+        "std_tau": float(np.std(taus_array)) if len(taus_array) > 0 else np.nan,
+        "n_comparisons": len(overlaps_array),
+        "n_snapshots": matrix.n_snapshots,
     }
+    if all_pairs:
+        tau = pairwise_rank_correlation(matrix)
+        upper = np.triu_indices(matrix.n_snapshots, k=1)
+        taus_all = tau[upper][~np.isnan(tau[upper])]
+        metrics["mean_overlap_all_pairs"] = float(np.mean(overlap[upper]))
+        metrics["mean_tau_all_pairs"] = float(np.mean(taus_all)) if len(taus_all) > 0 else np.nan
+    return metrics
 
 
 def analyze_stability_auto(
@@ -217,16 +305,17 @@ def analyze_stability_auto(
     Returns:
         Dictionary with stability metrics, or None if insufficient snapshots
     """
-    snapshots = load_snapshots(base_dir, target_name, method)
+    matrix = load_importance_matrix(base_dir, target_name, method)
+    n_snapshots = matrix.n_snapshots if matrix is not None else 0
     
-    if len(snapshots) < min_snapshots:
+    if n_snapshots < min_snapshots:
         logger.debug(
             f"Insufficient snapshots for {target_name}/{method}: "
-            f"{len(snapshots)} < {min_snapshots}"
+            f"{n_snapshots} < {min_snapshots}"
         )
         return None
     
-    metrics = compute_stability_metrics(snapshots, top_k=top_k)
+    metrics = compute_stability_metrics(matrix, top_k=top_k)
     
     if log_to_console:
         logger.info(f"📊 Stability for {target_name}/{method}:")
@@ -251,14 +340,14 @@ def analyze_stability_auto(
             report_dir.mkdir(parents=True, exist_ok=True)
             report_path = report_dir / f"{target_name}_{method}.txt"
         
-        save_stability_report(metrics, snapshots, report_path, top_k=top_k)
+        save_stability_report(metrics, matrix, report_path, top_k=top_k)
     
     return metrics
 
 
 def save_stability_report(
     metrics: Dict[str, float],
-    snapshots: List[FeatureImportanceSnapshot],
+    snapshots: Union[List[FeatureImportanceSnapshot], ImportanceMatrix],
     report_path: Path,
     top_k: int = 20
 ) -> None:
@@ -267,19 +356,20 @@ def save_stability_report(
     
     Args:
         metrics: Stability metrics dictionary
-        snapshots: List of snapshots analyzed
+        snapshots: Snapshots analyzed (list or ImportanceMatrix)
         report_path: Path to save report
         top_k: Number of top features to include in report
     """
+    matrix = _as_matrix(snapshots)
     try:
         with report_path.open("w") as f:
             f.write(f"Feature Importance Stability Report\n")
             f.write(f"{'='*60}\n\n")
             
-            if len(snapshots) > 0:
-                f.write(f"Target: {snapshots[0].target_name}\n")
-                f.write(f"Method: {snapshots[0].method}\n")
-                f.write(f"Universe: {snapshots[0].universe_id or 'N/A'}\n")
+            if matrix.n_snapshots > 0:
+                f.write(f"Target: {matrix.target_name}\n")
+                f.write(f"Method: {matrix.method}\n")
+                f.write(f"Universe: {matrix.universe_ids[0] or 'N/A'}\n")
             
             f.write(f"\nMetrics:\n")
             f.write(f"  Snapshots analyzed: {metrics['n_snapshots']}\n")
@@ -289,7 +379,7 @@ def save_stability_report(
                 f.write(f"  Kendall tau: {metrics['mean_tau']:.3f} ± {metrics['std_tau']:.3f}\n")
             
             # Selection frequency
-            freq = selection_frequency(snapshots, top_k=top_k)
+            freq = selection_frequency(matrix, top_k=top_k)
             if freq:
                 f.write(f"\nTop-{top_k} Selection Frequency:\n")
                 sorted_freq = sorted(freq.items(), key=lambda x: -x[1])
@@ -297,8 +387,8 @@ def save_stability_report(
                     f.write(f"  {feat:40s} {p:5.2%}\n")
             
             f.write(f"\nSnapshot History:\n")
-            for i, snapshot in enumerate(snapshots, 1):
-                f.write(f"  {i}. {snapshot.run_id} ({snapshot.created_at.isoformat()})\n")
+            for i, (run_id, created_at) in enumerate(zip(matrix.run_ids, matrix.created_at), 1):
+                f.write(f"  {i}. {run_id} ({created_at.isoformat()})\n")
         
         logger.debug(f"Saved stability report: {report_path}")
     except Exception as e:
@@ -31,6 +31,7 @@ import uuid
 from .schema import FeatureImportanceSnapshot
 from .io import save_importance_snapshot, get_snapshot_base_dir
 from .analysis import analyze_stability_auto
+from .store import list_store_keys, STORE_DIRNAME
 
 logger = logging.getLogger(__name__)
 
@@ -197,33 +198,31 @@ def analyze_all_stability_hook(
     
     all_metrics = {}
     
-    # Find all target/method combinations
+    # Find all target/method combinations (columnar store + legacy JSON directories)
+    combinations = set(list_store_keys(base_dir))
     for target_path in base_dir.iterdir():
-        if not target_path.is_dir():
+        if not target_path.is_dir() or target_path.name in (STORE_DIRNAME, "stability_reports"):
             continue
-        
-        target = target_path.name
+        for method_path in target_path.iterdir():
+            if method_path.is_dir():
+                combinations.add((target_path.name, method_path.name))
+    
+    for target, method_key in sorted(combinations):
         if target_name and target != target_name:
             continue
+        if method and method_key != method:
+            continue
         
-        for method_path in target_path.iterdir():
-            if not method_path.is_dir():
-                continue
-            
-            method = method_path.name
-            if method and method != method:
-                continue
-            
-            # Analyze this target/method combination
-            metrics = analyze_stability_auto(
-                base_dir=base_dir,
-                target_name=target,
-                method=method,
-                log_to_console=True,
-                save_report=True,
-            )
-            
-            if metrics:
-                all_metrics[f"{target}/{method}"] = metrics
+        # Analyze this target/method combination
+        metrics = analyze_stability_auto(
+            base_dir=base_dir,
+            target_name=target,
+            method=method_key,
+            log_to_console=True,
+            save_report=True,
+        )
+        
+        if metrics:
+            all_metrics[f"{target}/{method_key}"] = metrics
     
     return all_metrics
@@ -28,6 +28,7 @@ from typing import List, Dict, Optional
 from datetime import datetime
 
 from .schema import FeatureImportanceSnapshot
+from .store import save_snapshot_columnar, load_importance_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -37,23 +38,43 @@ def save_importance_snapshot(
     base_dir: Path,
 ) -> Path:
     """
-    Save feature importance snapshot to disk.
+    Save feature importance snapshot to the columnar snapshot store.
     
     Directory structure:
-        {base_dir}/{target_name}/{method}/{run_id}.json
+        {base_dir}/_snapshot_store/target={target_name}/method={method}/part-<created_ns>-<run_id>.parquet
     
     Args:
         snapshot: FeatureImportanceSnapshot to save
         base_dir: Base directory for snapshots (e.g., "artifacts/feature_importance")
     
     Returns:
-        Path to saved snapshot file
+        Path to saved snapshot fragment
+    """
+    try:
+        path = save_snapshot_columnar(snapshot, base_dir)
+        logger.debug(f"Saved importance snapshot: {path}")
+    except Exception as e:
+        logger.error(f"Failed to save importance snapshot for {snapshot.target_name}/{snapshot.method}: {e}")
+        raise
+    
+    return path
+
+
+def save_importance_snapshot_json(
+    snapshot: FeatureImportanceSnapshot,
+    base_dir: Path,
+) -> Path:
+    """
+    Save snapshot in the legacy per-run JSON layout.
+    
+    Directory structure:
+        {base_dir}/{target_name}/{method}/{run_id}.json
+    
+    JSON snapshots are imported into the columnar store on the next load.
     """
-    # Create directory structure
     target_dir = base_dir / snapshot.target_name / snapshot.method
     target_dir.mkdir(parents=True, exist_ok=True)
     
-    # Save as JSON
     path = target_dir / f"{snapshot.run_id}.json"
     
     try:
@@ -77,6 +98,9 @@ def load_snapshots(
     """
     Load all snapshots for a target and method.
     
+    Reads the columnar store (importing any legacy JSON snapshots first).
+    Prefer load_importance_matrix() for analysis; it avoids per-snapshot objects.
+    
     Args:
         base_dir: Base directory for snapshots
         target_name: Target name to load
@@ -87,35 +111,15 @@ def load_snapshots(
     Returns:
         List of FeatureImportanceSnapshot instances, sorted by created_at (oldest first)
     """
-    target_dir = base_dir / target_name / method
-    
-    if not target_dir.exists():
-        logger.debug(f"No snapshots directory found: {target_dir}")
+    matrix = load_importance_matrix(
+        base_dir, target_name, method,
+        min_timestamp=min_timestamp, max_timestamp=max_timestamp
+    )
+    if matrix is None:
+        logger.debug(f"No snapshots found for {target_name}/{method} under {base_dir}")
         return []
     
-    snapshots = []
-    for path in sorted(target_dir.glob("*.json")):
-        try:
-            with path.open("r") as f:
-                data = json.load(f)
-            
-            snapshot = FeatureImportanceSnapshot.from_dict(data)
-            
-            # Apply timestamp filters if provided
-            if min_timestamp and snapshot.created_at < min_timestamp:
-                continue
-            if max_timestamp and snapshot.created_at > max_timestamp:
-                continue
-            
-            snapshots.append(snapshot)
-        except Exception as e:
-            logger.warning(f"Failed to load snapshot {path}: {e}")
-            continue
-    
-    # Sort by creation time (oldest first)
-    snapshots.sort(key=lambda s: s.created_at)
-    
-    return snapshots
+    return matrix.to_snapshots()
 
 
 def get_snapshot_base_dir(output_dir: Optional[Path] = None) -> Path:
@@ -0,0 +1,299 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Columnar Feature Importance Snapshot Store
+
+One parquet dataset for all snapshots, keyed by target/method/run_id:
+
+    {base_dir}/_snapshot_store/target=<target>/method=<method>/part-<created_ns>-<run_id>.parquet
+
+Each fragment holds one snapshot in long form (feature, importance, rank). Loading a
+(target, method) partition reads the whole partition in one parquet call and pivots
+it into an ImportanceMatrix: a dense (n_snapshots, n_features) array over a shared
+feature dictionary, which the vectorized stability metrics in analysis.py consume.
+
+Legacy per-run JSON snapshots ({base_dir}/{target}/{method}/{run_id}.json) are
+imported on load (idempotent by run_id), so existing history is kept.
+"""
+
+import os
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from .schema import FeatureImportanceSnapshot
+
+logger = logging.getLogger(__name__)
+
+STORE_DIRNAME = "_snapshot_store"
+
+
+def _partition_dir(base_dir: Path, target_name: str, method: str) -> Path:
+    return (
+        Path(base_dir) / STORE_DIRNAME
+        / f"target={quote(target_name, safe='')}"
+        / f"method={quote(method, safe='')}"
+    )
+
+
+@dataclass
+class ImportanceMatrix:
+    """
+    Dense importance matrix for one (target, method), rows ordered by created_at.
+
+    values[i, j] is the importance of features[j] in snapshot i (NaN if absent);
+    ranks[i, j] is its position in that snapshot's importance ordering (NaN if absent).
+    """
+    target_name: str
+    method: str
+    run_ids: List[str]
+    universe_ids: List[Optional[str]]
+    created_at: List[datetime]
+    features: List[str]          # Feature dictionary (column order)
+    values: np.ndarray           # float64 (n_snapshots, n_features)
+    ranks: np.ndarray            # float64 (n_snapshots, n_features)
+
+    @property
+    def n_snapshots(self) -> int:
+        return len(self.run_ids)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: List[FeatureImportanceSnapshot]) -> 'ImportanceMatrix':
+        """Build a matrix from in-memory snapshots (order preserved)."""
+        features: List[str] = []
+        positions = {}
+        for snapshot in snapshots:
+            for feat in snapshot.features:
+                if feat not in positions:
+                    positions[feat] = len(features)
+                    features.append(feat)
+
+        values = np.full((len(snapshots), len(features)), np.nan)
+        ranks = np.full((len(snapshots), len(features)), np.nan)
+        for i, snapshot in enumerate(snapshots):
+            cols = np.fromiter((positions[f] for f in snapshot.features), dtype=np.int64, count=len(snapshot.features))
+            values[i, cols] = np.asarray(snapshot.importances, dtype=np.float64)
+            ranks[i, cols] = np.arange(len(cols), dtype=np.float64)
+
+        return cls(
+            target_name=snapshots[0].target_name if snapshots else "",
+            method=snapshots[0].method if snapshots else "",
+            run_ids=[s.run_id for s in snapshots],
+            universe_ids=[s.universe_id for s in snapshots],
+            created_at=[s.created_at for s in snapshots],
+            features=features,
+            values=values,
+            ranks=ranks,
+        )
+
+    def to_snapshots(self) -> List[FeatureImportanceSnapshot]:
+        """Expand back into per-run snapshots (features ordered by rank)."""
+        feature_arr = np.asarray(self.features, dtype=object)
+        snapshots = []
+        for i in range(self.n_snapshots):
+            present = np.flatnonzero(~np.isnan(self.ranks[i]))
+            order = present[np.argsort(self.ranks[i, present], kind="stable")]
+            snapshots.append(FeatureImportanceSnapshot(
+                target_name=self.target_name,
+                method=self.method,
+                universe_id=self.universe_ids[i],
+                run_id=self.run_ids[i],
+                created_at=self.created_at[i],
+                features=feature_arr[order].tolist(),
+                importances=self.values[i, order].tolist(),
+            ))
+        return snapshots
+
+
+def save_snapshot_columnar(snapshot: FeatureImportanceSnapshot, base_dir: Path) -> Path:
+    """
+    Append one snapshot to the columnar store.
+
+    Args:
+        snapshot: Snapshot to save
+        base_dir: Base snapshot directory (see io.get_snapshot_base_dir)
+
+    Returns:
+        Path to the written fragment
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    partition = _partition_dir(base_dir, snapshot.target_name, snapshot.method)
+    partition.mkdir(parents=True, exist_ok=True)
+
+    n = len(snapshot.features)
+    created_ns = int(pd.Timestamp(snapshot.created_at).value)
+    table = pa.table({
+        "run_id": pa.array([snapshot.run_id] * n, type=pa.string()),
+        "universe_id": pa.array([snapshot.universe_id] * n, type=pa.string()),
+        "created_at": pa.array([created_ns] * n, type=pa.int64()),
+        "feature": pa.array(snapshot.features, type=pa.string()),
+        "importance": pa.array(snapshot.importances, type=pa.float64()),
+        "rank": pa.array(np.arange(n, dtype=np.int32), type=pa.int32()),
+    })
+
+    quoted_run_id = quote(snapshot.run_id, safe='')
+    name = f"part-{created_ns:020d}-{quoted_run_id}.parquet"
+    path = partition / name
+    tmp = partition / f".{name}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+    # Re-saving a run_id replaces it (same semantics as overwriting {run_id}.json)
+    for previous in partition.glob(f"part-*-{quoted_run_id}.parquet"):
+        if previous != path and previous.stem.split("-", 2)[2] == quoted_run_id:
+            previous.unlink()
+    return path
+
+
+def stored_run_ids(base_dir: Path, target_name: str, method: str) -> Set[str]:
+    """Run IDs already in the store for (target, method), from fragment names only."""
+    partition = _partition_dir(base_dir, target_name, method)
+    if not partition.exists():
+        return set()
+    run_ids = set()
+    for path in partition.glob("part-*.parquet"):
+        # part-<created_ns>-<quoted run_id>.parquet
+        run_ids.add(unquote(path.stem.split("-", 2)[2]))
+    return run_ids
+
+
+def import_json_snapshots(base_dir: Path, target_name: str, method: str) -> int:
+    """
+    Import legacy JSON snapshots for (target, method) into the store.
+
+    Only JSON files whose run_id is not yet stored are parsed, so this is cheap
+    to call before every load.
+
+    Returns:
+        Number of snapshots imported
+    """
+    legacy_dir = Path(base_dir) / target_name / method
+    if not legacy_dir.exists():
+        return 0
+
+    known = stored_run_ids(base_dir, target_name, method)
+    imported = 0
+    for path in sorted(legacy_dir.glob("*.json")):
+        if path.stem in known:
+            continue
+        try:
+            with path.open("r") as f:
+                snapshot = FeatureImportanceSnapshot.from_dict(json.load(f))
+            if snapshot.run_id in known:
+                continue
+            save_snapshot_columnar(snapshot, base_dir)
+            known.add(snapshot.run_id)
+            imported += 1
+        except Exception as e:
+            logger.warning(f"Failed to import snapshot {path}: {e}")
+    if imported:
+        logger.debug(f"Imported {imported} JSON snapshots into columnar store for {target_name}/{method}")
+    return imported
+
+
+def load_importance_matrix(
+    base_dir: Path,
+    target_name: str,
+    method: str,
+    min_timestamp: Optional[datetime] = None,
+    max_timestamp: Optional[datetime] = None,
+    import_json: bool = True,
+) -> Optional[ImportanceMatrix]:
+    """
+    Load all snapshots of (target, method) as a dense ImportanceMatrix.
+
+    Args:
+        base_dir: Base snapshot directory
+        target_name: Target name
+        method: Method name
+        min_timestamp: Optional minimum created_at filter
+        max_timestamp: Optional maximum created_at filter
+        import_json: Import legacy JSON snapshots first
+
+    Returns:
+        ImportanceMatrix (rows sorted by created_at), or None if no snapshots exist
+    """
+    if import_json:
+        import_json_snapshots(base_dir, target_name, method)
+
+    partition = _partition_dir(base_dir, target_name, method)
+    if not partition.exists() or not any(partition.glob("part-*.parquet")):
+        return None
+
+    filters = []
+    if min_timestamp is not None:
+        filters.append(("created_at", ">=", int(pd.Timestamp(min_timestamp).value)))
+    if max_timestamp is not None:
+        filters.append(("created_at", "<=", int(pd.Timestamp(max_timestamp).value)))
+
+    df = pd.read_parquet(partition, filters=filters or None)
+    if len(df) == 0:
+        return None
+
+    # Snapshot rows: one per run, ordered by creation time
+    runs = (
+        df[["run_id", "universe_id", "created_at"]]
+        .drop_duplicates("run_id", keep="last")
+        .sort_values(["created_at", "run_id"], kind="stable")
+        .reset_index(drop=True)
+    )
+    row_of = pd.Series(np.arange(len(runs)), index=runs["run_id"].to_numpy())
+
+    # Feature dictionary: categorical codes give the dense column index
+    feature_cat = pd.Categorical(df["feature"])
+    rows = row_of.reindex(df["run_id"].to_numpy()).to_numpy()
+    cols = feature_cat.codes
+
+    values = np.full((len(runs), len(feature_cat.categories)), np.nan)
+    ranks = np.full_like(values, np.nan)
+    values[rows, cols] = df["importance"].to_numpy(dtype=np.float64)
+    ranks[rows, cols] = df["rank"].to_numpy(dtype=np.float64)
+
+    return ImportanceMatrix(
+        target_name=target_name,
+        method=method,
+        run_ids=runs["run_id"].tolist(),
+        universe_ids=[None if pd.isna(u) else u for u in runs["universe_id"]],
+        created_at=[pd.Timestamp(ts).to_pydatetime() for ts in runs["created_at"]],
+        features=[str(f) for f in feature_cat.categories],
+        values=values,
+        ranks=ranks,
+    )
+
+
+def list_store_keys(base_dir: Path) -> List[Tuple[str, str]]:
+    """(target, method) pairs present in the store."""
+    root = Path(base_dir) / STORE_DIRNAME
+    if not root.exists():
+        return []
+    keys = []
+    for method_dir in sorted(root.glob("target=*/method=*")):
+        if method_dir.is_dir():
+            target = unquote(method_dir.parent.name.split("=", 1)[1])
+            method = unquote(method_dir.name.split("=", 1)[1])
+            keys.append((target, method))
+    return keys
@@ -124,6 +124,93 @@ def spec_from_target(col: str) -> Optional[TaskSpec]:
     return TaskSpec('regression', 'regression', ['rmse', 'mae'], label_type='float32')
 
 
+# Integer label ranges up to this width are encoded with a lookup table instead of a sort
+_LUT_MAX_RANGE = 1 << 16  # DESIGN_CONSTANT_OK
+
+
+@dataclass
+class GroupIndex:
+    """
+    Per-timestamp groups from one sort-based pass over time values.
+    
+    Groups are numbered in time order. `order` is the permutation that sorts the rows
+    by time, or None when the rows were already time-sorted (no argsort was done).
+    """
+    group_ids: np.ndarray          # int64 group id per row (original row order)
+    boundaries: np.ndarray         # start offset of each group in sorted order, plus n at the end
+    order: Optional[np.ndarray] = None
+    
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.boundaries)
+    
+    @property
+    def n_groups(self) -> int:
+        return len(self.boundaries) - 1
+
+
+def group_index(time_vals: np.ndarray, time_sorted: Optional[bool] = None) -> GroupIndex:
+    """
+    Build per-timestamp groups (ids, boundaries, sizes) in a single pass.
+    
+    Args:
+        time_vals: Timestamp per row
+        time_sorted: True if the rows are known to be time-sorted (e.g. panels from
+            prepare_cross_sectional_data_for_ranking); None checks in O(n) and only
+            argsorts when needed
+    """
+    t = np.asarray(time_vals)
+    n = len(t)
+    if n == 0:
+        return GroupIndex(np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64))
+    
+    if time_sorted is None:
+        time_sorted = bool(np.all(t[1:] >= t[:-1]))
+    order = None if time_sorted else np.argsort(t, kind='stable')
+    t_sorted = t if order is None else t[order]
+    
+    changes = t_sorted[1:] != t_sorted[:-1]
+    boundaries = np.concatenate(([0], np.flatnonzero(changes) + 1, [n])).astype(np.int64)
+    ids_sorted = np.concatenate(([0], np.cumsum(changes))).astype(np.int64)
+    if order is None:
+        group_ids = ids_sorted
+    else:
+        group_ids = np.empty(n, dtype=np.int64)
+        group_ids[order] = ids_sorted
+    return GroupIndex(group_ids=group_ids, boundaries=boundaries, order=order)
+
+
+def _dense_codes(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (codes, uniques) with uniques sorted and codes in 0..K-1.
+    
+    Integral labels over a small range (ordinal/class targets) use an O(n) lookup
+    table; anything else falls back to np.unique.
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return np.zeros(0, dtype=np.int64), values[:0]
+    integral = np.issubdtype(values.dtype, np.integer) or (
+        np.issubdtype(values.dtype, np.floating) and np.array_equal(values, np.floor(values)))
+    if integral:
+        lo, hi = values.min(), values.max()
+        if hi - lo < _LUT_MAX_RANGE:
+            offsets = (values - lo).astype(np.int64)
+            present = np.bincount(offsets) > 0
+            lut = np.cumsum(present) - 1
+            uniques = (np.flatnonzero(present) + lo).astype(values.dtype)
+            return lut[offsets], uniques
+    uniques, codes = np.unique(values, return_inverse=True)
+    return codes.astype(np.int64).ravel(), uniques
+
+
+def _balanced_weights(codes: np.ndarray, n_classes: int) -> np.ndarray:
+    """sklearn 'balanced' weights n / (K * count[class]) per row, from dense codes."""
+    counts = np.bincount(codes, minlength=n_classes)
+    per_class = len(codes) / (n_classes * np.maximum(counts, 1))
+    return per_class[codes].astype(np.float32)
+
+
 def compute_class_weights(y: np.ndarray, method: str = 'balanced') -> np.ndarray:
     """
     Compute sample weights for class imbalance.
@@ -139,18 +226,17 @@ def compute_class_weights(y: np.ndarray, method: str = 'balanced') -> np.ndarray
         return np.ones(len(y), dtype=np.float32)
     
     try:
-        from sklearn.utils.class_weight import compute_class_weight
-        
-        classes = np.unique(y[~np.isnan(y)])
+        y = np.asarray(y)
+        valid = ~np.isnan(y) if np.issubdtype(y.dtype, np.floating) else np.ones(len(y), dtype=bool)
+        codes, classes = _dense_codes(y[valid])
         if len(classes) < 2:
             return np.ones(len(y), dtype=np.float32)
         
-        class_weights = compute_class_weight('balanced', classes=classes, y=y)
-        
-        # Map class weights to sample weights
-        weight_map = dict(zip(classes, class_weights))
-        sample_weights = np.array([weight_map.get(label, 1.0) for label in y], dtype=np.float32)
+        # Unlabeled (NaN) rows keep weight 1.0
+        sample_weights = np.ones(len(y), dtype=np.float32)
+        sample_weights[valid] = _balanced_weights(codes, len(classes))
         
+        class_weights = len(codes) / (len(classes) * np.bincount(codes, minlength=len(classes)))
         logger.info(f"[Class Weights] Classes: {classes}, Weights: {class_weights}")
         return sample_weights
         
@@ -170,22 +256,21 @@ def encode_multiclass_labels(y: np.ndarray, n_classes: Optional[int] = None) ->
     Returns:
         (encoded_labels, mapping_dict) where mapping_dict maps original → encoded
     """
-    unique_labels = np.unique(y[~np.isnan(y)])
-    unique_labels = np.sort(unique_labels)  # Preserve order for ordinal
+    y = np.asarray(y)
+    valid = ~np.isnan(y) if np.issubdtype(y.dtype, np.floating) else np.ones(len(y), dtype=bool)
+    codes, unique_labels = _dense_codes(y[valid])  # Sorted: preserves order for ordinal
     
     if n_classes and len(unique_labels) != n_classes:
         logger.warning(f"[Label Encoding] Expected {n_classes} classes, found {len(unique_labels)}")
     
     # Create mapping: original label → 0-indexed
-    label_map = {orig: idx for idx, orig in enumerate(unique_labels)}
-    
-    # Apply encoding
-    encoded = np.array([label_map.get(label, -1) for label in y], dtype=np.int32)
+    label_map = {orig: idx for idx, orig in enumerate(unique_labels.tolist())}
     
-    # Replace any unmapped (-1) with mode
-    if (encoded == -1).any():
-        mode = np.bincount(encoded[encoded >= 0]).argmax()
-        encoded[encoded == -1] = mode
+    # Unlabeled (NaN) rows get the mode class
+    encoded = np.empty(len(y), dtype=np.int32)
+    encoded[valid] = codes
+    if not valid.all():
+        encoded[~valid] = np.bincount(codes).argmax() if len(codes) else 0
     
     logger.info(f"[Label Encoding] Mapped {len(label_map)} classes: {label_map}")
     
@@ -195,44 +280,54 @@ def encode_multiclass_labels(y: np.ndarray, n_classes: Optional[int] = None) ->
     return encoded, inverse_map
 
 
-def build_ranking_groups(time_vals: Optional[np.ndarray]) -> Optional[np.ndarray]:
+def build_ranking_groups(time_vals: Optional[np.ndarray], time_sorted: Optional[bool] = None) -> Optional[np.ndarray]:
     """
     Build group sizes for ranking objectives (per-timestamp cross-sections).
     
     Args:
         time_vals: Timestamp values (same length as X/y), or None
+        time_sorted: See group_index
     
     Returns:
-        Array of group sizes (one per unique timestamp) or None
+        Array of group sizes (one per unique timestamp, in time order) or None
     """
+    index = _ranking_group_index(time_vals, time_sorted)
+    return None if index is None else index.sizes
+
+
+def _ranking_group_index(time_vals: Optional[np.ndarray], time_sorted: Optional[bool] = None) -> Optional[GroupIndex]:
     if time_vals is None:
         logger.warning("[Ranking Groups] No time values provided. Cannot build groups.")
         return None
     
     try:
-        import pandas as pd
-        
-        # Count samples per unique timestamp
-        df = pd.DataFrame({'ts': time_vals})
-        group_sizes = df.groupby('ts').size().values
-        
-        logger.info(f"[Ranking Groups] Built {len(group_sizes)} groups, sizes: min={group_sizes.min()}, max={group_sizes.max()}, mean={group_sizes.mean():.1f}")
-        
-        return group_sizes
+        index = group_index(time_vals, time_sorted)
+        if index.n_groups == 0:
+            return None
+        sizes = index.sizes
+        logger.info(f"[Ranking Groups] Built {index.n_groups} groups, sizes: min={sizes.min()}, max={sizes.max()}, mean={sizes.mean():.1f}")
+        return index
         
     except Exception as e:
         logger.error(f"[Ranking Groups] Failed to build groups: {e}")
         return None
 
 
-def prepare_labels_for_task(y: np.ndarray, spec: TaskSpec, time_vals: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray], dict]:
+def prepare_labels_for_task(y: np.ndarray, spec: TaskSpec, time_vals: Optional[np.ndarray] = None,
+                            time_sorted: Optional[bool] = None) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray], dict]:
     """
     Prepare labels and metadata for a specific task.
     
+    Labels are encoded and class-weighted from one set of dense codes, and ranking
+    groups come from one sort-based pass (skipped when the rows are already
+    time-sorted); for ranking, metadata also carries per-row 'group_ids' and
+    'group_boundaries'.
+    
     Args:
         y: Raw target values
         spec: Task specification from router
         time_vals: Timestamp values (for ranking groups)
+        time_sorted: True if rows are known to be time-sorted (see group_index)
     
     Returns:
         (y_prepared, sample_weights, group_sizes, metadata)
@@ -256,8 +351,10 @@ def prepare_labels_for_task(y: np.ndarray, spec: TaskSpec, time_vals: Optional[n
         metadata['label_map'] = label_map
         metadata['n_classes'] = len(label_map)
         
-        # Compute class weights if requested
-        if spec.class_weighting:
+        # Compute class weights if requested (codes are already dense 0..K-1)
+        if spec.class_weighting == 'balanced' and len(label_map) >= 2:
+            sample_weights = _balanced_weights(y_prepared, len(label_map))
+        elif spec.class_weighting:
             sample_weights = compute_class_weights(y_prepared, spec.class_weighting)
     
     # Binary: ensure 0/1 labels
@@ -271,9 +368,13 @@ def prepare_labels_for_task(y: np.ndarray, spec: TaskSpec, time_vals: Optional[n
     # Ranking: build group sizes
     elif spec.task == 'ranking':
         y_prepared = y.astype(spec.label_type)
-        group_sizes = build_ranking_groups(time_vals)
+        index = _ranking_group_index(time_vals, time_sorted)
         
-        if group_sizes is None:
+        if index is not None:
+            group_sizes = index.sizes
+            metadata['group_ids'] = index.group_ids
+            metadata['group_boundaries'] = index.boundaries
+        else:
             logger.warning("[Ranking] No groups available. Falling back to regression.")
             spec.task = 'regression'
             spec.objective = 'regression'
@@ -347,7 +448,7 @@ def route_target(target: str, time_vals: Optional[np.ndarray] = None) -> dict:
     
     Returns dict with everything needed for training:
     - spec: TaskSpec
-    - prepare_fn: Function to call on (y, time_vals) → (y_prep, weights, groups, meta)
+    - prepare_fn: Function to call on (y, time_vals, time_sorted=None) → (y_prep, weights, groups, meta)
     - objective_fn: Function to call on (family) → objective string
     """
     spec = spec_from_target(target)
@@ -355,7 +456,8 @@ def route_target(target: str, time_vals: Optional[np.ndarray] = None) -> dict:
     return {
         'spec': spec,
         # Avoid boolean ambiguity on numpy arrays: use explicit None check
-        'prepare_fn': lambda y, tv=None: prepare_labels_for_task(y, spec, tv if tv is not None else time_vals),
+        'prepare_fn': lambda y, tv=None, time_sorted=None: prepare_labels_for_task(
+            y, spec, tv if tv is not None else time_vals, time_sorted=time_sorted),
         'objective_fn': lambda family: get_objective_for_family(family, spec),
         'metrics': get_metrics_for_task(spec)
     }
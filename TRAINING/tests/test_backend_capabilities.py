@@ -0,0 +1,89 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+
+"""
+Backend Capability Cache Tests
+==============================
+
+Successes and host/build failures (library missing, no CUDA build, no nvidia-smi)
+are reused from the per-host file by later runs; transient fit failures are not.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from TRAINING.common import backend_capabilities as bc  # noqa: E402
+
+
+@pytest.fixture
+def probes(monkeypatch, tmp_path):
+    """Fake lightgbm probe whose outcome the test sets; counts calls across simulated runs."""
+    monkeypatch.setenv("BACKEND_PROBE_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("TRAINER_NO_PROBE_CACHE", raising=False)
+    monkeypatch.delenv("CUDA_VISIBLE_DEVICES", raising=False)
+    state = {"calls": 0, "error": None}
+
+    def probe(device, **params):
+        state["calls"] += 1
+        if state["error"] is not None:
+            raise state["error"]
+
+    monkeypatch.setitem(bc._PROBES, "lightgbm", probe)
+    bc.clear_capability_cache()
+    yield state
+    bc.clear_capability_cache()
+
+
+def _next_run():
+    bc.clear_capability_cache(disk=False)
+    return bc.backend_capability("lightgbm", "cuda")
+
+
+@pytest.mark.parametrize("error", [None, ImportError("no module"), bc._Unsupported("no nvidia-smi")])
+def test_success_and_host_failures_are_reused(probes, error):
+    probes["error"] = error
+    first = bc.backend_capability("lightgbm", "cuda")
+    second = _next_run()
+
+    assert probes["calls"] == 1
+    assert second.cached and second.available == first.available == (error is None)
+    assert second.error == first.error
+
+
+def test_transient_failure_is_retried_next_run(probes):
+    probes["error"] = RuntimeError("device busy")
+    assert not bc.backend_available("lightgbm", "cuda")
+    assert not bc.backend_available("lightgbm", "cuda")
+    assert probes["calls"] == 1  # once per process
+
+    probes["error"] = None
+    assert _next_run().available
+    assert probes["calls"] == 2
+
+
+def test_host_failure_expires_after_short_ttl(probes, monkeypatch):
+    probes["error"] = bc._Unsupported("XGBoost built without CUDA support")
+    bc.backend_capability("lightgbm", "cuda")
+    probes["error"] = None
+    later = bc.time.time() + 7 * 3600.0
+    monkeypatch.setattr(bc.time, "time", lambda: later)
+
+    assert _next_run().available
+    assert probes["calls"] == 2
@@ -0,0 +1,134 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Binned GBDT Dataset Tests
+=========================
+
+A panel is binned once per (data, bin params, library version); folds are
+row-index subsets of it, and index-subset fits go through public LightGBM APIs.
+"""
+
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+lgb = pytest.importorskip("lightgbm")
+
+from TRAINING.common import binned_datasets as bd  # noqa: E402
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 8))
+    y = X[:, 0] * 2.0 - X[:, 1] + rng.normal(scale=0.1, size=2000)
+    return X, y
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = bd.BinnedDatasetCache(cache_dir=tmp_path, persist=False, max_entries=2)
+    monkeypatch.setattr(bd, "get_binned_dataset_cache", lambda: cache)
+    return cache
+
+
+def test_persistence_is_opt_in():
+    cfg = bd._get_config()
+    assert cfg["persist"] is False
+    assert cfg["max_disk_gb"] <= 2.0
+
+
+def test_panel_binned_once_across_folds(panel, cache):
+    X, y = panel
+    params = {"max_bin": 63, "verbose": -1}
+    folds = [np.arange(0, 1000), np.arange(1000, 2000)]
+    first = cache.lgb_subsets(X, y, params, folds)
+    second = cache.lgb_subsets(X, y, params, folds[::-1])
+    assert cache.stats["lgb_builds"] == 1
+    assert cache.stats["lgb_memory_hits"] == 1
+    assert [d.num_data() for d in first + second] == [1000] * 4
+    np.testing.assert_allclose(first[1].get_label(), y[1000:].astype(np.float32))
+
+
+def test_bin_params_change_the_key(panel, cache):
+    X, y = panel
+    cache.lgb_full(X, {"max_bin": 63, "verbose": -1})
+    cache.lgb_full(X, {"max_bin": 127, "verbose": -1, "learning_rate": 0.1})
+    cache.lgb_full(X, {"max_bin": 127, "verbose": -1, "learning_rate": 0.5})  # training param only
+    assert cache.stats["lgb_builds"] == 2
+    assert cache.stats["lgb_memory_hits"] == 1
+
+
+def test_disk_persistence_and_eviction(panel, tmp_path):
+    X, y = panel
+    params = {"max_bin": 63, "verbose": -1}
+    writer = bd.BinnedDatasetCache(cache_dir=tmp_path, persist=True)
+    writer.lgb_full(X, params)
+    assert len(list(tmp_path.glob("lgb-*.bin"))) == 1
+
+    reader = bd.BinnedDatasetCache(cache_dir=tmp_path, persist=True)
+    assert reader.lgb_full(X, params).num_data() == len(X)
+    assert reader.stats["lgb_disk_hits"] == 1 and reader.stats["lgb_builds"] == 0
+
+    tiny = bd.BinnedDatasetCache(cache_dir=tmp_path, persist=True, max_disk_gb=1e-9)
+    tiny.lgb_full(X[:500], params)
+    assert len(list(tmp_path.glob("lgb-*.bin"))) <= 1
+
+
+def test_fit_on_indices_returns_public_api_model(panel, cache):
+    X, y = panel
+    template = lgb.LGBMRegressor(n_estimators=200, learning_rate=0.1, num_leaves=15,
+                                 random_state=7, verbose=-1)
+    model = bd.fit_lgbm_on_indices(
+        template, X, y, np.arange(1600), np.arange(1600, 2000),
+        callbacks=[lgb.early_stopping(10, verbose=False)]
+    )
+    assert isinstance(model, bd.LightGBMBoosterRegressor)
+    with pytest.raises(Exception):
+        template.booster_  # the template estimator is only read, never fitted
+    assert model.n_features_in_ == X.shape[1]
+    assert 0 < model.best_iteration_ <= model.n_estimators_ <= 200
+    assert "valid_0" in model.evals_result_
+    assert model.feature_importances_.shape == (X.shape[1],)
+    assert np.argmax(model.feature_importances_) in (0, 1)
+
+    preds = model.predict(X[1600:])
+    assert preds.shape == (400,)
+    assert np.corrcoef(preds, y[1600:])[0, 1] > 0.9
+
+    restored = pickle.loads(pickle.dumps(model))
+    np.testing.assert_allclose(restored.predict(X[1600:]), preds)
+
+
+def test_fit_on_indices_falls_back(panel, cache, monkeypatch):
+    X, y = panel
+    idx = np.arange(1000)
+    assert bd.fit_lgbm_on_indices(lgb.LGBMClassifier(verbose=-1), X, (y > 0).astype(int), idx) is None
+    monkeypatch.setattr(bd, "get_binned_dataset_cache", lambda: None)
+    assert bd.fit_lgbm_on_indices(lgb.LGBMRegressor(verbose=-1), X, y, idx) is None
+
+
+def test_train_params_from_public_estimator_params():
+    template = lgb.LGBMRegressor(n_estimators=50, n_jobs=2, num_threads=3,
+                                 importance_type="gain", max_bin=31)
+    params = bd._lgb_train_params(template)
+    assert params["objective"] == "regression"
+    assert params["num_threads"] == 3 and "n_jobs" not in params
+    assert params["max_bin"] == 31
+    assert not {"n_estimators", "importance_type"} & set(params)
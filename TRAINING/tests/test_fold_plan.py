@@ -0,0 +1,112 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Fold Plan Reuse Tests
+=====================
+
+PurgedTimeSeriesSplit plans folds once per panel size; a plan handed over via
+fold_plan= (object or saved path) is reused by other consumers and reruns when it
+matches the panel and split settings.
+"""
+
+import warnings
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from TRAINING.utils.purged_time_series_split import (  # noqa: E402
+    FoldPlan, PurgedTimeSeriesSplit, fold_plan_path, load_fold_plan,
+)
+
+PURGE = pd.Timedelta(minutes=60)
+
+
+def _panel(n_bars=200, n_symbols=5):
+    times = pd.date_range("2025-01-01", periods=n_bars, freq="5min")
+    return np.repeat(times.values, n_symbols)
+
+
+def _splitter(times, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # panel-data notice from the constructor
+        return PurgedTimeSeriesSplit(n_splits=3, purge_overlap_time=PURGE,
+                                     time_column_values=times, **kwargs)
+
+
+def test_plan_cached_per_panel_size_without_warnings():
+    times = _panel()
+    cv = _splitter(times)
+    first = cv.plan(len(times))
+    assert len(first) == 2  # the first test fold has no history to train on
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert cv.plan(len(times)) is first
+        cv.plan(len(times) // 2)  # a different size rebuilds silently
+        assert cv.plan(len(times)) is first
+    assert not [w for w in caught if "does not match" in str(w.message)]
+
+
+def test_saved_plan_is_loaded_on_rerun(tmp_path):
+    times = _panel()
+    path = fold_plan_path(tmp_path, "fwd_ret_60m", "SYMBOL_SPECIFIC", "AAPL")
+    assert path == tmp_path / "fold_plans" / "fwd_ret_60m__SYMBOL_SPECIFIC__AAPL.json"
+
+    built = _splitter(times, fold_plan=path).plan(len(times))
+    assert path.exists()
+
+    rerun = _splitter(times, fold_plan=path)
+    assert rerun.fold_plan is not None
+    reused = rerun.plan(len(times))
+    assert reused is rerun.fold_plan
+    np.testing.assert_array_equal(reused.folds, built.folds)
+    assert [t.tolist() for t, _ in rerun.split(np.zeros(len(times)))] == \
+           [t.tolist() for t, _ in built.split()]
+
+
+def test_incompatible_plan_is_rebuilt():
+    times = _panel()
+    plan = _splitter(times).plan(len(times))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        other_purge = PurgedTimeSeriesSplit(n_splits=3, purge_overlap_time=PURGE * 2,
+                                            time_column_values=times, fold_plan=plan)
+        other_folds = PurgedTimeSeriesSplit(n_splits=4, purge_overlap_time=PURGE,
+                                            time_column_values=times, fold_plan=plan)
+    assert other_purge.plan(len(times)) is not plan
+    assert other_folds.plan(len(times)) is not plan
+    assert len(other_folds.plan(len(times))) <= 4
+
+
+def test_time_purged_plan_shared_with_row_count_splitter():
+    times = _panel()
+    plan = _splitter(times).plan(len(times))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        legacy = PurgedTimeSeriesSplit(n_splits=3, purge_overlap=17, fold_plan=plan)
+        assert legacy.plan(len(times)) is plan
+
+
+def test_unreadable_plan_is_ignored(tmp_path):
+    path = tmp_path / "broken.json"
+    assert load_fold_plan(path) is None
+    path.write_text("{not json")
+    assert load_fold_plan(path) is None
+    assert isinstance(FoldPlan.from_dict(_splitter(_panel()).plan(1000).to_dict()), FoldPlan)
@@ -0,0 +1,99 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+"""
+FTRL-Proximal Trainer Tests
+===========================
+
+Warm starts align by the feature names that survive preprocessing (from a
+trainer or a saved state file); parquet streaming feeds rows in time order.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("xgboost")  # TRAINING.model_fun imports every trainer
+
+from TRAINING.model_fun.ftrl_proximal_trainer import (  # noqa: E402
+    FTRLProximalRegressor, FTRLProximalTrainer, iter_parquet_chunks,
+)
+
+CONFIG = {"epochs": 1, "chunk_rows": 500, "minibatch_rows": 64, "learning_rate": 0.5, "beta": 1.0,
+          "l1_regularization_strength": 0.0, "l2_regularization_strength": 1.0, "clip": 5.0}
+NAMES = [f"x{i}" for i in range(6)]
+
+
+def _data(n=3000, seed=0, nan_col=None):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(NAMES)))
+    y = 2.0 * X[:, 0] - X[:, 1] + rng.normal(scale=0.1, size=n)
+    if nan_col is not None:
+        X[:, nan_col] = np.nan
+    return X, y
+
+
+def test_warm_start_with_dropped_all_nan_column():
+    X, y = _data(nan_col=3)
+    first = FTRLProximalTrainer(dict(CONFIG))
+    first.train(X, y, feature_names=NAMES)
+    assert first.feature_names == [n for n in NAMES if n != "x3"]
+    assert first.model.feature_names == first.feature_names
+
+    X2, y2 = _data(seed=1, nan_col=3)
+    second = FTRLProximalTrainer(dict(CONFIG))
+    second.train(X2, y2, feature_names=NAMES, warm_start=first)
+    assert second.model.n_seen_ > first.model.n_seen_
+    assert second.predict(X2).shape == (len(y2),)
+
+
+def test_saved_state_warm_starts_by_name(tmp_path):
+    X, y = _data()
+    trainer = FTRLProximalTrainer(dict(CONFIG))
+    trainer.train(X, y, feature_names=NAMES)
+    path = trainer.save_state(tmp_path / "ftrl_state")
+    assert path.exists() and path.suffix == ".npz"
+
+    reordered = NAMES[::-1] + ["new"]
+    restored = FTRLProximalRegressor(0.5, 1.0, 0.0, 1.0, 64, 5.0).load_state(path, reordered)
+    coef = dict(zip(reordered, restored.coef_))
+    np.testing.assert_allclose([coef[n] for n in NAMES], trainer.model.coef_)
+    assert coef["new"] == 0.0
+
+
+def test_train_from_parquet_merges_files_by_time(tmp_path):
+    pytest.importorskip("pyarrow")
+    X, y = _data(n=2000)
+    t = np.arange(len(y))
+    paths = []
+    for part in range(2):  # two "symbols", interleaved in time
+        rows = slice(part, None, 2)
+        df = pd.DataFrame(X[rows], columns=NAMES).assign(target=y[rows], ts=t[rows])
+        paths.append(tmp_path / f"part{part}.parquet")
+        df.to_parquet(paths[-1], index=False)
+
+    chunks = list(iter_parquet_chunks(paths, NAMES, "target", chunk_rows=300, time_col="ts"))
+    assert max(len(c[1]) for c in chunks) <= 300
+    np.testing.assert_allclose(np.concatenate([c[0] for c in chunks]), X.astype(np.float32))
+
+    streamed = FTRLProximalTrainer(dict(CONFIG, chunk_rows=300))
+    streamed.train_from_parquet(paths, NAMES, "target", time_col="ts")
+    assert streamed.model.n_seen_ == len(y)
+    assert streamed.model.feature_names == NAMES
+    assert np.corrcoef(streamed.predict(X), y)[0, 1] > 0.95
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Import-Time Budget Test
+=======================
+
+Entry points must stay cheap to import: `--help` or a single LightGBM target
+should not pay for TensorFlow/PyTorch. Each entry module is imported in a fresh
+interpreter under `python -X importtime`; the test checks which heavy modules
+got loaded and that the cumulative import time stays under budget.
+
+Budgets are deliberately generous (they catch regressions like an eager TF
+import, not noise). Scale them on slow machines with IMPORT_BUDGET_SCALE.
+"""
+
+import os
+import pathlib
+import re
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+BUDGET_SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1.0"))
+
+# entry module -> (budget in seconds, top-level modules that must not be imported)
+ENTRY_POINTS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "TRAINING.training_strategies.main": (3.0, ("tensorflow", "torch", "keras")),
+    "TRAINING.orchestration.intelligent_trainer": (4.0, ("tensorflow", "torch", "keras", "lightgbm")),
+    "TRAINING.ranking": (0.5, ("tensorflow", "torch", "lightgbm", "xgboost", "sklearn")),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def _import_profile(module: str) -> Dict[str, int]:
+    """Top-level import tree of `module`: {qualified module name: cumulative microseconds}."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=600,
+    )
+    assert proc.returncode == 0, f"import {module} failed:\n{proc.stderr[-4000:]}"
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_import_budget(module):
+    budget_s, forbidden = ENTRY_POINTS[module]
+    profile = _import_profile(module)
+
+    loaded_heavy = sorted(name for name in profile if name.split(".")[0] in forbidden)
+    assert not loaded_heavy, (
+        f"import {module} eagerly loads {sorted({n.split('.')[0] for n in loaded_heavy})}; "
+        f"move these imports into the functions that need them"
+    )
+
+    elapsed_s = profile.get(module, 0) / 1e6
+    limit_s = budget_s * BUDGET_SCALE
+    slowest = sorted(profile.items(), key=lambda kv: -kv[1])[:10]
+    assert elapsed_s <= limit_s, (
+        f"import {module} took {elapsed_s:.2f}s (budget {limit_s:.2f}s). Slowest imports:\n"
+        + "\n".join(f"  {us / 1e6:7.3f}s  {name}" for name, us in slowest)
+    )
+
+
+if __name__ == "__main__":
+    for entry in sorted(ENTRY_POINTS):
+        test_entry_point_import_budget(entry)
+    print("✅ Import-time budgets met")
@@ -0,0 +1,78 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+
+"""
+Leakage Sentinel Batch Tests
+============================
+
+LeakageSentinel.run_batch scores the base prediction against time-permuted
+labels, so an honest model that fits its sample well still passes the
+randomized-time test.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from sklearn.linear_model import LinearRegression, LogisticRegression  # noqa: E402
+
+from TRAINING.common.leakage_sentinels import LeakageSentinel  # noqa: E402
+
+
+def _panel(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5))
+    y = X @ np.arange(1.0, 6.0) + rng.normal(size=n)
+    return X, y
+
+
+def _randomized(results):
+    (result,) = [r for r in results if r.test_name == "randomized_time"]
+    return result
+
+
+@pytest.mark.parametrize("classify", [False, True])
+def test_randomized_time_scores_permuted_labels(classify):
+    X, y = _panel()
+    if classify:
+        y = (y > 0).astype(int)
+        factory = lambda name: LogisticRegression()  # noqa: E731
+    else:
+        factory = lambda name: LinearRegression()  # noqa: E731
+    sentinel = LeakageSentinel(randomized_time_threshold=0.5)
+
+    in_sample = factory("base").fit(X, y).score(X, y)
+    result = _randomized(sentinel.run_batch(X, y, factory, enabled_tests=["randomized_time"]))
+
+    assert in_sample > 0.8
+    assert result.passed
+    assert result.score < 0.55
+
+
+def test_randomized_time_uses_base_rows_only():
+    X, y = _panel()
+    rows = np.arange(0, len(y), 2)
+    sentinel = LeakageSentinel(randomized_time_threshold=0.5)
+
+    result = _randomized(sentinel.run_batch(X, y, lambda name: LinearRegression(), rows=rows,
+                                            enabled_tests=["randomized_time"]))
+
+    assert result.details["n_samples"] == len(rows)
+    assert result.passed
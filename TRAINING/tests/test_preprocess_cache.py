@@ -0,0 +1,113 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Shared Preprocessing Cache Tests
+================================
+
+Every family trained on a target must get the same train-mode preprocessing
+result: computed once, shared read-only, with private colmask/imputer copies.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from TRAINING.common import preprocess_cache as pc  # noqa: E402
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 6))
+    X[rng.random(X.shape) < 0.05] = np.nan
+    X[:, 3] = np.nan  # all-NaN column is dropped on train
+    y = rng.normal(size=500)
+    y[::50] = np.nan  # non-finite targets are filtered
+    return X, y
+
+
+def test_config_dir_is_repo_config():
+    assert pc._CONFIG_DIR == pc._REPO_ROOT / "CONFIG"
+    assert (pc._REPO_ROOT / "TRAINING" / "common" / "preprocess_cache.py").exists()
+
+
+def test_hit_returns_same_entry(panel):
+    X, y = panel
+    cache = pc.PreprocessCache(max_entries=2)
+    first = cache.get_or_compute(X, y, "median")
+    second = cache.get_or_compute(X.copy(), y.copy(), "median")  # same content, new buffers
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first.X.shape == (int(np.isfinite(y).sum()), 5)
+    assert not first.colmask[3]
+
+
+def test_miss_on_changed_data_or_strategy(panel):
+    X, y = panel
+    cache = pc.PreprocessCache(max_entries=4)
+    base = cache.get_or_compute(X, y, "median")
+    assert cache.get_or_compute(X, y, "mean") is not base
+    X2 = X.copy()
+    X2[0, 0] = 123.0
+    assert cache.get_or_compute(X2, y, "median") is not base
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_lru_eviction(panel):
+    X, y = panel
+    cache = pc.PreprocessCache(max_entries=1)
+    cache.get_or_compute(X, y, "median")
+    cache.get_or_compute(X, y, "mean")
+    assert len(cache) == 1
+    cache.get_or_compute(X, y, "median")
+    assert cache.misses == 3
+
+
+def test_shared_arrays_are_read_only(panel):
+    X, y = panel
+    entry = pc.PreprocessCache(max_entries=1).get_or_compute(X, y, "median")
+    for arr in (entry.X, entry.y, entry.colmask):
+        assert not arr.flags.writeable
+        with pytest.raises(ValueError):
+            arr[0] = 0
+    assert entry.X.flags.owndata and entry.X.dtype == np.float32
+    assert np.isfinite(entry.X).all()
+
+
+def test_preprocess_train_hands_out_private_state(panel, monkeypatch):
+    X, y = panel
+    cache = pc.PreprocessCache(max_entries=1)
+    monkeypatch.setattr(pc, "get_preprocess_cache", lambda: cache)
+
+    X1, y1, colmask1, imputer1 = pc.preprocess_train(X, y, "median")
+    X2, y2, colmask2, imputer2 = pc.preprocess_train(X, y, "median")
+
+    assert X1 is X2 and y1 is y2  # arrays shared across trainers
+    assert colmask1 is not colmask2 and imputer1 is not imputer2
+    colmask1[0] = False  # a trainer's own copy stays writable and independent
+    assert colmask2[0]
+    np.testing.assert_array_equal(imputer1.statistics_, imputer2.statistics_)
+
+
+def test_input_arrays_untouched(panel):
+    X, y = panel
+    X_before, y_before = X.copy(), y.copy()
+    pc.compute_preprocessing(X, y, "median")
+    np.testing.assert_array_equal(X, X_before)
+    np.testing.assert_array_equal(y, y_before)
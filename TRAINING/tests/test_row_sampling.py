@@ -0,0 +1,68 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+"""
+Training Row Sampling Tests
+===========================
+
+time_stratified_timestamp_mask keeps whole timestamps, spread over time strata,
+and fills the row budget even when a stratum's share is below one cross-section.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("polars")
+
+from TRAINING.training_strategies.data_preparation import time_stratified_timestamp_mask  # noqa: E402
+
+
+def _kept_rows(counts, max_rows, seed=0, n_strata=64):
+    return int(counts[time_stratified_timestamp_mask(counts, max_rows, seed, n_strata)].sum())
+
+
+@pytest.mark.parametrize("max_rows", [20_000, 100_000])
+def test_wide_panel_fills_budget(max_rows):
+    counts = np.full(10_000, 500)  # a stratum's share is below one 500-symbol cross-section
+    assert _kept_rows(counts, max_rows) == max_rows
+
+
+def test_kept_timestamps_spread_over_time():
+    counts = np.full(10_000, 500)
+    mask = time_stratified_timestamp_mask(counts, 20_000, seed=0)
+    per_period = np.bincount(np.flatnonzero(mask) * 8 // len(counts), minlength=8)
+    assert per_period.min() >= 4
+
+
+def test_small_budget_keeps_one_timestamp():
+    counts = np.full(1_000, 500)
+    mask = time_stratified_timestamp_mask(counts, 100, seed=0)
+    assert mask.sum() == 1
+
+
+def test_uneven_cross_sections_stay_within_budget():
+    counts = np.random.default_rng(1).integers(1, 900, size=5_000)
+    for max_rows in (1_000, 50_000, 1_000_000):
+        kept = _kept_rows(counts, max_rows, seed=3)
+        assert min(max_rows, counts.sum()) - counts.max() <= kept <= max_rows  # short by under one timestamp
+
+
+def test_budget_above_total_keeps_everything():
+    counts = np.full(100, 10)
+    assert time_stratified_timestamp_mask(counts, 5_000, seed=0).all()
@@ -17,62 +17,69 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 """Training strategies - split from original large file for maintainability."""
 
-# Re-export everything for backward compatibility
-from TRAINING.training_strategies.family_runners import (
-    _run_family_inproc,
-    _run_family_isolated,
-)
-
-from TRAINING.training_strategies.utils import (
-    setup_logging,
-    _now,
-    safe_duration,
-    _pkg_ver,
-    _env_guard,
-    build_sequences_from_features,
-    tf_available,
-    ngboost_available,
-    pick_tf_device,
-)
-
-from TRAINING.training_strategies.data_preparation import (
-    prepare_training_data_cross_sectional,
-)
+# Re-export everything for backward compatibility.
+# Exports are resolved lazily (PEP 562): importing the package (or main for `--help`)
+# must not pull in the family runners, strategies and their framework dependencies.
+_LAZY_EXPORTS = {
+    # Family runners
+    '_run_family_inproc': '.family_runners',
+    '_run_family_isolated': '.family_runners',
+    # Utils
+    'setup_logging': '.utils',
+    '_now': '.utils',
+    'safe_duration': '.utils',
+    '_pkg_ver': '.utils',
+    '_env_guard': '.utils',
+    'build_sequences_from_features': '.utils',
+    'build_sequence_windows': '.utils',
+    'SequenceWindows': '.utils',
+    'tf_available': '.utils',
+    'ngboost_available': '.utils',
+    'pick_tf_device': '.utils',
+    'ALL_FAMILIES': '.utils',
+    # Data preparation
+    'prepare_training_data_cross_sectional': '.data_preparation',
+    'load_mtf_data': '.strategies',
+    'discover_targets': '.strategies',
+    'prepare_training_data': '.strategies',
+    # Training
+    'train_models_for_interval_comprehensive': '.training',
+    'train_model_comprehensive': '.training',
+    '_legacy_train_fallback': '.training',
+    # Strategies
+    'create_strategy_config': '.strategies',
+    'train_with_strategy': '.strategies',
+    'compare_strategies': '.strategies',
+    # Main
+    'main': '.main',
+    # Constants
+    'TF_FAMS': '.setup',
+    'TORCH_FAMS': '.setup',
+    'CPU_FAMS': '.setup',
+}
 
-from TRAINING.training_strategies.strategies import (
-    load_mtf_data,
-    discover_targets,
-    prepare_training_data,
-)
 
-from TRAINING.training_strategies.training import (
-    train_models_for_interval_comprehensive,
-    train_model_comprehensive,
-    _legacy_train_fallback,
-)
+def __getattr__(name):
+    if name == 'FAMILY_CAPS':
+        # FAMILY_CAPS is in models.specialized.constants, not here
+        try:
+            from TRAINING.models.specialized.constants import FAMILY_CAPS as value
+        except ImportError:
+            value = {}
+        globals()[name] = value
+        return value
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from TRAINING.training_strategies.strategies import (
-    create_strategy_config,
-    train_with_strategy,
-    compare_strategies,
-)
 
-from TRAINING.training_strategies.main import main
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS) | {'FAMILY_CAPS'})
 
-# Export constants
-from TRAINING.training_strategies.setup import (
-    TF_FAMS,
-    TORCH_FAMS,
-    CPU_FAMS,
-)
-from TRAINING.training_strategies.utils import (
-    ALL_FAMILIES,
-)
-# FAMILY_CAPS is in models.specialized.constants, not here
-try:
-    from TRAINING.models.specialized.constants import FAMILY_CAPS
-except ImportError:
-    FAMILY_CAPS = {}
 
 __all__ = [
     # Family runners
@@ -85,6 +92,8 @@ __all__ = [
     '_pkg_ver',
     '_env_guard',
     'build_sequences_from_features',
+    'build_sequence_windows',
+    'SequenceWindows',
     'tf_available',
     'ngboost_available',
     'pick_tf_device',
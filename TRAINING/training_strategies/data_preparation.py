@@ -101,16 +101,16 @@ _JOBLIB_TMP.mkdir(parents=True, exist_ok=True)
 os.environ.setdefault("JOBLIB_TEMP_FOLDER", str(_JOBLIB_TMP))
 
 # Force clean loky worker shutdown at exit to prevent semlock/file leaks
-try:
-    from joblib.externals.loky import get_reusable_executor
-    @atexit.register
-    def _loky_shutdown():
-        try:
-            get_reusable_executor().shutdown(wait=True, kill_workers=True)
-        except Exception:
-            pass
-except Exception:
-    pass
+# (only if loky was loaded: importing it here would slow every entry point)
+@atexit.register
+def _loky_shutdown():
+    loky = sys.modules.get("joblib.externals.loky")
+    if loky is None:
+        return
+    try:
+        loky.get_reusable_executor().shutdown(wait=True, kill_workers=True)
+    except Exception:
+        pass
 
 """
 Enhanced Training Script with Multiple Strategies - Full Original Functionality
@@ -188,12 +188,86 @@ logger = logging.getLogger(__name__)
 
 """Data preparation functions for training strategies."""
 
+def time_stratified_timestamp_mask(rows_per_ts: np.ndarray, max_rows: int, seed: int,
+                                   n_strata: int = 64) -> np.ndarray:
+    """
+    Choose whole timestamps so that at most max_rows rows are kept.
+    
+    rows_per_ts holds the row count of each unique timestamp in time order. Timestamps
+    are split into n_strata equal-count time strata and each stratum keeps (in seeded
+    random order) timestamps up to the same share of its rows, so every period of the
+    sample keeps its weight and every kept timestamp keeps its full cross-section.
+    Quota a stratum cannot use (its next timestamp does not fit) carries over to the
+    next stratum, so budgets smaller than n_strata cross-sections still fill up; at
+    least one timestamp is always kept.
+    
+    Returns:
+        Boolean mask over the unique timestamps
+    """
+    counts = np.asarray(rows_per_ts, dtype=np.int64)
+    n_ts = len(counts)
+    total = int(counts.sum())
+    if n_ts == 0 or total <= max_rows:
+        return np.ones(n_ts, dtype=bool)
+    
+    n_strata = max(1, min(int(n_strata), n_ts))
+    strata = (np.arange(n_ts) * n_strata) // n_ts
+    order = np.lexsort((np.random.default_rng(seed).random(n_ts), strata))
+    quota = np.bincount(strata, weights=counts, minlength=n_strata) * (max(max_rows, 0) / total)
+    
+    # Strata are contiguous in `order`; keep each stratum's random-order prefix that fits
+    bounds = np.searchsorted(strata[order], np.arange(n_strata + 1), side="left")
+    mask = np.zeros(n_ts, dtype=bool)
+    carry = 0.0
+    for s in range(n_strata):
+        idx = order[bounds[s]:bounds[s + 1]]
+        allowance = quota[s] + carry
+        cum = np.cumsum(counts[idx])
+        n_keep = int(np.searchsorted(cum, allowance, side="right"))
+        mask[idx[:n_keep]] = True
+        carry = allowance - (cum[n_keep - 1] if n_keep else 0)
+    
+    if not mask.any():
+        mask[order[0]] = True
+    return mask
+
+
+def _resolve_row_budget(n_features: int, max_rows: Optional[int], families: Optional[List[str]]) -> Optional[int]:
+    """Training row budget: memory headroom (MemoryManager) capped by an explicit max_rows."""
+    budget = None
+    try:
+        from TRAINING.memory.memory_manager import MemoryManager
+        budget = MemoryManager().training_row_budget(n_features, families)
+    except Exception as e:
+        logger.debug(f"Memory-based row budget unavailable: {e}")
+    if max_rows:
+        budget = min(budget, int(max_rows)) if budget else int(max_rows)
+    return budget
+
+
+def _sampling_strata() -> int:
+    if _CONFIG_AVAILABLE:
+        try:
+            return int(get_cfg("memory.sampling.n_strata", default=64, config_name="memory_config"))
+        except Exception:
+            pass
+    return 64  # FALLBACK_DEFAULT_OK
+
+
 def prepare_training_data_cross_sectional(mtf_data: Dict[str, pd.DataFrame], 
                                        target: str, 
                                        feature_names: List[str] = None,
                                        min_cs: int = 10,
-                                       max_cs_samples: int = None) -> Tuple[np.ndarray, np.ndarray, List[str], np.ndarray, np.ndarray, List[str], Optional[np.ndarray], Dict[str, Any]]:
-    """Prepare cross-sectional training data with polars optimization for memory efficiency."""
+                                       max_cs_samples: int = None,
+                                       max_rows: Optional[int] = None,
+                                       families: Optional[List[str]] = None,
+                                       sample_seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, List[str], np.ndarray, np.ndarray, List[str], Optional[np.ndarray], Dict[str, Any]]:
+    """Prepare cross-sectional training data with polars optimization for memory efficiency.
+    
+    Rows are sampled while the panel is built (before the pandas/numpy copies): the row
+    budget comes from MemoryManager headroom for the given families, capped by max_rows,
+    and whole timestamps are kept (time-stratified, seeded by sample_seed).
+    """
     
     logger.info(f"🎯 Building cross-sectional training data for target: {target}")
     if max_cs_samples is None:
@@ -208,16 +282,22 @@ def prepare_training_data_cross_sectional(mtf_data: Dict[str, pd.DataFrame],
     else:
         logger.info(f"📊 Cross-sectional sampling: max {max_cs_samples} samples per timestamp")
     
+    if sample_seed is None:
+        from TRAINING.common.determinism import stable_seed_from
+        sample_seed = stable_seed_from([target, 'downsample'])
+    sampling = {'max_rows': max_rows, 'families': families, 'seed': sample_seed}
+    
     if USE_POLARS:
-        return _prepare_training_data_polars(mtf_data, target, feature_names, min_cs, max_cs_samples)
+        return _prepare_training_data_polars(mtf_data, target, feature_names, min_cs, max_cs_samples, sampling)
     else:
-        return _prepare_training_data_pandas(mtf_data, target, feature_names, min_cs, max_cs_samples)
+        return _prepare_training_data_pandas(mtf_data, target, feature_names, min_cs, max_cs_samples, sampling)
 
 def _prepare_training_data_polars(mtf_data: Dict[str, pd.DataFrame], 
                                  target: str, 
                                  feature_names: List[str] = None,
                                  min_cs: int = 10,
-                                 max_cs_samples: int = None) -> Tuple[np.ndarray, np.ndarray, List[str], np.ndarray, np.ndarray, List[str], Optional[np.ndarray], Dict[str, Any]]:
+                                 max_cs_samples: int = None,
+                                 sampling: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, np.ndarray, List[str], np.ndarray, np.ndarray, List[str], Optional[np.ndarray], Dict[str, Any]]:
     """Polars-based data preparation for memory efficiency with cross-sectional sampling."""
     
     logger.info(f"🎯 Building cross-sectional training data (polars, memory-efficient) for target: {target}")
@@ -330,6 +410,24 @@ def _prepare_training_data_polars(mtf_data: Dict[str, pd.DataFrame],
         
         logger.info(f"Cross-sectional sampling applied")
     
+    # Row budget sampling on the polars frame, before any pandas/numpy copy exists
+    sampling = sampling or {}
+    row_budget = _resolve_row_budget(len(feature_names or []), sampling.get('max_rows'), sampling.get('families'))
+    if row_budget and combined_pl.height > row_budget:
+        n_before = combined_pl.height
+        if ts_name:
+            ts_counts = combined_pl.group_by(ts_name).len().sort(ts_name)
+            mask = time_stratified_timestamp_mask(ts_counts["len"].to_numpy(), row_budget,
+                                                  sampling.get('seed', 0), _sampling_strata())
+            kept_ts = ts_counts.filter(pl.Series(mask))[ts_name]
+            combined_pl = combined_pl.filter(pl.col(ts_name).is_in(kept_ts))
+            logger.info(f"✂️ Time-stratified sampling: kept {int(mask.sum())}/{len(mask)} timestamps, "
+                       f"{combined_pl.height:,}/{n_before:,} rows (budget {row_budget:,})")
+        else:
+            idx = np.sort(np.random.default_rng(sampling.get('seed', 0)).choice(n_before, row_budget, replace=False))
+            combined_pl = combined_pl[idx]
+            logger.info(f"✂️ Row sampling (no time column): {row_budget:,}/{n_before:,} rows")
+    
     # Extract target and features using polars
     try:
         # Get target column
@@ -365,7 +463,8 @@ def _prepare_training_data_pandas(mtf_data: Dict[str, pd.DataFrame],
                                  target: str, 
                                  feature_names: List[str] = None,
                                  min_cs: int = 10,
-                                 max_cs_samples: int = None) -> Tuple[np.ndarray, np.ndarray, List[str], np.ndarray, np.ndarray, List[str], Optional[np.ndarray], Dict[str, Any]]:
+                                 max_cs_samples: int = None,
+                                 sampling: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, np.ndarray, List[str], np.ndarray, np.ndarray, List[str], Optional[np.ndarray], Dict[str, Any]]:
     """Pandas-based data preparation (fallback)."""
     
     # Combine all symbol data
@@ -433,6 +532,23 @@ def _prepare_training_data_pandas(mtf_data: Dict[str, pd.DataFrame],
         except Exception as e:
             logger.warning(f"  Feature registry validation failed: {e}. Using provided features as-is.")
     
+    # Row budget sampling before the feature frame/ndarray copies
+    sampling = sampling or {}
+    row_budget = _resolve_row_budget(len(feature_names or []), sampling.get('max_rows'), sampling.get('families'))
+    if row_budget and len(combined_df) > row_budget:
+        n_before = len(combined_df)
+        if time_col is not None:
+            ts_counts = combined_df.groupby(time_col, sort=True).size()
+            mask = time_stratified_timestamp_mask(ts_counts.to_numpy(), row_budget,
+                                                  sampling.get('seed', 0), _sampling_strata())
+            combined_df = combined_df[combined_df[time_col].isin(ts_counts.index[mask])]
+            logger.info(f"✂️ Time-stratified sampling: kept {int(mask.sum())}/{len(mask)} timestamps, "
+                       f"{len(combined_df):,}/{n_before:,} rows (budget {row_budget:,})")
+        else:
+            idx = np.sort(np.random.default_rng(sampling.get('seed', 0)).choice(n_before, row_budget, replace=False))
+            combined_df = combined_df.iloc[idx]
+            logger.info(f"✂️ Row sampling (no time column): {row_budget:,}/{n_before:,} rows")
+    
     return _process_combined_data_pandas(combined_df, target, feature_names)
 
 def _process_combined_data_pandas(combined_df: pd.DataFrame, target: str, feature_names: List[str]) -> Tuple[np.ndarray, np.ndarray, List[str], np.ndarray, np.ndarray, List[str], Optional[np.ndarray], Dict[str, Any]]:
@@ -101,16 +101,16 @@ _JOBLIB_TMP.mkdir(parents=True, exist_ok=True)
 os.environ.setdefault("JOBLIB_TEMP_FOLDER", str(_JOBLIB_TMP))
 
 # Force clean loky worker shutdown at exit to prevent semlock/file leaks
-try:
-    from joblib.externals.loky import get_reusable_executor
-    @atexit.register
-    def _loky_shutdown():
-        try:
-            get_reusable_executor().shutdown(wait=True, kill_workers=True)
-        except Exception:
-            pass
-except Exception:
-    pass
+# (only if loky was loaded: importing it here would slow every entry point)
+@atexit.register
+def _loky_shutdown():
+    loky = sys.modules.get("joblib.externals.loky")
+    if loky is None:
+        return
+    try:
+        loky.get_reusable_executor().shutdown(wait=True, kill_workers=True)
+    except Exception:
+        pass
 
 """
 Enhanced Training Script with Multiple Strategies - Full Original Functionality
@@ -164,12 +164,25 @@ import numpy as np
 # Setup logger
 logger = logging.getLogger(__name__)
 
-def _run_family_inproc(family: str, X, y, total_threads: int = 12, trainer_kwargs: dict | None = None):
+# PyTorch sequence trainers; they train on lazy (N', T, F) windows over a 2D X
+TORCH_SEQ_MODMAP = {
+    "CNN1D":          ("model_fun.cnn1d_trainer_torch",          "CNN1DTrainerTorch"),
+    "LSTM":           ("model_fun.lstm_trainer_torch",           "LSTMTrainerTorch"),
+    "Transformer":    ("model_fun.transformer_trainer_torch",    "TransformerTrainerTorch"),
+    "TabCNN":         ("model_fun.tabcnn_trainer_torch",         "TabCNNTrainerTorch"),
+    "TabLSTM":        ("model_fun.tablstm_trainer_torch",        "TabLSTMTrainerTorch"),
+    "TabTransformer": ("model_fun.tabtransformer_trainer_torch", "TabTransformerTrainerTorch"),
+}
+
+def _run_family_inproc(family: str, X, y, total_threads: int = 12, trainer_kwargs: dict | None = None,
+                       symbols=None, time_vals=None):
     """
     Runs a family trainer in the main process with unified threading control.
     - No multiprocessing, no payload temp files, no IPC.
     - Uses plan_for_family + thread_guard to clamp pools.
     - Configures TF safely if the family uses it.
+    - Torch sequence families (TORCH_SEQ_MODMAP) get a 2D X as lazy windows
+      (build_sequence_windows) and torch threads from the plan.
     
     Args:
         family: Model family name
@@ -177,6 +190,8 @@ def _run_family_inproc(family: str, X, y, total_threads: int = 12, trainer_kwarg
         y: Training targets
         total_threads: Total threads available
         trainer_kwargs: Additional trainer arguments
+        symbols: Per-row symbols, keep sequence windows within one symbol
+        time_vals: Per-row timestamps, order rows within a symbol for sequence windows
     
     Returns:
         Trained model
@@ -211,6 +226,20 @@ def _run_family_inproc(family: str, X, y, total_threads: int = 12, trainer_kwarg
     
     logger.info(f"[InProc] Training {family} with OMP={omp}, MKL={mkl}")
     
+    if family in TORCH_SEQ_MODMAP:
+        # Resolved trainer config, with torch intra-op threads from the plan
+        trainer_kwargs = dict(trainer_kwargs or {})
+        trainer_kwargs["config"] = {**(trainer_kwargs.get("config") or {}), "num_threads": omp}
+        if np.ndim(X) == 2:  # (N, F) -> lazy (N', T, F) windows, labels at each window's last row
+            from TRAINING.training_strategies.utils import build_sequence_windows
+            X = build_sequence_windows(X, y, lookback=None, symbols=symbols, time_vals=time_vals)
+            y = X.targets
+        try:
+            import torch
+            torch.backends.cudnn.benchmark = True
+        except Exception:
+            pass
+    
     # Best-effort CUDA visibility: keep CPU families off the GPU
     # Save original CVD to restore after CPU families
     original_cvd = os.environ.get("CUDA_VISIBLE_DEVICES", None)
@@ -234,7 +263,7 @@ def _run_family_inproc(family: str, X, y, total_threads: int = 12, trainer_kwarg
     # Clamp threadpools for this fit()
     with thread_guard(omp=omp, mkl=mkl):
         # Import and instantiate trainer
-        mod_name, cls_name = MODMAP[family]
+        mod_name, cls_name = MODMAP[family] if family in MODMAP else TORCH_SEQ_MODMAP[family]
         Trainer = getattr(importlib.import_module(mod_name), cls_name)
         trainer = Trainer(**(trainer_kwargs or {}))
         
@@ -101,16 +101,16 @@ _JOBLIB_TMP.mkdir(parents=True, exist_ok=True)
 os.environ.setdefault("JOBLIB_TEMP_FOLDER", str(_JOBLIB_TMP))
 
 # Force clean loky worker shutdown at exit to prevent semlock/file leaks
-try:
-    from joblib.externals.loky import get_reusable_executor
-    @atexit.register
-    def _loky_shutdown():
-        try:
-            get_reusable_executor().shutdown(wait=True, kill_workers=True)
-        except Exception:
-            pass
-except Exception:
-    pass
+# (only if loky was loaded: importing it here would slow every entry point)
+@atexit.register
+def _loky_shutdown():
+    loky = sys.modules.get("joblib.externals.loky")
+    if loky is None:
+        return
+    try:
+        loky.get_reusable_executor().shutdown(wait=True, kill_workers=True)
+    except Exception:
+        pass
 
 """
 Enhanced Training Script with Multiple Strategies - Full Original Functionality
@@ -142,10 +142,8 @@ if str(_TRAINING_ROOT) not in sys.path:
 if '.' not in sys.path:
     sys.path.insert(0, '.')
 
-from TRAINING.common.isolation_runner import child_isolated
-from TRAINING.common.threads import temp_environ, child_env_for_family, plan_for_family, thread_guard, set_estimator_threads
-from TRAINING.common.tf_runtime import ensure_tf_initialized
-from TRAINING.common.tf_setup import tf_thread_setup
+# isolation_runner, threads, tf_runtime and tf_setup are used by the family runners
+# (imported with training.py when main() starts training), not at module load.
 
 # Family classifications
 # TF families: TensorFlow models that use GPU when available
@@ -160,8 +158,8 @@ CPU_FAMS = {"LightGBM", "QuantileLightGBM", "XGBoost", "RewardBased", "NGBoost",
 """Main entry point for training strategies."""
 
 # Import all dependencies
-from TRAINING.training_strategies.training import train_models_for_interval_comprehensive, train_model_comprehensive
-from TRAINING.training_strategies.strategies import load_mtf_data, discover_targets, prepare_training_data, create_strategy_config, train_with_strategy, compare_strategies
+# (training/strategies modules and joblib are imported inside main(): `--help` and
+#  argument errors should not pay for the training stack)
 from TRAINING.training_strategies.utils import (
     setup_logging, ALL_FAMILIES, THREADS, MKL_THREADS_DEFAULT,
     _env_guard, USE_POLARS, FAMILY_CAPS, CROSS_SECTIONAL_MODELS, SEQUENTIAL_MODELS
@@ -171,7 +169,6 @@ from TRAINING.training_strategies.utils import (
 import argparse
 from datetime import datetime
 import logging
-import joblib
 
 # Third-party imports
 import pandas as pd
@@ -277,8 +274,17 @@ def main():
     # Training plan integration
     parser.add_argument('--training-plan-dir', type=str, help='Path to training plan directory (METRICS/training_plan). If provided, will filter targets and model families based on plan.')
     
+    # Model cache
+    parser.add_argument('--model-cache', action='store_true', help='Reuse cached models whose data/config/seed match (see pipeline.model_cache)')
+    parser.add_argument('--no-model-cache', action='store_true', help='Always retrain; do not reuse cached models (see pipeline.model_cache)')
+    
     args = parser.parse_args()
     
+    if args.model_cache:
+        os.environ["TRAINER_MODEL_CACHE"] = "1"
+    if args.no_model_cache:
+        os.environ["TRAINER_NO_MODEL_CACHE"] = "1"
+    
     # Setup logging first (before any logger calls)
     listener = setup_logging(args.log_level)
     # Re-get logger after setup_logging configures it
@@ -287,6 +293,7 @@ def main():
     # Set global backend for sequential models
     global SEQ_BACKEND
     SEQ_BACKEND = args.seq_backend
+    os.environ["TRAINER_SEQ_BACKEND"] = SEQ_BACKEND  # Read by train_model_comprehensive
     logger.info(f"Sequential backend: {SEQ_BACKEND}")
     
     # Handle polars settings
@@ -390,6 +397,10 @@ def main():
     logger.info(f"📁 Output directory: {output_dir}")
     
     try:
+        import joblib
+        from TRAINING.training_strategies.training import train_models_for_interval_comprehensive
+        from TRAINING.training_strategies.strategies import load_mtf_data, discover_targets
+
         # Load data (with optional row limiting like original script)
         logger.info(f"📂 Loading data from {args.data_dir}")
         logger.info(f"📊 Symbols: {args.symbols}")
@@ -101,16 +101,16 @@ _JOBLIB_TMP.mkdir(parents=True, exist_ok=True)
 os.environ.setdefault("JOBLIB_TEMP_FOLDER", str(_JOBLIB_TMP))
 
 # Force clean loky worker shutdown at exit to prevent semlock/file leaks
-try:
-    from joblib.externals.loky import get_reusable_executor
-    @atexit.register
-    def _loky_shutdown():
-        try:
-            get_reusable_executor().shutdown(wait=True, kill_workers=True)
-        except Exception:
-            pass
-except Exception:
-    pass
+# (only if loky was loaded: importing it here would slow every entry point)
+@atexit.register
+def _loky_shutdown():
+    loky = sys.modules.get("joblib.externals.loky")
+    if loky is None:
+        return
+    try:
+        loky.get_reusable_executor().shutdown(wait=True, kill_workers=True)
+    except Exception:
+        pass
 
 """
 Enhanced Training Script with Multiple Strategies - Full Original Functionality
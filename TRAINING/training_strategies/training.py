@@ -101,16 +101,16 @@ _JOBLIB_TMP.mkdir(parents=True, exist_ok=True)
 os.environ.setdefault("JOBLIB_TEMP_FOLDER", str(_JOBLIB_TMP))
 
 # Force clean loky worker shutdown at exit to prevent semlock/file leaks
-try:
-    from joblib.externals.loky import get_reusable_executor
-    @atexit.register
-    def _loky_shutdown():
-        try:
-            get_reusable_executor().shutdown(wait=True, kill_workers=True)
-        except Exception:
-            pass
-except Exception:
-    pass
+# (only if loky was loaded: importing it here would slow every entry point)
+@atexit.register
+def _loky_shutdown():
+    loky = sys.modules.get("joblib.externals.loky")
+    if loky is None:
+        return
+    try:
+        loky.get_reusable_executor().shutdown(wait=True, kill_workers=True)
+    except Exception:
+        pass
 
 """
 Enhanced Training Script with Multiple Strategies - Full Original Functionality
@@ -191,11 +191,20 @@ def train_models_for_interval_comprehensive(interval: str, targets: List[str],
                                            max_cs_samples: int = None,
                                            max_rows_train: int = None,
                                            target_features: Dict[str, List[str]] = None,
-                                           target_families: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
-    """Train models for a specific interval using comprehensive approach (replicates original script)."""
+                                           target_families: Optional[Dict[str, List[str]]] = None,
+                                           use_model_cache: Optional[bool] = None) -> Dict[str, Any]:
+    """Train models for a specific interval using comprehensive approach (replicates original script).
+
+    Trained (target, family) models are reused from the model cache when the data, routed
+    config, seed and library versions match a previous run. The cache is opt-in
+    (pipeline.model_cache.enabled, --model-cache or use_model_cache=True).
+    """
     
     logger.info(f"🎯 Training models for interval: {interval}")
     
+    from TRAINING.common.model_cache import get_model_cache
+    model_cache = get_model_cache(use_model_cache)
+    
     results = {
         'interval': interval,
         'targets': targets,
@@ -256,7 +265,8 @@ def train_models_for_interval_comprehensive(interval: str, targets: List[str],
                     logger.info(f"Using {len(selected_features)} selected features for {target}")
         
         X, y, feature_names, symbols, indices, feat_cols, time_vals, routing_meta = prepare_training_data_cross_sectional(
-            mtf_data, target, feature_names=selected_features, min_cs=min_cs, max_cs_samples=max_cs_samples
+            mtf_data, target, feature_names=selected_features, min_cs=min_cs, max_cs_samples=max_cs_samples,
+            max_rows=max_rows_train, families=target_families
         )
         prep_elapsed = _t.time() - prep_start
         print(f"✅ Data preparation completed in {prep_elapsed:.2f}s")  # Debug print
@@ -279,21 +289,8 @@ def train_models_for_interval_comprehensive(interval: str, targets: List[str],
                 'group_sizes': None
             }
         
-        # Apply row cap to prevent OOM
-        if max_rows_train and len(X) > max_rows_train:
-            # Use deterministic seed from determinism system
-            from TRAINING.common.determinism import BASE_SEED, stable_seed_from
-            # Generate seed based on target for deterministic downsampling
-            downsample_seed = stable_seed_from([target, 'downsample']) if target else (BASE_SEED if BASE_SEED is not None else 42)
-            rng = np.random.RandomState(downsample_seed)
-            idx = rng.choice(len(X), max_rows_train, replace=False)
-            X, y = X[idx], y[idx]
-            if time_vals is not None: time_vals = time_vals[idx]
-            if symbols is not None: symbols = symbols[idx]
-            logger.info(f"✂️ Downsampled to max_rows_train={max_rows_train}")
-        
         # Store cohort metadata context for later use in reproducibility tracking
-        # Store AFTER downsampling (if any) so we track the actual training cohort
+        # Rows were already sampled (memory budget / max_rows_train) during data preparation
         # These will be used to extract cohort metadata at the end of training
         cohort_context = {
             'X': X,  # This is the actual training data (may be downsampled)
@@ -307,6 +304,12 @@ def train_models_for_interval_comprehensive(interval: str, targets: List[str],
         
         target_results = {}
         
+        # One fingerprint of the training panel per target, shared by every family's cache key
+        data_fp = None
+        if model_cache is not None:
+            from TRAINING.common.model_cache import data_fingerprint
+            data_fp = data_fingerprint(X, y, feature_names)
+        
         # CRITICAL: Order families to prevent cross-lib thread pollution
         # Run CPU-GBDT families FIRST, then TF/XGB families
         FAMILY_ORDER = [
@@ -366,7 +369,9 @@ def train_models_for_interval_comprehensive(interval: str, targets: List[str],
                 # Train model using modular system with routing metadata
                 try:
                     model_result = train_model_comprehensive(
-                        family, X, y, target, strategy, feature_names, caps, routing_meta
+                        family, X, y, target, strategy, feature_names, caps, routing_meta,
+                        model_cache=model_cache, data_fp=data_fp,
+                        symbols=symbols, time_vals=time_vals
                     )
                     elapsed = _now() - start_time
                     logger.info(f"⏱️ [{family}] {family} training completed in {elapsed:.2f} seconds")
@@ -683,10 +688,55 @@ def train_models_for_interval_comprehensive(interval: str, targets: List[str],
     
     return results
 
+def _sequence_backend() -> str:
+    """Backend for sequential families: --seq-backend (TRAINER_SEQ_BACKEND), else pipeline.sequential.backend."""
+    backend = os.getenv("TRAINER_SEQ_BACKEND")
+    if not backend and _CONFIG_AVAILABLE:
+        backend = get_cfg("pipeline.sequential.backend", default="torch")
+    return str(backend or "torch").lower()
+
+
+def _torch_available() -> bool:
+    """Check if PyTorch is importable (without importing it)."""
+    if "torch" in sys.modules:
+        return True
+    try:
+        import importlib.util
+        return importlib.util.find_spec("torch") is not None
+    except (ImportError, Exception):
+        return False
+
+
+def _train_torch_sequence_family(family: str, X, y, symbols=None, time_vals=None,
+                                 trainer_config: Optional[Dict[str, Any]] = None):
+    """
+    Train a torch sequence family in-process on lazy windows over the 2D matrix.
+    
+    A 2D (N, F) X is never expanded to (N', T, F): build_sequence_windows keeps the
+    matrix once and the trainer's loaders gather each [B, T, F] batch from it. Runs
+    through _run_family_inproc, so the family gets its thread plan and thread guard
+    like every other in-process family, and trainer_config reaches the trainer.
+    """
+    return _run_family_inproc(
+        family, X, y,
+        total_threads=THREADS,
+        trainer_kwargs={"config": trainer_config if trainer_config is not None else {"num_threads": THREADS}},
+        symbols=symbols, time_vals=time_vals
+    )
+
+
 def train_model_comprehensive(family: str, X: np.ndarray, y: np.ndarray, 
                             target: str, strategy: str, feature_names: List[str],
-                            caps: Dict[str, Any], routing_meta: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Train model using modular trainers directly - enforces runtime policy and routing."""
+                            caps: Dict[str, Any], routing_meta: Dict[str, Any] = None,
+                            model_cache=None, data_fp: Optional[str] = None,
+                            symbols=None, time_vals=None) -> Dict[str, Any]:
+    """Train model using modular trainers directly - enforces runtime policy and routing.
+
+    With a model_cache and data_fp (see TRAINING.common.model_cache), a previously trained
+    model for the same data/config/seed/library versions is loaded instead of retrained.
+    Sequential families on the torch backend train on lazy (N', T, F) windows over X;
+    symbols/time_vals keep windows within one symbol and in time order.
+    """
     
     logger.info(f"🎯 Training {family} model with {strategy} strategy")
     
@@ -778,8 +828,35 @@ def train_model_comprehensive(family: str, X: np.ndarray, y: np.ndarray,
     
     logger.info(f"[{family}] Trainer config: {trainer_config}")
     
+    cache_key = None
+    if model_cache is not None and data_fp is not None:
+        # Thread count does not change the fitted model; everything else in the routed config does
+        key_config = {k: v for k, v in trainer_config.items() if k != "num_threads"}
+        cache_key = model_cache.key(family, data_fp, strategy, key_config)
+        cached = model_cache.get(cache_key)
+        if cached is not None:
+            model, cached_metrics = cached
+            logger.info(f"♻️ [{family}] Loaded cached model for {target} (key {cache_key[:12]}, "
+                        f"originally trained in {cached_metrics.get('train_seconds', float('nan')):.1f}s)")
+            manager = SingleTaskStrategy({'family': family})
+            manager.models[family] = model
+            return {
+                'model': model,
+                'trainer': None, 'test_predictions': None, 'success': True,
+                'family': family, 'target': target, 'strategy': strategy,
+                'strategy_manager': manager, 'cache_hit': True,
+                'cached_metrics': cached_metrics
+            }
+    
+    train_start = _now()
+    
     # Execute based on decision
-    if USE_INPROC:
+    if family in TORCH_SEQ_FAMILIES and _sequence_backend() == "torch" and _torch_available():
+        logger.info("🔥 [%s] using PyTorch on lazy sequence windows (in-process)", family)
+        print(f"🔥 [{family}] using PyTorch on lazy sequence windows...")
+        model = _train_torch_sequence_family(family, X, y, symbols=symbols, time_vals=time_vals,
+                                             trainer_config=trainer_config)
+    elif USE_INPROC:
         logger.info("🔄 [%s] using in-process training (no isolation) with %s threads", family, THREADS)
         print(f"🔄 [{family}] using in-process training with {THREADS} threads...")
         model = _run_family_inproc(
@@ -798,6 +875,12 @@ def train_model_comprehensive(family: str, X: np.ndarray, y: np.ndarray,
             trainer_kwargs={"config": trainer_config}
         )
     
+    if cache_key is not None and model is not None:
+        model_cache.put(cache_key, model,
+                        metrics={"train_seconds": _now() - train_start},
+                        info={"family": family, "target": target, "strategy": strategy,
+                              "n_rows": int(len(X)), "n_features": int(X.shape[1])})
+    
     # Wrap model in strategy manager
     manager = SingleTaskStrategy({'family': family})
     manager.models[family] = model
@@ -836,52 +919,13 @@ def _legacy_train_fallback(family: str, X: np.ndarray, y: np.ndarray, target: st
     # SEQ_BACKEND is only used in dead code path - default to 'torch' if not provided
     SEQ_BACKEND = kwargs.get('seq_backend', 'torch')  # Default for legacy code
     if family in TORCH_SEQ_FAMILIES and SEQ_BACKEND == 'torch':
-        logger.info("🔥 [%s] using PyTorch implementation for better performance…", family)
-        print(f"🔥 [{family}] using PyTorch implementation for better performance...")
-        
-        # Configure PyTorch threading
-        try:
-            import torch
-            torch.set_num_threads(1 if not CPU_ONLY else THREADS)
-            torch.backends.cudnn.benchmark = True
-        except Exception:
-            pass
-        
-        # Convert to sequential format if needed
-        if len(X.shape) == 2:  # (N, F) -> (N, T, F)
-            # Load lookback from config if available
-            lookback = None  # Will use config default in function
-            X_seq = build_sequences_from_features(X, lookback=lookback)
-        else:
-            X_seq = X  # Already sequential
-        
-        # Import and use PyTorch trainer
-        if family == 'CNN1D':
-            from model_fun.cnn1d_trainer_torch import CNN1DTrainerTorch
-            trainer = CNN1DTrainerTorch(config={"num_threads": THREADS})
-        elif family == 'LSTM':
-            from model_fun.lstm_trainer_torch import LSTMTrainerTorch
-            trainer = LSTMTrainerTorch(config={"num_threads": THREADS})
-        elif family == 'Transformer':
-            from model_fun.transformer_trainer_torch import TransformerTrainerTorch
-            trainer = TransformerTrainerTorch(config={"num_threads": THREADS})
-        elif family == 'TabCNN':
-            from model_fun.tabcnn_trainer_torch import TabCNNTrainerTorch
-            trainer = TabCNNTrainerTorch(config={"num_threads": THREADS})
-        elif family == 'TabLSTM':
-            from model_fun.tablstm_trainer_torch import TabLSTMTrainerTorch
-            trainer = TabLSTMTrainerTorch(config={"num_threads": THREADS})
-        elif family == 'TabTransformer':
-            from model_fun.tabtransformer_trainer_torch import TabTransformerTrainerTorch
-            trainer = TabTransformerTrainerTorch(config={"num_threads": THREADS})
-        
-        # Train the model
-        model = trainer.train(X_seq, y)
-        
+        trainer = _train_torch_sequence_family(
+            family, X, y, symbols=kwargs.get('symbols'), time_vals=kwargs.get('time_vals')
+        )
         manager = SingleTaskStrategy({'family': family})
-        manager.models[family] = model
+        manager.models[family] = trainer
         return {
-            'model': model,
+            'model': trainer,
             'trainer': trainer, 'test_predictions': None, 'success': True,
             'family': family, 'target': target, 'strategy': strategy,
             'strategy_manager': manager
@@ -101,16 +101,16 @@ _JOBLIB_TMP.mkdir(parents=True, exist_ok=True)
 os.environ.setdefault("JOBLIB_TEMP_FOLDER", str(_JOBLIB_TMP))
 
 # Force clean loky worker shutdown at exit to prevent semlock/file leaks
-try:
-    from joblib.externals.loky import get_reusable_executor
-    @atexit.register
-    def _loky_shutdown():
-        try:
-            get_reusable_executor().shutdown(wait=True, kill_workers=True)
-        except Exception:
-            pass
-except Exception:
-    pass
+# (only if loky was loaded: importing it here would slow every entry point)
+@atexit.register
+def _loky_shutdown():
+    loky = sys.modules.get("joblib.externals.loky")
+    if loky is None:
+        return
+    try:
+        loky.get_reusable_executor().shutdown(wait=True, kill_workers=True)
+    except Exception:
+        pass
 
 """
 Enhanced Training Script with Multiple Strategies - Full Original Functionality
@@ -142,10 +142,8 @@ if str(_TRAINING_ROOT) not in sys.path:
 if '.' not in sys.path:
     sys.path.insert(0, '.')
 
-from TRAINING.common.isolation_runner import child_isolated
-from TRAINING.common.threads import temp_environ, child_env_for_family, plan_for_family, thread_guard, set_estimator_threads
-from TRAINING.common.tf_runtime import ensure_tf_initialized
-from TRAINING.common.tf_setup import tf_thread_setup
+# (isolation_runner/threads/tf_runtime/tf_setup are not used here; family_runners
+#  imports them, so importing utils for constants stays light)
 
 # Family classifications
 TF_FAMS = {"MLP", "VAE", "GAN", "MetaLearning", "MultiTask"}
@@ -260,7 +258,6 @@ Eight = Tuple[np.ndarray, np.ndarray, List[str], List[str], np.ndarray, List[str
 import sys
 # Removed duplicate import: os
 import warnings
-import joblib
 from datetime import datetime
 # Removed unused import: glob
 import time
@@ -368,9 +365,18 @@ FAMILY_CAPS = {
 }
 
 
+def _default_lookback():
+    if _CONFIG_AVAILABLE:
+        return get_cfg("pipeline.sequential.default_lookback", default=64)
+    return 64
+
+
 def build_sequences_from_features(X, lookback=None):
     """
     Convert 2D features (N, F) to 3D sequences (N', T, F) using rolling windows.
+
+    Materializes every window (a T-fold copy of X); training paths should use
+    build_sequence_windows instead, which gathers windows lazily at batch time.
     
     Args:
         X: (N, F) feature matrix
@@ -381,10 +387,7 @@ def build_sequences_from_features(X, lookback=None):
     """
     # Load lookback from config if not provided
     if lookback is None:
-        if _CONFIG_AVAILABLE:
-            lookback = get_cfg("pipeline.sequential.default_lookback", default=64)
-        else:
-            lookback = 64
+        lookback = _default_lookback()
     N, F = X.shape
     if N <= lookback:
         # If not enough data, pad with zeros
@@ -392,33 +395,167 @@ def build_sequences_from_features(X, lookback=None):
         X_seq[0, :N, :] = X
         return X_seq
     
-    # Create rolling windows
-    X_seq = np.zeros((N - lookback + 1, lookback, F), dtype=np.float32)
-    for i in range(N - lookback + 1):
-        X_seq[i] = X[i:i + lookback]
-    
-    return X_seq
+    # Rolling windows: strided (N', F, T) view -> (N', T, F) float32 copy
+    windows = np.lib.stride_tricks.sliding_window_view(np.asarray(X), lookback, axis=0)
+    return np.ascontiguousarray(windows.transpose(0, 2, 1), dtype=np.float32)
+
+
+class SequenceWindows:
+    """
+    Lazy (N', T, F) window view over a 2D (N, F) feature matrix.
+
+    The feature matrix is stored once (in memory or as a read-only memmap) together
+    with a window index; [B, T, F] batches are produced by a strided gather at batch
+    time. Windows never cross symbol boundaries: rows are grouped by symbol and
+    ordered by time within each symbol, and window k covers the T consecutive rows
+    of one symbol ending at row ``end_rows[k]``. Windows are ordered by the time of
+    their last row, so a tail slice is the most recent data (as with the eager
+    array on a time-ordered panel).
+
+    Exposes ``shape``/``ndim``/``len`` like the eager array so the torch sequence
+    trainers can read (T, F) from it unchanged.
+    """
+
+    ndim = 3
+
+    def __init__(self, X, lookback=None, y=None, symbols=None, time_vals=None, storage=None):
+        """
+        Args:
+            X: (N, F) feature matrix
+            lookback: sequence length T (loads from config if None)
+            y: optional (N,) row labels; window labels are taken at each window's last row
+            symbols: optional (N,) symbol per row (windows stay within one symbol)
+            time_vals: optional (N,) timestamps per row (row order within a symbol)
+            storage: "memory" or "memmap" (loads pipeline.sequential.window_storage if None)
+        """
+        if lookback is None:
+            lookback = _default_lookback()
+        if storage is None:
+            storage = get_cfg("pipeline.sequential.window_storage", default="memory") if _CONFIG_AVAILABLE else "memory"
+
+        X = np.asarray(X)
+        if X.ndim != 2:
+            raise ValueError(f"SequenceWindows expects a 2D (N, F) matrix, got shape {X.shape}")
+        self.lookback = int(lookback)
+        self.storage = storage
+        self.X = self._store(X, storage)
+        N = X.shape[0]
+
+        # Row order: grouped by symbol, time-ordered within each symbol (stable)
+        time_key = np.asarray(time_vals) if time_vals is not None else np.arange(N)
+        if symbols is not None:
+            _, codes = np.unique(np.asarray(symbols), return_inverse=True)
+            order = np.lexsort((time_key, codes))
+            codes_sorted = codes[order]
+            starts = np.flatnonzero(np.r_[True, codes_sorted[1:] != codes_sorted[:-1]])
+            group_start = np.repeat(starts, np.diff(np.r_[starts, N]))
+        else:
+            order = np.argsort(time_key, kind="stable") if time_vals is not None else np.arange(N)
+            group_start = np.zeros(N, dtype=np.int64)
+
+        positions = np.arange(N)
+        end_positions = positions[positions - group_start >= self.lookback - 1]
+        # Window order follows the time of the last row (stable: symbol order breaks ties)
+        end_positions = end_positions[np.argsort(time_key[order[end_positions]], kind="stable")]
+
+        self.order = order.astype(np.int64, copy=False)
+        self.end_positions = end_positions.astype(np.int64, copy=False)
+        self._offsets = np.arange(self.lookback - 1, -1, -1, dtype=np.int64)
+        self.targets = None if y is None else np.asarray(y)[self.end_rows]
+
+    @staticmethod
+    def _store(X, storage):
+        if storage == "memmap":
+            import tempfile
+            import weakref
+            fd, path = tempfile.mkstemp(suffix=".npy", prefix="seq_windows_")
+            os.close(fd)
+            np.save(path, np.ascontiguousarray(X, dtype=np.float32))
+            mm = np.load(path, mmap_mode="r")
+            # File is unlinked when the memmap goes away
+            weakref.finalize(mm, os.remove, path)
+            return mm
+        if storage != "memory":
+            logger.warning(f"Unknown window storage '{storage}', using memory")
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    @property
+    def end_rows(self):
+        """Row index (into X) of each window's last row."""
+        return self.order[self.end_positions]
+
+    @property
+    def shape(self):
+        return (len(self.end_positions), self.lookback, self.X.shape[1])
+
+    def __len__(self):
+        return len(self.end_positions)
+
+    def window_rows(self, idx):
+        """(B, T) row indices into X for windows idx, oldest row first."""
+        ends = self.end_positions[np.asarray(idx, dtype=np.int64)]
+        return self.order[ends[:, None] - self._offsets]
+
+    def gather(self, idx):
+        """Materialize windows idx as a (B, T, F) float32 array."""
+        return np.asarray(self.X[self.window_rows(idx)], dtype=np.float32)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self.gather(np.arange(len(self))[idx])
+        if np.isscalar(idx):
+            return self.gather([idx])[0]
+        return self.gather(idx)
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.gather(np.arange(len(self)))
+        return arr if dtype is None else arr.astype(dtype, copy=False)
+
+
+def build_sequence_windows(X, y=None, lookback=None, symbols=None, time_vals=None, storage=None):
+    """
+    Lazy counterpart of build_sequences_from_features for training.
+
+    Returns:
+        SequenceWindows over X; window labels (aligned to each window's last row)
+        are in ``.targets`` when y is given.
+    """
+    windows = SequenceWindows(X, lookback=lookback, y=y, symbols=symbols,
+                              time_vals=time_vals, storage=storage)
+    if len(windows) == 0:
+        raise ValueError(
+            f"Not enough rows per symbol for lookback={windows.lookback} (N={np.asarray(X).shape[0]})"
+        )
+    logger.info(
+        f"Sequence windows: {len(windows)} x T={windows.lookback} x F={windows.shape[2]} "
+        f"(storage={windows.storage}, base matrix {windows.X.nbytes / 1e6:.1f} MB)"
+    )
+    return windows
 
 def tf_available():
     """Check if TensorFlow is available.
     
-    Note: This is a lenient check - we only verify the module can be imported.
-    Full initialization happens in child processes, so we don't need to verify
-    GPU availability or full library loading here.
+    Note: This is a lenient check - we only verify the module can be found
+    (without importing it, which costs seconds). Full initialization happens
+    in child processes, so we don't need to verify GPU availability or full
+    library loading here.
     """
-    try:
-        import tensorflow as tf  # noqa: F401
+    if "tensorflow" in sys.modules:
         return True
+    try:
+        import importlib.util
+        return importlib.util.find_spec("tensorflow") is not None
     except (ImportError, Exception):
-        # Catch all exceptions - TensorFlow might fail to import for various reasons
-        # (library loading, CUDA issues, etc.) but child processes will handle it
+        # Catch all exceptions - a broken install is handled by child processes
         return False
 
 def ngboost_available():
-    """Check if NGBoost is available."""
-    try:
-        import ngboost  # noqa
+    """Check if NGBoost is available (without importing it)."""
+    if "ngboost" in sys.modules:
         return True
+    try:
+        import importlib.util
+        return importlib.util.find_spec("ngboost") is not None
     except Exception:
         return False
 
@@ -433,12 +570,13 @@ def pick_tf_device():
     except Exception:
         return "/CPU:0"
 
-TF_DEVICE = pick_tf_device()
-try:
-    import tensorflow as tf
-    gpus = tf.config.list_physical_devices('GPU')
-    logger.info(f"TF device: {TF_DEVICE} | GPUs: {len(gpus)}")
-except Exception:
-    logger.info(f"TF device: {TF_DEVICE}")
+def __getattr__(name):
+    # TF_DEVICE is resolved on first access: probing it imports TensorFlow
+    if name == "TF_DEVICE":
+        device = pick_tf_device()
+        globals()["TF_DEVICE"] = device
+        logger.info(f"TF device: {device}")
+        return device
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
@@ -202,8 +202,13 @@ class UnifiedTrainingInterface:
                                   timestamps: Optional[np.ndarray] = None,
                                   symbols: Optional[np.ndarray] = None,
                                   n_splits: int = 5,
+                                  fold_plan: Optional[Any] = None,
                                   **kwargs) -> Tuple[Any, Dict[str, float]]:
-        """Train model with cross-sectional cross-validation."""
+        """Train model with cross-sectional cross-validation.
+
+        fold_plan (a FoldPlan, or the path of a saved one) is reused for the purged CV
+        when it matches the preprocessed panel, so reruns split identically.
+        """
         
         logger.info(f"🚀 Starting unified training with CV: {len(X)} samples, {n_splits} splits")
         
@@ -230,7 +235,7 @@ class UnifiedTrainingInterface:
                 # If target_column is available in kwargs, we could extract horizon
                 # For now, use safe default
                 purge_overlap = 17  # 60m / 5m + 5 buffer
-                purged_cv = PurgedTimeSeriesSplit(n_splits=n_splits, purge_overlap=purge_overlap)
+                purged_cv = PurgedTimeSeriesSplit(n_splits=n_splits, purge_overlap=purge_overlap, fold_plan=fold_plan)
                 
                 cv_scores = cross_val_score(trainer, X_processed, y_processed, cv=purged_cv)
                 cv_results = {
@@ -29,11 +29,18 @@ severe data leakage.
 """
 
 
+import hashlib
+import json
+import logging
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
 import numpy as np
 import pandas as pd
 from sklearn.model_selection._split import _BaseKFold
 from sklearn.utils import indexable
-from typing import Optional, Union
 
 try:
     from sklearn.utils.validation import _num_samples
@@ -48,6 +55,227 @@ except ImportError:
         else:
             raise TypeError(f"Cannot determine number of samples in {type(x)}")
 
+logger = logging.getLogger(__name__)
+
+
+def _time_fingerprint(time_ns: Optional[np.ndarray]) -> Optional[str]:
+    if time_ns is None:
+        return None
+    return hashlib.blake2b(np.ascontiguousarray(time_ns, dtype=np.int64).tobytes(), digest_size=16).hexdigest()
+
+
+def _as_time_ns(time_vals) -> Optional[np.ndarray]:
+    """Timestamps as int64 nanoseconds (tz-aware values in UTC), or None if not datetime-like."""
+    try:
+        index = pd.DatetimeIndex(time_vals)
+        # asi8 is in the index's own unit (pandas >= 2 may keep s/ms/us resolution)
+        return (index.as_unit('ns') if hasattr(index, 'as_unit') else index).asi8
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class FoldPlan:
+    """
+    Fold boundaries of a PurgedTimeSeriesSplit, computed once.
+    
+    Each fold is a row (fold_idx, train_start, train_stop, test_start, test_stop) of
+    half-open row ranges over the time-sorted panel, so a plan is a few integers per
+    fold regardless of panel size. Folds whose train range is purged away are not
+    listed. Plans serialize to a plain dict/JSON (RunContext.fold_plan, run metadata)
+    and can be handed back to PurgedTimeSeriesSplit(fold_plan=...) so every consumer
+    and rerun splits identically without recomputing.
+    """
+    n_samples: int
+    n_splits: int
+    folds: np.ndarray                       # int64 (n_folds, 5)
+    purge_overlap_time_ns: Optional[int] = None
+    purge_overlap: int = 0
+    time_fingerprint: Optional[str] = None  # blake2b of the int64-ns timestamps
+    fold_times: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @classmethod
+    def build(
+        cls,
+        n_samples: int,
+        n_splits: int,
+        time_vals=None,
+        purge_overlap_time: Optional[pd.Timedelta] = None,
+        purge_overlap: int = 0,
+    ) -> 'FoldPlan':
+        """
+        Compute fold ranges: equal-size contiguous test folds; train is every row up to
+        the last timestamp <= test_start - purge_overlap_time (or, in the deprecated
+        row-count mode, up to test_start - purge_overlap rows).
+        """
+        fold_sizes = np.full(n_splits, n_samples // n_splits, dtype=np.int64)
+        fold_sizes[:n_samples % n_splits] += 1
+        test_stop = np.cumsum(fold_sizes)
+        test_start = test_stop - fold_sizes
+        time_ns = None
+        fold_times: List[Dict[str, Any]] = []
+        
+        if purge_overlap_time is not None and time_vals is not None:
+            # One searchsorted for all folds: rows with timestamp <= test_start_time - purge
+            # (side='right' keeps every row of a shared panel timestamp on the same side)
+            time_ns = _as_time_ns(time_vals)
+            if time_ns is not None:
+                t = time_ns
+                cutoffs = t[np.minimum(test_start, n_samples - 1)] - pd.Timedelta(purge_overlap_time).value
+            else:
+                t = np.asarray(time_vals)
+                cutoffs = np.array([t[min(i, n_samples - 1)] - purge_overlap_time for i in test_start])
+            train_stop = np.maximum(np.searchsorted(t, cutoffs, side='right'), 0).astype(np.int64)
+            
+            if time_ns is not None:
+                ts = pd.to_datetime(time_ns, unit='ns')
+                for k in np.flatnonzero((train_stop > 0) & (fold_sizes > 0)):
+                    fold_times.append({
+                        'fold_idx': int(k),
+                        'train_end': str(ts[train_stop[k] - 1]),
+                        'purge_cutoff': str(pd.Timestamp(cutoffs[k], unit='ns')),
+                        'test_start': str(ts[test_start[k]]),
+                        'test_end': str(ts[test_stop[k] - 1]),
+                    })
+                overlap = (train_stop > 0) & (t[np.maximum(train_stop - 1, 0)] > cutoffs)
+                for k in np.flatnonzero(overlap):
+                    warnings.warn(
+                        f"⚠️  CRITICAL: Timestamp overlap detected in fold {k + 1}: "
+                        f"train_max > cutoff (test_start - purge={purge_overlap_time})"
+                    )
+            
+            skipped = np.flatnonzero(train_stop <= 0)
+            if len(skipped):
+                k = skipped[0]
+                warnings.warn(
+                    f"Fold {k + 1}: purge_overlap_time={purge_overlap_time} is too large. "
+                    f"Train set would be empty (test_start row={test_start[k]}). "
+                    f"Skipping {len(skipped)} fold(s)."
+                )
+        else:
+            # LEGACY ROW-COUNT BASED PURGING (DEPRECATED - DANGEROUS FOR PANEL DATA)
+            warnings.warn(
+                f"⚠️  CRITICAL: Using row-count based purging (DEPRECATED). "
+                f"This is INVALID for panel data (cross-sectional). "
+                f"If you have multiple symbols per timestamp, this will cause catastrophic data leakage. "
+                f"Please provide purge_overlap_time and time_column_values for time-based purging.",
+                UserWarning
+            )
+            train_stop = test_start - int(purge_overlap)
+            for k in np.flatnonzero(train_stop <= 0):
+                warnings.warn(
+                    f"Fold {k + 1}: purge_overlap={purge_overlap} is too large. "
+                    f"Train set would be empty (start={test_start[k]}, train_stop={train_stop[k]}). "
+                    f"Skipping this fold."
+                )
+        
+        keep = train_stop > 0
+        folds = np.column_stack([
+            np.arange(n_splits, dtype=np.int64), np.zeros(n_splits, dtype=np.int64),
+            train_stop, test_start, test_stop,
+        ])[keep]
+        return cls(
+            n_samples=int(n_samples),
+            n_splits=int(n_splits),
+            folds=folds.astype(np.int64),
+            purge_overlap_time_ns=None if purge_overlap_time is None else int(pd.Timedelta(purge_overlap_time).value),
+            purge_overlap=int(purge_overlap),
+            time_fingerprint=_time_fingerprint(time_ns),
+            fold_times=fold_times,
+        )
+    
+    def __len__(self) -> int:
+        return len(self.folds)
+    
+    @property
+    def ranges(self) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """[((train_start, train_stop), (test_start, test_stop)), ...]"""
+        return [((int(a), int(b)), (int(c), int(d))) for _, a, b, c, d in self.folds]
+    
+    def split(self, n_samples: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield (train_indices, test_indices) for each fold."""
+        if n_samples is not None and n_samples != self.n_samples:
+            raise ValueError(f"FoldPlan was built for {self.n_samples} samples, got {n_samples}")
+        for _, a, b, c, d in self.folds:
+            yield np.arange(a, b), np.arange(c, d)
+    
+    def compatible(self, n_splits: int, purge_overlap_time: Optional[pd.Timedelta] = None,
+                   purge_overlap: int = 0) -> bool:
+        """
+        True if this plan was built with these split settings. A time-purged plan is
+        also accepted by a row-count splitter: it is the correct purge for panel data.
+        """
+        if n_splits != self.n_splits:
+            return False
+        if purge_overlap_time is not None:
+            return self.purge_overlap_time_ns == int(pd.Timedelta(purge_overlap_time).value)
+        return self.purge_overlap_time_ns is not None or self.purge_overlap == int(purge_overlap)
+    
+    def matches(self, n_samples: int, time_vals=None) -> bool:
+        """True if this plan was built for a panel of this size (and these timestamps)."""
+        if n_samples != self.n_samples:
+            return False
+        if time_vals is None or self.time_fingerprint is None:
+            return True
+        return _time_fingerprint(_as_time_ns(time_vals)) == self.time_fingerprint
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'n_samples': self.n_samples,
+            'n_splits': self.n_splits,
+            'folds': self.folds.tolist(),
+            'purge_overlap_time_ns': self.purge_overlap_time_ns,
+            'purge_overlap': self.purge_overlap,
+            'time_fingerprint': self.time_fingerprint,
+            'fold_times': self.fold_times,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FoldPlan':
+        return cls(
+            n_samples=int(data['n_samples']),
+            n_splits=int(data['n_splits']),
+            folds=np.asarray(data['folds'], dtype=np.int64).reshape(-1, 5),
+            purge_overlap_time_ns=data.get('purge_overlap_time_ns'),
+            purge_overlap=int(data.get('purge_overlap', 0)),
+            time_fingerprint=data.get('time_fingerprint'),
+            fold_times=list(data.get('fold_times', [])),
+        )
+    
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        tmp.replace(path)
+        return path
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'FoldPlan':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def load_fold_plan(path: Union[str, Path]) -> Optional[FoldPlan]:
+    """FoldPlan saved at path, or None if there is none (or it cannot be read)."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        return FoldPlan.load(path)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug(f"Ignoring unreadable fold plan {path}: {e}")
+        return None
+
+
+def fold_plan_path(output_dir: Union[str, Path], target: str, view: Optional[str] = None,
+                   symbol: Optional[str] = None) -> Path:
+    """Where a target's FoldPlan is kept between reruns: {output_dir}/fold_plans/{target}[__{view}][__{symbol}].json"""
+    parts = [str(p) for p in (target, view, symbol) if p]
+    name = "__".join(parts).replace("/", "_").replace("\\", "_")
+    return Path(output_dir) / "fold_plans" / f"{name}.json"
+
 
 class PurgedTimeSeriesSplit(_BaseKFold):
     """
@@ -96,6 +324,12 @@ class PurgedTimeSeriesSplit(_BaseKFold):
         
         # Legacy row-count based (DEPRECATED - DO NOT USE for panel data):
         # cv = PurgedTimeSeriesSplit(n_splits=5, purge_overlap=17)  # DANGEROUS!
+    
+    Fold boundaries are computed once per panel size into a FoldPlan (see plan());
+    repeated split() calls reuse it. fold_plan= takes a FoldPlan from another
+    consumer (RunContext.fold_plan), or the path of a saved plan (fold_plan_path()):
+    it is loaded if present and matching, and a freshly built plan is written there,
+    so reruns split identically without recomputing.
     """
     
     def __init__(
@@ -103,12 +337,19 @@ class PurgedTimeSeriesSplit(_BaseKFold):
         n_splits=5,  # FALLBACK_DEFAULT_OK (should load from preprocessing_config.yaml) 
         purge_overlap_time: Optional[pd.Timedelta] = None,
         purge_overlap: int = 0,  # Legacy parameter for backward compatibility
-        time_column_values: Optional[Union[np.ndarray, pd.Series, list]] = None
+        time_column_values: Optional[Union[np.ndarray, pd.Series, list]] = None,
+        fold_plan: Optional[Union[FoldPlan, str, Path]] = None
     ):
         super().__init__(n_splits, shuffle=False, random_state=None)
         self.purge_overlap_time = purge_overlap_time
         self.purge_overlap = purge_overlap  # Legacy support
         self.time_vals = time_column_values
+        self.fold_plan_path = None
+        if isinstance(fold_plan, (str, Path)):
+            self.fold_plan_path = Path(fold_plan)
+            fold_plan = load_fold_plan(self.fold_plan_path)
+        self.fold_plan = fold_plan
+        self._plans: Dict[int, FoldPlan] = {}  # n_samples -> plan built/accepted for it
         
         # Validate time-based mode
         if purge_overlap_time is not None:
@@ -161,12 +402,47 @@ class PurgedTimeSeriesSplit(_BaseKFold):
                 sort_idx = np.argsort(self.time_vals)
                 self.time_vals = self.time_vals.iloc[sort_idx] if isinstance(self.time_vals, pd.Series) else pd.Series(self.time_vals).iloc[sort_idx]
     
+    def plan(self, n_samples: int) -> FoldPlan:
+        """
+        FoldPlan for a panel of n_samples rows, computed once per panel size.
+        
+        A plan passed via fold_plan= is used if it matches the panel (size and
+        timestamps) and the split settings; otherwise a fresh plan is built (and
+        saved, when fold_plan= was a path).
+        """
+        plan = self._plans.get(n_samples)
+        if plan is not None:
+            return plan
+        time_based = self.purge_overlap_time is not None and self.time_vals is not None
+        supplied = self.fold_plan
+        if (supplied is not None
+                and supplied.matches(n_samples, self.time_vals if time_based else None)
+                and supplied.compatible(self.n_splits, self.purge_overlap_time if time_based else None,
+                                        self.purge_overlap)):
+            plan = supplied
+        else:
+            plan = FoldPlan.build(
+                n_samples, self.n_splits,
+                time_vals=self.time_vals if time_based else None,
+                purge_overlap_time=self.purge_overlap_time if time_based else None,
+                purge_overlap=self.purge_overlap,
+            )
+            if self.fold_plan_path is not None:
+                try:
+                    plan.save(self.fold_plan_path)
+                except OSError as e:
+                    logger.debug(f"Could not save fold plan to {self.fold_plan_path}: {e}")
+        self._plans[n_samples] = plan
+        self.fold_plan = plan
+        return plan
+    
     def split(self, X, y=None, groups=None):
         """
         Generate indices to split data into training and test set.
         
         Uses TIME-BASED purging when purge_overlap_time is provided (recommended).
         Falls back to row-count based purging for backward compatibility.
+        Fold boundaries come from plan(), so repeated calls do not recompute them.
         
         Args:
             X: Feature matrix
@@ -177,106 +453,7 @@ class PurgedTimeSeriesSplit(_BaseKFold):
             (train_indices, test_indices) tuples
         """
         X, y, groups = indexable(X, y, groups)
-        n_samples = _num_samples(X)
-        indices = np.arange(n_samples)
-        
-        # Calculate fold sizes (distribute samples evenly across folds)
-        fold_sizes = np.full(self.n_splits, n_samples // self.n_splits, dtype=int)
-        fold_sizes[:n_samples % self.n_splits] += 1
-        
-        current = 0
-        
-        for fold_idx, fold_size in enumerate(fold_sizes):
-            start, stop = current, current + fold_size
-            test_indices = indices[start:stop]
-            
-            # TIME-BASED PURGING (CRITICAL for panel data)
-            # Panel data structure: Multiple rows share the same timestamp (e.g., 50 symbols = 50 rows per bar)
-            # With 50 symbols, 1 bar = 50 rows. Row-count purging (17 rows) = ~20 seconds, not 60 minutes!
-            # Time-based purging correctly handles this by purging ALL rows with timestamps in the purge window.
-            if self.purge_overlap_time is not None and self.time_vals is not None:
-                # Find the timestamp of the first test sample
-                test_start_time = self.time_vals.iloc[start] if isinstance(self.time_vals, pd.Series) else self.time_vals[start]
-                
-                # Calculate the cutoff time (test_start - purge_window)
-                # This ensures no training data overlaps with the test target horizon
-                cutoff_time = test_start_time - self.purge_overlap_time
-                
-                # CRITICAL: Find ALL rows with timestamp <= cutoff_time
-                # searchsorted(..., side='right') returns the rightmost position where cutoff_time would be inserted,
-                # which means it includes ALL rows with timestamp <= cutoff_time.
-                # This correctly handles panel data where multiple rows share the same timestamp.
-                if isinstance(self.time_vals, pd.Series):
-                    # Use pandas searchsorted for Series
-                    train_stop_idx = self.time_vals.searchsorted(cutoff_time, side='right')
-                else:
-                    # Use numpy searchsorted for array
-                    train_stop_idx = np.searchsorted(self.time_vals, cutoff_time, side='right')
-                
-                # Ensure we don't go negative
-                train_stop_idx = max(0, train_stop_idx)
-                
-                # Validate: Ensure no timestamp overlap between train and test
-                # This is a safety check to catch any edge cases
-                if train_stop_idx > 0:
-                    train_indices = indices[:train_stop_idx]
-                    # Verify no timestamp leakage (all train timestamps < cutoff_time)
-                    # train_max_time should be <= cutoff_time (which is test_min_time - purge_overlap_time)
-                    # If train_max_time > cutoff_time, there's a problem
-                    train_max_time = self.time_vals.iloc[train_stop_idx - 1] if isinstance(self.time_vals, pd.Series) else self.time_vals[train_stop_idx - 1]
-                    test_min_time = test_start_time
-                    # CRITICAL: train_max_time should be <= cutoff_time (not >= test_min_time - purge)
-                    # The correct check: train_max_time should NOT exceed the cutoff
-                    if train_max_time > cutoff_time:
-                        import warnings
-                        warnings.warn(
-                            f"⚠️  CRITICAL: Timestamp overlap detected in fold {fold_idx + 1}: "
-                            f"train_max={train_max_time} > cutoff={cutoff_time} (test_min={test_min_time} - purge={self.purge_overlap_time})"
-                        )
-                    
-                    yield train_indices, test_indices
-                else:
-                    # If purge eats the whole train set (early folds), skip this fold
-                    # This is expected behavior when there's not enough historical data
-                    # Only warn once per splitter instance to avoid spam
-                    if not hasattr(self, '_warned_empty_fold'):
-                        import warnings
-                        warnings.warn(
-                            f"Fold {fold_idx + 1}: purge_overlap_time={self.purge_overlap_time} is too large. "
-                            f"Train set would be empty (test_start={test_start_time}, cutoff={cutoff_time}). "
-                            f"Skipping this fold. (This warning will only appear once per CV splitter)"
-                        )
-                        self._warned_empty_fold = True
-            
-            # LEGACY ROW-COUNT BASED PURGING (DEPRECATED - DANGEROUS FOR PANEL DATA)
-            # CRITICAL WARNING: Row-count purging is INVALID for panel data where multiple symbols
-            # share the same timestamp. With 50 symbols, 1 bar = 50 rows. Purging 17 rows = ~20 seconds,
-            # not 60 minutes! This causes 100% data leakage.
-            else:
-                import warnings
-                warnings.warn(
-                    f"⚠️  CRITICAL: Using row-count based purging (DEPRECATED). "
-                    f"This is INVALID for panel data (cross-sectional). "
-                    f"If you have multiple symbols per timestamp, this will cause catastrophic data leakage. "
-                    f"Please provide purge_overlap_time and time_column_values for time-based purging.",
-                    UserWarning
-                )
-                # The 'Train' set is everything BEFORE the test set
-                # BUT we must cut off the end of the training set to prevent leakage
-                train_stop = start - self.purge_overlap
-                
-                if train_stop > 0:
-                    train_indices = indices[:train_stop]
-                    yield train_indices, test_indices
-                else:
-                    # If purge eats the whole train set (early folds), skip this fold
-                    warnings.warn(
-                        f"Fold {fold_idx + 1}: purge_overlap={self.purge_overlap} is too large. "
-                        f"Train set would be empty (start={start}, train_stop={train_stop}). "
-                        f"Skipping this fold."
-                    )
-            
-            current = stop
+        yield from self.plan(_num_samples(X)).split()
     
     def get_n_splits(self, X=None, y=None, groups=None):
         """Returns the number of splitting iterations in the cross-validator"""
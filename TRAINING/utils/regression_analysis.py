@@ -311,10 +311,10 @@ def analyze_cohort_trends(
     min_runs_per_segment: int = 8
 ) -> pd.DataFrame:
     """
-    Analyze trends across all cohorts in index.parquet.
+    Analyze trends across all cohorts in the run index.
     
     Args:
-        index_file: Path to index.parquet
+        index_file: Path to REPRODUCIBILITY/index.parquet (partitioned index/ next to it is read too)
         target: Target metric to analyze
         half_life_days: Half-life for recency weighting
         min_runs_per_segment: Minimum runs per segment
@@ -322,11 +322,13 @@ def analyze_cohort_trends(
     Returns:
         DataFrame with per-cohort/segment analysis results
     """
-    if not index_file.exists():
-        logger.error(f"Index file not found: {index_file}")
+    from TRAINING.utils.reproducibility_index import ReproducibilityIndex
+    run_index = ReproducibilityIndex.from_index_path(index_file)
+    if not run_index.exists():
+        logger.error(f"Run index not found under: {run_index.repro_dir}")
         return pd.DataFrame()
     
-    df = pd.read_parquet(index_file)
+    df = run_index.query()
     
     # Prepare segments
     df = prepare_segments(df)
@@ -0,0 +1,368 @@
+"""
+Copyright (c) 2025-2026 Fox ML Infrastructure LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Append-Only Reproducibility Index
+
+Replaces the read-modify-write REPRODUCIBILITY/index.parquet with small per-run
+parquet fragments, partitioned by phase and target:
+
+    REPRODUCIBILITY/index/phase=TARGET_RANKING/target=y_will_peak_60m_0.8/part-<ns>-<pid>.parquet
+
+Writers never read existing rows, so logging cost is constant as history grows and
+concurrent writers cannot clobber each other. Partitions are compacted in the
+background (guarded by a file lock) once they accumulate too many fragments.
+
+Queries prune partitions from the directory layout and push remaining predicates
+and column projections down into the parquet reader. A legacy monolithic
+index.parquet, if present, is still read so existing history is not lost.
+
+Usage:
+    from TRAINING.utils.reproducibility_index import ReproducibilityIndex
+
+    index = ReproducibilityIndex(repro_dir)
+    index.append(row)
+    df = index.query(phase="TARGET_RANKING", target="y_will_peak_60m_0.8",
+                     filters=[("cohort_id", "==", cohort_id)])
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+    _HAS_FCNTL = True
+except ImportError:  # Windows
+    _HAS_FCNTL = False
+
+INDEX_DIRNAME = "index"
+LEGACY_INDEX_FILENAME = "index.parquet"
+LOCK_FILENAME = ".index.lock"
+
+# Columns that identify a unique index row (latest write wins)
+DEDUP_KEYS = ["phase", "mode", "target", "symbol", "model_family", "cohort_id", "run_id"]
+
+# Compaction runs one background thread per process at most
+_compaction_lock = threading.Lock()
+
+
+def _encode_partition_value(value: Optional[str]) -> str:
+    """Encode a partition value so it is safe as a directory name."""
+    return quote(str(value) if value is not None else "__null__", safe="")
+
+
+def _decode_partition_value(value: str) -> Optional[str]:
+    decoded = unquote(value)
+    return None if decoded == "__null__" else decoded
+
+
+def _load_compaction_threshold() -> int:
+    """Fragments per partition before background compaction kicks in."""
+    try:
+        from CONFIG.config_loader import get_safety_config
+        safety_cfg = get_safety_config()
+        safety_section = safety_cfg.get('safety', {})
+        repro_cfg = safety_section.get('reproducibility', {})
+        return int(repro_cfg.get('index_compaction_threshold', 64))
+    except Exception:
+        return 64  # FALLBACK_DEFAULT_OK
+
+
+class ReproducibilityIndex:
+    """Partitioned, append-only run index under a REPRODUCIBILITY directory."""
+
+    def __init__(self, repro_dir: Path, compaction_threshold: Optional[int] = None):
+        """
+        Initialize index.
+
+        Args:
+            repro_dir: REPRODUCIBILITY directory (contains index/ and optional legacy index.parquet)
+            compaction_threshold: Fragments per partition before compaction (loads from config if None)
+        """
+        self.repro_dir = Path(repro_dir)
+        self.root = self.repro_dir / INDEX_DIRNAME
+        self.legacy_file = self.repro_dir / LEGACY_INDEX_FILENAME
+        self.compaction_threshold = (
+            compaction_threshold if compaction_threshold is not None else _load_compaction_threshold()
+        )
+
+    @classmethod
+    def from_index_path(cls, index_path: Path) -> 'ReproducibilityIndex':
+        """Build from a legacy REPRODUCIBILITY/index.parquet path (as passed to DecisionEngine)."""
+        return cls(Path(index_path).parent)
+
+    def exists(self) -> bool:
+        """True if any index data (fragments or legacy file) exists."""
+        if self.legacy_file.exists():
+            return True
+        return self.root.exists() and any(self.root.glob("phase=*/target=*/*.parquet"))
+
+    def version(self) -> Tuple[Tuple[str, int], ...]:
+        """
+        Cheap change token for the index: mtimes of the legacy file, the index root and
+        every partition directory.
+
+        Appending or compacting fragments changes the mtime of their partition directory
+        (and new partitions change the root/phase directories), so the token changes
+        whenever query() results could. Costs one stat per partition, not per row.
+        """
+        entries = []
+        for path in [self.legacy_file, self.root, *self.root.glob("phase=*"), *self.root.glob("phase=*/target=*")]:
+            try:
+                entries.append((str(path), path.stat().st_mtime_ns))
+            except FileNotFoundError:
+                continue
+        return tuple(sorted(entries))
+
+    def _partition_dir(self, phase: Optional[str], target: Optional[str]) -> Path:
+        return (
+            self.root
+            / f"phase={_encode_partition_value(phase)}"
+            / f"target={_encode_partition_value(target)}"
+        )
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive inter-process lock for compaction (no-op without fcntl)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        lock_path = self.root / LOCK_FILENAME
+        with open(lock_path, "a") as lock_file:
+            if _HAS_FCNTL:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if _HAS_FCNTL:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def append(self, row: Dict[str, Any]) -> Path:
+        """
+        Append one row as a new fragment. Never reads or rewrites existing data.
+
+        Args:
+            row: Index row; must contain 'phase' and 'target'
+
+        Returns:
+            Path of the written fragment
+        """
+        partition = self._partition_dir(row.get("phase"), row.get("target"))
+        partition.mkdir(parents=True, exist_ok=True)
+
+        # Nanosecond prefix keeps fragment names in write order (used for dedup)
+        name = f"part-{time.time_ns():020d}-{os.getpid()}-{threading.get_ident()}.parquet"
+        fragment = partition / name
+        tmp = partition / f".{name}.tmp"
+
+        # Partition keys live in the directory name, not in the fragment
+        data = {k: v for k, v in row.items() if k not in ("phase", "target")}
+        pd.DataFrame([data]).to_parquet(tmp, index=False)
+        os.replace(tmp, fragment)  # Atomic: readers never see a partial fragment
+
+        self._maybe_compact_async(partition)
+        return fragment
+
+    def _list_partitions(self, phase: Optional[str] = None, target: Optional[str] = None) -> List[Tuple[str, str, Path]]:
+        """List (phase, target, dir) partitions, pruned by the given keys."""
+        if not self.root.exists():
+            return []
+        phase_glob = f"phase={_encode_partition_value(phase)}" if phase is not None else "phase=*"
+        target_glob = f"target={_encode_partition_value(target)}" if target is not None else "target=*"
+        partitions = []
+        for part_dir in sorted(self.root.glob(f"{phase_glob}/{target_glob}")):
+            if not part_dir.is_dir():
+                continue
+            part_phase = _decode_partition_value(part_dir.parent.name.split("=", 1)[1])
+            part_target = _decode_partition_value(part_dir.name.split("=", 1)[1])
+            partitions.append((part_phase, part_target, part_dir))
+        return partitions
+
+    @staticmethod
+    def _fragments(part_dir: Path) -> List[Path]:
+        return sorted(p for p in part_dir.glob("part-*.parquet"))
+
+    @staticmethod
+    def _write_order(fragment: Path) -> int:
+        """Write-time nanoseconds encoded in a fragment name."""
+        try:
+            return int(fragment.name[len("part-"):].split("-", 1)[0])
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def _read_fragment(
+        path: Path,
+        filters: Optional[List[Tuple[str, str, Any]]],
+        columns: Optional[List[str]]
+    ) -> Optional[pd.DataFrame]:
+        """Read one fragment with predicate/column pushdown; None if filtered out or unreadable."""
+        try:
+            if filters or columns:
+                import pyarrow.parquet as pq
+                schema_names = set(pq.read_schema(path).names)
+                if filters and any(col not in schema_names for col, _, _ in filters):
+                    return None
+                read_columns = [c for c in columns if c in schema_names] if columns else None
+                df = pd.read_parquet(path, columns=read_columns, filters=filters or None)
+            else:
+                df = pd.read_parquet(path)
+        except FileNotFoundError:
+            return None  # Removed by a concurrent compaction; rows live in the compacted fragment
+        except Exception as e:
+            logger.debug(f"Failed to read index fragment {path}: {e}")
+            return None
+        return df if len(df) > 0 else None
+
+    def query(
+        self,
+        phase: Optional[str] = None,
+        target: Optional[str] = None,
+        filters: Optional[List[Tuple[str, str, Any]]] = None,
+        columns: Optional[List[str]] = None,
+        include_legacy: bool = True
+    ) -> pd.DataFrame:
+        """
+        Read index rows matching the given partition keys and predicates.
+
+        Args:
+            phase: Only read this phase's partitions (None = all)
+            target: Only read this target's partitions (None = all)
+            filters: Extra predicates in pyarrow DNF form, e.g. [("cohort_id", "==", cid)]
+            columns: Columns to return (None = all); partition keys are always included
+            include_legacy: Also read a pre-existing monolithic index.parquet
+
+        Returns:
+            DataFrame in write order with duplicate keys collapsed (latest wins)
+        """
+        frames = []
+        # Projection is applied after dedup: reading only the requested columns
+        # would collapse rows that differ in a dedup key the caller didn't ask for
+        read_columns = list(dict.fromkeys(list(columns) + DEDUP_KEYS)) if columns else None
+
+        if include_legacy and self.legacy_file.exists():
+            legacy_filters = list(filters or [])
+            if phase is not None:
+                legacy_filters.append(("phase", "==", phase))
+            if target is not None:
+                legacy_filters.append(("target", "==", target))
+            legacy_df = self._read_fragment(self.legacy_file, legacy_filters, read_columns)
+            if legacy_df is not None:
+                frames.append(legacy_df)
+
+        # Fragments are ordered by their write-time prefix across partitions so
+        # "latest row" semantics (iloc[-1]) match the old single-file index
+        fragment_frames = []
+        for part_phase, part_target, part_dir in self._list_partitions(phase, target):
+            for fragment in self._fragments(part_dir):
+                df = self._read_fragment(fragment, filters, read_columns)
+                if df is None:
+                    continue
+                df.insert(0, "target", part_target)
+                df.insert(0, "phase", part_phase)
+                fragment_frames.append((self._write_order(fragment), df))
+        fragment_frames.sort(key=lambda item: item[0])
+        frames.extend(df for _, df in fragment_frames)
+
+        if not frames:
+            return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+
+        result = pd.concat(frames, ignore_index=True)
+        dedup_keys = [k for k in DEDUP_KEYS if k in result.columns]
+        if dedup_keys:
+            result = result.drop_duplicates(subset=dedup_keys, keep="last").reset_index(drop=True)
+        if columns:
+            result = result.reindex(columns=list(dict.fromkeys(["phase", "target"] + list(columns))))
+        return result
+
+    def compact_partition(self, part_dir: Path) -> Optional[Path]:
+        """
+        Merge all fragments of one partition into a single fragment.
+
+        The merged fragment is written before inputs are removed and keeps the
+        name position of the newest input, so concurrent readers see either the
+        inputs, or the merged file, or both (deduplicated) - never neither.
+        """
+        with self._file_lock():
+            fragments = self._fragments(part_dir)
+            if len(fragments) < 2:
+                return None
+
+            frames = []
+            for fragment in fragments:
+                try:
+                    frames.append(pd.read_parquet(fragment))
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable index fragment during compaction {fragment}: {e}")
+            if not frames:
+                return None
+
+            merged = pd.concat(frames, ignore_index=True)
+            dedup_keys = [k for k in DEDUP_KEYS if k in merged.columns]
+            if dedup_keys:
+                merged = merged.drop_duplicates(subset=dedup_keys, keep="last")
+
+            newest = self._write_order(fragments[-1])
+            compacted = part_dir / f"part-{newest:020d}-compacted.parquet"
+            tmp = part_dir / f".{compacted.name}.tmp"
+            merged.to_parquet(tmp, index=False)
+            os.replace(tmp, compacted)
+
+            for fragment in fragments:
+                if fragment != compacted:
+                    try:
+                        fragment.unlink()
+                    except FileNotFoundError:
+                        pass
+            logger.debug(f"Compacted {len(fragments)} index fragments into {compacted}")
+            return compacted
+
+    def compact(self) -> int:
+        """Compact every partition at or above the threshold. Returns partitions compacted."""
+        compacted = 0
+        for _, _, part_dir in self._list_partitions():
+            if len(self._fragments(part_dir)) >= self.compaction_threshold:
+                if self.compact_partition(part_dir) is not None:
+                    compacted += 1
+        return compacted
+
+    def _maybe_compact_async(self, part_dir: Path) -> None:
+        """Start a background compaction of this partition if it has grown too large."""
+        if self.compaction_threshold <= 0:
+            return
+        if len(self._fragments(part_dir)) < self.compaction_threshold:
+            return
+        if not _compaction_lock.acquire(blocking=False):
+            return  # A compaction is already running in this process
+
+        def _run():
+            try:
+                self.compact_partition(part_dir)
+            except Exception as e:
+                logger.debug(f"Background index compaction failed (non-critical): {e}")
+            finally:
+                _compaction_lock.release()
+
+        threading.Thread(target=_run, name="repro-index-compaction", daemon=True).start()
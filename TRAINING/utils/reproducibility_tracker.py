@@ -33,6 +33,8 @@ from enum import Enum
 import math
 import pandas as pd
 
+from TRAINING.utils.reproducibility_index import ReproducibilityIndex
+
 # Import RunContext and AuditEnforcer for automated audit-grade tracking
 try:
     from TRAINING.utils.run_context import RunContext
@@ -1064,7 +1066,8 @@ class ReproducibilityTracker:
             
             repro_dir = self.output_dir.parent / "REPRODUCIBILITY"
             index_file = repro_dir / "index.parquet"
-            if index_file.exists():
+            run_index = ReproducibilityIndex(repro_dir)
+            if run_index.exists():
                 # Check if Bayesian policy is enabled
                 use_bayesian = get_cfg("training.decisions.use_bayesian", default=False, config_name="training_config")
                 
@@ -1077,11 +1080,12 @@ class ReproducibilityTracker:
                 # Get segment_id from index if available
                 segment_id_for_decision = None
                 try:
-                    if index_file.exists():
-                        df_temp = pd.read_parquet(index_file)
-                        mask = df_temp['cohort_id'] == cohort_id
-                        if mask.any():
-                            segment_id_for_decision = df_temp[mask]['segment_id'].iloc[-1] if 'segment_id' in df_temp.columns else None
+                    df_temp = run_index.query(
+                        filters=[('cohort_id', '==', cohort_id)],
+                        columns=['cohort_id', 'segment_id']
+                    )
+                    if len(df_temp) > 0 and df_temp['segment_id'].notna().any():
+                        segment_id_for_decision = df_temp['segment_id'].dropna().iloc[-1]
                 except Exception:
                     pass
                 decision_result = engine.evaluate(cohort_id, run_id_clean, segment_id=segment_id_for_decision)
@@ -1259,9 +1263,9 @@ class ReproducibilityTracker:
         metrics: Dict[str, Any],
         cohort_dir: Path
     ) -> None:
-        """Update the global index.parquet file."""
+        """Append this run to the partitioned run index (see reproducibility_index)."""
         repro_dir = self.output_dir.parent / "REPRODUCIBILITY"
-        index_file = repro_dir / "index.parquet"
+        run_index = ReproducibilityIndex(repro_dir)
         
         # Normalize stage
         if isinstance(stage, Stage):
@@ -1281,15 +1285,15 @@ class ReproducibilityTracker:
         # Compute segment_id for decision-making (segments reset on identity breaks)
         segment_id = None
         try:
-            from TRAINING.utils.regression_analysis import prepare_segments
-            # Load existing index to compute segment
-            if index_file.exists():
+            from TRAINING.utils.regression_analysis import prepare_segments, IDENTITY_COLS
+            # Load only this cohort's history to compute segment
+            if run_index.exists():
                 try:
-                    df_existing = pd.read_parquet(index_file)
-                    # Filter to same cohort
-                    cohort_mask = df_existing['cohort_id'] == cohort_id
-                    if cohort_mask.any():
-                        df_cohort = df_existing[cohort_mask].copy()
+                    df_cohort = run_index.query(
+                        filters=[('cohort_id', '==', cohort_id)],
+                        columns=['cohort_id', 'run_started_at', 'segment_id', *IDENTITY_COLS]
+                    )
+                    if len(df_cohort) > 0:
                         # Prepare segments (adds segment_id column)
                         df_cohort = prepare_segments(df_cohort, time_col='run_started_at')
                         # Get segment_id for this run (will be computed based on identity fields)
@@ -1477,41 +1481,31 @@ class ReproducibilityTracker:
             "path": str(cohort_dir.relative_to(repro_dir))
         }
         
-        # Load existing index or create new
-        if index_file.exists():
-            try:
-                df = pd.read_parquet(index_file)
-            except Exception:
-                df = pd.DataFrame()
-        else:
-            df = pd.DataFrame()
-        
-        # Append new row
-        new_df = pd.DataFrame([new_row])
-        df = pd.concat([df, new_df], ignore_index=True)
-        
-        # Remove duplicates (keep latest)
-        df = df.drop_duplicates(
-            subset=["phase", "mode", "target", "symbol", "model_family", "cohort_id", "run_id"],
-            keep="last"
-        )
-        
-        # Save
+        # Append-only: one fragment per run, duplicates collapse at query time (latest wins)
         try:
-            index_file.parent.mkdir(parents=True, exist_ok=True)
-            df.to_parquet(index_file, index=False)
-            # Parquet files are automatically flushed, but ensure directory is synced
-            if hasattr(os, 'sync'):
-                try:
-                    os.sync()  # Sync filesystem (if available)
-                except AttributeError:
-                    pass  # os.sync not available on all systems
+            run_index.append(new_row)
         except Exception as e:
             error_type = "IO_ERROR" if isinstance(e, (IOError, OSError)) else "SERIALIZATION_ERROR" if isinstance(e, (json.JSONDecodeError, TypeError)) else "UNKNOWN_ERROR"
-            logger.warning(f"Failed to save index.parquet to {index_file}: {e}, error_type={error_type}")
+            logger.warning(f"Failed to append to run index under {run_index.root}: {e}, error_type={error_type}")
             # Don't re-raise - index update failure shouldn't break the run
     
     
+    @staticmethod
+    def _index_filters(
+        route_type: Optional[str],
+        symbol: Optional[str],
+        model_family: Optional[str]
+    ) -> List[Tuple[str, str, Any]]:
+        """Build run-index predicates for the optional mode/symbol/model_family keys."""
+        filters = []
+        if route_type:
+            filters.append(('mode', '==', route_type.upper()))
+        if symbol:
+            filters.append(('symbol', '==', symbol))
+        if model_family:
+            filters.append(('model_family', '==', model_family))
+        return filters
+    
     def _find_matching_cohort(
         self,
         stage: str,
@@ -1521,29 +1515,23 @@ class ReproducibilityTracker:
         symbol: Optional[str] = None,
         model_family: Optional[str] = None
     ) -> Optional[str]:
-        """Find matching cohort ID from index.parquet."""
+        """Find matching cohort ID from the run index."""
         repro_dir = self.output_dir.parent / "REPRODUCIBILITY"
-        index_file = repro_dir / "index.parquet"
+        run_index = ReproducibilityIndex(repro_dir)
         
-        if not index_file.exists():
+        if not run_index.exists():
             return None
         
         try:
-            df = pd.read_parquet(index_file)
-            
             phase = stage.upper().replace("MODEL_TRAINING", "TRAINING")
             
-            # Filter for same phase, target, mode, symbol, model_family
-            mask = (df['phase'] == phase) & (df['target'] == item_name)
-            
-            if route_type:
-                mask &= (df['mode'] == route_type.upper())
-            if symbol:
-                mask &= (df['symbol'] == symbol)
-            if model_family:
-                mask &= (df['model_family'] == model_family)
-            
-            candidates = df[mask]
+            # Read only this phase/target partition, filtering mode, symbol, model_family on read
+            candidates = run_index.query(
+                phase=phase,
+                target=item_name,
+                filters=self._index_filters(route_type, symbol, model_family),
+                columns=['cohort_id', 'N_effective', 'path']
+            )
             
             if len(candidates) == 0:
                 return None
@@ -1697,31 +1685,26 @@ class ReproducibilityTracker:
             Previous run metrics dict or None if no comparable run found
         """
         repro_dir = self.output_dir.parent / "REPRODUCIBILITY"
-        index_file = repro_dir / "index.parquet"
+        run_index = ReproducibilityIndex(repro_dir)
         
-        if not index_file.exists():
+        if not run_index.exists():
             return None
         
         try:
-            df = pd.read_parquet(index_file)
-            
             phase = stage.upper().replace("MODEL_TRAINING", "TRAINING")
             
-            # Filter for matching stage, target, mode, symbol, model_family
-            mask = (df['phase'] == phase) & (df['target'] == item_name)
-            
-            if route_type:
-                mask &= (df['mode'] == route_type.upper())
-            if symbol:
-                mask &= (df['symbol'] == symbol)
-            if model_family:
-                mask &= (df['model_family'] == model_family)
-            
-            # If cohort_id provided, filter to same cohort
+            # Read only this phase/target partition, filtering mode, symbol, model_family
+            # (and cohort_id, if provided) on read
+            filters = self._index_filters(route_type, symbol, model_family)
             if cohort_id:
-                mask &= (df['cohort_id'] == cohort_id)
+                filters.append(('cohort_id', '==', cohort_id))
             
-            candidates = df[mask].sort_values('date', ascending=False)
+            candidates = run_index.query(
+                phase=phase,
+                target=item_name,
+                filters=filters,
+                columns=['cohort_id', 'N_effective', 'path', 'date']
+            ).sort_values('date', ascending=False)
             
             if len(candidates) == 0:
                 return None
@@ -2082,15 +2065,15 @@ class ReproducibilityTracker:
                 route_entropy = None
                 try:
                     repro_dir = self.output_dir.parent / "REPRODUCIBILITY"
-                    index_file = repro_dir / "index.parquet"
-                    if index_file.exists():
-                        df = pd.read_parquet(index_file)
+                    run_index = ReproducibilityIndex(repro_dir)
+                    if run_index.exists():
                         # Get route history for this cohort/target
                         cohort_id = self._compute_cohort_id(cohort_metadata, route_type)
-                        mask = (df['cohort_id'] == cohort_id) & (df['target'] == item_name)
+                        filters = [('cohort_id', '==', cohort_id)]
                         if route_type:
-                            mask &= (df['mode'] == route_type.upper())
-                        route_history = df[mask]['route'].dropna().tolist()
+                            filters.append(('mode', '==', route_type.upper()))
+                        df = run_index.query(target=item_name, filters=filters, columns=['route'])
+                        route_history = df['route'].dropna().tolist()
                         if len(route_history) >= 3:
                             # Compute entropy: -sum(p * log2(p))
                             from collections import Counter
@@ -66,6 +66,7 @@ class RunContext:
     purge_minutes: Optional[float] = None
     embargo_minutes: Optional[float] = None
     fold_timestamps: Optional[List[Dict[str, Any]]] = None
+    fold_plan: Optional[Any] = None  # FoldPlan (fold row ranges, reusable across consumers/reruns)
     
     # Feature configuration
     feature_lookback_max_minutes: Optional[float] = None
@@ -189,5 +190,6 @@ class RunContext:
             "stage": self.stage,
             "route_type": self.route_type,
             "symbol": self.symbol,
-            "model_family": self.model_family
+            "model_family": self.model_family,
+            "fold_plan": self.fold_plan.to_dict() if self.fold_plan is not None else None
         }
@@ -136,21 +136,31 @@ class TrendAnalyzer:
         self.min_runs_for_trend = min_runs_for_trend
         self.suspicious_slope_threshold = suspicious_slope_threshold
     
-    def load_artifact_index(self) -> pd.DataFrame:
+    def load_artifact_index(self, refresh: bool = True) -> pd.DataFrame:
         """
-        Load or build unified artifact index from REPRODUCIBILITY structure.
+        Load or incrementally update the unified artifact index from REPRODUCIBILITY structure.
+        
+        The index is persisted as artifact_index.parquet alongside a small state file
+        (artifact_index_state.json) holding a per-cohort (mtime_ns, size) signature of
+        metadata.json/metrics.json. On refresh only cohorts that
+        are new or whose files changed are parsed (in parallel), and their rows are
+        merged into the existing index; rows for deleted cohorts are dropped.
+        
+        Args:
+            refresh: If False, return the persisted index as-is when present
         
         Returns:
             DataFrame with one row per run, normalized columns
         """
         index_path = self.reproducibility_dir / "artifact_index.parquet"
+        state_path = self.reproducibility_dir / "artifact_index_state.json"
         
         # Try to load existing index
+        existing_df = None
         if index_path.exists():
             try:
-                df = pd.read_parquet(index_path)
-                logger.debug(f"Loaded existing artifact index: {len(df)} runs")
-                return df
+                existing_df = pd.read_parquet(index_path)
+                logger.debug(f"Loaded existing artifact index: {len(existing_df)} runs")
             except Exception as e:
                 logger.warning(f"Failed to load existing index: {e}, rebuilding...")
                 # Remove corrupted file
@@ -160,63 +170,144 @@ class TrendAnalyzer:
                 except Exception:
                     pass
         
-        # Build index from REPRODUCIBILITY structure
-        logger.info("Building artifact index from REPRODUCIBILITY structure...")
-        rows = []
+        if existing_df is not None and not refresh:
+            return existing_df
         
-        # Walk REPRODUCIBILITY directory
-        for stage_dir in self.reproducibility_dir.iterdir():
-            if not stage_dir.is_dir() or stage_dir.name.startswith('.'):
+        # Signatures from the last build; without them (or the index) everything is rebuilt
+        state = self._load_index_state(state_path) if existing_df is not None else {}
+        known_signatures: Dict[str, List[int]] = state.get('cohorts', {})
+        
+        # Cheap pass: stat files only, no JSON parsing
+        current_signatures: Dict[str, List[int]] = {}
+        changed: List[Tuple[str, Path, Path]] = []
+        for stage, item_dir, cohort_dir in self._iter_cohort_dirs():
+            signature = self._cohort_signature(cohort_dir)
+            if signature is None:
                 continue
-            
-            stage = stage_dir.name
-            
-            # Handle nested structure: STAGE/MODE/target/cohort=.../
-            for item_dir in self._walk_stage_directory(stage_dir):
-                for cohort_dir in item_dir.iterdir():
-                    if not cohort_dir.is_dir() or not cohort_dir.name.startswith('cohort='):
-                        continue
-                    
-                    # Load metadata and metrics
-                    metadata_file = cohort_dir / "metadata.json"
-                    metrics_file = cohort_dir / "metrics.json"
-                    
-                    if not metadata_file.exists():
-                        continue
-                    
-                    try:
-                        with open(metadata_file, 'r') as f:
-                            metadata = json.load(f)
-                        
-                        metrics = {}
-                        if metrics_file.exists():
-                            with open(metrics_file, 'r') as f:
-                                metrics = json.load(f)
-                        
-                        # Extract normalized row
-                        row = self._extract_index_row(stage, item_dir, cohort_dir, metadata, metrics)
-                        if row:
-                            rows.append(row)
-                    except Exception as e:
-                        logger.debug(f"Failed to load {metadata_file}: {e}")
-                        continue
-        
-        if not rows:
+            key = str(cohort_dir.relative_to(self.reproducibility_dir))
+            current_signatures[key] = signature
+            if known_signatures.get(key) != signature:
+                changed.append((stage, item_dir, cohort_dir))
+        
+        removed = set(known_signatures) - set(current_signatures)
+        if existing_df is not None and not changed and not removed:
+            logger.debug("Artifact index up to date")
+            return existing_df
+        
+        if existing_df is None or not known_signatures:
+            logger.info("Building artifact index from REPRODUCIBILITY structure...")
+        else:
+            logger.info(f"Updating artifact index: {len(changed)} new/changed cohorts, {len(removed)} removed")
+        
+        # Parse only new/changed cohorts, in parallel (I/O bound)
+        rows = []
+        if changed:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor() as pool:
+                for row in pool.map(lambda args: self._load_cohort_row(*args), changed):
+                    if row:
+                        rows.append(row)
+        
+        # Merge: drop stale rows for changed/removed cohorts, then append fresh rows
+        if existing_df is not None and known_signatures and len(existing_df) > 0 and 'metadata_path' in existing_df.columns:
+            stale_paths = {
+                str(self.reproducibility_dir / key / "metadata.json")
+                for key in removed.union(str(c.relative_to(self.reproducibility_dir)) for _, _, c in changed)
+            }
+            kept_df = existing_df[~existing_df['metadata_path'].isin(stale_paths)]
+        else:
+            kept_df = None
+        
+        new_df = pd.DataFrame(rows)
+        if kept_df is not None and len(kept_df) > 0:
+            df = pd.concat([kept_df, new_df], ignore_index=True) if len(new_df) > 0 else kept_df.reset_index(drop=True)
+        else:
+            df = new_df
+        
+        if len(df) == 0:
             logger.warning("No runs found in REPRODUCIBILITY directory")
             return pd.DataFrame()
         
-        df = pd.DataFrame(rows)
-        
-        # Save index for future use
+        # Save index and state for future use
         try:
             index_path.parent.mkdir(parents=True, exist_ok=True)
             df.to_parquet(index_path)
+            self._save_index_state(state_path, {'cohorts': current_signatures})
             logger.info(f"Saved artifact index: {len(df)} runs")
         except Exception as e:
             logger.warning(f"Failed to save artifact index: {e}")
         
         return df
     
+    def _iter_cohort_dirs(self):
+        """Yield (stage, item_dir, cohort_dir) for every cohort directory in the tree."""
+        from TRAINING.utils.reproducibility_index import INDEX_DIRNAME
+        
+        for stage_dir in self.reproducibility_dir.iterdir():
+            if not stage_dir.is_dir() or stage_dir.name.startswith('.') or stage_dir.name == INDEX_DIRNAME:
+                continue
+            
+            stage = stage_dir.name
+            
+            # Handle nested structure: STAGE/MODE/target/cohort=.../
+            for item_dir in self._walk_stage_directory(stage_dir):
+                for cohort_dir in item_dir.iterdir():
+                    if cohort_dir.is_dir() and cohort_dir.name.startswith('cohort='):
+                        yield stage, item_dir, cohort_dir
+    
+    @staticmethod
+    def _cohort_signature(cohort_dir: Path) -> Optional[List[int]]:
+        """(max mtime_ns, total size) of metadata.json + metrics.json; None if no metadata."""
+        try:
+            meta_stat = (cohort_dir / "metadata.json").stat()
+        except OSError:
+            return None
+        mtime_ns, size = meta_stat.st_mtime_ns, meta_stat.st_size
+        try:
+            metrics_stat = (cohort_dir / "metrics.json").stat()
+            mtime_ns = max(mtime_ns, metrics_stat.st_mtime_ns)
+            size += metrics_stat.st_size
+        except OSError:
+            pass
+        return [mtime_ns, size]
+    
+    def _load_cohort_row(self, stage: str, item_dir: Path, cohort_dir: Path) -> Optional[Dict[str, Any]]:
+        """Parse metadata/metrics of one cohort into an index row."""
+        metadata_file = cohort_dir / "metadata.json"
+        metrics_file = cohort_dir / "metrics.json"
+        try:
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+            
+            metrics = {}
+            if metrics_file.exists():
+                with open(metrics_file, 'r') as f:
+                    metrics = json.load(f)
+            
+            # Extract normalized row
+            return self._extract_index_row(stage, item_dir, cohort_dir, metadata, metrics)
+        except Exception as e:
+            logger.debug(f"Failed to load {metadata_file}: {e}")
+            return None
+    
+    @staticmethod
+    def _load_index_state(state_path: Path) -> Dict[str, Any]:
+        if not state_path.exists():
+            return {}
+        try:
+            with open(state_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.debug(f"Failed to load artifact index state: {e}, rebuilding")
+            return {}
+    
+    @staticmethod
+    def _save_index_state(state_path: Path, state: Dict[str, Any]) -> None:
+        tmp_path = state_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        tmp_path.replace(state_path)
+    
     def _walk_stage_directory(self, stage_dir: Path) -> List[Path]:
         """Walk stage directory to find all item directories (targets/features/models)."""
         items = []